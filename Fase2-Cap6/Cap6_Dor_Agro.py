@@ -16,9 +16,11 @@ import sys
 import os
 import logging
 import json
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Dict, Any, Tuple, List, Union
+from typing import Optional, Dict, Any, Tuple, List, Union, Iterator
 from dotenv import load_dotenv
 
 # --- CONFIGURAÇÕES INICIAIS ---
@@ -196,6 +198,124 @@ def input_email() -> Optional[str]:
             return email
         logger.warning("Formato inválido! Use exemplo@dominio.com")
 
+# --- CACHE DE INSTRUÇÕES ---
+# Quantidade de instruções mantidas preparadas por conexão (cursores e cache do driver)
+TAMANHO_CACHE_INSTRUCOES = int(os.getenv("DB_STMT_CACHE_SIZE", "50"))
+
+class CacheInstrucoes:
+    """
+    Mantém um cursor preparado por texto SQL para uma conexão.
+
+    Ao reutilizar o mesmo cursor para o mesmo SQL, as execuções repetidas evitam
+    o custo de alocação de cursor e de parse. O cache é limitado (LRU) e
+    contabiliza acertos e falhas.
+    """
+
+    def __init__(self, conn: oracledb.Connection, capacidade: int = TAMANHO_CACHE_INSTRUCOES):
+        """
+        Inicializa o cache de instruções.
+
+        Args:
+            conn (oracledb.Connection): Conexão dona dos cursores.
+            capacidade (int): Quantidade máxima de cursores mantidos abertos.
+        """
+        self.conn = conn
+        self.capacidade = capacidade
+        self.cursores: "OrderedDict[str, oracledb.Cursor]" = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter_cursor(self, sql: str) -> oracledb.Cursor:
+        """
+        Retorna o cursor preparado para o SQL, criando-o se necessário.
+
+        Args:
+            sql (str): Texto do comando SQL.
+
+        Returns:
+            oracledb.Cursor: Cursor já preparado com o comando.
+        """
+        cursor = self.cursores.get(sql)
+        if cursor is not None:
+            self.cursores.move_to_end(sql)
+            self.acertos += 1
+            return cursor
+
+        self.falhas += 1
+        cursor = self.conn.cursor()
+        cursor.prepare(sql)
+        self.cursores[sql] = cursor
+        if len(self.cursores) > self.capacidade:
+            _, mais_antigo = self.cursores.popitem(last=False)
+            mais_antigo.close()
+        return cursor
+
+    def descartar(self, sql: str) -> None:
+        """
+        Fecha e remove o cursor de um SQL (usado após erros de execução).
+
+        Args:
+            sql (str): Texto do comando SQL.
+        """
+        cursor = self.cursores.pop(sql, None)
+        if cursor is not None:
+            try:
+                cursor.close()
+            except oracledb.Error:
+                pass
+
+    def estatisticas(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            Dict[str, int]: Acertos, falhas e quantidade de cursores abertos.
+        """
+        return {"acertos": self.acertos, "falhas": self.falhas, "cursores": len(self.cursores)}
+
+    def fechar(self) -> None:
+        """Fecha todos os cursores mantidos pelo cache."""
+        for sql in list(self.cursores):
+            self.descartar(sql)
+
+# Caches por conexão (chave: id da conexão; o cache mantém a referência à conexão)
+_caches_instrucoes: Dict[int, CacheInstrucoes] = {}
+
+def obter_cache_instrucoes(conn: oracledb.Connection) -> CacheInstrucoes:
+    """
+    Retorna o cache de instruções da conexão, criando-o no primeiro uso.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+
+    Returns:
+        CacheInstrucoes: Cache associado à conexão.
+    """
+    cache = _caches_instrucoes.get(id(conn))
+    if cache is None:
+        cache = CacheInstrucoes(conn)
+        _caches_instrucoes[id(conn)] = cache
+    return cache
+
+def liberar_cache_instrucoes(conn: oracledb.Connection) -> Dict[str, int]:
+    """
+    Fecha os cursores em cache da conexão e descarta o cache.
+
+    Deve ser chamada antes de fechar a conexão.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+
+    Returns:
+        Dict[str, int]: Estatísticas finais do cache.
+    """
+    cache = _caches_instrucoes.pop(id(conn), None)
+    if cache is None:
+        return {"acertos": 0, "falhas": 0, "cursores": 0}
+    estatisticas = cache.estatisticas()
+    cache.fechar()
+    return estatisticas
+
 def executar_sql(
         conn: oracledb.Connection,
         sql: str,
@@ -205,6 +325,9 @@ def executar_sql(
     """
     Executa operações SQL no banco de dados com tratamento de erros.
 
+    Os cursores são reaproveitados por texto SQL através do cache de instruções
+    da conexão, por isso os comandos devem usar binds em vez de valores literais.
+
     Args:
         conn (oracledb.Connection): Conexão com o banco de dados.
         sql (str): Comando SQL a ser executado.
@@ -220,41 +343,162 @@ def executar_sql(
     Raises:
         DatabaseError: Em caso de falha na execução SQL.
     """
-    cursor = None
+    cache = obter_cache_instrucoes(conn)
     try:
-        cursor = conn.cursor()
+        cursor = cache.obter_cursor(sql)
 
         if operacao == 'insert_returning':
             id_var = cursor.var(oracledb.NUMBER)
             if params is None:
                 params = {}
             params['id'] = id_var
-            cursor.execute(sql, params)
-            conn.commit()
+            cursor.execute(None, params)
+            if not em_transacao(conn):
+                conn.commit()
             logger.info(f"Operação realizada: {sql.split()[0]} com ID {id_var.getvalue()[0]}")
             return id_var.getvalue()[0]
 
         elif operacao == 'insert':
-            cursor.execute(sql, params)
-            conn.commit()
+            cursor.execute(None, params)
+            if not em_transacao(conn):
+                conn.commit()
             logger.info(f"Operação realizada: {sql.split()[0]}")
 
         elif operacao == 'select_one':
-            cursor.execute(sql, params)
+            cursor.execute(None, params)
             return cursor.fetchone()
 
         elif operacao == 'select_all':
-            cursor.execute(sql, params)
+            cursor.execute(None, params)
             return cursor.fetchall(), [desc[0] for desc in cursor.description]
 
     except oracledb.DatabaseError as e:
         error, = e.args
         logger.error(f"Erro Oracle (ORA-{error.code}): {error.message}")
+        cache.descartar(sql)
         conn.rollback()
+        if em_transacao(conn):
+            _transacoes_ativas[id(conn)]["falhou"] = True
         raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
-    finally:
-        if cursor:
-            cursor.close()
+
+# --- TRANSAÇÕES (UNIDADE DE TRABALHO) ---
+# Transações abertas por conexão (chave: id da conexão)
+_transacoes_ativas: Dict[int, Dict[str, Any]] = {}
+
+def em_transacao(conn: oracledb.Connection) -> bool:
+    """
+    Indica se a conexão está dentro de um bloco `transacao`.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+
+    Returns:
+        bool: True se houver transação aberta.
+    """
+    return id(conn) in _transacoes_ativas
+
+@contextmanager
+def transacao(conn: oracledb.Connection) -> Iterator[oracledb.Connection]:
+    """
+    Agrupa várias operações em uma única transação (unidade de trabalho).
+
+    Dentro do bloco, `executar_sql` não faz commit a cada comando: o commit
+    ocorre uma única vez ao final. Qualquer exceção, ou falha SQL capturada
+    por quem chamou, desfaz todas as operações. Blocos aninhados participam
+    da transação mais externa.
+
+    Exemplo:
+        with transacao(conn):
+            executar_sql(conn, SQL_INSERT_PLANTIO, dados, 'insert_returning')
+            executar_sql(conn, SQL_INSERT_INSUMO, insumo)
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+
+    Yields:
+        oracledb.Connection: A própria conexão.
+
+    Raises:
+        DatabaseError: Se alguma operação falhou ou o commit não foi concluído.
+    """
+    chave = id(conn)
+    if chave in _transacoes_ativas:
+        yield conn
+        return
+
+    _transacoes_ativas[chave] = {"falhou": False}
+    try:
+        yield conn
+    except BaseException:
+        del _transacoes_ativas[chave]
+        conn.rollback()
+        logger.warning("Transação desfeita")
+        raise
+
+    if _transacoes_ativas.pop(chave)["falhou"]:
+        conn.rollback()
+        raise DatabaseError("Transação desfeita: uma das operações falhou")
+
+    try:
+        conn.commit()
+        logger.info("Transação confirmada")
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        logger.error(f"Erro Oracle (ORA-{error.code}) ao confirmar transação: {error.message}")
+        conn.rollback()
+        raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+
+# --- COMANDOS DE CADASTRO ---
+SQL_INSERT_PRODUTOR = """
+    INSERT INTO Produtores (
+        nome_fazenda, cnpj, localizacao, area_hectares, 
+        telefone, email, biografia, data_cadastro
+    ) VALUES (
+        :nome, :cnpj, :local, :area, :tel, :email, :bio, SYSDATE
+    )
+    RETURNING id_produtor INTO :id
+"""
+
+SQL_INSERT_PLANTIO = """
+    INSERT INTO Plantios (
+        id_produtor, id_rastreio, cultura, data_plantio, data_colheita,
+        solo_tipo, metodo_irrigacao, uso_agrotoxico, descricao
+    ) VALUES (
+        :id_produtor, :id_rastreio, :cultura, :data_plantio, :data_colheita,
+        :solo_tipo, :metodo_irrigacao, :uso_agrotoxico, :descricao
+    )
+    RETURNING id_plantio INTO :id
+"""
+
+SQL_INSERT_INSUMO = """
+    INSERT INTO Insumos (
+        id_insumo, id_plantio, tipo, nome, quantidade, unidade
+    ) VALUES (
+        :id_insumo, :id_plantio, :tipo, :nome, :quantidade, :unidade
+    )
+"""
+
+SQL_INSERT_CERTIFICACAO = """
+    INSERT INTO Certificacoes (
+        id_certificacao, id_produtor, tipo, certificadora, data_validade, codigo_certificado
+    ) VALUES (
+        :id_cert, :id_prod, :tipo, :certif, :data_val, :codigo
+    )
+"""
+
+SQL_INSERT_TRANSPORTE = """
+    INSERT INTO Transporte (
+        id_transporte, id_plantio, tipo_veiculo, distancia_km, 
+        emissao_co2, data_transporte, destino
+    ) VALUES (
+        :id_transp, :id_plant, :tipo_veic, :distancia,
+        :emissao, :data_transp, :destino
+    )
+"""
+
+SQL_PROXIMO_ID_INSUMO = "SELECT NVL(MAX(id_insumo), 0) + 1 FROM Insumos"
+SQL_PROXIMO_ID_CERTIFICACAO = "SELECT NVL(MAX(id_certificacao), 0) + 1 FROM Certificacoes"
+SQL_PROXIMO_ID_TRANSPORTE = "SELECT NVL(MAX(id_transporte), 0) + 1 FROM Transporte"
 
 # --- FUNÇÃO DE CADASTRO ---
 def cadastrar_produtores(conn: oracledb.Connection) -> None:
@@ -283,15 +527,7 @@ def cadastrar_produtores(conn: oracledb.Connection) -> None:
             "bio": input_texto("Biografia (opcional): ")  # Corrigido para :bio
         }
 
-        sql = """
-        INSERT INTO Produtores (
-            nome_fazenda, cnpj, localizacao, area_hectares, 
-            telefone, email, biografia, data_cadastro
-        ) VALUES (
-            :nome, :cnpj, :local, :area, :tel, :email, :bio, SYSDATE
-        )
-        RETURNING id_produtor INTO :id
-        """
+        sql = SQL_INSERT_PRODUTOR
 
         id_produtor = executar_sql(conn, sql, dados, 'insert_returning')
         print(f"\n✅ Produtor cadastrado com sucesso! ID: {id_produtor}")
@@ -334,16 +570,7 @@ def cadastrar_plantios(conn: oracledb.Connection) -> None:
             "descricao": input_texto("Descrição (400 caracteres, opcional): ", max_caracteres=400)
         }
 
-        sql = """
-        INSERT INTO Plantios (
-            id_produtor, id_rastreio, cultura, data_plantio, data_colheita,
-            solo_tipo, metodo_irrigacao, uso_agrotoxico, descricao
-        ) VALUES (
-            :id_produtor, :id_rastreio, :cultura, :data_plantio, :data_colheita,
-            :solo_tipo, :metodo_irrigacao, :uso_agrotoxico, :descricao
-        )
-        RETURNING id_plantio INTO :id
-        """
+        sql = SQL_INSERT_PLANTIO
 
         id_plantio = executar_sql(conn, sql, dados, 'insert_returning')
         print(f"\n✅ Plantio cadastrado com sucesso! ID: {id_plantio}")
@@ -378,18 +605,9 @@ def cadastrar_insumos(conn: oracledb.Connection, dados=None) -> None:
                  }
 
         # Obter próximo ID disponível
-        cursor = conn.cursor()
-        cursor.execute("SELECT NVL(MAX(id_insumo), 0) + 1 FROM Insumos")
-        proximo_id = cursor.fetchone()[0]
-        cursor.close()
+        proximo_id = executar_sql(conn, SQL_PROXIMO_ID_INSUMO, operacao='select_one')[0]
 
-        sql = """
-        INSERT INTO Insumos (
-            id_insumo, id_plantio, tipo, nome, quantidade, unidade
-        ) VALUES (
-            :id_insumo, :id_plantio, :tipo, :nome, :quantidade, :unidade
-        )
-        """
+        sql = SQL_INSERT_INSUMO
 
         params = {
             "id_insumo": proximo_id,
@@ -433,18 +651,9 @@ def cadastrar_certificacoes(conn: oracledb.Connection) -> None:
         }
 
         # Obter próximo ID disponível
-        cursor = conn.cursor()
-        cursor.execute("SELECT NVL(MAX(id_certificacao), 0) + 1 FROM Certificacoes")
-        proximo_id = cursor.fetchone()[0]
-        cursor.close()
+        proximo_id = executar_sql(conn, SQL_PROXIMO_ID_CERTIFICACAO, operacao='select_one')[0]
 
-        sql = """
-        INSERT INTO Certificacoes (
-            id_certificacao, id_produtor, tipo, certificadora, data_validade, codigo_certificado
-        ) VALUES (
-            :id_cert, :id_prod, :tipo, :certif, :data_val, :codigo
-        )
-        """
+        sql = SQL_INSERT_CERTIFICACAO
 
         executar_sql(conn, sql, {
             "id_cert": proximo_id,
@@ -494,20 +703,9 @@ def cadastrar_transportes(conn: oracledb.Connection) -> None:
         }
 
         # Obter próximo ID disponível
-        cursor = conn.cursor()
-        cursor.execute("SELECT NVL(MAX(id_transporte), 0) + 1 FROM Transporte")
-        proximo_id = cursor.fetchone()[0]
-        cursor.close()
+        proximo_id = executar_sql(conn, SQL_PROXIMO_ID_TRANSPORTE, operacao='select_one')[0]
 
-        sql = """
-        INSERT INTO Transporte (
-            id_transporte, id_plantio, tipo_veiculo, distancia_km, 
-            emissao_co2, data_transporte, destino
-        ) VALUES (
-            :id_transp, :id_plant, :tipo_veic, :distancia,
-            :emissao, :data_transp, :destino
-        )
-        """
+        sql = SQL_INSERT_TRANSPORTE
 
         executar_sql(conn, sql, {
             "id_transp": proximo_id,
@@ -528,7 +726,78 @@ def cadastrar_transportes(conn: oracledb.Connection) -> None:
     finally:
         input("\nPressione Enter para continuar...")
 
+def registrar_cadeia_produtiva(
+        conn: oracledb.Connection,
+        produtor: Dict[str, Any],
+        plantios: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Registra um produtor com seus plantios, insumos e transportes em uma única transação.
+
+    Usado em cargas não interativas: todos os registros são confirmados com um
+    único commit, ou nenhum é gravado em caso de falha.
+
+    Args:
+        conn (oracledb.Connection): Conexão ativa com o banco de dados.
+        produtor (Dict[str, Any]): Dados do produtor (chaves de SQL_INSERT_PRODUTOR).
+        plantios (List[Dict[str, Any]]): Plantios (chaves de SQL_INSERT_PLANTIO, exceto
+            id_produtor), cada um com listas opcionais 'insumos' e 'transportes'.
+
+    Returns:
+        Dict[str, Any]: IDs gerados ('id_produtor' e lista 'plantios').
+
+    Raises:
+        DatabaseError: Se qualquer operação falhar (nada é gravado).
+    """
+    with transacao(conn):
+        id_produtor = executar_sql(conn, SQL_INSERT_PRODUTOR, dict(produtor), 'insert_returning')
+        ids_plantios = []
+
+        for plantio in plantios:
+            dados_plantio = {chave: valor for chave, valor in plantio.items()
+                             if chave not in ('insumos', 'transportes')}
+            dados_plantio["id_produtor"] = id_produtor
+            id_plantio = executar_sql(conn, SQL_INSERT_PLANTIO, dados_plantio, 'insert_returning')
+            ids_plantios.append(id_plantio)
+
+            for insumo in plantio.get('insumos', []):
+                executar_sql(conn, SQL_INSERT_INSUMO, {
+                    "id_insumo": executar_sql(conn, SQL_PROXIMO_ID_INSUMO, operacao='select_one')[0],
+                    "id_plantio": id_plantio,
+                    "tipo": insumo["tipo"],
+                    "nome": insumo.get("nome"),
+                    "quantidade": float(insumo["quantidade"]) if insumo.get("quantidade") is not None else None,
+                    "unidade": insumo.get("unidade")
+                })
+
+            for transporte in plantio.get('transportes', []):
+                executar_sql(conn, SQL_INSERT_TRANSPORTE, {
+                    "id_transp": executar_sql(conn, SQL_PROXIMO_ID_TRANSPORTE, operacao='select_one')[0],
+                    "id_plant": id_plantio,
+                    "tipo_veic": transporte.get("tipo_veiculo"),
+                    "distancia": float(transporte["distancia_km"]) if transporte.get("distancia_km") is not None else None,
+                    "emissao": float(transporte["emissao_co2"]) if transporte.get("emissao_co2") is not None else None,
+                    "data_transp": transporte.get("data_transporte"),
+                    "destino": transporte.get("destino")
+                })
+
+    logger.info(f"Cadeia produtiva registrada: produtor {id_produtor}, {len(ids_plantios)} plantio(s)")
+    return {"id_produtor": id_produtor, "plantios": ids_plantios}
+
 # --- FUNÇÃO PARA LISTAR CADASTROS ---
+# Textos SQL fixos por tabela: cada tabela sempre gera o mesmo texto,
+# permitindo o reaproveitamento dos cursores pelo cache de instruções
+CHAVES_TABELAS = {
+    'PRODUTORES': 'id_produtor',
+    'PLANTIOS': 'id_plantio',
+    'INSUMOS': 'id_insumo',
+    'CERTIFICACOES': 'id_certificacao',
+    'TRANSPORTE': 'id_transporte'
+}
+SQL_LISTAGEM = {tabela: f"SELECT * FROM {tabela}" for tabela in CHAVES_TABELAS}
+SQL_CONSULTA_POR_ID = {tabela: f"SELECT * FROM {tabela} WHERE {chave} = :id" for tabela, chave in CHAVES_TABELAS.items()}
+SQL_EXCLUSAO_POR_ID = {tabela: f"DELETE FROM {tabela} WHERE {chave} = :id" for tabela, chave in CHAVES_TABELAS.items()}
+
 def listar_cadastro(conn: oracledb.Connection) -> None:
     """
     Exibe um menu secundário para listar registros de cadastros específicos.
@@ -572,8 +841,7 @@ def listar_cadastro(conn: oracledb.Connection) -> None:
 
             try:
                 # Executa o SELECT na tabela escolhida
-                sql = f"SELECT * FROM {tabela['nome']}"
-                resultados, colunas = executar_sql(conn, sql, operacao='select_all')
+                resultados, colunas = executar_sql(conn, SQL_LISTAGEM[tabela['nome']], operacao='select_all')
 
                 if not resultados:
                     print(f"\nℹ️ Nenhum registro encontrado na tabela {tabela['nome']}.")
@@ -652,7 +920,7 @@ def excluir_registros(conn: oracledb.Connection) -> None:
 
             try:
                 # Verifica existência
-                sql_verifica = f"SELECT * FROM {tabela['nome']} WHERE {tabela['id']} = :id"
+                sql_verifica = SQL_CONSULTA_POR_ID[tabela['nome']]
                 resultado, colunas = executar_sql(conn, sql_verifica, {'id': id_registro}, 'select_all')
 
                 if not resultado:
@@ -667,7 +935,7 @@ def excluir_registros(conn: oracledb.Connection) -> None:
 
                 # Confirmação
                 if input_opcao("\nConfirmar exclusão? (S/N): ", ["S", "N"]) == "S":
-                    sql_exclui = f"DELETE FROM {tabela['nome']} WHERE {tabela['id']} = :id"
+                    sql_exclui = SQL_EXCLUSAO_POR_ID[tabela['nome']]
                     executar_sql(conn, sql_exclui, {'id': id_registro})
                     print("\n✅ Registro excluído com sucesso!")
 
@@ -683,11 +951,310 @@ def excluir_registros(conn: oracledb.Connection) -> None:
         logger.exception("Erro na função de exclusão")
         print("\n❌ Ocorreu um erro inesperado. Consulte o log para detalhes.")
 
+# --- EXPURGO E RESET DA BASE ---
+# Ordem de exclusão CRÍTICA (filhos antes dos pais, respeitando as FKs)
+TABELAS_EXPURGO = ['CERTIFICACOES', 'TRANSPORTE', 'INSUMOS', 'PLANTIOS', 'PRODUTORES']
+
+SEQUENCIAS = {
+    'PRODUTORES': 'SEQ_PRODUTORES',
+    'PLANTIOS': 'SEQ_PLANTIOS',
+    'INSUMOS': 'SEQ_INSUMOS',
+    'CERTIFICACOES': 'SEQ_CERTIFICACOES',
+    'TRANSPORTE': 'SEQ_TRANSPORTE'
+}
+
+# Quantidade de linhas removidas por lote (um commit por lote) nos expurgos seletivos
+TAMANHO_LOTE_EXPURGO = int(os.getenv("PURGE_BATCH_SIZE", "10000"))
+
+def _exigir_fora_de_transacao(conn: oracledb.Connection, operacao: str) -> None:
+    """
+    Impede operações que fazem commit por conta própria dentro de um bloco `transacao`.
+
+    DDL faz commit implícito e os expurgos confirmam cada lote, o que gravaria
+    pela metade a unidade de trabalho de quem chamou.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+        operacao (str): Descrição da operação, usada na mensagem de erro.
+
+    Raises:
+        ValidationError: Se a conexão estiver dentro de uma transação.
+    """
+    if em_transacao(conn):
+        raise ValidationError(f"{operacao} não pode ser executado dentro de uma transação")
+
+def _executar_ddl(conn: oracledb.Connection, sql: str) -> None:
+    """
+    Executa um comando DDL (TRUNCATE, ALTER, CREATE, DROP) com tratamento de erros.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+        sql (str): Comando DDL a ser executado.
+
+    Raises:
+        ValidationError: Se a conexão estiver dentro de uma transação (o DDL faz commit implícito).
+        DatabaseError: Em caso de falha na execução.
+    """
+    _exigir_fora_de_transacao(conn, "DDL")
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        logger.info(f"DDL executado: {sql}")
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        logger.error(f"Erro Oracle (ORA-{error.code}) em '{sql}': {error.message}")
+        raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+    finally:
+        if cursor:
+            cursor.close()
+
+def listar_fks(conn: oracledb.Connection, tabelas: List[str]) -> List[Tuple[str, str]]:
+    """
+    Lista as chaves estrangeiras habilitadas que envolvem as tabelas informadas.
+
+    Considera tanto as FKs declaradas nas tabelas quanto as que as referenciam,
+    pois ambas impedem o TRUNCATE (ORA-02266).
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+        tabelas (List[str]): Nomes das tabelas (maiúsculas).
+
+    Returns:
+        List[Tuple[str, str]]: Pares (tabela, constraint) das FKs habilitadas.
+    """
+    binds = {f"t{i}": tabela for i, tabela in enumerate(tabelas)}
+    lista = ', '.join(f":{nome}" for nome in binds)
+    sql = f"""
+    SELECT c.table_name, c.constraint_name
+    FROM user_constraints c
+    LEFT JOIN user_constraints r ON r.constraint_name = c.r_constraint_name
+    WHERE c.constraint_type = 'R'
+      AND c.status = 'ENABLED'
+      AND (c.table_name IN ({lista}) OR r.table_name IN ({lista}))
+    ORDER BY c.table_name, c.constraint_name
+    """
+    resultados, _ = executar_sql(conn, sql, binds, 'select_all')
+    return [(tabela, constraint) for tabela, constraint in resultados]
+
+def contar_registros(conn: oracledb.Connection, tabelas: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Conta os registros de cada tabela (usado como dry-run do reset total).
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+        tabelas (Optional[List[str]]): Tabelas a serem contadas (padrão: TABELAS_EXPURGO).
+
+    Returns:
+        Dict[str, int]: Quantidade de registros por tabela.
+    """
+    if tabelas is None:
+        tabelas = TABELAS_EXPURGO
+    return {
+        tabela: executar_sql(conn, f"SELECT COUNT(*) FROM {tabela}", operacao='select_one')[0]
+        for tabela in tabelas
+    }
+
+def resetar_sequencia(conn: oracledb.Connection, sequencia: str) -> None:
+    """
+    Reinicia uma sequência em 1.
+
+    Usa ALTER SEQUENCE ... RESTART (Oracle 18c+) e, se não suportado,
+    recria a sequência.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+        sequencia (str): Nome da sequência.
+    """
+    try:
+        _executar_ddl(conn, f"ALTER SEQUENCE {sequencia} RESTART START WITH 1")
+        return
+    except DatabaseError:
+        logger.warning(f"RESTART não suportado para {sequencia}, recriando a sequência")
+    try:
+        _executar_ddl(conn, f"DROP SEQUENCE {sequencia}")
+    except DatabaseError:
+        pass  # Ignora se a sequência não existir
+    _executar_ddl(conn, f"CREATE SEQUENCE {sequencia} START WITH 1 INCREMENT BY 1 NOCACHE NOCYCLE")
+
+def resetar_base(conn: oracledb.Connection, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Remove todos os registros do sistema via TRUNCATE e reinicia as sequências.
+
+    Fluxo:
+    1. Desabilita as FKs que envolvem as tabelas
+    2. Executa TRUNCATE das tabelas (filhos antes dos pais)
+    3. Reabilita as FKs na ordem inversa (mesmo em caso de falha)
+    4. Reinicia as sequências de ID
+
+    O TRUNCATE não gera undo por linha, ao contrário do DELETE, por isso o reset
+    leva segundos mesmo em tabelas grandes. ATENÇÃO: a operação é irreversível.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+        dry_run (bool): Se True, apenas retorna as contagens sem alterar nada.
+
+    Returns:
+        Dict[str, int]: Quantidade de registros por tabela antes do reset.
+
+    Raises:
+        ValidationError: Se a conexão estiver dentro de uma transação.
+        DatabaseError: Em caso de falha em qualquer etapa.
+    """
+    contagens = contar_registros(conn)
+    if dry_run:
+        return contagens
+    _exigir_fora_de_transacao(conn, "O reset da base")
+
+    fks = listar_fks(conn, TABELAS_EXPURGO)
+    desabilitadas = []
+    try:
+        for tabela, constraint in fks:
+            _executar_ddl(conn, f"ALTER TABLE {tabela} DISABLE CONSTRAINT {constraint}")
+            desabilitadas.append((tabela, constraint))
+
+        for tabela in TABELAS_EXPURGO:
+            _executar_ddl(conn, f"TRUNCATE TABLE {tabela}")
+            logger.info(f"{tabela}: {contagens[tabela]} registros removidos")
+    finally:
+        # Como os filhos são truncados antes dos pais, os dados restantes
+        # continuam consistentes e as FKs podem ser revalidadas
+        for tabela, constraint in reversed(desabilitadas):
+            _executar_ddl(conn, f"ALTER TABLE {tabela} ENABLE CONSTRAINT {constraint}")
+
+    for sequencia in SEQUENCIAS.values():
+        resetar_sequencia(conn, sequencia)
+
+    return contagens
+
+def _etapas_expurgo(
+        id_produtor: Optional[int],
+        data_inicio: Optional[datetime.date],
+        data_fim: Optional[datetime.date]
+) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Monta as etapas (tabela, condição, parâmetros) de um expurgo seletivo.
+
+    Os plantios são filtrados por produtor e/ou período de plantio. Quando apenas
+    o produtor é informado, suas certificações e o próprio produtor também são removidos.
+
+    Args:
+        id_produtor (Optional[int]): ID do produtor a expurgar.
+        data_inicio (Optional[datetime.date]): Data inicial de plantio (inclusiva).
+        data_fim (Optional[datetime.date]): Data final de plantio (inclusiva).
+
+    Returns:
+        List[Tuple[str, str, Dict[str, Any]]]: Etapas na ordem de execução.
+    """
+    filtros = []
+    params = {}
+    if id_produtor is not None:
+        filtros.append("id_produtor = :id_produtor")
+        params["id_produtor"] = id_produtor
+    if data_inicio is not None:
+        filtros.append("data_plantio >= :data_inicio")
+        params["data_inicio"] = data_inicio
+    if data_fim is not None:
+        filtros.append("data_plantio < :data_fim + 1")
+        params["data_fim"] = data_fim
+    if not filtros:
+        raise ValidationError("Informe o produtor e/ou o período do expurgo")
+
+    filtro_plantios = " AND ".join(filtros)
+    subconsulta = f"id_plantio IN (SELECT id_plantio FROM PLANTIOS WHERE {filtro_plantios})"
+
+    etapas = [
+        ('TRANSPORTE', subconsulta, params),
+        ('INSUMOS', subconsulta, params),
+        ('PLANTIOS', filtro_plantios, params)
+    ]
+    if id_produtor is not None and data_inicio is None and data_fim is None:
+        params_produtor = {"id_produtor": id_produtor}
+        etapas.append(('CERTIFICACOES', "id_produtor = :id_produtor", params_produtor))
+        etapas.append(('PRODUTORES', "id_produtor = :id_produtor", params_produtor))
+    return etapas
+
+def expurgar_seletivo(
+        conn: oracledb.Connection,
+        id_produtor: Optional[int] = None,
+        data_inicio: Optional[datetime.date] = None,
+        data_fim: Optional[datetime.date] = None,
+        tamanho_lote: int = TAMANHO_LOTE_EXPURGO,
+        dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    Expurga registros por produtor e/ou período de plantio em lotes.
+
+    Cada tabela é limpa com DELETEs baseados em conjunto, limitados a
+    `tamanho_lote` linhas e com commit a cada lote, evitando transações
+    gigantes de undo/redo em jobs de retenção.
+
+    Args:
+        conn (oracledb.Connection): Conexão com o banco de dados.
+        id_produtor (Optional[int]): ID do produtor a expurgar.
+        data_inicio (Optional[datetime.date]): Data inicial de plantio (inclusiva).
+        data_fim (Optional[datetime.date]): Data final de plantio (inclusiva).
+        tamanho_lote (int): Quantidade máxima de linhas por lote.
+        dry_run (bool): Se True, apenas conta as linhas que seriam removidas.
+
+    Returns:
+        Dict[str, int]: Quantidade de registros (removidos ou a remover) por tabela.
+
+    Raises:
+        ValidationError: Se nenhum critério for informado ou se a conexão
+            estiver dentro de uma transação (cada lote é confirmado).
+        DatabaseError: Em caso de falha na execução SQL.
+    """
+    if not dry_run:
+        _exigir_fora_de_transacao(conn, "O expurgo seletivo")
+    resultado = {}
+    for tabela, condicao, params in _etapas_expurgo(id_produtor, data_inicio, data_fim):
+        if dry_run:
+            sql = f"SELECT COUNT(*) FROM {tabela} WHERE {condicao}"
+            resultado[tabela] = executar_sql(conn, sql, dict(params), 'select_one')[0]
+            continue
+
+        sql = f"DELETE FROM {tabela} WHERE {condicao} AND ROWNUM <= :lote"
+        total = 0
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            while True:
+                cursor.execute(sql, dict(params, lote=tamanho_lote))
+                removidas = cursor.rowcount
+                conn.commit()
+                total += removidas
+                if removidas < tamanho_lote:
+                    break
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}) ao expurgar {tabela}: {error.message}")
+            conn.rollback()
+            raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+        finally:
+            if cursor:
+                cursor.close()
+
+        resultado[tabela] = total
+        logger.info(f"Expurgo {tabela}: {total} registros removidos")
+    return resultado
+
+def exibir_contagens(contagens: Dict[str, int]) -> None:
+    """
+    Exibe a quantidade de registros por tabela.
+
+    Args:
+        contagens (Dict[str, int]): Quantidade de registros por tabela.
+    """
+    for tabela, quantidade in contagens.items():
+        print(f"  {tabela:15}: {quantidade} registro(s)")
+
 def excluir_tudo(conn: oracledb.Connection) -> None:
     """
     Realiza a exclusão total de todos os registros do sistema com confirmação.
 
-    Reseta todas as sequências de IDs para 1.
+    Exibe a contagem de registros (dry-run) antes da confirmação, usa TRUNCATE
+    com as FKs temporariamente desabilitadas e reseta todas as sequências de IDs para 1.
     ATENÇÃO: Esta operação é irreversível!
 
     Args:
@@ -699,38 +1266,19 @@ def excluir_tudo(conn: oracledb.Connection) -> None:
         print("- Remover TODOS os registros do sistema")
         print("- Resetar todas as sequências de ID para 1")
 
+        print("\nRegistros atuais:")
+        exibir_contagens(resetar_base(conn, dry_run=True))
+
         if input_opcao("\nTem CERTEZA que deseja continuar? (Digite 'CONFIRMAR' para prosseguir): ",
                        ["CONFIRMAR"]) != "CONFIRMAR":
             print("\nOperação cancelada pelo usuário.")
             input("Pressione Enter para voltar ao menu...")
             return
 
-        # Ordem de exclusão CRÍTICA (respeitando FKs)
-        tabelas = ['CERTIFICACOES', 'TRANSPORTE', 'INSUMOS', 'PLANTIOS', 'PRODUTORES']
-
-        for tabela in tabelas:
-            try:
-                executar_sql(conn, f"DELETE FROM {tabela}")
-                print(f"✓ {tabela}: Registros excluídos")
-            except DatabaseError:
-                print(f"\n❌ Falha ao excluir registros de {tabela}")
-                raise
-
-        # Resetar sequências
-        sequencias = {
-            'PRODUTORES': 'SEQ_PRODUTORES',
-            'PLANTIOS': 'SEQ_PLANTIOS',
-            'INSUMOS': 'SEQ_INSUMOS',
-            'CERTIFICACOES': 'SEQ_CERTIFICACOES',
-            'TRANSPORTE': 'SEQ_TRANSPORTE'
-        }
-
-        for tabela, seq in sequencias.items():
-            try:
-                executar_sql(conn, f"DROP SEQUENCE {seq}")
-            except:
-                pass  # Ignora se a sequência não existir
-            executar_sql(conn, f"CREATE SEQUENCE {seq} START WITH 1 INCREMENT BY 1 NOCACHE NOCYCLE")
+        contagens = resetar_base(conn)
+        for tabela, quantidade in contagens.items():
+            print(f"✓ {tabela}: {quantidade} registros excluídos")
+        for seq in SEQUENCIAS.values():
             print(f"✓ Sequência {seq}: Resetada para 1")
 
         print("\n✅ Banco de dados totalmente limpo e sequências resetadas!")
@@ -743,6 +1291,48 @@ def excluir_tudo(conn: oracledb.Connection) -> None:
     finally:
         input("\nPressione Enter para voltar ao menu...")
 
+def expurgo_seletivo(conn: oracledb.Connection) -> None:
+    """
+    Interface para expurgo seletivo por produtor e/ou período de plantio.
+
+    Exibe a quantidade de registros afetados (dry-run) antes da confirmação.
+
+    Args:
+        conn (oracledb.Connection): Conexão ativa com o banco de dados.
+    """
+    try:
+        formatar_titulo("EXPURGO SELETIVO")
+        id_produtor = input_inteiro_positivo("ID do Produtor: ") if input_opcao(
+            "Filtrar por produtor? (S/N): ", ["S", "N"]) == "S" else None
+        data_inicio = data_fim = None
+        if input_opcao("Filtrar por período de plantio? (S/N): ", ["S", "N"]) == "S":
+            data_inicio = input_data("Data inicial")
+            data_fim = input_data("Data final")
+
+        contagens = expurgar_seletivo(conn, id_produtor, data_inicio, data_fim, dry_run=True)
+        print("\nRegistros que serão removidos:")
+        exibir_contagens(contagens)
+
+        if not any(contagens.values()):
+            print("\nℹ️ Nenhum registro encontrado para os critérios informados.")
+            return
+
+        if input_opcao("\nConfirmar expurgo? (S/N): ", ["S", "N"]) == "S":
+            contagens = expurgar_seletivo(conn, id_produtor, data_inicio, data_fim)
+            for tabela, quantidade in contagens.items():
+                print(f"✓ {tabela}: {quantidade} registros excluídos")
+            print("\n✅ Expurgo concluído!")
+
+    except ValidationError as e:
+        print(f"\n❌ {e}")
+    except DatabaseError:
+        print("\n❌ Falha no expurgo. Consulte o log para detalhes.")
+    except Exception as e:
+        logger.exception("Erro inesperado no expurgo seletivo")
+        print("\n❌ Ocorreu um erro inesperado. Consulte o log para detalhes.")
+    finally:
+        input("\nPressione Enter para voltar ao menu...")
+
 def consultar_rastreabilidade(conn: oracledb.Connection) -> None:
     """
     Consulta completa de rastreabilidade de produtos agrícolas.
@@ -815,6 +1405,7 @@ def conectar_oracle() -> oracledb.Connection:
     - SERVICE_NAME: Nome do serviço Oracle
     - DB_USER: Nome de usuário
     - DB_PASSWORD: Senha
+    - DB_STMT_CACHE_SIZE: Tamanho do cache de instruções (opcional)
 
     Returns:
         oracledb.Connection: Objeto de conexão ativa.
@@ -833,7 +1424,8 @@ def conectar_oracle() -> oracledb.Connection:
         conn = oracledb.connect(
             user=os.getenv("DB_USER"),
             password=os.getenv("DB_PASSWORD"),
-            dsn=dsn
+            dsn=dsn,
+            stmtcachesize=TAMANHO_CACHE_INSTRUCOES
         )
 
         logger.info("Conexão com o banco de dados estabelecida com sucesso")
@@ -860,6 +1452,7 @@ def exibir_menu() -> None:
     print("7. Excluir REGISTROS")
     print("8. Excluir TUDO (CUIDADO!)")
     print("9. Consultar RASTREABILIDADE")
+    print("10. Expurgo SELETIVO (produtor/período)")
     print("0. SAIR")
     print("=" * 50)
 
@@ -908,11 +1501,13 @@ def main() -> None:
                 excluir_tudo(conn)
             elif opcao == '9':
                 consultar_rastreabilidade(conn)
+            elif opcao == '10':
+                expurgo_seletivo(conn)
             elif opcao == '0':
                 print("\nEncerrando conexão com o banco de dados...")
                 break
             else:
-                print("\nOpção inválida! Digite um número entre 0 e 8.")
+                print("\nOpção inválida! Digite um número entre 0 e 10.")
                 input("Pressione Enter para tentar novamente...")
 
     except DatabaseError:
@@ -924,6 +1519,7 @@ def main() -> None:
         sys.exit(1)
     finally:
         if 'conn' in locals() and conn:
+            logger.info(f"Cache de instruções: {liberar_cache_instrucoes(conn)}")
             conn.close()
             logger.info("Conexão com o banco encerrada")
         print("\nObrigado por usar o sistema! Até logo!")
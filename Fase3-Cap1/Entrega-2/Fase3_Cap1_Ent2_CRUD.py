@@ -11,11 +11,24 @@ Data: Maio 2025
 
 import oracledb
 import csv
+import json
 import os
 import logging
+import re
 import sys
-from datetime import datetime
-from typing import List, Dict, Any, Tuple, Optional, Union
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Optional, Union, Iterator, Callable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (usado apenas por ler_colunar)
+    np = None
 
 # Configuração de logging
 logging.basicConfig(
@@ -41,16 +54,826 @@ class ValidationError(Exception):
     pass
 
 
+class PlanoExecucaoError(DatabaseError):
+    """Exceção para planos de execução com full scan não permitido."""
+    pass
+
+
+class MigracaoError(DatabaseError):
+    """Exceção para falhas na migração de esquema."""
+    pass
+
+
+class RetencaoError(DatabaseError):
+    """Exceção para falhas no expurgo de partições."""
+    pass
+
+
+# --- LIMITES DAS COLUNAS NUMÉRICAS ---
+# (precisão, escala) conforme SCRIPT_DDL_PROJETO_FASE2_CAP1.SQL
+PRECISAO_CODIGO = (10, 0)   # cod_cultura, cod_sensor, cod_medicao, cod_sugestao, cod_aplicacao
+PRECISAO_VALOR = (10, 2)    # valor_medicao, valor_sugestao, valor_aplicacao, valor_minimo, valor_maximo
+
+
+def validar_numero(campo: str, valor: Optional[float], precisao: int, escala: int) -> None:
+    """
+    Valida se um valor cabe em uma coluna NUMBER(precisao, escala).
+
+    Args:
+        campo: Nome do campo (para a mensagem de erro)
+        valor: Valor a validar (None é ignorado)
+        precisao: Precisão da coluna
+        escala: Escala da coluna
+
+    Raises:
+        ValidationError: Se o valor exceder a parte inteira suportada pela coluna
+    """
+    if valor is None or valor == "":
+        return
+    limite = 10 ** (precisao - escala)
+    if abs(float(valor)) >= limite:
+        raise ValidationError(
+            f"{campo} = {valor} excede o limite da coluna NUMBER({precisao},{escala}) (máximo {limite - 10 ** -escala})")
+
+
+def _converter_data_hora(valor: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    """
+    Converte 'YYYY-MM-DD' ou 'YYYY-MM-DD HH:MM:SS' em datetime.
+
+    Raises:
+        ValidationError: Se o formato for inválido
+    """
+    if valor is None or isinstance(valor, datetime):
+        return valor
+    for formato in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(valor, formato)
+        except ValueError:
+            continue
+    raise ValidationError(f"Data inválida: {valor} (use YYYY-MM-DD ou YYYY-MM-DD HH:MM:SS)")
+
+
+# --- ESQUEMA E IMPORTAÇÃO DE CSV ---
+CAMINHO_DDL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SCRIPT_DDL_PROJETO_FASE2_CAP1.SQL")
+
+# Carga de CSV: bytes por bloco de arquivo (carga paralela) e linhas por executemany
+TAMANHO_BLOCO_CSV = int(os.getenv("CSV_BLOCK_SIZE", 8 * 1024 * 1024))
+TAMANHO_LOTE_CSV = int(os.getenv("CSV_BATCH_SIZE", 5000))
+
+# Formatos das datas nos arquivos CSV
+FORMATO_DATA_CSV = '%Y-%m-%d'
+FORMATO_DATA_HORA_CSV = '%Y-%m-%d %H:%M:%S'
+
+MODOS_IMPORTACAO = ("insert", "merge")
+
+
+def carregar_esquema_ddl(caminho: str = CAMINHO_DDL) -> Dict[str, Dict[str, Any]]:
+    """
+    Extrai tabelas, colunas e chaves primárias do script DDL do projeto.
+
+    Args:
+        caminho: Caminho do script DDL
+
+    Returns:
+        Dicionário tabela -> {'colunas': {coluna: {'tipo', 'precisao', 'escala', 'obrigatoria'}},
+                              'pk': [colunas da chave primária]}
+    """
+    with open(caminho, encoding='utf-8') as f:
+        ddl = re.sub(r"--[^\n]*", "", f.read())
+
+    esquema = {}
+    for tabela, corpo in re.findall(r"CREATE\s+TABLE\s+(\w+)\s*\((.*?)\)\s*(?:PARTITION\b[^;]*)?;",
+                                    ddl, re.IGNORECASE | re.DOTALL):
+        colunas = {}
+        for definicao in re.split(r",\s*(?![^()]*\))", corpo):
+            item = re.match(r"\s*(\w+)\s+(TIMESTAMP WITH LOCAL TIME ZONE|\w+)\s*(?:\(\s*(\d+)\s*(?:,\s*(\d+))?\s*\))?"
+                            r"(.*)", definicao, re.IGNORECASE | re.DOTALL)
+            if not item:
+                continue
+            coluna, tipo, precisao, escala, resto = item.groups()
+            colunas[coluna.lower()] = {
+                "tipo": "TIMESTAMP" if tipo.upper().startswith("TIMESTAMP") else tipo.upper(),
+                "precisao": int(precisao) if precisao else None,
+                "escala": int(escala) if escala else 0,
+                "obrigatoria": "NOT NULL" in resto.upper()
+            }
+        esquema[tabela.upper()] = {"colunas": colunas, "pk": []}
+
+    for tabela, colunas_pk in re.findall(
+            r"ALTER\s+TABLE\s+(\w+)\s+ADD\s+CONSTRAINT\s+\w+\s+PRIMARY\s+KEY\s*\(([^)]*)\)",
+            ddl, re.IGNORECASE):
+        if tabela.upper() in esquema:
+            esquema[tabela.upper()]["pk"] = [coluna.strip().lower() for coluna in colunas_pk.split(",")]
+
+    return esquema
+
+
+def montar_comando_importacao(tabela: str, colunas: List[str], esquema: Dict[str, Dict[str, Any]],
+                              modo: str = "insert") -> str:
+    """
+    Monta o comando de carga de uma linha de CSV.
+
+    No modo 'merge' a linha é mesclada pela chave primária: linhas novas são
+    inseridas e linhas existentes só são atualizadas quando algum valor mudou,
+    de modo que recarregar um arquivo inalterado não gera escrita.
+
+    Args:
+        tabela: Nome da tabela
+        colunas: Colunas na ordem do cabeçalho do CSV
+        esquema: Esquema obtido por carregar_esquema_ddl()
+        modo: 'insert' ou 'merge'
+
+    Returns:
+        Comando SQL com binds posicionais na ordem das colunas
+
+    Raises:
+        ValidationError: Se o modo for inválido ou a tabela não tiver chave primária no modo 'merge'
+    """
+    if modo not in MODOS_IMPORTACAO:
+        raise ValidationError(f"Modo de importação inválido: {modo} (use {' ou '.join(MODOS_IMPORTACAO)})")
+
+    # Os valores chegam já convertidos para os tipos nativos (ConversorLinhaCSV)
+    valores = [f":{i + 1}" for i in range(len(colunas))]
+
+    if modo == "insert":
+        return f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join(valores)})"
+
+    pk = esquema.get(tabela.upper(), {}).get("pk", [])
+    if not pk or not set(pk) <= set(colunas):
+        raise ValidationError(f"Tabela {tabela} sem chave primária completa no CSV para o modo merge")
+
+    origem = ", ".join(f"{valor} AS {coluna}" for valor, coluna in zip(valores, colunas))
+    juncao = " AND ".join(f"t.{coluna} = s.{coluna}" for coluna in pk)
+    demais = [coluna for coluna in colunas if coluna not in pk]
+    sql = f"MERGE INTO {tabela} t USING (SELECT {origem} FROM dual) s ON ({juncao})"
+    if demais:
+        # DECODE compara tratando NULL = NULL, evitando atualizar linhas sem alteração
+        atribuicoes = ", ".join(f"t.{coluna} = s.{coluna}" for coluna in demais)
+        alterada = " OR ".join(f"DECODE(t.{coluna}, s.{coluna}, 0, 1) = 1" for coluna in demais)
+        sql += f" WHEN MATCHED THEN UPDATE SET {atribuicoes} WHERE {alterada}"
+    sql += (f" WHEN NOT MATCHED THEN INSERT ({', '.join(colunas)})"
+            f" VALUES ({', '.join(f's.{coluna}' for coluna in colunas)})")
+    return sql
+
+
+@lru_cache(maxsize=65536)
+def _data_csv(texto: str) -> datetime:
+    """Converte uma data do CSV (memoizado: as datas se repetem muito entre linhas)."""
+    return datetime.strptime(texto, FORMATO_DATA_CSV)
+
+
+@lru_cache(maxsize=65536)
+def _data_hora_csv(texto: str) -> datetime:
+    """Converte uma data e hora do CSV (memoizado: leituras periódicas repetem os instantes)."""
+    return datetime.strptime(texto, FORMATO_DATA_HORA_CSV)
+
+
+def tipo_bind(definicao: Dict[str, Any]) -> Any:
+    """Tipo para cursor.setinputsizes a partir da definição de uma coluna do DDL."""
+    if definicao["tipo"] == "NUMBER":
+        return oracledb.DB_TYPE_NUMBER
+    if definicao["tipo"] == "DATE":
+        return oracledb.DB_TYPE_DATE
+    if definicao["tipo"] == "TIMESTAMP":
+        return oracledb.DB_TYPE_TIMESTAMP
+    return definicao["precisao"] or 4000
+
+
+class ConversorLinhaCSV:
+    """
+    Converte as linhas de um CSV para os tipos nativos das colunas, conforme o script DDL.
+
+    NUMBER sem casas decimais vira int, demais NUMBER viram float, DATE e
+    TIMESTAMP viram datetime e textos têm o tamanho verificado. Linhas com
+    valores inválidos são rejeitadas no cliente, antes de chegar ao banco, e
+    os binds são declarados com setinputsizes para que o Oracle não precise
+    converter texto linha a linha.
+    """
+
+    def __init__(self, tabela: str, colunas: List[str], esquema: Dict[str, Dict[str, Any]]):
+        """
+        Prepara os conversores das colunas na ordem do cabeçalho do CSV.
+
+        Raises:
+            ValidationError: Se alguma coluna do CSV não existir na tabela
+        """
+        definicoes = esquema.get(tabela.upper(), {}).get("colunas", {})
+        desconhecidas = [coluna for coluna in colunas if coluna not in definicoes]
+        if desconhecidas:
+            raise ValidationError(f"Colunas inexistentes em {tabela}: {', '.join(desconhecidas)}")
+
+        self.tabela = tabela
+        self.colunas = colunas
+        self.definicoes = [definicoes[coluna] for coluna in colunas]
+        self.conversores = [self._conversor(coluna, definicao) for coluna, definicao in zip(colunas, self.definicoes)]
+
+    @staticmethod
+    def _conversor(coluna: str, definicao: Dict[str, Any]) -> Callable[[str], Any]:
+        """Cria a função de conversão de uma coluna."""
+        tipo, precisao, escala = definicao["tipo"], definicao["precisao"], definicao["escala"]
+
+        if tipo == "NUMBER":
+            def converter_numero(texto: str) -> Union[int, float]:
+                valor = int(texto) if precisao and escala == 0 else float(texto)
+                if precisao:
+                    validar_numero(coluna, valor, precisao, escala)
+                return valor
+            return converter_numero
+        if tipo == "DATE":
+            return _data_csv
+        if tipo == "TIMESTAMP":
+            return _data_hora_csv
+
+        def converter_texto(texto: str) -> str:
+            if precisao and len(texto) > precisao:
+                raise ValueError(f"{coluna} excede {precisao} caracteres")
+            return texto
+        return converter_texto
+
+    def tipos_bind(self) -> List[Any]:
+        """Tipos para cursor.setinputsizes, na ordem das colunas."""
+        return [tipo_bind(definicao) for definicao in self.definicoes]
+
+    def converter(self, linha: List[str]) -> List[Any]:
+        """
+        Converte uma linha do CSV.
+
+        Raises:
+            ValidationError: Se a linha tiver quantidade de campos ou valores inválidos
+        """
+        if len(linha) != len(self.colunas):
+            raise ValidationError(f"{len(linha)} campos, esperados {len(self.colunas)}")
+        valores = []
+        for coluna, definicao, converter, texto in zip(self.colunas, self.definicoes, self.conversores, linha):
+            texto = texto.strip()
+            if not texto:
+                if definicao["obrigatoria"]:
+                    raise ValidationError(f"{coluna} é obrigatório")
+                valores.append(None)
+                continue
+            try:
+                valores.append(converter(texto))
+            except ValueError as e:
+                raise ValidationError(f"{coluna} = '{texto}' inválido: {e}") from e
+        return valores
+
+    def converter_lote(self, linhas: List[List[str]]) -> Tuple[List[List[Any]], int]:
+        """
+        Converte um lote de linhas, registrando e descartando as inválidas.
+
+        Returns:
+            Tupla (linhas convertidas, quantidade de linhas rejeitadas)
+        """
+        convertidas = []
+        rejeitadas = 0
+        for linha in linhas:
+            try:
+                convertidas.append(self.converter(linha))
+            except ValidationError as e:
+                logger.error(f"Linha rejeitada em {self.tabela}: {e}")
+                logger.error(f"Dados: {linha}")
+                rejeitadas += 1
+        return convertidas, rejeitadas
+
+
+class CheckpointImportacao:
+    """
+    Registra o progresso da importação de um arquivo CSV em um JSON ao lado dele.
+
+    O checkpoint guarda o deslocamento em bytes e a quantidade de linhas já
+    confirmadas, além do tamanho do arquivo; se o arquivo encolher (foi
+    substituído), a importação recomeça do início. O checkpoint é gravado
+    logo após cada commit, por substituição atômica do arquivo.
+    """
+
+    def __init__(self, arquivo_csv: str):
+        self.caminho = f"{arquivo_csv}.checkpoint.json"
+        self.arquivo_csv = arquivo_csv
+        self.offset = 0
+        self.linhas = 0
+        self.concluido = False
+
+    def carregar(self) -> "CheckpointImportacao":
+        """Lê o checkpoint salvo, se existir e ainda corresponder ao arquivo."""
+        if not os.path.exists(self.caminho):
+            return self
+        with open(self.caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+        tamanho = os.path.getsize(self.arquivo_csv)
+        if dados.get("offset", 0) > tamanho:
+            logger.warning(f"Checkpoint de {self.arquivo_csv} descartado: arquivo menor que o deslocamento salvo")
+            return self
+        self.offset = dados["offset"]
+        self.linhas = dados["linhas"]
+        # Um arquivo concluído que cresceu (novas linhas ao final) é retomado
+        self.concluido = dados.get("concluido", False) and dados.get("tamanho") == tamanho
+        return self
+
+    def salvar(self, offset: int, linhas: int, concluido: bool = False):
+        """Grava o progresso confirmado."""
+        self.offset, self.linhas, self.concluido = offset, linhas, concluido
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({"offset": offset, "linhas": linhas, "concluido": concluido,
+                       "tamanho": os.path.getsize(self.arquivo_csv)}, f)
+        os.replace(temporario, self.caminho)
+
+    def remover(self):
+        """Apaga o checkpoint (reinicia a importação)."""
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+        self.offset, self.linhas, self.concluido = 0, 0, False
+
+
+# --- TIPOS NATIVOS NA LEITURA ---
+# As consultas retornam datas e números nativos; a formatação em texto ocorre
+# apenas na apresentação (formatar_linhas), conforme o tipo de cada coluna.
+FORMATOS_APRESENTACAO = {
+    "DB_TYPE_DATE": '%Y-%m-%d',
+    "DB_TYPE_TIMESTAMP": '%Y-%m-%d %H:%M:%S',
+    "DB_TYPE_TIMESTAMP_TZ": '%Y-%m-%d %H:%M:%S',
+    "DB_TYPE_TIMESTAMP_LTZ": '%Y-%m-%d %H:%M:%S'
+}
+
+# Linhas buscadas por ida ao banco nas leituras colunares
+TAMANHO_ARRAY_COLUNAR = 10000
+
+
+def tratador_tipos_saida(cursor, metadata):
+    """
+    Output type handler: NUMBER com casas decimais é buscado direto como double.
+
+    Evita a conversão intermediária do NUMBER Oracle para Decimal/texto no
+    cliente. Só NUMBER(p,s) com s > 0: colunas inteiras e NUMBER calculado
+    sem precisão declarada (COUNT(*), MAX(..)+1, SUM(ORA_HASH(..)), escala
+    -127) continuam como int/Decimal, sem perder precisão.
+    """
+    if metadata.type_code is oracledb.DB_TYPE_NUMBER and metadata.scale is not None and metadata.scale > 0:
+        return cursor.var(oracledb.DB_TYPE_BINARY_DOUBLE, arraysize=cursor.arraysize)
+    return None
+
+
+def formatadores_colunas(descricao: List[Any]) -> List[Optional[str]]:
+    """
+    Retorna, para cada coluna de cursor.description, o formato strftime de apresentação.
+
+    Colunas que não são datas recebem None (mantidas como estão).
+    """
+    return [FORMATOS_APRESENTACAO.get(getattr(coluna[1], "name", None)) for coluna in descricao]
+
+
+def formatar_linhas(linhas: List[Dict[str, Any]], formatos: Dict[str, Optional[str]]) -> List[Dict[str, Any]]:
+    """
+    Converte as datas das linhas em texto (borda de apresentação).
+
+    Args:
+        linhas: Linhas como dicionários coluna -> valor nativo
+        formatos: Dicionário coluna -> formato strftime (ou None)
+
+    Returns:
+        As mesmas linhas, com as datas formatadas
+    """
+    colunas_data = [(coluna, formato) for coluna, formato in formatos.items() if formato]
+    if not colunas_data:
+        return linhas
+    for linha in linhas:
+        for coluna, formato in colunas_data:
+            if linha[coluna] is not None:
+                linha[coluna] = linha[coluna].strftime(formato)
+    return linhas
+
+
+def benchmark_conversao(linhas: int = 200000) -> Dict[str, float]:
+    """
+    Mede o custo por linha da montagem dos resultados no cliente (sem banco).
+
+    Repete o que _montar_linhas faz com as linhas de uma consulta de medições:
+    o caminho antigo (TO_CHAR no SQL, linhas já em texto), com e sem o
+    consumidor convertendo de volta para datetime/float, contra os tipos
+    nativos com formatação por formatadores_colunas/formatar_linhas (modo
+    compatível) e sem formatação (tipos_nativos=True).
+
+    Uso: python Fase3_Cap1_Ent2_CRUD.py --benchmark-conversao
+
+    Args:
+        linhas: Quantidade de linhas sintéticas
+
+    Returns:
+        Dicionário cenário -> microssegundos por linha
+    """
+    colunas = ["COD_MEDICAO", "DATA_HORA_MEDICAO", "VALOR_MEDICAO", "UN_MEDICAO", "COD_SENSOR"]
+    descricao_texto = [(coluna, oracledb.DB_TYPE_VARCHAR) for coluna in colunas]
+    descricao_nativa = [(coluna, tipo) for coluna, tipo in zip(colunas, (
+        oracledb.DB_TYPE_NUMBER, oracledb.DB_TYPE_TIMESTAMP, oracledb.DB_TYPE_BINARY_DOUBLE,
+        oracledb.DB_TYPE_VARCHAR, oracledb.DB_TYPE_NUMBER))]
+    base = datetime(2025, 5, 1)
+    nativas = [(i, base + timedelta(seconds=15 * i), 40.0 + (i % 600) / 10, "%", i % 50)
+               for i in range(linhas)]
+    texto = [(str(cod), data.strftime('%Y-%m-%d %H:%M:%S'), f"{valor:.2f}", un, str(sensor))
+             for cod, data, valor, un, sensor in nativas]
+
+    def montar(rows, descricao, formatar):
+        # Mesmo corpo de AgricolaDatabaseManager._montar_linhas
+        nomes = [desc[0] for desc in descricao]
+        resultado = [dict(zip(nomes, row)) for row in rows]
+        if not formatar:
+            return resultado
+        return formatar_linhas(resultado, dict(zip(nomes, formatadores_colunas(descricao))))
+
+    def texto_como_veio():
+        return montar(texto, descricao_texto, True)
+
+    def texto_de_volta_para_nativo():
+        resultado = montar(texto, descricao_texto, True)
+        for linha in resultado:
+            linha["DATA_HORA_MEDICAO"] = datetime.strptime(linha["DATA_HORA_MEDICAO"], '%Y-%m-%d %H:%M:%S')
+            linha["VALOR_MEDICAO"] = float(linha["VALOR_MEDICAO"])
+        return resultado
+
+    def nativo_compativel():
+        return montar(nativas, descricao_nativa, True)
+
+    def nativo():
+        return montar(nativas, descricao_nativa, False)
+
+    resultados = {}
+    for nome, cenario in (("TO_CHAR, texto como veio", texto_como_veio),
+                          ("TO_CHAR + conversão no consumidor", texto_de_volta_para_nativo),
+                          ("nativo + formatar_linhas (compatível)", nativo_compativel),
+                          ("nativo (tipos_nativos=True)", nativo)):
+        inicio = time.perf_counter()
+        cenario()
+        resultados[nome] = (time.perf_counter() - inicio) / linhas * 1e6
+
+    print(f"\n=== CUSTO DE MONTAGEM POR LINHA ({linhas} linhas) ===")
+    for nome, microssegundos in resultados.items():
+        print(f"  {nome:<40} {microssegundos:8.3f} µs")
+    return resultados
+
+
+# --- COMANDOS SQL DO DAO ---
+# Textos fixos usados pelo AgricolaDatabaseManager. Mantê-los centralizados
+# garante o reaproveitamento no cache de instruções e permite que
+# verificar_planos_execucao() analise exatamente os comandos executados.
+
+# Códigos gerados por sequências (migrações 3 e 4): com MAX + 1, duas inserções
+# simultâneas (outra sessão ou corrotinas do gerenciador assíncrono) leriam o
+# mesmo máximo e colidiriam na chave primária. Medições usam a mesma sequência
+# do MERGE da ingestão.
+SQL_PROXIMO_COD_CULTURA = "SELECT SEQ_CULTURAS.NEXTVAL FROM dual"
+SQL_PROXIMO_COD_SENSOR = "SELECT SEQ_SENSORES.NEXTVAL FROM dual"
+SQL_PROXIMO_COD_MEDICAO = "SELECT SEQ_MEDICOES.NEXTVAL FROM dual"
+SQL_PROXIMO_COD_SUGESTAO = "SELECT SEQ_SUGESTOES.NEXTVAL FROM dual"
+SQL_PROXIMO_COD_APLICACAO = "SELECT SEQ_APLICACOES.NEXTVAL FROM dual"
+
+SQL_SELECT_CULTURAS = """
+SELECT cod_cultura, desc_cultura, tamanho_cultura,
+       data_prev_colheita
+FROM T_CULTURAS
+"""
+SQL_SELECT_CULTURA_POR_COD = SQL_SELECT_CULTURAS + "WHERE cod_cultura = :1"
+
+SQL_SELECT_SENSORES = """
+SELECT cod_sensor, nm_sensor, tipo_sensor, objetivo_sensor, fab_sensor,
+       modelo_sensor, data_instalacao,
+       latitude_instalacao, longitude_instalacao, valor_minimo, valor_maximo,
+       unidade, cod_cultura
+FROM T_SENSORES
+"""
+SQL_SELECT_SENSOR_POR_COD = SQL_SELECT_SENSORES + "WHERE cod_sensor = :1"
+
+SQL_SELECT_MEDICOES = """
+SELECT cod_medicao, data_hora_medicao,
+       valor_medicao, un_medicao, cod_sensor
+FROM T_MEDICOES
+"""
+SQL_SELECT_MEDICAO_POR_CHAVE = SQL_SELECT_MEDICOES + "WHERE cod_medicao = :1 AND cod_sensor = :2"
+SQL_SELECT_MEDICAO_POR_COD = SQL_SELECT_MEDICOES + "WHERE cod_medicao = :1"
+SQL_SELECT_MEDICOES_POR_SENSOR = SQL_SELECT_MEDICOES + "WHERE cod_sensor = :1"
+
+SQL_SELECT_SUGESTOES = """
+SELECT cod_medicao, cod_sugestao, objetivo_sugestao,
+       data_hora_sugestao,
+       valor_sugestao, un_sugestao, cod_sensor
+FROM T_SUGESTOES
+"""
+SQL_SELECT_SUGESTAO_POR_CHAVE = SQL_SELECT_SUGESTOES + "WHERE cod_sugestao = :1 AND cod_medicao = :2 AND cod_sensor = :3"
+SQL_SELECT_SUGESTOES_POR_MEDICAO = SQL_SELECT_SUGESTOES + "WHERE cod_medicao = :1 AND cod_sensor = :2"
+SQL_SELECT_SUGESTAO_POR_COD = SQL_SELECT_SUGESTOES + "WHERE cod_sugestao = :1"
+
+SQL_SELECT_APLICACOES = """
+SELECT cod_medicao, cod_sugestao, cod_sensor, cod_cultura, cod_aplicacao,
+       nm_produto_utilizado, valor_aplicacao, un_aplicacao,
+       data_hora_aplicacao,
+       nm_resp_aplicacao, documento_resp
+FROM T_APLICACOES
+"""
+SQL_SELECT_APLICACAO_POR_COD = SQL_SELECT_APLICACOES + "WHERE cod_aplicacao = :1"
+SQL_SELECT_APLICACOES_POR_SUGESTAO = SQL_SELECT_APLICACOES + "WHERE cod_medicao = :1 AND cod_sugestao = :2 AND cod_sensor = :3"
+
+SQL_DELETE_CULTURA = """
+DELETE FROM T_CULTURAS c
+WHERE c.cod_cultura = :1
+  AND NOT EXISTS (SELECT 1 FROM T_SENSORES s WHERE s.cod_cultura = c.cod_cultura)
+  AND NOT EXISTS (SELECT 1 FROM T_APLICACOES a WHERE a.cod_cultura = c.cod_cultura)
+"""
+SQL_DELETE_SENSOR = """
+DELETE FROM T_SENSORES s
+WHERE s.cod_sensor = :1
+  AND NOT EXISTS (SELECT 1 FROM T_MEDICOES m WHERE m.cod_sensor = s.cod_sensor)
+"""
+SQL_DELETE_MEDICAO = """
+DELETE FROM T_MEDICOES m
+WHERE m.cod_medicao = :1 AND m.cod_sensor = :2
+  AND NOT EXISTS (SELECT 1 FROM T_SUGESTOES s
+                  WHERE s.cod_medicao = m.cod_medicao AND s.cod_sensor = m.cod_sensor)
+"""
+SQL_DELETE_SUGESTAO = """
+DELETE FROM T_SUGESTOES s
+WHERE s.cod_sugestao = :1 AND s.cod_medicao = :2 AND s.cod_sensor = :3
+  AND NOT EXISTS (SELECT 1 FROM T_APLICACOES a
+                  WHERE a.cod_sugestao = s.cod_sugestao AND a.cod_medicao = s.cod_medicao
+                    AND a.cod_sensor = s.cod_sensor)
+"""
+SQL_DELETE_APLICACAO_POR_CHAVE = """
+DELETE FROM T_APLICACOES
+WHERE cod_aplicacao = :1 AND cod_medicao = :2 AND cod_sugestao = :3 AND cod_sensor = :4
+"""
+SQL_DELETE_APLICACAO_POR_COD = "DELETE FROM T_APLICACOES WHERE cod_aplicacao = :1"
+
+# Subárvore de uma cultura, dos filhos para os pais (delete_cultura_cascata)
+_SENSORES_DA_CULTURA = "cod_sensor IN (SELECT cod_sensor FROM T_SENSORES WHERE cod_cultura = :cod_cultura)"
+SQL_DELETE_CASCATA_CULTURA = [
+    ("T_APLICACOES", f"DELETE FROM T_APLICACOES WHERE cod_cultura = :cod_cultura OR {_SENSORES_DA_CULTURA}"),
+    ("T_SUGESTOES", f"DELETE FROM T_SUGESTOES WHERE {_SENSORES_DA_CULTURA}"),
+    ("T_MEDICOES", f"DELETE FROM T_MEDICOES WHERE {_SENSORES_DA_CULTURA}"),
+    ("T_SENSORES", "DELETE FROM T_SENSORES WHERE cod_cultura = :cod_cultura"),
+    ("T_CULTURAS", "DELETE FROM T_CULTURAS WHERE cod_cultura = :cod_cultura")
+]
+
+# T_MEDICOES é particionada por mês em data_hora_medicao. O intervalo é sempre
+# informado (com limites padrão quando omitido) para que o mesmo comando seja
+# reutilizado e o Oracle descarte as partições fora da janela (partition pruning).
+DATA_HORA_MINIMA = datetime(1900, 1, 1)
+DATA_HORA_MAXIMA = datetime(9999, 12, 31)
+
+SQL_MEDICOES_POR_CULTURA = """
+SELECT m.cod_medicao, m.data_hora_medicao,
+       m.valor_medicao, m.un_medicao, m.cod_sensor,
+       s.nm_sensor, s.tipo_sensor, c.desc_cultura
+FROM T_MEDICOES m
+JOIN T_SENSORES s ON m.cod_sensor = s.cod_sensor
+JOIN T_CULTURAS c ON s.cod_cultura = c.cod_cultura
+WHERE c.cod_cultura = :1
+  AND m.data_hora_medicao >= :2
+  AND m.data_hora_medicao < :3
+ORDER BY m.data_hora_medicao DESC
+"""
+
+SQL_MEDICOES_RECENTES = """
+SELECT m.cod_medicao, m.data_hora_medicao,
+       m.valor_medicao, m.un_medicao, m.cod_sensor
+FROM T_MEDICOES m
+WHERE m.data_hora_medicao >= :1
+ORDER BY m.data_hora_medicao DESC
+"""
+
+SQL_APLICACOES_POR_CULTURA = """
+SELECT a.cod_aplicacao, a.nm_produto_utilizado, a.valor_aplicacao, a.un_aplicacao,
+       a.data_hora_aplicacao,
+       a.nm_resp_aplicacao, a.documento_resp, c.desc_cultura
+FROM T_APLICACOES a
+JOIN T_CULTURAS c ON a.cod_cultura = c.cod_cultura
+WHERE c.cod_cultura = :1
+ORDER BY a.data_hora_aplicacao DESC
+"""
+
+SQL_SUGESTOES_POR_SENSOR = """
+SELECT s.cod_sugestao, s.objetivo_sugestao,
+       s.data_hora_sugestao,
+       s.valor_sugestao, s.un_sugestao, s.cod_sensor, s.cod_medicao,
+       m.valor_medicao, m.data_hora_medicao
+FROM T_SUGESTOES s
+JOIN T_MEDICOES m ON s.cod_medicao = m.cod_medicao AND s.cod_sensor = m.cod_sensor
+WHERE s.cod_sensor = :1
+ORDER BY s.data_hora_sugestao DESC
+"""
+
+# Comandos verificados pelo harness de planos: nome -> (sql, full scan permitido)
+# As listagens completas (sem filtro) leem a tabela inteira por definição.
+CONSULTAS_DAO = {
+    "create_cultura (próximo código)": (SQL_PROXIMO_COD_CULTURA, False),
+    "create_sensor (próximo código)": (SQL_PROXIMO_COD_SENSOR, False),
+    "create_medicao (próximo código)": (SQL_PROXIMO_COD_MEDICAO, False),
+    "create_sugestao (próximo código)": (SQL_PROXIMO_COD_SUGESTAO, False),
+    "create_aplicacao (próximo código)": (SQL_PROXIMO_COD_APLICACAO, False),
+    "read_cultura()": (SQL_SELECT_CULTURAS, True),
+    "read_cultura(cod_cultura)": (SQL_SELECT_CULTURA_POR_COD, False),
+    "read_sensor()": (SQL_SELECT_SENSORES, True),
+    "read_sensor(cod_sensor)": (SQL_SELECT_SENSOR_POR_COD, False),
+    "read_medicao()": (SQL_SELECT_MEDICOES, True),
+    "read_medicao(cod_medicao, cod_sensor)": (SQL_SELECT_MEDICAO_POR_CHAVE, False),
+    "read_medicao(cod_medicao)": (SQL_SELECT_MEDICAO_POR_COD, False),
+    "read_medicao(cod_sensor)": (SQL_SELECT_MEDICOES_POR_SENSOR, False),
+    "read_sugestao()": (SQL_SELECT_SUGESTOES, True),
+    "read_sugestao(cod_sugestao, cod_medicao, cod_sensor)": (SQL_SELECT_SUGESTAO_POR_CHAVE, False),
+    "read_sugestao(cod_medicao, cod_sensor)": (SQL_SELECT_SUGESTOES_POR_MEDICAO, False),
+    "read_sugestao(cod_sugestao)": (SQL_SELECT_SUGESTAO_POR_COD, False),
+    "read_aplicacao()": (SQL_SELECT_APLICACOES, True),
+    "read_aplicacao(cod_aplicacao)": (SQL_SELECT_APLICACAO_POR_COD, False),
+    "read_aplicacao(cod_medicao, cod_sugestao, cod_sensor)": (SQL_SELECT_APLICACOES_POR_SUGESTAO, False),
+    "delete_cultura": (SQL_DELETE_CULTURA, False),
+    "delete_sensor": (SQL_DELETE_SENSOR, False),
+    "delete_medicao": (SQL_DELETE_MEDICAO, False),
+    "delete_sugestao": (SQL_DELETE_SUGESTAO, False),
+    "delete_aplicacao(chave completa)": (SQL_DELETE_APLICACAO_POR_CHAVE, False),
+    "delete_aplicacao(cod_aplicacao)": (SQL_DELETE_APLICACAO_POR_COD, False),
+    "get_medicoes_by_cultura": (SQL_MEDICOES_POR_CULTURA, False),
+    # Lê por completo apenas as partições da janela recente
+    "get_medicoes_recentes": (SQL_MEDICOES_RECENTES, True),
+    "get_aplicacoes_by_cultura": (SQL_APLICACOES_POR_CULTURA, False),
+    "get_sugestoes_by_sensor": (SQL_SUGESTOES_POR_SENSOR, False),
+}
+CONSULTAS_DAO.update({
+    f"delete_cultura_cascata ({tabela})": (sql, False) for tabela, sql in SQL_DELETE_CASCATA_CULTURA
+})
+
+
+# --- MAPEAMENTO DAS TABELAS ---
+TABELAS_MAPEADAS = ("T_CULTURAS", "T_SENSORES", "T_MEDICOES", "T_SUGESTOES", "T_APLICACOES")
+OPERACOES_MAPEADOR = ("inserir", "atualizar", "excluir", "obter")
+
+
+class MapeadorTabela:
+    """
+    Comandos de uma tabela compilados uma única vez a partir do DDL do projeto.
+
+    INSERT, DELETE e SELECT têm um único texto SQL, com binds nomeados e tipos
+    fixos; datas ausentes são enviadas como NULL em vez de mudarem o formato do
+    comando. O UPDATE escreve só as colunas alteradas: há um texto por conjunto
+    de colunas, gerado na primeira vez e guardado no mapeador, de modo que
+    chamadas com os mesmos campos reaproveitam o comando no cache de instruções
+    sem regravar (nem gerar redo e disparar triggers para) as demais colunas.
+    """
+
+    def __init__(self, tabela: str, definicao: Dict[str, Any]):
+        """
+        Args:
+            tabela: Nome da tabela
+            definicao: Entrada da tabela em carregar_esquema_ddl()
+        """
+        self.tabela = tabela
+        self.definicoes = definicao["colunas"]
+        self.colunas = list(self.definicoes)
+        self.pk = list(definicao["pk"])
+        self.atualizaveis = [coluna for coluna in self.colunas if coluna not in self.pk]
+
+        self._chave = " AND ".join(f"{coluna} = :{coluna}" for coluna in self.pk)
+        self.sql_inserir = (f"INSERT INTO {tabela} ({', '.join(self.colunas)}) "
+                            f"VALUES ({', '.join(':' + coluna for coluna in self.colunas)})")
+        self.sql_excluir = f"DELETE FROM {tabela} WHERE {self._chave}"
+        self.sql_obter = f"SELECT {', '.join(self.colunas)} FROM {tabela} WHERE {self._chave}"
+        # Conjunto de colunas (na ordem do DDL) -> (UPDATE, tipos dos binds)
+        self._atualizacoes: Dict[Tuple[str, ...], Tuple[str, Dict[str, Any]]] = {}
+
+        self._tipos_colunas = {coluna: tipo_bind(self.definicoes[coluna]) for coluna in self.colunas}
+        tipos_chave = {coluna: self._tipos_colunas[coluna] for coluna in self.pk}
+        self._tipos = {
+            "inserir": self._tipos_colunas,
+            "excluir": tipos_chave,
+            "obter": tipos_chave
+        }
+
+    def colunas_alteradas(self, campos: Dict[str, Any]) -> Tuple[str, ...]:
+        """Colunas de campos na ordem do DDL (chave do UPDATE compilado)."""
+        return tuple(coluna for coluna in self.atualizaveis if coluna in campos)
+
+    def _atualizacao(self, colunas: Optional[Tuple[str, ...]]) -> Tuple[str, Dict[str, Any]]:
+        """UPDATE e tipos dos binds para o conjunto de colunas (todas, se omitido), gerados uma vez."""
+        colunas = tuple(self.atualizaveis) if colunas is None else colunas
+        compilado = self._atualizacoes.get(colunas)
+        if compilado is None:
+            sql = (f"UPDATE {self.tabela} SET {', '.join(f'{coluna} = :{coluna}' for coluna in colunas)} "
+                   f"WHERE {self._chave}")
+            tipos = {coluna: self._tipos_colunas[coluna] for coluna in self.pk + list(colunas)}
+            compilado = self._atualizacoes.setdefault(colunas, (sql, tipos))
+        return compilado
+
+    def sql(self, operacao: str, colunas: Optional[Tuple[str, ...]] = None) -> str:
+        """
+        Comando compilado da operação ('inserir', 'atualizar', 'excluir' ou 'obter').
+
+        Em 'atualizar', colunas é o resultado de colunas_alteradas() (todas, se omitido).
+        """
+        if operacao == "atualizar":
+            return self._atualizacao(colunas)[0]
+        return getattr(self, f"sql_{operacao}")
+
+    def tipos_bind(self, operacao: str, colunas: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """Tipos dos binds nomeados da operação, para cursor.setinputsizes(**tipos)."""
+        if operacao == "atualizar":
+            return self._atualizacao(colunas)[1]
+        return self._tipos[operacao]
+
+    def e_data(self, coluna: str) -> bool:
+        """Indica se a coluna é DATE ou TIMESTAMP."""
+        return self.definicoes[coluna]["tipo"] in ("DATE", "TIMESTAMP")
+
+    def _converter(self, coluna: str, valor: Any) -> Any:
+        """Valida números contra a precisão do DDL e converte datas em texto para datetime."""
+        definicao = self.definicoes[coluna]
+        if self.e_data(coluna):
+            return None if valor == "" else _converter_data_hora(valor)
+        if definicao["tipo"] == "NUMBER" and definicao["precisao"]:
+            validar_numero(coluna, valor, definicao["precisao"], definicao["escala"])
+        return valor
+
+    def _verificar_colunas(self, campos: Dict[str, Any], permitidas: List[str]):
+        """Garante que todas as colunas informadas existam na operação."""
+        desconhecidas = [coluna for coluna in campos if coluna not in permitidas]
+        if desconhecidas:
+            raise ValidationError(f"Colunas inválidas para {self.tabela}: {', '.join(desconhecidas)}")
+
+    def params_chave(self, chave: Dict[str, Any]) -> Dict[str, Any]:
+        """Binds da chave primária (excluir e obter)."""
+        faltando = [coluna for coluna in self.pk if chave.get(coluna) is None]
+        if faltando:
+            raise ValidationError(f"Chave incompleta para {self.tabela}: falta {', '.join(faltando)}")
+        return {coluna: self._converter(coluna, chave[coluna]) for coluna in self.pk}
+
+    def params_inserir(self, registro: Dict[str, Any]) -> Dict[str, Any]:
+        """Binds do INSERT; colunas ausentes são gravadas como NULL."""
+        self._verificar_colunas(registro, self.colunas)
+        return {coluna: self._converter(coluna, registro.get(coluna)) for coluna in self.colunas}
+
+    def params_atualizar(self, chave: Dict[str, Any], campos: Dict[str, Any]) -> Dict[str, Any]:
+        """Binds do UPDATE das colunas de campos (ver colunas_alteradas) e da chave."""
+        self._verificar_colunas(campos, self.atualizaveis)
+        params = self.params_chave(chave)
+        params.update({coluna: self._converter(coluna, valor) for coluna, valor in campos.items()})
+        return params
+
+    def campos_informados(self, campos: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Filtra os argumentos das rotinas update_*: ignora colunas que não são
+        atualizáveis e valores None; "" limpa apenas colunas de data.
+        """
+        return {
+            coluna: valor for coluna, valor in campos.items()
+            if coluna in self.atualizaveis and valor is not None and (valor != "" or self.e_data(coluna))
+        }
+
+
+_mapeadores: Dict[str, MapeadorTabela] = {}
+_trava_mapeadores = threading.Lock()
+
+
+def obter_mapeador(tabela: str) -> MapeadorTabela:
+    """
+    Mapeador compilado da tabela, criado na primeira chamada e compartilhado
+    pelo restante do processo.
+
+    Raises:
+        ValidationError: Se a tabela não existir no DDL do projeto
+    """
+    tabela = tabela.upper()
+    mapeador = _mapeadores.get(tabela)
+    if mapeador is None:
+        with _trava_mapeadores:
+            if not _mapeadores:
+                esquema = carregar_esquema_ddl()
+                _mapeadores.update({nome: MapeadorTabela(nome, definicao)
+                                    for nome, definicao in esquema.items() if nome in TABELAS_MAPEADAS})
+        mapeador = _mapeadores.get(tabela)
+        if mapeador is None:
+            raise ValidationError(f"Tabela não mapeada: {tabela}")
+    return mapeador
+
+
+def consultas_mapeadores() -> Dict[str, Tuple[str, bool]]:
+    """Comandos compilados dos mapeadores, no formato de CONSULTAS_DAO."""
+    return {
+        f"{operacao} ({tabela})": (obter_mapeador(tabela).sql(operacao), False)
+        for tabela in TABELAS_MAPEADAS for operacao in OPERACOES_MAPEADOR if operacao != "inserir"
+    }
+
+
 class AgricolaDatabaseManager:
     """
     Classe responsável pelo gerenciamento do banco de dados agrícola.
     Implementa operações CRUD e funções de análise de dados.
     """
 
-    def __init__(self):
+    def __init__(self, tipos_nativos: bool = False):
         """
         Inicializa o gerenciador de banco de dados Oracle.
+
+        Args:
+            tipos_nativos: Se True, as consultas retornam datas como datetime; se False
+                           (compatível com as versões anteriores), como texto formatado
         """
+        self.tipos_nativos = tipos_nativos
+
         # Configurações de conexão Oracle
         self.host = "localhost"
         self.port = 1522
@@ -61,11 +884,22 @@ class AgricolaDatabaseManager:
         self.conn = None
         self.cursor = None
 
+        # Estado da unidade de trabalho (ver transacao())
+        self._em_transacao = False
+        self._transacao_falhou = False
+
     def connect(self):
-        """Estabelece conexão com o banco de dados Oracle."""
+        """
+        Estabelece conexão com o banco de dados Oracle.
+
+        Dentro de uma transação a conexão já aberta é mantida.
+        """
+        if self._em_transacao:
+            return
         try:
             dsn = oracledb.makedsn(self.host, self.port, service_name=self.service_name)
             self.conn = oracledb.connect(user=self.user, password=self.password, dsn=dsn)
+            self.conn.outputtypehandler = tratador_tipos_saida
             self.cursor = self.conn.cursor()
             logger.info("Conexão com o banco de dados estabelecida com sucesso")
         except oracledb.DatabaseError as e:
@@ -74,7 +908,13 @@ class AgricolaDatabaseManager:
             raise DatabaseError(f"Falha na conexão com o banco de dados (ORA-{error.code})") from e
 
     def disconnect(self):
-        """Fecha a conexão com o banco de dados."""
+        """
+        Fecha a conexão com o banco de dados.
+
+        Dentro de uma transação a conexão só é fechada ao final do bloco.
+        """
+        if self._em_transacao:
+            return
         if self.conn:
             if self.cursor:
                 self.cursor.close()
@@ -83,10 +923,63 @@ class AgricolaDatabaseManager:
             self.cursor = None
             logger.info("Conexão com o banco de dados encerrada")
 
+    @contextmanager
+    def transacao(self) -> Iterator["AgricolaDatabaseManager"]:
+        """
+        Agrupa várias operações CRUD em uma única transação (unidade de trabalho).
+
+        Dentro do bloco a conexão permanece aberta entre os métodos e os comandos
+        não são confirmados individualmente: o commit ocorre uma única vez ao final.
+        Qualquer exceção, ou falha tratada internamente por um método (que
+        retornou False ou []), desfaz todas as operações. Blocos aninhados participam
+        da transação mais externa.
+
+        Exemplo:
+            with db.transacao():
+                cod_cultura = db.create_cultura("Trigo", 1200.50)
+                db.create_sensor(..., cod_cultura=cod_cultura)
+
+        Yields:
+            AgricolaDatabaseManager: O próprio gerenciador.
+
+        Raises:
+            DatabaseError: Se alguma operação falhou ou o commit não foi concluído.
+        """
+        if self._em_transacao:
+            yield self
+            return
+
+        self.connect()
+        self._em_transacao = True
+        self._transacao_falhou = False
+        try:
+            try:
+                yield self
+            except BaseException:
+                self.conn.rollback()
+                logger.warning("Transação desfeita")
+                raise
+
+            if self._transacao_falhou:
+                self.conn.rollback()
+                raise DatabaseError("Transação desfeita: uma das operações falhou")
+
+            try:
+                self.conn.commit()
+                logger.info("Transação confirmada")
+            except oracledb.DatabaseError as e:
+                error, = e.args
+                logger.error(f"Erro Oracle (ORA-{error.code}) ao confirmar transação: {error.message}")
+                self.conn.rollback()
+                raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+        finally:
+            self._em_transacao = False
+            self.disconnect()
+
     def executar_sql(
             self,
             sql: str,
-            params: Optional[List[Any]] = None,
+            params: Optional[Union[List[Any], Dict[str, Any]]] = None,
             operacao: str = 'insert'
     ) -> Union[int, List[Dict[str, Any]], Dict[str, Any], None]:
         """
@@ -94,7 +987,7 @@ class AgricolaDatabaseManager:
 
         Args:
             sql (str): Comando SQL a ser executado.
-            params (Optional[List[Any]]): Lista de parâmetros para o comando SQL.
+            params (Optional[Union[List[Any], Dict[str, Any]]]): Parâmetros posicionais (lista) ou nomeados (dicionário).
             operacao (str): Tipo de operação ('insert', 'select_one', 'select_all', 'update', 'delete').
 
         Returns:
@@ -113,7 +1006,8 @@ class AgricolaDatabaseManager:
             if operacao in ('insert', 'update', 'delete'):
                 self.cursor.execute(sql, params)
                 affected_rows = self.cursor.rowcount
-                self.conn.commit()
+                if not self._em_transacao:
+                    self.conn.commit()
                 logger.info(f"Operação realizada: {sql.split()[0]}, linhas afetadas: {affected_rows}")
                 return affected_rows
 
@@ -121,32 +1015,240 @@ class AgricolaDatabaseManager:
                 self.cursor.execute(sql, params)
                 row = self.cursor.fetchone()
                 if row:
-                    columns = [desc[0] for desc in self.cursor.description]
-                    return dict(zip(columns, row))
+                    return self._montar_linhas([row])[0]
                 return None
 
             elif operacao == 'select_all':
                 self.cursor.execute(sql, params)
                 rows = self.cursor.fetchall()
                 if rows:
-                    columns = [desc[0] for desc in self.cursor.description]
-                    return [dict(zip(columns, row)) for row in rows]
+                    return self._montar_linhas(rows)
                 return []
 
         except oracledb.DatabaseError as e:
             error, = e.args
             logger.error(f"Erro Oracle (ORA-{error.code}): {error.message}")
             self.conn.rollback()
+            if self._em_transacao:
+                self._transacao_falhou = True
+            raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+
+    def _montar_linhas(self, rows: List[Tuple]) -> List[Dict[str, Any]]:
+        """Converte as linhas do cursor em dicionários, formatando as datas no modo compatível."""
+        columns = [desc[0] for desc in self.cursor.description]
+        linhas = [dict(zip(columns, row)) for row in rows]
+        if self.tipos_nativos:
+            return linhas
+        return formatar_linhas(linhas, dict(zip(columns, formatadores_colunas(self.cursor.description))))
+
+    def _existe_registro(self, tabela: str, condicao: str, params: List[Any]) -> bool:
+        """
+        Verifica se existe ao menos um registro que atende à condição.
+
+        A consulta para no primeiro registro encontrado (ROWNUM = 1), ao contrário
+        de um COUNT(*), que percorre todas as linhas filhas.
+
+        Args:
+            tabela: Nome da tabela
+            condicao: Condição WHERE com binds posicionais
+            params: Valores dos binds
+
+        Returns:
+            True se existir ao menos um registro
+        """
+        # Via executar_sql: uma falha aqui também desfaz a transação em andamento
+        return self.executar_sql(f"SELECT 1 FROM {tabela} WHERE {condicao} AND ROWNUM = 1", params,
+                                 'select_one') is not None
+
+    def _proximo_codigo(self, sql: str) -> int:
+        """Obtém o próximo código da sequência da tabela (via executar_sql, como _existe_registro)."""
+        linha = self.executar_sql(sql, [], 'select_one')
+        return next(iter(linha.values()))
+
+    def _falha_tratada(self, mensagem: str, erro: Exception) -> None:
+        """
+        Registra a falha de um método que a trata retornando False ou [].
+
+        Dentro de transacao() a falha marca a transação para ser desfeita, mesmo
+        quando não veio do banco (ex.: ValidationError dos mapeadores).
+        """
+        logger.error(f"{mensagem}: {erro}")
+        if self._em_transacao:
+            self._transacao_falhou = True
+
+    def executar_lote(self, sql: str, linhas: List[Union[List[Any], Dict[str, Any]]],
+                      tipos: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Executa o mesmo comando para várias linhas com um único executemany.
+
+        Segue as regras de executar_sql: commit ao final fora de uma transação,
+        rollback e DatabaseError em caso de falha.
+
+        Args:
+            sql: Comando com binds nomeados
+            linhas: Binds de cada linha
+            tipos: Tipos dos binds para cursor.setinputsizes (opcional)
+
+        Returns:
+            Total de linhas afetadas
+        """
+        if not linhas:
+            return 0
+        try:
+            if tipos:
+                self.cursor.setinputsizes(**tipos)
+            self.cursor.executemany(sql, linhas)
+            affected_rows = self.cursor.rowcount
+            if not self._em_transacao:
+                self.conn.commit()
+            logger.info(f"Operação em lote realizada: {sql.split()[0]}, {len(linhas)} linhas enviadas, "
+                        f"linhas afetadas: {affected_rows}")
+            return affected_rows
+
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}): {error.message}")
+            self.conn.rollback()
+            if self._em_transacao:
+                self._transacao_falhou = True
             raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
 
-    def import_csv_data(self, csv_dir: str):
+    def _executar_mapeado(self, mapeador: MapeadorTabela, operacao: str, params: Dict[str, Any],
+                          tipo_execucao: str, colunas: Optional[Tuple[str, ...]] = None
+                          ) -> Union[int, Dict[str, Any], None]:
+        """Executa uma operação avulsa com o comando e os tipos compilados do mapeador."""
+        self.cursor.setinputsizes(**mapeador.tipos_bind(operacao, colunas))
+        return self.executar_sql(mapeador.sql(operacao, colunas), params, tipo_execucao)
+
+    def inserir(self, tabela: str, registros: List[Dict[str, Any]]) -> int:
+        """
+        Insere registros em qualquer tabela mapeada (colunas ausentes ficam NULL).
+
+        Args:
+            tabela: Uma das TABELAS_MAPEADAS
+            registros: Dicionários coluna -> valor, com a chave primária preenchida
+
+        Returns:
+            Número de linhas inseridas
+        """
+        mapeador = obter_mapeador(tabela)
+        linhas = [mapeador.params_inserir(registro) for registro in registros]
+        self.connect()
+        try:
+            return self.executar_lote(mapeador.sql_inserir, linhas, mapeador.tipos_bind("inserir"))
+        finally:
+            self.disconnect()
+
+    def atualizar(self, tabela: str, alteracoes: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        Atualiza registros em qualquer tabela mapeada com os UPDATEs compilados.
+
+        As alterações são agrupadas pelo conjunto de colunas: um executemany por
+        grupo, todos na mesma transação.
+
+        Args:
+            tabela: Uma das TABELAS_MAPEADAS
+            alteracoes: Pares (chave primária, campos a alterar); campos com None
+                        gravam NULL
+
+        Returns:
+            Número de linhas atualizadas
+        """
+        mapeador = obter_mapeador(tabela)
+        grupos: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for chave, campos in alteracoes:
+            grupos.setdefault(mapeador.colunas_alteradas(campos), []).append(
+                mapeador.params_atualizar(chave, campos))
+        grupos.pop((), None)   # Nenhuma coluna a alterar
+        if not grupos:
+            return 0
+        with self.transacao():
+            return sum(self.executar_lote(mapeador.sql("atualizar", colunas), linhas,
+                                          mapeador.tipos_bind("atualizar", colunas))
+                       for colunas, linhas in grupos.items())
+
+    def excluir(self, tabela: str, chaves: List[Dict[str, Any]]) -> int:
+        """
+        Exclui registros de qualquer tabela mapeada pela chave primária.
+
+        As restrições de chave estrangeira continuam valendo: registros com filhos
+        geram DatabaseError (use delete_cultura_cascata para a subárvore completa).
+
+        Args:
+            tabela: Uma das TABELAS_MAPEADAS
+            chaves: Dicionários com as colunas da chave primária
+
+        Returns:
+            Número de linhas excluídas
+        """
+        mapeador = obter_mapeador(tabela)
+        linhas = [mapeador.params_chave(chave) for chave in chaves]
+        self.connect()
+        try:
+            return self.executar_lote(mapeador.sql_excluir, linhas, mapeador.tipos_bind("excluir"))
+        finally:
+            self.disconnect()
+
+    def obter(self, tabela: str, chave: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Lê um registro de qualquer tabela mapeada pela chave primária.
+
+        Args:
+            tabela: Uma das TABELAS_MAPEADAS
+            chave: Dicionário com as colunas da chave primária
+
+        Returns:
+            Dicionário com as colunas do registro ou None se não existir
+        """
+        mapeador = obter_mapeador(tabela)
+        params = mapeador.params_chave(chave)
+        self.connect()
+        try:
+            return self._executar_mapeado(mapeador, "obter", params, 'select_one')
+        finally:
+            self.disconnect()
+
+    def _inserir_registro(self, tabela: str, registro: Dict[str, Any]) -> None:
+        """Insere um registro com a conexão atual (usado pelas rotinas create_*)."""
+        mapeador = obter_mapeador(tabela)
+        self._executar_mapeado(mapeador, "inserir", mapeador.params_inserir(registro), 'insert')
+
+    def _atualizar_registro(self, tabela: str, chave: Dict[str, Any], campos: Dict[str, Any]) -> Optional[int]:
+        """
+        Atualiza um registro com a conexão atual (usado pelas rotinas update_*).
+
+        Returns:
+            Linhas afetadas ou None se nenhum campo atualizável foi informado
+        """
+        mapeador = obter_mapeador(tabela)
+        campos = mapeador.campos_informados(campos)
+        if not campos:
+            return None
+        return self._executar_mapeado(mapeador, "atualizar", mapeador.params_atualizar(chave, campos), 'update',
+                                      mapeador.colunas_alteradas(campos))
+
+    def import_csv_data(self, csv_dir: str, modo: str = "insert", reiniciar: bool = False,
+                        tamanho_lote: int = TAMANHO_LOTE_CSV) -> Dict[str, Dict[str, int]]:
         """
         Importa dados de arquivos CSV para o banco de dados.
 
+        A importação é retomável: após cada lote confirmado, o deslocamento no
+        arquivo é gravado em <arquivo>.checkpoint.json, e uma nova execução
+        continua do ponto em que a anterior parou (arquivos já concluídos são
+        ignorados). No modo 'merge' a carga é idempotente: linhas existentes e
+        inalteradas não geram escrita, e uma queda entre o commit e a gravação
+        do checkpoint não causa erros de chave duplicada na retomada.
+
         Args:
             csv_dir: Diretório contendo os arquivos CSV
+            modo: 'insert' (padrão) ou 'merge' (upsert pela chave primária)
+            reiniciar: Se True, descarta os checkpoints e importa desde o início
+            tamanho_lote: Linhas por executemany/commit
+
+        Returns:
+            Dicionário tabela -> {'inseridas': n, 'rejeitadas': n}
         """
-        self.connect()
+        esquema = carregar_esquema_ddl()
 
         # Ordem de importação para respeitar as chaves estrangeiras
         tables = [
@@ -157,32 +1259,87 @@ class AgricolaDatabaseManager:
             "t_aplicacoes"
         ]
 
-        for table in tables:
-            csv_file = os.path.join(csv_dir, f"{table}.csv")
-            if not os.path.exists(csv_file):
-                logger.warning(f"Arquivo não encontrado: {csv_file}")
-                continue
-
-            with open(csv_file, 'r') as f:
-                csv_reader = csv.reader(f)
-                headers = next(csv_reader)  # Lê o cabeçalho
-
-                # Prepara a instrução SQL de inserção
-                placeholders = ', '.join([f':{i + 1}' for i in range(len(headers))])
-                insert_query = f"INSERT INTO {table.upper()} ({', '.join(headers)}) VALUES ({placeholders})"
+        resumo = {}
+        self.connect()
+        try:
+            for table in tables:
+                csv_file = os.path.join(csv_dir, f"{table}.csv")
+                if not os.path.exists(csv_file):
+                    logger.warning(f"Arquivo não encontrado: {csv_file}")
+                    continue
+
+                checkpoint = CheckpointImportacao(csv_file)
+                if reiniciar:
+                    checkpoint.remover()
+                checkpoint.carregar()
+                if checkpoint.concluido:
+                    logger.info(f"Tabela {table.upper()} já importada ({checkpoint.linhas} linhas), ignorada")
+                    continue
+
+                resumo[table.upper()] = self._importar_arquivo(table.upper(), csv_file, esquema, modo,
+                                                               checkpoint, tamanho_lote)
+                logger.info(f"Dados importados com sucesso para a tabela {table.upper()}")
+        finally:
+            self.disconnect()
 
-                # Insere os dados
-                for row in csv_reader:
-                    try:
-                        # Converte a lista de valores para uma lista de parâmetros posicionais
-                        self.executar_sql(insert_query, row, 'insert')
-                    except DatabaseError as e:
-                        logger.error(f"Erro ao inserir dados em {table}: {e}")
-                        logger.error(f"Dados: {row}")
+        return resumo
 
-            logger.info(f"Dados importados com sucesso para a tabela {table.upper()}")
+    def _importar_arquivo(self, tabela: str, csv_file: str, esquema: Dict[str, Dict[str, Any]], modo: str,
+                          checkpoint: CheckpointImportacao, tamanho_lote: int) -> Dict[str, int]:
+        """
+        Importa um CSV a partir do checkpoint, em lotes, gravando o progresso após cada commit.
 
-        self.disconnect()
+        Returns:
+            Dicionário {'inseridas': n, 'rejeitadas': n} desta execução
+        """
+        totais = {'inseridas': 0, 'rejeitadas': 0}
+
+        # Leitura binária: f.tell() fornece o deslocamento exato para o checkpoint
+        with open(csv_file, 'rb') as f:
+            headers = next(csv.reader([f.readline().decode('utf-8')]))
+            sql = montar_comando_importacao(tabela, headers, esquema, modo)
+            conversor = ConversorLinhaCSV(tabela, headers, esquema)
+            if checkpoint.offset:
+                f.seek(checkpoint.offset)
+                logger.info(f"Retomando {tabela} a partir da linha {checkpoint.linhas + 1}")
+
+            linhas = checkpoint.linhas
+            while True:
+                lote = []
+                for linha in f:
+                    if linha.strip():
+                        lote.append(linha.decode('utf-8'))
+                    if len(lote) >= tamanho_lote:
+                        break
+                if not lote:
+                    break
+
+                rows, invalidas = conversor.converter_lote(list(csv.reader(lote)))
+                erros = []
+                try:
+                    if rows:
+                        self.cursor.setinputsizes(*conversor.tipos_bind())
+                        self.cursor.executemany(sql, rows, batcherrors=True)
+                        erros = self.cursor.getbatcherrors()
+                    self.conn.commit()
+                except oracledb.DatabaseError as e:
+                    error, = e.args
+                    logger.error(f"Erro Oracle (ORA-{error.code}) ao importar {tabela}: {error.message}")
+                    self.conn.rollback()
+                    raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+
+                for erro in erros:
+                    logger.error(f"Erro ao inserir dados em {tabela}: {erro.message}")
+                    logger.error(f"Dados: {rows[erro.offset]}")
+                totais['inseridas'] += len(rows) - len(erros)
+                totais['rejeitadas'] += len(erros) + invalidas
+
+                linhas += len(rows) + invalidas
+                checkpoint.salvar(f.tell(), linhas)
+
+            checkpoint.salvar(f.tell(), linhas, concluido=True)
+
+        return totais
 
     # Operações CRUD para T_CULTURAS
 
@@ -202,31 +1359,15 @@ class AgricolaDatabaseManager:
 
         try:
             # Obtém o próximo código de cultura
-            self.cursor.execute("SELECT NVL(MAX(cod_cultura), 0) + 1 FROM T_CULTURAS")
-            new_cod = self.cursor.fetchone()[0]
-
-            # Insere a nova cultura com tratamento adequado para a data
-            if data_prev_colheita is not None:
-                sql = """
-                INSERT INTO T_CULTURAS (
-                    cod_cultura, desc_cultura, tamanho_cultura, data_prev_colheita
-                ) VALUES (
-                    :1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD')
-                )
-                """
-                params = [new_cod, desc_cultura, tamanho_cultura, data_prev_colheita]
-            else:
-                sql = """
-                INSERT INTO T_CULTURAS (
-                    cod_cultura, desc_cultura, tamanho_cultura, data_prev_colheita
-                ) VALUES (
-                    :1, :2, :3, NULL
-                )
-                """
-                # CORREÇÃO: Remover o parâmetro data_prev_colheita quando for NULL
-                params = [new_cod, desc_cultura, tamanho_cultura]
-
-            self.executar_sql(sql, params, 'insert')
+            new_cod = self._proximo_codigo(SQL_PROXIMO_COD_CULTURA)
+
+            # Datas ausentes seguem como NULL no mesmo comando compilado
+            self._inserir_registro("T_CULTURAS", {
+                "cod_cultura": new_cod,
+                "desc_cultura": desc_cultura,
+                "tamanho_cultura": tamanho_cultura,
+                "data_prev_colheita": data_prev_colheita
+            })
             logger.info(f"Nova cultura inserida com ID: {new_cod}")
 
             return new_cod
@@ -251,17 +1392,14 @@ class AgricolaDatabaseManager:
 
         try:
             if cod_cultura is not None:
-                sql = "SELECT cod_cultura, desc_cultura, tamanho_cultura, TO_CHAR(data_prev_colheita, 'YYYY-MM-DD') as data_prev_colheita FROM T_CULTURAS WHERE cod_cultura = :1"
-                params = [cod_cultura]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_CULTURA_POR_COD, [cod_cultura], 'select_all')
             else:
-                sql = "SELECT cod_cultura, desc_cultura, tamanho_cultura, TO_CHAR(data_prev_colheita, 'YYYY-MM-DD') as data_prev_colheita FROM T_CULTURAS"
-                result = self.executar_sql(sql, [], 'select_all')
+                result = self.executar_sql(SQL_SELECT_CULTURAS, [], 'select_all')
 
             return result
 
         except Exception as e:
-            logger.error(f"Erro ao ler cultura(s): {e}")
+            self._falha_tratada("Erro ao ler cultura(s)", e)
             return []
         finally:
             self.disconnect()
@@ -283,39 +1421,16 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            # Constrói a consulta SQL dinamicamente com base nos parâmetros fornecidos
-            update_fields = []
-            params = []
-            param_index = 1
-
-            if desc_cultura is not None:
-                update_fields.append(f"desc_cultura = :{param_index}")
-                params.append(desc_cultura)
-                param_index += 1
-
-            if tamanho_cultura is not None:
-                update_fields.append(f"tamanho_cultura = :{param_index}")
-                params.append(tamanho_cultura)
-                param_index += 1
-
-            if data_prev_colheita is not None:
-                update_fields.append(f"data_prev_colheita = TO_DATE(:{param_index}, 'YYYY-MM-DD')")
-                params.append(data_prev_colheita)
-                param_index += 1
-            elif data_prev_colheita == "":  # Caso especial para limpar a data
-                update_fields.append("data_prev_colheita = NULL")
-                # Não adiciona parâmetro para NULL
-
-            if not update_fields:
+            # UPDATE compilado: altera só os campos informados ("" limpa a data)
+            affected_rows = self._atualizar_registro("T_CULTURAS", {"cod_cultura": cod_cultura}, {
+                "desc_cultura": desc_cultura,
+                "tamanho_cultura": tamanho_cultura,
+                "data_prev_colheita": data_prev_colheita
+            })
+            if affected_rows is None:
                 logger.warning("Nenhum campo fornecido para atualização")
                 return False
 
-            # Adiciona o código da cultura como último parâmetro
-            params.append(cod_cultura)
-
-            sql = f"UPDATE T_CULTURAS SET {', '.join(update_fields)} WHERE cod_cultura = :{param_index}"
-
-            affected_rows = self.executar_sql(sql, params, 'update')
             success = affected_rows > 0
 
             if success:
@@ -326,7 +1441,7 @@ class AgricolaDatabaseManager:
             return success
 
         except Exception as e:
-            logger.error(f"Erro ao atualizar cultura: {e}")
+            self._falha_tratada("Erro ao atualizar cultura", e)
             return False
         finally:
             self.disconnect()
@@ -344,40 +1459,59 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            # Verifica se existem sensores associados a esta cultura
-            sql_check_sensores = "SELECT COUNT(*) FROM T_SENSORES WHERE cod_cultura = :1"
-            self.cursor.execute(sql_check_sensores, [cod_cultura])
-            if self.cursor.fetchone()[0] > 0:
-                logger.warning(
-                    f"Não é possível excluir a cultura {cod_cultura} pois existem sensores associados a ela.")
-                return False
-
-            # Verifica se existem aplicações associadas a esta cultura
-            sql_check_aplicacoes = "SELECT COUNT(*) FROM T_APLICACOES WHERE cod_cultura = :1"
-            self.cursor.execute(sql_check_aplicacoes, [cod_cultura])
-            if self.cursor.fetchone()[0] > 0:
-                logger.warning(
-                    f"Não é possível excluir a cultura {cod_cultura} pois existem aplicações associadas a ela.")
-                return False
-
-            # Remove a cultura
-            sql = "DELETE FROM T_CULTURAS WHERE cod_cultura = :1"
+            # Remove a cultura apenas se não houver sensores nem aplicações associados
+            sql = SQL_DELETE_CULTURA
             affected_rows = self.executar_sql(sql, [cod_cultura], 'delete')
             success = affected_rows > 0
 
             if success:
                 logger.info(f"Cultura {cod_cultura} removida com sucesso")
+            elif self._existe_registro("T_SENSORES", "cod_cultura = :1", [cod_cultura]):
+                logger.warning(
+                    f"Não é possível excluir a cultura {cod_cultura} pois existem sensores associados a ela.")
+            elif self._existe_registro("T_APLICACOES", "cod_cultura = :1", [cod_cultura]):
+                logger.warning(
+                    f"Não é possível excluir a cultura {cod_cultura} pois existem aplicações associadas a ela.")
             else:
                 logger.warning(f"Nenhuma cultura encontrada com o código {cod_cultura}")
 
             return success
 
         except Exception as e:
-            logger.error(f"Erro ao excluir cultura: {e}")
+            self._falha_tratada("Erro ao excluir cultura", e)
             return False
         finally:
             self.disconnect()
 
+    def delete_cultura_cascata(self, cod_cultura: int) -> Dict[str, int]:
+        """
+        Remove uma cultura e toda a sua subárvore em uma única transação.
+
+        A subárvore (sensores → medições → sugestões → aplicações) é removida com
+        um DELETE baseado em conjunto por tabela, dos filhos para os pais.
+
+        Args:
+            cod_cultura: Código da cultura a ser removida
+
+        Returns:
+            Dicionário com a quantidade de registros removidos por tabela
+
+        Raises:
+            DatabaseError: Se alguma etapa falhar (nada é removido)
+        """
+        try:
+            removidos = {}
+            with self.transacao():
+                for tabela, sql in SQL_DELETE_CASCATA_CULTURA:
+                    removidos[tabela] = self.executar_sql(sql, {"cod_cultura": cod_cultura}, 'delete')
+
+            logger.info(f"Cultura {cod_cultura} removida em cascata: {removidos}")
+            return removidos
+
+        except Exception as e:
+            logger.error(f"Erro ao excluir cultura {cod_cultura} em cascata: {e}")
+            raise
+
     # Operações CRUD para T_SENSORES
 
     def create_sensor(self, nm_sensor: str, tipo_sensor: str, objetivo_sensor: str,
@@ -409,42 +1543,24 @@ class AgricolaDatabaseManager:
 
         try:
             # Obtém o próximo código de sensor
-            self.cursor.execute("SELECT NVL(MAX(cod_sensor), 0) + 1 FROM T_SENSORES")
-            new_cod = self.cursor.fetchone()[0]
-
-            # Insere o novo sensor com tratamento adequado para a data
-            if data_instalacao is not None:
-                sql = """
-                INSERT INTO T_SENSORES (
-                    cod_sensor, nm_sensor, tipo_sensor, objetivo_sensor, fab_sensor, 
-                    modelo_sensor, data_instalacao, latitude_instalacao, longitude_instalacao, 
-                    valor_minimo, valor_maximo, unidade, cod_cultura
-                ) VALUES (
-                    :1, :2, :3, :4, :5, :6, TO_DATE(:7, 'YYYY-MM-DD'), :8, :9, :10, :11, :12, :13
-                )
-                """
-                params = [
-                    new_cod, nm_sensor, tipo_sensor, objetivo_sensor, fab_sensor,
-                    modelo_sensor, data_instalacao, latitude_instalacao, longitude_instalacao,
-                    valor_minimo, valor_maximo, unidade, cod_cultura
-                ]
-            else:
-                sql = """
-                INSERT INTO T_SENSORES (
-                    cod_sensor, nm_sensor, tipo_sensor, objetivo_sensor, fab_sensor, 
-                    modelo_sensor, data_instalacao, latitude_instalacao, longitude_instalacao, 
-                    valor_minimo, valor_maximo, unidade, cod_cultura
-                ) VALUES (
-                    :1, :2, :3, :4, :5, :6, NULL, :7, :8, :9, :10, :11, :12
-                )
-                """
-                params = [
-                    new_cod, nm_sensor, tipo_sensor, objetivo_sensor, fab_sensor,
-                    modelo_sensor, latitude_instalacao, longitude_instalacao,
-                    valor_minimo, valor_maximo, unidade, cod_cultura
-                ]
-
-            self.executar_sql(sql, params, 'insert')
+            new_cod = self._proximo_codigo(SQL_PROXIMO_COD_SENSOR)
+
+            # Datas ausentes seguem como NULL no mesmo comando compilado
+            self._inserir_registro("T_SENSORES", {
+                "cod_sensor": new_cod,
+                "nm_sensor": nm_sensor,
+                "tipo_sensor": tipo_sensor,
+                "objetivo_sensor": objetivo_sensor,
+                "fab_sensor": fab_sensor,
+                "modelo_sensor": modelo_sensor,
+                "data_instalacao": data_instalacao,
+                "latitude_instalacao": latitude_instalacao,
+                "longitude_instalacao": longitude_instalacao,
+                "valor_minimo": valor_minimo,
+                "valor_maximo": valor_maximo,
+                "unidade": unidade,
+                "cod_cultura": cod_cultura
+            })
             logger.info(f"Novo sensor inserido com ID: {new_cod}")
 
             return new_cod
@@ -469,30 +1585,14 @@ class AgricolaDatabaseManager:
 
         try:
             if cod_sensor is not None:
-                sql = """
-                SELECT cod_sensor, nm_sensor, tipo_sensor, objetivo_sensor, fab_sensor, 
-                       modelo_sensor, TO_CHAR(data_instalacao, 'YYYY-MM-DD') as data_instalacao, 
-                       latitude_instalacao, longitude_instalacao, valor_minimo, valor_maximo, 
-                       unidade, cod_cultura 
-                FROM T_SENSORES 
-                WHERE cod_sensor = :1
-                """
-                params = [cod_sensor]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_SENSOR_POR_COD, [cod_sensor], 'select_all')
             else:
-                sql = """
-                SELECT cod_sensor, nm_sensor, tipo_sensor, objetivo_sensor, fab_sensor, 
-                       modelo_sensor, TO_CHAR(data_instalacao, 'YYYY-MM-DD') as data_instalacao, 
-                       latitude_instalacao, longitude_instalacao, valor_minimo, valor_maximo, 
-                       unidade, cod_cultura 
-                FROM T_SENSORES
-                """
-                result = self.executar_sql(sql, [], 'select_all')
+                result = self.executar_sql(SQL_SELECT_SENSORES, [], 'select_all')
 
             return result
 
         except Exception as e:
-            logger.error(f"Erro ao ler sensor(es): {e}")
+            self._falha_tratada("Erro ao ler sensor(es)", e)
             return []
         finally:
             self.disconnect()
@@ -511,43 +1611,12 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            # Campos válidos para atualização
-            valid_fields = [
-                'nm_sensor', 'tipo_sensor', 'objetivo_sensor', 'fab_sensor',
-                'modelo_sensor', 'data_instalacao', 'latitude_instalacao',
-                'longitude_instalacao', 'valor_minimo', 'valor_maximo',
-                'unidade', 'cod_cultura'
-            ]
-
-            # Filtra apenas os campos válidos
-            update_fields = []
-            params = []
-            param_index = 1
-
-            for field, value in kwargs.items():
-                if field in valid_fields and value is not None:
-                    # Tratamento especial para campos de data
-                    if field == 'data_instalacao':
-                        update_fields.append(f"{field} = TO_DATE(:{param_index}, 'YYYY-MM-DD')")
-                    else:
-                        update_fields.append(f"{field} = :{param_index}")
-                    params.append(value)
-                    param_index += 1
-                elif field in valid_fields and value == "":  # Caso especial para limpar campos
-                    if field == 'data_instalacao':
-                        update_fields.append(f"{field} = NULL")
-                        # Não adiciona parâmetro para NULL
-
-            if not update_fields:
+            # Campos fora das colunas atualizáveis de T_SENSORES são ignorados
+            affected_rows = self._atualizar_registro("T_SENSORES", {"cod_sensor": cod_sensor}, kwargs)
+            if affected_rows is None:
                 logger.warning("Nenhum campo válido fornecido para atualização")
                 return False
 
-            # Adiciona o código do sensor como último parâmetro
-            params.append(cod_sensor)
-
-            sql = f"UPDATE T_SENSORES SET {', '.join(update_fields)} WHERE cod_sensor = :{param_index}"
-
-            affected_rows = self.executar_sql(sql, params, 'update')
             success = affected_rows > 0
 
             if success:
@@ -558,7 +1627,7 @@ class AgricolaDatabaseManager:
             return success
 
         except Exception as e:
-            logger.error(f"Erro ao atualizar sensor: {e}")
+            self._falha_tratada("Erro ao atualizar sensor", e)
             return False
         finally:
             self.disconnect()
@@ -576,27 +1645,22 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            # Verifica se existem medições associadas a este sensor
-            sql_check = "SELECT COUNT(*) FROM T_MEDICOES WHERE cod_sensor = :1"
-            self.cursor.execute(sql_check, [cod_sensor])
-            if self.cursor.fetchone()[0] > 0:
-                logger.warning(f"Não é possível excluir o sensor {cod_sensor} pois existem medições associadas a ele.")
-                return False
-
-            # Remove o sensor
-            sql = "DELETE FROM T_SENSORES WHERE cod_sensor = :1"
+            # Remove o sensor apenas se não houver medições associadas
+            sql = SQL_DELETE_SENSOR
             affected_rows = self.executar_sql(sql, [cod_sensor], 'delete')
             success = affected_rows > 0
 
             if success:
                 logger.info(f"Sensor {cod_sensor} removido com sucesso")
+            elif self._existe_registro("T_MEDICOES", "cod_sensor = :1", [cod_sensor]):
+                logger.warning(f"Não é possível excluir o sensor {cod_sensor} pois existem medições associadas a ele.")
             else:
                 logger.warning(f"Nenhum sensor encontrado com o código {cod_sensor}")
 
             return success
 
         except Exception as e:
-            logger.error(f"Erro ao excluir sensor: {e}")
+            self._falha_tratada("Erro ao excluir sensor", e)
             return False
         finally:
             self.disconnect()
@@ -621,34 +1685,16 @@ class AgricolaDatabaseManager:
 
         try:
             # Obtém o próximo código de medição
-            self.cursor.execute("SELECT NVL(MAX(cod_medicao), 0) + 1 FROM T_MEDICOES")
-            new_cod = self.cursor.fetchone()[0]
-
-            # Insere a nova medição com tratamento adequado para a data
-            if data_hora_medicao is not None:
-                sql = """
-                INSERT INTO T_MEDICOES (
-                    cod_medicao, data_hora_medicao, valor_medicao, un_medicao, cod_sensor
-                ) VALUES (
-                    :1, TO_TIMESTAMP(:2, 'YYYY-MM-DD HH24:MI:SS'), :3, :4, :5
-                )
-                """
-                params = [
-                    new_cod, data_hora_medicao, valor_medicao, un_medicao, cod_sensor
-                ]
-            else:
-                sql = """
-                INSERT INTO T_MEDICOES (
-                    cod_medicao, data_hora_medicao, valor_medicao, un_medicao, cod_sensor
-                ) VALUES (
-                    :1, NULL, :2, :3, :4
-                )
-                """
-                params = [
-                    new_cod, valor_medicao, un_medicao, cod_sensor
-                ]
-
-            self.executar_sql(sql, params, 'insert')
+            new_cod = self._proximo_codigo(SQL_PROXIMO_COD_MEDICAO)
+
+            # Datas ausentes seguem como NULL no mesmo comando compilado
+            self._inserir_registro("T_MEDICOES", {
+                "cod_medicao": new_cod,
+                "data_hora_medicao": data_hora_medicao,
+                "valor_medicao": valor_medicao,
+                "un_medicao": un_medicao,
+                "cod_sensor": cod_sensor
+            })
             logger.info(f"Nova medição inserida com ID: {new_cod}")
 
             return new_cod
@@ -673,32 +1719,19 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            base_sql = """
-            SELECT cod_medicao, TO_CHAR(data_hora_medicao, 'YYYY-MM-DD HH24:MI:SS') as data_hora_medicao, 
-                   valor_medicao, un_medicao, cod_sensor 
-            FROM T_MEDICOES
-            """
-
             if cod_medicao is not None and cod_sensor is not None:
-                sql = f"{base_sql} WHERE cod_medicao = :1 AND cod_sensor = :2"
-                params = [cod_medicao, cod_sensor]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_MEDICAO_POR_CHAVE, [cod_medicao, cod_sensor], 'select_all')
             elif cod_medicao is not None:
-                sql = f"{base_sql} WHERE cod_medicao = :1"
-                params = [cod_medicao]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_MEDICAO_POR_COD, [cod_medicao], 'select_all')
             elif cod_sensor is not None:
-                sql = f"{base_sql} WHERE cod_sensor = :1"
-                params = [cod_sensor]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_MEDICOES_POR_SENSOR, [cod_sensor], 'select_all')
             else:
-                sql = base_sql
-                result = self.executar_sql(sql, [], 'select_all')
+                result = self.executar_sql(SQL_SELECT_MEDICOES, [], 'select_all')
 
             return result
 
         except Exception as e:
-            logger.error(f"Erro ao ler medição(ões): {e}")
+            self._falha_tratada("Erro ao ler medição(ões)", e)
             return []
         finally:
             self.disconnect()
@@ -722,40 +1755,17 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            # Constrói a consulta SQL dinamicamente com base nos parâmetros fornecidos
-            update_fields = []
-            params = []
-            param_index = 1
-
-            if data_hora_medicao is not None:
-                update_fields.append(f"data_hora_medicao = TO_TIMESTAMP(:{param_index}, 'YYYY-MM-DD HH24:MI:SS')")
-                params.append(data_hora_medicao)
-                param_index += 1
-            elif data_hora_medicao == "":  # Caso especial para limpar a data
-                update_fields.append("data_hora_medicao = NULL")
-                # Não adiciona parâmetro para NULL
-
-            if valor_medicao is not None:
-                update_fields.append(f"valor_medicao = :{param_index}")
-                params.append(valor_medicao)
-                param_index += 1
-
-            if un_medicao is not None:
-                update_fields.append(f"un_medicao = :{param_index}")
-                params.append(un_medicao)
-                param_index += 1
-
-            if not update_fields:
+            # UPDATE compilado: altera só os campos informados ("" limpa a data)
+            affected_rows = self._atualizar_registro(
+                "T_MEDICOES", {"cod_medicao": cod_medicao, "cod_sensor": cod_sensor}, {
+                    "data_hora_medicao": data_hora_medicao,
+                    "valor_medicao": valor_medicao,
+                    "un_medicao": un_medicao
+                })
+            if affected_rows is None:
                 logger.warning("Nenhum campo fornecido para atualização")
                 return False
 
-            # Adiciona os códigos como últimos parâmetros
-            params.append(cod_medicao)
-            params.append(cod_sensor)
-
-            sql = f"UPDATE T_MEDICOES SET {', '.join(update_fields)} WHERE cod_medicao = :{param_index} AND cod_sensor = :{param_index + 1}"
-
-            affected_rows = self.executar_sql(sql, params, 'update')
             success = affected_rows > 0
 
             if success:
@@ -766,7 +1776,7 @@ class AgricolaDatabaseManager:
             return success
 
         except Exception as e:
-            logger.error(f"Erro ao atualizar medição: {e}")
+            self._falha_tratada("Erro ao atualizar medição", e)
             return False
         finally:
             self.disconnect()
@@ -785,28 +1795,23 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            # Verifica se existem sugestões associadas a esta medição
-            sql_check = "SELECT COUNT(*) FROM T_SUGESTOES WHERE cod_medicao = :1 AND cod_sensor = :2"
-            self.cursor.execute(sql_check, [cod_medicao, cod_sensor])
-            if self.cursor.fetchone()[0] > 0:
-                logger.warning(
-                    f"Não é possível excluir a medição {cod_medicao} do sensor {cod_sensor} pois existem sugestões associadas a ela.")
-                return False
-
-            # Remove a medição
-            sql = "DELETE FROM T_MEDICOES WHERE cod_medicao = :1 AND cod_sensor = :2"
+            # Remove a medição apenas se não houver sugestões associadas
+            sql = SQL_DELETE_MEDICAO
             affected_rows = self.executar_sql(sql, [cod_medicao, cod_sensor], 'delete')
             success = affected_rows > 0
 
             if success:
                 logger.info(f"Medição {cod_medicao} do sensor {cod_sensor} removida com sucesso")
+            elif self._existe_registro("T_SUGESTOES", "cod_medicao = :1 AND cod_sensor = :2", [cod_medicao, cod_sensor]):
+                logger.warning(
+                    f"Não é possível excluir a medição {cod_medicao} do sensor {cod_sensor} pois existem sugestões associadas a ela.")
             else:
                 logger.warning(f"Nenhuma medição encontrada com o código {cod_medicao} e sensor {cod_sensor}")
 
             return success
 
         except Exception as e:
-            logger.error(f"Erro ao excluir medição: {e}")
+            self._falha_tratada("Erro ao excluir medição", e)
             return False
         finally:
             self.disconnect()
@@ -834,38 +1839,18 @@ class AgricolaDatabaseManager:
 
         try:
             # Obtém o próximo código de sugestão
-            self.cursor.execute("SELECT NVL(MAX(cod_sugestao), 0) + 1 FROM T_SUGESTOES")
-            new_cod = self.cursor.fetchone()[0]
-
-            # Insere a nova sugestão com tratamento adequado para a data
-            if data_hora_sugestao is not None:
-                sql = """
-                INSERT INTO T_SUGESTOES (
-                    cod_medicao, cod_sugestao, objetivo_sugestao, data_hora_sugestao, 
-                    valor_sugestao, un_sugestao, cod_sensor
-                ) VALUES (
-                    :1, :2, :3, TO_TIMESTAMP(:4, 'YYYY-MM-DD HH24:MI:SS'), :5, :6, :7
-                )
-                """
-                params = [
-                    cod_medicao, new_cod, objetivo_sugestao, data_hora_sugestao,
-                    valor_sugestao, un_sugestao, cod_sensor
-                ]
-            else:
-                sql = """
-                INSERT INTO T_SUGESTOES (
-                    cod_medicao, cod_sugestao, objetivo_sugestao, data_hora_sugestao, 
-                    valor_sugestao, un_sugestao, cod_sensor
-                ) VALUES (
-                    :1, :2, :3, NULL, :4, :5, :6
-                )
-                """
-                params = [
-                    cod_medicao, new_cod, objetivo_sugestao,
-                    valor_sugestao, un_sugestao, cod_sensor
-                ]
-
-            self.executar_sql(sql, params, 'insert')
+            new_cod = self._proximo_codigo(SQL_PROXIMO_COD_SUGESTAO)
+
+            # Datas ausentes seguem como NULL no mesmo comando compilado
+            self._inserir_registro("T_SUGESTOES", {
+                "cod_medicao": cod_medicao,
+                "cod_sugestao": new_cod,
+                "objetivo_sugestao": objetivo_sugestao,
+                "data_hora_sugestao": data_hora_sugestao,
+                "valor_sugestao": valor_sugestao,
+                "un_sugestao": un_sugestao,
+                "cod_sensor": cod_sensor
+            })
             logger.info(f"Nova sugestão inserida com ID: {new_cod}")
 
             return new_cod
@@ -892,33 +1877,19 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            base_sql = """
-            SELECT cod_medicao, cod_sugestao, objetivo_sugestao, 
-                   TO_CHAR(data_hora_sugestao, 'YYYY-MM-DD HH24:MI:SS') as data_hora_sugestao, 
-                   valor_sugestao, un_sugestao, cod_sensor 
-            FROM T_SUGESTOES
-            """
-
             if cod_sugestao is not None and cod_medicao is not None and cod_sensor is not None:
-                sql = f"{base_sql} WHERE cod_sugestao = :1 AND cod_medicao = :2 AND cod_sensor = :3"
-                params = [cod_sugestao, cod_medicao, cod_sensor]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_SUGESTAO_POR_CHAVE, [cod_sugestao, cod_medicao, cod_sensor], 'select_all')
             elif cod_medicao is not None and cod_sensor is not None:
-                sql = f"{base_sql} WHERE cod_medicao = :1 AND cod_sensor = :2"
-                params = [cod_medicao, cod_sensor]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_SUGESTOES_POR_MEDICAO, [cod_medicao, cod_sensor], 'select_all')
             elif cod_sugestao is not None:
-                sql = f"{base_sql} WHERE cod_sugestao = :1"
-                params = [cod_sugestao]
-                result = self.executar_sql(sql, params, 'select_all')
+                result = self.executar_sql(SQL_SELECT_SUGESTAO_POR_COD, [cod_sugestao], 'select_all')
             else:
-                sql = base_sql
-                result = self.executar_sql(sql, [], 'select_all')
+                result = self.executar_sql(SQL_SELECT_SUGESTOES, [], 'select_all')
 
             return result
 
         except Exception as e:
-            logger.error(f"Erro ao ler sugestão(ões): {e}")
+            self._falha_tratada("Erro ao ler sugestão(ões)", e)
             return []
         finally:
             self.disconnect()
@@ -944,48 +1915,18 @@ class AgricolaDatabaseManager:
         self.connect()
 
         try:
-            # Constrói a consulta SQL dinamicamente com base nos parâmetros fornecidos
-            update_fields = []
-            params = []
-            param_index = 1
-
-            if objetivo_sugestao is not None:
-                update_fields.append(f"objetivo_sugestao = :{param_index}")
-                params.append(objetivo_sugestao)
-                param_index += 1
-
-            if data_hora_sugestao is not None:
-                update_fields.append(f"data_hora_sugestao = TO_TIMESTAMP(:{param_index}, 'YYYY-MM-DD HH24:MI:SS')")
-                params.append(data_hora_sugestao)
-                param_index += 1
-            elif data_hora_sugestao == "":  # Caso especial para limpar a data
-                update_fields.append("data_hora_sugestao = NULL")
-                # Não adiciona parâmetro para NULL
-
-            if valor_sugestao is not None:
-                update_fields.append(f"valor_sugestao = :{param_index}")
-                params.append(valor_sugestao)
-                param_index += 1
-
-            if un_sugestao is not None:
-                update_fields.append(f"un_sugestao = :{param_index}")
-                params.append(un_sugestao)
-                param_index += 1
-
-            if not update_fields:
+            # UPDATE compilado: altera só os campos informados ("" limpa a data)
+            affected_rows = self._atualizar_registro(
+                "T_SUGESTOES", {"cod_sugestao": cod_sugestao, "cod_medicao": cod_medicao, "cod_sensor": cod_sensor}, {
+                    "objetivo_sugestao": objetivo_sugestao,
+                    "data_hora_sugestao": data_hora_sugestao,
+                    "valor_sugestao": valor_sugestao,
+                    "un_sugestao": un_sugestao
+                })
+            if affected_rows is None:
                 logger.warning("Nenhum campo fornecido para atualização")
                 return False
 
-            # Adiciona os códigos como últimos parâmetros
-            params.append(cod_sugestao)
-            params.append(cod_medicao)
-            params.append(cod_sensor)
-
-            sql = f"""UPDATE T_SUGESTOES 
-                   SET {', '.join(update_fields)} 
-                   WHERE cod_sugestao = :{param_index} AND cod_medicao = :{param_index + 1} AND cod_sensor = :{param_index + 2}"""
-
-            affected_rows = self.executar_sql(sql, params, 'update')
             success = affected_rows > 0
 
             if success:
@@ -996,388 +1937,1470 @@ class AgricolaDatabaseManager:
             return success
 
         except Exception as e:
-            logger.error(f"Erro ao atualizar sugestão: {e}")
+            self._falha_tratada("Erro ao atualizar sugestão", e)
             return False
         finally:
             self.disconnect()
 
     def delete_sugestao(self, cod_sugestao: int, cod_medicao: int, cod_sensor: int) -> bool:
         """
-        Remove uma sugestão do banco de dados.
+        Remove uma sugestão do banco de dados.
+
+        Args:
+            cod_sugestao: Código da sugestão a ser removida
+            cod_medicao: Código da medição associada
+            cod_sensor: Código do sensor associado
+
+        Returns:
+            True se a remoção foi bem-sucedida, False caso contrário
+        """
+        self.connect()
+
+        try:
+            # Remove a sugestão apenas se não houver aplicações associadas
+            sql = SQL_DELETE_SUGESTAO
+            params = [cod_sugestao, cod_medicao, cod_sensor]
+            affected_rows = self.executar_sql(sql, params, 'delete')
+            success = affected_rows > 0
+
+            if success:
+                logger.info(f"Sugestão {cod_sugestao} removida com sucesso")
+            elif self._existe_registro("T_APLICACOES", "cod_sugestao = :1 AND cod_medicao = :2 AND cod_sensor = :3", params):
+                logger.warning(
+                    f"Não é possível excluir a sugestão {cod_sugestao} pois existem aplicações associadas a ela.")
+            else:
+                logger.warning(f"Nenhuma sugestão encontrada com os códigos fornecidos")
+
+            return success
+
+        except Exception as e:
+            self._falha_tratada("Erro ao excluir sugestão", e)
+            return False
+        finally:
+            self.disconnect()
+
+    # Operações CRUD para T_APLICACOES
+
+    def create_aplicacao(self, cod_medicao: int, cod_sugestao: int, cod_sensor: int,
+                         cod_cultura: int, nm_produto_utilizado: str, valor_aplicacao: float,
+                         un_aplicacao: str, data_hora_aplicacao: str,
+                         nm_resp_aplicacao: str, documento_resp: str) -> int:
+        """
+        Insere uma nova aplicação no banco de dados.
+
+        Args:
+            cod_medicao: Código da medição associada
+            cod_sugestao: Código da sugestão associada
+            cod_sensor: Código do sensor associado
+            cod_cultura: Código da cultura associada
+            nm_produto_utilizado: Nome do produto utilizado
+            valor_aplicacao: Valor da aplicação
+            un_aplicacao: Unidade de medida (2 caracteres)
+            data_hora_aplicacao: Data e hora da aplicação (formato YYYY-MM-DD HH24:MI:SS)
+            nm_resp_aplicacao: Nome do responsável pela aplicação
+            documento_resp: Documento do responsável
+
+        Returns:
+            ID da aplicação inserida
+        """
+        self.connect()
+
+        try:
+            # Obtém o próximo código de aplicação
+            new_cod = self._proximo_codigo(SQL_PROXIMO_COD_APLICACAO)
+
+            # Datas ausentes seguem como NULL no mesmo comando compilado
+            self._inserir_registro("T_APLICACOES", {
+                "cod_medicao": cod_medicao,
+                "cod_sugestao": cod_sugestao,
+                "cod_sensor": cod_sensor,
+                "cod_cultura": cod_cultura,
+                "cod_aplicacao": new_cod,
+                "nm_produto_utilizado": nm_produto_utilizado,
+                "valor_aplicacao": valor_aplicacao,
+                "un_aplicacao": un_aplicacao,
+                "data_hora_aplicacao": data_hora_aplicacao,
+                "nm_resp_aplicacao": nm_resp_aplicacao,
+                "documento_resp": documento_resp
+            })
+            logger.info(f"Nova aplicação inserida com ID: {new_cod}")
+
+            return new_cod
+
+        except Exception as e:
+            logger.error(f"Erro ao criar aplicação: {e}")
+            raise
+        finally:
+            self.disconnect()
+
+    def read_aplicacao(self, cod_aplicacao: int = None, cod_medicao: int = None,
+                       cod_sugestao: int = None, cod_sensor: int = None) -> List[Dict[str, Any]]:
+        """
+        Recupera dados de aplicações do banco de dados.
+
+        Args:
+            cod_aplicacao: Código da aplicação (opcional)
+            cod_medicao: Código da medição (opcional)
+            cod_sugestao: Código da sugestão (opcional)
+            cod_sensor: Código do sensor (opcional)
+
+        Returns:
+            Lista de dicionários com os dados das aplicações
+        """
+        self.connect()
+
+        try:
+            if cod_aplicacao is not None:
+                result = self.executar_sql(SQL_SELECT_APLICACAO_POR_COD, [cod_aplicacao], 'select_all')
+            elif cod_medicao is not None and cod_sugestao is not None and cod_sensor is not None:
+                result = self.executar_sql(SQL_SELECT_APLICACOES_POR_SUGESTAO, [cod_medicao, cod_sugestao, cod_sensor], 'select_all')
+            else:
+                result = self.executar_sql(SQL_SELECT_APLICACOES, [], 'select_all')
+
+            return result
+
+        except Exception as e:
+            self._falha_tratada("Erro ao ler aplicação(ões)", e)
+            return []
+        finally:
+            self.disconnect()
+
+    def update_aplicacao(self, cod_aplicacao: int, cod_medicao: int, cod_sugestao: int,
+                         cod_sensor: int, **kwargs) -> bool:
+        """
+        Atualiza dados de uma aplicação existente.
+
+        Args:
+            cod_aplicacao: Código da aplicação a ser atualizada
+            cod_medicao: Código da medição associada
+            cod_sugestao: Código da sugestão associada
+            cod_sensor: Código do sensor associado
+            **kwargs: Pares chave-valor com os campos a serem atualizados
+
+        Returns:
+            True se a atualização foi bem-sucedida, False caso contrário
+        """
+        self.connect()
+
+        try:
+            # Campos fora das colunas atualizáveis de T_APLICACOES são ignorados
+            affected_rows = self._atualizar_registro("T_APLICACOES", {
+                "cod_aplicacao": cod_aplicacao,
+                "cod_medicao": cod_medicao,
+                "cod_sugestao": cod_sugestao,
+                "cod_sensor": cod_sensor
+            }, kwargs)
+            if affected_rows is None:
+                logger.warning("Nenhum campo válido fornecido para atualização")
+                return False
+
+            success = affected_rows > 0
+
+            if success:
+                logger.info(f"Aplicação {cod_aplicacao} atualizada com sucesso")
+            else:
+                logger.warning(f"Nenhuma aplicação encontrada com os códigos fornecidos")
+
+            return success
+
+        except Exception as e:
+            self._falha_tratada("Erro ao atualizar aplicação", e)
+            return False
+        finally:
+            self.disconnect()
+
+    def delete_aplicacao(self, cod_aplicacao: int, cod_medicao: int = None,
+                         cod_sugestao: int = None, cod_sensor: int = None) -> bool:
+        """
+        Remove uma aplicação do banco de dados.
+
+        Args:
+            cod_aplicacao: Código da aplicação a ser removida
+            cod_medicao: Código da medição associada (opcional)
+            cod_sugestao: Código da sugestão associada (opcional)
+            cod_sensor: Código do sensor associado (opcional)
+
+        Returns:
+            True se a remoção foi bem-sucedida, False caso contrário
+        """
+        self.connect()
+
+        try:
+            if cod_medicao is not None and cod_sugestao is not None and cod_sensor is not None:
+                sql = SQL_DELETE_APLICACAO_POR_CHAVE
+                params = [cod_aplicacao, cod_medicao, cod_sugestao, cod_sensor]
+            else:
+                sql = SQL_DELETE_APLICACAO_POR_COD
+                params = [cod_aplicacao]
+
+            affected_rows = self.executar_sql(sql, params, 'delete')
+            success = affected_rows > 0
+
+            if success:
+                logger.info(f"Aplicação {cod_aplicacao} removida com sucesso")
+            else:
+                logger.warning(f"Nenhuma aplicação encontrada com os códigos fornecidos")
+
+            return success
+
+        except Exception as e:
+            self._falha_tratada("Erro ao excluir aplicação", e)
+            return False
+        finally:
+            self.disconnect()
+
+    # Consultas analíticas
+
+    def get_medicoes_by_cultura(self, cod_cultura: int,
+                                data_inicio: Optional[Union[str, datetime]] = None,
+                                data_fim: Optional[Union[str, datetime]] = None) -> List[Dict[str, Any]]:
+        """
+        Recupera as medições associadas a uma cultura específica.
+
+        Args:
+            cod_cultura: Código da cultura
+            data_inicio: Início do período, inclusivo (opcional, formato YYYY-MM-DD [HH:MM:SS])
+            data_fim: Fim do período, exclusivo (opcional, formato YYYY-MM-DD [HH:MM:SS])
+
+        Returns:
+            Lista de dicionários com os dados das medições
+        """
+        self.connect()
+
+        try:
+            inicio = _converter_data_hora(data_inicio) or DATA_HORA_MINIMA
+            fim = _converter_data_hora(data_fim) or DATA_HORA_MAXIMA
+            result = self.executar_sql(SQL_MEDICOES_POR_CULTURA, [cod_cultura, inicio, fim], 'select_all')
+            return result
+
+        except Exception as e:
+            self._falha_tratada("Erro ao recuperar medições por cultura", e)
+            return []
+        finally:
+            self.disconnect()
+
+    def get_medicoes_recentes(self, dias: int = 7) -> List[Dict[str, Any]]:
+        """
+        Recupera as medições dos últimos dias (lê apenas as partições recentes).
+
+        Args:
+            dias: Tamanho da janela em dias
+
+        Returns:
+            Lista de dicionários com os dados das medições
+        """
+        self.connect()
+
+        try:
+            inicio = datetime.now() - timedelta(days=dias)
+            return self.executar_sql(SQL_MEDICOES_RECENTES, [inicio], 'select_all')
+
+        except Exception as e:
+            self._falha_tratada("Erro ao recuperar medições recentes", e)
+            return []
+        finally:
+            self.disconnect()
+
+    def get_aplicacoes_by_cultura(self, cod_cultura: int) -> List[Dict[str, Any]]:
+        """
+        Recupera todas as aplicações associadas a uma cultura específica.
+
+        Args:
+            cod_cultura: Código da cultura
+
+        Returns:
+            Lista de dicionários com os dados das aplicações
+        """
+        self.connect()
+
+        try:
+            result = self.executar_sql(SQL_APLICACOES_POR_CULTURA, [cod_cultura], 'select_all')
+            return result
+
+        except Exception as e:
+            self._falha_tratada("Erro ao recuperar aplicações por cultura", e)
+            return []
+        finally:
+            self.disconnect()
+
+    def get_sugestoes_by_sensor(self, cod_sensor: int) -> List[Dict[str, Any]]:
+        """
+        Recupera todas as sugestões associadas a um sensor específico.
+
+        Args:
+            cod_sensor: Código do sensor
+
+        Returns:
+            Lista de dicionários com os dados das sugestões
+        """
+        self.connect()
+
+        try:
+            result = self.executar_sql(SQL_SUGESTOES_POR_SENSOR, [cod_sensor], 'select_all')
+            return result
+
+        except Exception as e:
+            self._falha_tratada("Erro ao recuperar sugestões por sensor", e)
+            return []
+        finally:
+            self.disconnect()
+
+    # Verificação de planos de execução
+
+    def ler_colunar(self, sql: str, params: Optional[Union[List[Any], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Executa uma consulta analítica e retorna os resultados por coluna.
+
+        Os valores são sempre nativos. Com NumPy instalado, colunas numéricas e
+        de data viram arrays (float64/int64 e datetime64[us]); sem NumPy, listas.
+
+        Args:
+            sql: Consulta SQL (ex.: SQL_MEDICOES_POR_CULTURA)
+            params: Parâmetros da consulta
+
+        Returns:
+            Dicionário coluna -> array ou lista de valores
+        """
+        self.connect()
+
+        try:
+            self.cursor.arraysize = TAMANHO_ARRAY_COLUNAR
+            self.cursor.prefetchrows = TAMANHO_ARRAY_COLUNAR
+            self.cursor.execute(sql, params or [])
+            columns = [desc[0] for desc in self.cursor.description]
+            valores = list(zip(*self.cursor.fetchall())) or [()] * len(columns)
+
+            colunas = {}
+            for descricao, coluna in zip(self.cursor.description, valores):
+                tipo = descricao[1]
+                if np is not None and None not in coluna:
+                    if tipo is oracledb.DB_TYPE_NUMBER or tipo is oracledb.DB_TYPE_BINARY_DOUBLE:
+                        colunas[descricao[0]] = np.array(coluna)
+                        continue
+                    if getattr(tipo, "name", None) in FORMATOS_APRESENTACAO:
+                        colunas[descricao[0]] = np.array(coluna, dtype='datetime64[us]')
+                        continue
+                colunas[descricao[0]] = list(coluna)
+            return colunas
+
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}): {error.message}")
+            raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+        finally:
+            self.disconnect()
+
+    def verificar_planos_execucao(self, consultas: Dict[str, Tuple[str, bool]] = None) -> Dict[str, List[str]]:
+        """
+        Captura o plano de execução de cada comando do DAO e falha se houver full scan.
+
+        Usa EXPLAIN PLAN (sem executar os comandos) e considera full scan as
+        operações TABLE ACCESS FULL, INDEX FULL SCAN e INDEX FAST FULL SCAN.
+        Leituras de MIN/MAX pelo índice não são consideradas full scan.
+        As estatísticas das tabelas devem estar coletadas (DBMS_STATS) para que
+        o otimizador escolha os mesmos caminhos da produção.
+
+        Args:
+            consultas: Comandos a verificar no formato nome -> (sql, full scan permitido)
+                (opcional, padrão CONSULTAS_DAO e os comandos dos mapeadores)
+
+        Returns:
+            Dicionário nome -> linhas do plano de execução
+
+        Raises:
+            PlanoExecucaoError: Se algum comando não permitido fizer full scan
+        """
+        if consultas is None:
+            consultas = {**CONSULTAS_DAO, **consultas_mapeadores()}
+
+        planos = {}
+        violacoes = []
+        self.connect()
+
+        try:
+            for indice, (nome, (sql, permite_full_scan)) in enumerate(consultas.items(), 1):
+                statement_id = f"DAO_{indice}"
+                self.cursor.execute("DELETE FROM PLAN_TABLE WHERE statement_id = :1", [statement_id])
+                self.cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}")
+                self.cursor.execute("""
+                    SELECT depth, operation, options, object_name
+                    FROM PLAN_TABLE
+                    WHERE statement_id = :1
+                    ORDER BY id
+                """, [statement_id])
+
+                linhas = []
+                for depth, operation, options, object_name in self.cursor.fetchall():
+                    options = options or ""
+                    linhas.append(f"{'  ' * depth}{operation} {options} {object_name or ''}".rstrip())
+                    full_scan = ((operation == "TABLE ACCESS" and options.startswith("FULL"))
+                                 or (operation == "INDEX" and options in ("FULL SCAN", "FAST FULL SCAN")))
+                    if full_scan and not permite_full_scan:
+                        violacoes.append(f"{nome}: {operation} {options} {object_name}")
+                planos[nome] = linhas
+
+            self.conn.rollback()  # Descarta as linhas gravadas na PLAN_TABLE
+
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}) ao capturar planos: {error.message}")
+            raise DatabaseError(f"Falha ao capturar planos de execução (ORA-{error.code})") from e
+        finally:
+            self.disconnect()
+
+        if violacoes:
+            for violacao in violacoes:
+                logger.error(f"Full scan não permitido - {violacao}")
+            raise PlanoExecucaoError(f"{len(violacoes)} comando(s) do DAO com full scan: {'; '.join(violacoes)}")
+
+        logger.info(f"Planos de execução verificados: {len(planos)} comandos sem full scan indevido")
+        return planos
+
+
+# --- GERENCIADOR COMPARTILHADO ENTRE THREADS ---
+
+
+def niveis_dependencia(dependencias: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Agrupa as tabelas em níveis de carga (ordenação topológica por níveis).
+
+    Cada tabela fica em um nível posterior ao de todas as tabelas que ela referencia.
+
+    Args:
+        dependencias: Dicionário tabela -> tabelas referenciadas
+
+    Returns:
+        Lista de níveis, cada um com as tabelas que podem ser carregadas juntas
+
+    Raises:
+        ValidationError: Se houver dependência circular
+    """
+    pendentes = {tabela: set(pais) & set(dependencias) for tabela, pais in dependencias.items()}
+    niveis = []
+    while pendentes:
+        nivel = sorted(tabela for tabela, pais in pendentes.items() if not pais)
+        if not nivel:
+            raise ValidationError(f"Dependência circular entre as tabelas: {', '.join(sorted(pendentes))}")
+        niveis.append(nivel)
+        for tabela in nivel:
+            del pendentes[tabela]
+        for pais in pendentes.values():
+            pais.difference_update(nivel)
+    return niveis
+
+
+def dividir_arquivo_em_blocos(caminho: str, tamanho_bloco: int) -> List[Tuple[int, int]]:
+    """
+    Divide um CSV em intervalos de bytes alinhados a quebras de linha, após o cabeçalho.
+
+    Pressupõe que nenhum campo contenha quebra de linha entre aspas.
+
+    Args:
+        caminho: Caminho do arquivo
+        tamanho_bloco: Tamanho aproximado de cada bloco em bytes
+
+    Returns:
+        Lista de (início, fim) em bytes
+    """
+    tamanho = os.path.getsize(caminho)
+    blocos = []
+    with open(caminho, 'rb') as f:
+        f.readline()
+        inicio = f.tell()
+        while inicio < tamanho:
+            f.seek(min(inicio + tamanho_bloco, tamanho))
+            f.readline()
+            fim = min(f.tell(), tamanho)
+            blocos.append((inicio, fim))
+            inicio = fim
+    return blocos
+
+
+class AgricolaDatabaseManagerThreadSafe(AgricolaDatabaseManager):
+    """
+    Variante do AgricolaDatabaseManager que pode ser compartilhada entre threads.
+
+    A conexão, o cursor e o estado da transação ficam em armazenamento local
+    de cada thread (threading.local), então as chamadas connect()/disconnect()
+    de uma thread não alteram o estado das demais. As conexões vêm de um pool
+    (oracledb.create_pool) e são devolvidas a ele em disconnect().
+
+    Exemplo:
+        db = AgricolaDatabaseManagerThreadSafe(pool_max=8)
+        relatorio = db.relatorio_medicoes_por_cultura(max_workers=8)
+    """
+
+    def __init__(self, pool_min: int = 1, pool_max: int = 8, tipos_nativos: bool = False):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            pool_min: Conexões mantidas abertas no pool
+            pool_max: Máximo de conexões simultâneas (uma por thread ativa)
+            tipos_nativos: Ver AgricolaDatabaseManager
+        """
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self.pool = None
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        super().__init__(tipos_nativos)
+
+    # Estado por thread: substitui os atributos de instância da classe base
+
+    @property
+    def conn(self):
+        return getattr(self._local, "conn", None)
+
+    @conn.setter
+    def conn(self, valor):
+        self._local.conn = valor
+
+    @property
+    def cursor(self):
+        return getattr(self._local, "cursor", None)
+
+    @cursor.setter
+    def cursor(self, valor):
+        self._local.cursor = valor
+
+    @property
+    def _em_transacao(self):
+        return getattr(self._local, "em_transacao", False)
+
+    @_em_transacao.setter
+    def _em_transacao(self, valor):
+        self._local.em_transacao = valor
+
+    @property
+    def _transacao_falhou(self):
+        return getattr(self._local, "transacao_falhou", False)
+
+    @_transacao_falhou.setter
+    def _transacao_falhou(self, valor):
+        self._local.transacao_falhou = valor
+
+    def _obter_pool(self):
+        """Cria o pool de conexões na primeira utilização."""
+        with self._pool_lock:
+            if self.pool is None:
+                dsn = oracledb.makedsn(self.host, self.port, service_name=self.service_name)
+                self.pool = oracledb.create_pool(user=self.user, password=self.password, dsn=dsn,
+                                                 min=self.pool_min, max=self.pool_max, increment=1)
+                logger.info(f"Pool de conexões criado (min={self.pool_min}, max={self.pool_max})")
+            return self.pool
+
+    def connect(self):
+        """
+        Obtém uma conexão do pool para a thread atual.
+
+        Dentro de uma transação a conexão já obtida é mantida.
+        """
+        if self._em_transacao:
+            return
+        try:
+            self.conn = self._obter_pool().acquire()
+            self.conn.outputtypehandler = tratador_tipos_saida
+            self.cursor = self.conn.cursor()
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}): {error.message}")
+            raise DatabaseError(f"Falha na conexão com o banco de dados (ORA-{error.code})") from e
+
+    def disconnect(self):
+        """
+        Devolve a conexão da thread atual ao pool.
+
+        Dentro de uma transação a conexão só é devolvida ao final do bloco.
+        """
+        if self._em_transacao:
+            return
+        if self.conn:
+            if self.cursor:
+                self.cursor.close()
+            self.pool.release(self.conn)
+            self.conn = None
+            self.cursor = None
+
+    def fechar_pool(self):
+        """Fecha o pool de conexões (após o término de todas as threads)."""
+        with self._pool_lock:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+                logger.info("Pool de conexões encerrado")
+
+    def executar_em_paralelo(self, tarefas: List[Tuple[Callable, tuple]],
+                             max_workers: Optional[int] = None) -> List[Any]:
+        """
+        Executa chamadas independentes em um ThreadPoolExecutor.
+
+        Args:
+            tarefas: Lista de (método, argumentos), ex.: [(db.get_medicoes_by_cultura, (1,))]
+            max_workers: Número de threads (padrão: tamanho máximo do pool)
+
+        Returns:
+            Resultados na mesma ordem das tarefas
+
+        Raises:
+            Exception: A primeira exceção levantada por uma das tarefas
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or self.pool_max) as executor:
+            futuros = [executor.submit(metodo, *argumentos) for metodo, argumentos in tarefas]
+            return [futuro.result() for futuro in futuros]
+
+    def dependencias_fk(self, tabelas: List[str]) -> Dict[str, List[str]]:
+        """
+        Lê do dicionário de dados as chaves estrangeiras entre as tabelas informadas.
+
+        Args:
+            tabelas: Nomes das tabelas (maiúsculas)
+
+        Returns:
+            Dicionário tabela -> tabelas referenciadas (pais)
+        """
+        self.connect()
+        try:
+            self.cursor.execute("""
+                SELECT DISTINCT filha.table_name, pai.table_name
+                FROM user_constraints filha
+                JOIN user_constraints pai ON pai.constraint_name = filha.r_constraint_name
+                WHERE filha.constraint_type = 'R'
+            """)
+            dependencias = {tabela: [] for tabela in tabelas}
+            for filha, pai in self.cursor.fetchall():
+                if filha in dependencias and pai in dependencias and filha != pai:
+                    dependencias[filha].append(pai)
+            return dependencias
+        finally:
+            self.disconnect()
+
+    def _carregar_bloco(self, tabela: str, caminho: str, inicio: int, fim: int,
+                        tamanho_lote: int, sql: str, conversor: ConversorLinhaCSV) -> Tuple[int, int]:
+        """
+        Insere as linhas de um bloco do CSV (bytes [inicio, fim)) com executemany.
+
+        Linhas inválidas (ConversorLinhaCSV) ou rejeitadas pelo banco (batcherrors)
+        são registradas sem interromper o bloco.
+
+        Returns:
+            Tupla (linhas inseridas, linhas rejeitadas)
+        """
+        with open(caminho, 'rb') as f:
+            f.seek(inicio)
+            dados = f.read(fim - inicio).decode('utf-8')
+
+        linhas, rejeitadas = conversor.converter_lote(
+            [linha for linha in csv.reader(dados.splitlines()) if linha])
+
+        inseridas = 0
+        self.connect()
+        try:
+            for posicao in range(0, len(linhas), tamanho_lote):
+                lote = linhas[posicao:posicao + tamanho_lote]
+                self.cursor.setinputsizes(*conversor.tipos_bind())
+                self.cursor.executemany(sql, lote, batcherrors=True)
+                erros = self.cursor.getbatcherrors()
+                for erro in erros:
+                    logger.error(f"Erro ao inserir dados em {tabela}: {erro.message}")
+                    logger.error(f"Dados: {lote[erro.offset]}")
+                inseridas += len(lote) - len(erros)
+                rejeitadas += len(erros)
+            self.conn.commit()
+            return inseridas, rejeitadas
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}) ao carregar {tabela} [{inicio}:{fim}]: {error.message}")
+            self.conn.rollback()
+            raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+        finally:
+            self.disconnect()
+
+    def import_csv_paralelo(self, csv_dir: str, max_workers: Optional[int] = None,
+                            tamanho_bloco: int = TAMANHO_BLOCO_CSV,
+                            tamanho_lote: int = TAMANHO_LOTE_CSV, modo: str = "insert") -> Dict[str, Dict[str, int]]:
+        """
+        Importa os arquivos CSV em paralelo, respeitando as chaves estrangeiras.
+
+        As tabelas são agrupadas em níveis pelo grafo de dependências (FKs): as
+        tabelas de um mesmo nível, e os blocos de cada arquivo, são carregados
+        ao mesmo tempo em conexões do pool; um nível só começa depois que todos
+        os blocos do nível anterior foram confirmados.
+
+        Args:
+            csv_dir: Diretório contendo os arquivos <tabela>.csv
+            max_workers: Número de threads (padrão: tamanho máximo do pool)
+            tamanho_bloco: Tamanho aproximado, em bytes, de cada bloco de arquivo
+            tamanho_lote: Linhas por chamada de executemany
+            modo: 'insert' (padrão) ou 'merge' (upsert pela chave primária)
+
+        Returns:
+            Dicionário tabela -> {'inseridas': n, 'rejeitadas': n}
+        """
+        esquema = carregar_esquema_ddl()
+        arquivos = {}
+        for nome in sorted(os.listdir(csv_dir)):
+            if nome.lower().endswith('.csv'):
+                arquivos[os.path.splitext(nome)[0].upper()] = os.path.join(csv_dir, nome)
+
+        resumo = {}
+        for nivel in niveis_dependencia(self.dependencias_fk(list(arquivos))):
+            tarefas = []
+            for tabela in nivel:
+                with open(arquivos[tabela], 'rb') as f:
+                    cabecalho = next(csv.reader([f.readline().decode('utf-8')]))
+                sql = montar_comando_importacao(tabela, cabecalho, esquema, modo)
+                conversor = ConversorLinhaCSV(tabela, cabecalho, esquema)
+                for inicio, fim in dividir_arquivo_em_blocos(arquivos[tabela], tamanho_bloco):
+                    tarefas.append((tabela, (self._carregar_bloco, (tabela, arquivos[tabela], inicio, fim,
+                                                                    tamanho_lote, sql, conversor))))
+            logger.info(f"Carregando nível {', '.join(nivel)} em {len(tarefas)} blocos")
+
+            # Barreira: executar_em_paralelo só retorna após todos os blocos do nível
+            resultados = self.executar_em_paralelo([tarefa for _, tarefa in tarefas], max_workers)
+            for (tabela, _), (inseridas, rejeitadas) in zip(tarefas, resultados):
+                totais = resumo.setdefault(tabela, {'inseridas': 0, 'rejeitadas': 0})
+                totais['inseridas'] += inseridas
+                totais['rejeitadas'] += rejeitadas
+
+        for tabela, totais in resumo.items():
+            logger.info(f"Dados importados para a tabela {tabela}: {totais['inseridas']} linhas, "
+                        f"{totais['rejeitadas']} rejeitadas")
+        return resumo
+
+    def _consultar(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Executa uma consulta em conexão própria sem tratar o erro, para que uma
+        falha chegue a executar_em_paralelo em vez de virar uma lista vazia.
+
+        Raises:
+            DatabaseError: Em caso de falha na consulta
+        """
+        self.connect()
+        try:
+            return self.executar_sql(sql, params, 'select_all')
+        finally:
+            self.disconnect()
+
+    def relatorio_medicoes_por_cultura(self, max_workers: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Consulta as medições de todas as culturas em paralelo.
 
         Args:
-            cod_sugestao: Código da sugestão a ser removida
-            cod_medicao: Código da medição associada
-            cod_sensor: Código do sensor associado
+            max_workers: Número de threads (padrão: tamanho máximo do pool)
 
         Returns:
-            True se a remoção foi bem-sucedida, False caso contrário
+            Dicionário cod_cultura -> lista de medições
+
+        Raises:
+            DatabaseError: Se a consulta de alguma cultura falhar
         """
-        self.connect()
+        culturas = [cultura['COD_CULTURA'] for cultura in self._consultar(SQL_SELECT_CULTURAS, [])]
+        periodo = [DATA_HORA_MINIMA, DATA_HORA_MAXIMA]
+        resultados = self.executar_em_paralelo(
+            [(self._consultar, (SQL_MEDICOES_POR_CULTURA, [cod_cultura, *periodo])) for cod_cultura in culturas],
+            max_workers)
+        return dict(zip(culturas, resultados))
+
+
+# --- MIGRAÇÕES DE ESQUEMA ---
+# Colunas ampliadas pela migração 1: (tabela, coluna, precisão, escala)
+COLUNAS_AMPLIADAS = [
+    ("T_CULTURAS", "COD_CULTURA", *PRECISAO_CODIGO),
+    ("T_SENSORES", "COD_SENSOR", *PRECISAO_CODIGO),
+    ("T_SENSORES", "COD_CULTURA", *PRECISAO_CODIGO),
+    ("T_SENSORES", "VALOR_MINIMO", *PRECISAO_VALOR),
+    ("T_SENSORES", "VALOR_MAXIMO", *PRECISAO_VALOR),
+    ("T_MEDICOES", "COD_MEDICAO", *PRECISAO_CODIGO),
+    ("T_MEDICOES", "COD_SENSOR", *PRECISAO_CODIGO),
+    ("T_MEDICOES", "VALOR_MEDICAO", *PRECISAO_VALOR),
+    ("T_SUGESTOES", "COD_MEDICAO", *PRECISAO_CODIGO),
+    ("T_SUGESTOES", "COD_SUGESTAO", *PRECISAO_CODIGO),
+    ("T_SUGESTOES", "COD_SENSOR", *PRECISAO_CODIGO),
+    ("T_SUGESTOES", "VALOR_SUGESTAO", *PRECISAO_VALOR),
+    ("T_APLICACOES", "COD_MEDICAO", *PRECISAO_CODIGO),
+    ("T_APLICACOES", "COD_SUGESTAO", *PRECISAO_CODIGO),
+    ("T_APLICACOES", "COD_SENSOR", *PRECISAO_CODIGO),
+    ("T_APLICACOES", "COD_CULTURA", *PRECISAO_CODIGO),
+    ("T_APLICACOES", "COD_APLICACAO", *PRECISAO_CODIGO),
+    ("T_APLICACOES", "VALOR_APLICACAO", *PRECISAO_VALOR)
+]
+
+
+SQL_PARTICIONAR_MEDICOES = """
+ALTER TABLE T_MEDICOES MODIFY
+    PARTITION BY RANGE (data_hora_medicao) INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+    (PARTITION P_MED_INICIAL VALUES LESS THAN (TIMESTAMP '2024-01-01 00:00:00'))
+    ONLINE UPDATE INDEXES (IDX_MED_SENS_DATA LOCAL)
+"""
 
-        try:
-            # Verifica se existem aplicações associadas a esta sugestão
-            sql_check = """SELECT COUNT(*) FROM T_APLICACOES 
-                         WHERE cod_sugestao = :1 AND cod_medicao = :2 AND cod_sensor = :3"""
-            self.cursor.execute(sql_check, [cod_sugestao, cod_medicao, cod_sensor])
-            if self.cursor.fetchone()[0] > 0:
-                logger.warning(
-                    f"Não é possível excluir a sugestão {cod_sugestao} pois existem aplicações associadas a ela.")
-                return False
+# Bases criadas antes do índice no DDL: criado (não particionado) antes da migração 2,
+# que o converte em índice local
+SQL_CRIAR_IDX_MED_SENS_DATA = """
+CREATE INDEX IDX_MED_SENS_DATA ON T_MEDICOES
+    (cod_sensor, data_hora_medicao, cod_medicao, valor_medicao, un_medicao) ONLINE
+"""
 
-            # Remove a sugestão
-            sql = """DELETE FROM T_SUGESTOES 
-                   WHERE cod_sugestao = :1 AND cod_medicao = :2 AND cod_sensor = :3"""
-            affected_rows = self.executar_sql(sql, [cod_sugestao, cod_medicao, cod_sensor], 'delete')
-            success = affected_rows > 0
 
-            if success:
-                logger.info(f"Sugestão {cod_sugestao} removida com sucesso")
-            else:
-                logger.warning(f"Nenhuma sugestão encontrada com os códigos fornecidos")
+class MigradorEsquema:
+    """
+    Aplica migrações de esquema versionadas sem bloqueios longos das tabelas.
 
-            return success
+    As versões aplicadas são registradas em T_MIGRACOES. Cada migração é um
+    método desta classe registrado em MIGRACOES. Após cada migração, a
+    quantidade de linhas e o checksum (ORA_HASH) das tabelas afetadas são
+    comparados com os valores anteriores.
+    """
 
-        except Exception as e:
-            logger.error(f"Erro ao excluir sugestão: {e}")
-            return False
-        finally:
-            self.disconnect()
+    # Migrações disponíveis, em ordem: (versão, descrição, método)
+    MIGRACOES = [
+        (1, "Amplia chaves NUMBER(3) e valores NUMBER(5,2)", "ampliar_colunas_numericas"),
+        (2, "Particiona T_MEDICOES por mês (data_hora_medicao)", "particionar_medicoes"),
+        (3, "Chave natural de T_MEDICOES (cod_sensor, data_hora_medicao)", "criar_chave_natural_medicoes"),
+        (4, "Sequências dos códigos de culturas, sensores, sugestões e aplicações", "criar_sequencias_codigos"),
+    ]
 
-    # Operações CRUD para T_APLICACOES
+    # Sequência -> (tabela, coluna) de cada código gerado pelos create_* (migração 4)
+    SEQUENCIAS_CODIGOS = {
+        "SEQ_CULTURAS": ("T_CULTURAS", "cod_cultura"),
+        "SEQ_SENSORES": ("T_SENSORES", "cod_sensor"),
+        "SEQ_SUGESTOES": ("T_SUGESTOES", "cod_sugestao"),
+        "SEQ_APLICACOES": ("T_APLICACOES", "cod_aplicacao"),
+    }
 
-    def create_aplicacao(self, cod_medicao: int, cod_sugestao: int, cod_sensor: int,
-                         cod_cultura: int, nm_produto_utilizado: str, valor_aplicacao: float,
-                         un_aplicacao: str, data_hora_aplicacao: str,
-                         nm_resp_aplicacao: str, documento_resp: str) -> int:
+    def __init__(self, db: AgricolaDatabaseManager, tamanho_lote: int = 10000, ddl_lock_timeout: int = 30):
         """
-        Insere uma nova aplicação no banco de dados.
+        Inicializa o migrador.
 
         Args:
-            cod_medicao: Código da medição associada
-            cod_sugestao: Código da sugestão associada
-            cod_sensor: Código do sensor associado
-            cod_cultura: Código da cultura associada
-            nm_produto_utilizado: Nome do produto utilizado
-            valor_aplicacao: Valor da aplicação
-            un_aplicacao: Unidade de medida (2 caracteres)
-            data_hora_aplicacao: Data e hora da aplicação (formato YYYY-MM-DD HH24:MI:SS)
-            nm_resp_aplicacao: Nome do responsável pela aplicação
-            documento_resp: Documento do responsável
-
-        Returns:
-            ID da aplicação inserida
+            db: Gerenciador usado para obter a conexão
+            tamanho_lote: Linhas atualizadas por lote (um commit por lote) nos backfills
+            ddl_lock_timeout: Segundos que cada DDL aguarda por bloqueios em vez de falhar
         """
-        self.connect()
+        self.db = db
+        self.tamanho_lote = tamanho_lote
+        self.ddl_lock_timeout = ddl_lock_timeout
 
-        try:
-            # Obtém o próximo código de aplicação
-            self.cursor.execute("SELECT NVL(MAX(cod_aplicacao), 0) + 1 FROM T_APLICACOES")
-            new_cod = self.cursor.fetchone()[0]
-
-            # Insere a nova aplicação com tratamento adequado para a data
-            if data_hora_aplicacao is not None:
-                sql = """
-                INSERT INTO T_APLICACOES (
-                    cod_medicao, cod_sugestao, cod_sensor, cod_cultura, cod_aplicacao,
-                    nm_produto_utilizado, valor_aplicacao, un_aplicacao, data_hora_aplicacao,
-                    nm_resp_aplicacao, documento_resp
-                ) VALUES (
-                    :1, :2, :3, :4, :5, :6, :7, :8, TO_TIMESTAMP(:9, 'YYYY-MM-DD HH24:MI:SS'), :10, :11
-                )
-                """
-                params = [
-                    cod_medicao, cod_sugestao, cod_sensor, cod_cultura, new_cod,
-                    nm_produto_utilizado, valor_aplicacao, un_aplicacao, data_hora_aplicacao,
-                    nm_resp_aplicacao, documento_resp
-                ]
-            else:
-                sql = """
-                INSERT INTO T_APLICACOES (
-                    cod_medicao, cod_sugestao, cod_sensor, cod_cultura, cod_aplicacao,
-                    nm_produto_utilizado, valor_aplicacao, un_aplicacao, data_hora_aplicacao,
-                    nm_resp_aplicacao, documento_resp
-                ) VALUES (
-                    :1, :2, :3, :4, :5, :6, :7, :8, NULL, :9, :10
-                )
-                """
-                params = [
-                    cod_medicao, cod_sugestao, cod_sensor, cod_cultura, new_cod,
-                    nm_produto_utilizado, valor_aplicacao, un_aplicacao,
-                    nm_resp_aplicacao, documento_resp
-                ]
-
-            self.executar_sql(sql, params, 'insert')
-            logger.info(f"Nova aplicação inserida com ID: {new_cod}")
+    def _executar(self, sql: str, params: Optional[Union[List[Any], Dict[str, Any]]] = None) -> int:
+        """
+        Executa um comando (DDL ou DML) na conexão do gerenciador.
 
-            return new_cod
+        Args:
+            sql: Comando SQL
+            params: Parâmetros do comando (opcional)
 
-        except Exception as e:
-            logger.error(f"Erro ao criar aplicação: {e}")
-            raise
-        finally:
-            self.disconnect()
+        Returns:
+            Número de linhas afetadas
 
-    def read_aplicacao(self, cod_aplicacao: int = None, cod_medicao: int = None,
-                       cod_sugestao: int = None, cod_sensor: int = None) -> List[Dict[str, Any]]:
+        Raises:
+            MigracaoError: Em caso de falha
         """
-        Recupera dados de aplicações do banco de dados.
+        try:
+            self.db.cursor.execute(sql, params or [])
+            return self.db.cursor.rowcount
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}) em '{sql.strip()}': {error.message}")
+            raise MigracaoError(f"Falha na migração (ORA-{error.code})") from e
 
-        Args:
-            cod_aplicacao: Código da aplicação (opcional)
-            cod_medicao: Código da medição (opcional)
-            cod_sugestao: Código da sugestão (opcional)
-            cod_sensor: Código do sensor (opcional)
+    def _consultar(self, sql: str, params: Optional[List[Any]] = None) -> List[Tuple]:
+        """Executa uma consulta e retorna todas as linhas."""
+        self._executar(sql, params)
+        return self.db.cursor.fetchall()
 
-        Returns:
-            Lista de dicionários com os dados das aplicações
+    def versoes_aplicadas(self) -> List[int]:
         """
-        self.connect()
+        Retorna as versões já registradas em T_MIGRACOES, criando a tabela se necessário.
 
-        try:
-            base_sql = """
-            SELECT cod_medicao, cod_sugestao, cod_sensor, cod_cultura, cod_aplicacao,
-                   nm_produto_utilizado, valor_aplicacao, un_aplicacao, 
-                   TO_CHAR(data_hora_aplicacao, 'YYYY-MM-DD HH24:MI:SS') as data_hora_aplicacao,
-                   nm_resp_aplicacao, documento_resp
-            FROM T_APLICACOES
-            """
+        Returns:
+            Lista de versões aplicadas
+        """
+        if not self._consultar("SELECT 1 FROM user_tables WHERE table_name = 'T_MIGRACOES'"):
+            self._executar("""
+                CREATE TABLE T_MIGRACOES (
+                    versao         NUMBER(5)     NOT NULL PRIMARY KEY,
+                    descricao      VARCHAR2(100) NOT NULL,
+                    data_aplicacao TIMESTAMP     DEFAULT SYSTIMESTAMP NOT NULL
+                )
+            """)
+        return [versao for versao, in self._consultar("SELECT versao FROM T_MIGRACOES ORDER BY versao")]
 
-            if cod_aplicacao is not None:
-                sql = f"{base_sql} WHERE cod_aplicacao = :1"
-                params = [cod_aplicacao]
-                result = self.executar_sql(sql, params, 'select_all')
-            elif cod_medicao is not None and cod_sugestao is not None and cod_sensor is not None:
-                sql = f"{base_sql} WHERE cod_medicao = :1 AND cod_sugestao = :2 AND cod_sensor = :3"
-                params = [cod_medicao, cod_sugestao, cod_sensor]
-                result = self.executar_sql(sql, params, 'select_all')
-            else:
-                sql = base_sql
-                result = self.executar_sql(sql, [], 'select_all')
+    def aplicar_migracoes(self) -> List[int]:
+        """
+        Aplica, em ordem, as migrações ainda não registradas.
 
-            return result
+        Returns:
+            Lista das versões aplicadas nesta execução
 
-        except Exception as e:
-            logger.error(f"Erro ao ler aplicação(ões): {e}")
-            return []
+        Raises:
+            MigracaoError: Se alguma migração ou verificação falhar
+        """
+        self.db.connect()
+        aplicadas = []
+        try:
+            # DDLs aguardam bloqueios por alguns segundos em vez de falhar com ORA-00054
+            self._executar(f"ALTER SESSION SET ddl_lock_timeout = {int(self.ddl_lock_timeout)}")
+            ja_aplicadas = self.versoes_aplicadas()
+
+            for versao, descricao, metodo in self.MIGRACOES:
+                if versao in ja_aplicadas:
+                    continue
+                logger.info(f"Aplicando migração {versao}: {descricao}")
+                getattr(self, metodo)()
+                self._executar("INSERT INTO T_MIGRACOES (versao, descricao) VALUES (:1, :2)", [versao, descricao])
+                self.db.conn.commit()
+                aplicadas.append(versao)
+                logger.info(f"Migração {versao} concluída")
+
+            return aplicadas
         finally:
-            self.disconnect()
+            self.db.disconnect()
 
-    def update_aplicacao(self, cod_aplicacao: int, cod_medicao: int, cod_sugestao: int,
-                         cod_sensor: int, **kwargs) -> bool:
+    def capturar_verificacao(self, tabela: str, excluir_colunas: Tuple[str, ...] = ()) -> Tuple[int, int]:
         """
-        Atualiza dados de uma aplicação existente.
+        Calcula a quantidade de linhas e um checksum do conteúdo de uma tabela.
 
         Args:
-            cod_aplicacao: Código da aplicação a ser atualizada
-            cod_medicao: Código da medição associada
-            cod_sugestao: Código da sugestão associada
-            cod_sensor: Código do sensor associado
-            **kwargs: Pares chave-valor com os campos a serem atualizados
+            tabela: Nome da tabela
+            excluir_colunas: Colunas ignoradas no checksum (ex.: a coluna em conversão)
 
         Returns:
-            True se a atualização foi bem-sucedida, False caso contrário
+            Tupla (quantidade de linhas, checksum)
         """
-        self.connect()
+        colunas = [coluna for coluna, in self._consultar(
+            "SELECT column_name FROM user_tab_columns WHERE table_name = :1 ORDER BY column_id", [tabela])
+                   if coluna not in excluir_colunas]
+        expressao = " || '|' || ".join(f"TO_CHAR({coluna})" for coluna in colunas)
+        quantidade, checksum = self._consultar(f"SELECT COUNT(*), NVL(SUM(ORA_HASH({expressao})), 0) FROM {tabela}")[0]
+        return quantidade, checksum
+
+    def verificar_integridade(self, antes: Dict[str, Tuple[int, int]], depois: Dict[str, Tuple[int, int]]) -> None:
+        """
+        Compara quantidades de linhas e checksums capturados antes e depois de uma migração.
 
-        try:
-            # Campos válidos para atualização
-            valid_fields = [
-                'cod_cultura', 'nm_produto_utilizado', 'valor_aplicacao',
-                'un_aplicacao', 'data_hora_aplicacao', 'nm_resp_aplicacao',
-                'documento_resp'
-            ]
-
-            # Filtra apenas os campos válidos
-            update_fields = []
-            params = []
-            param_index = 1
-
-            for field, value in kwargs.items():
-                if field in valid_fields and value is not None:
-                    # Tratamento especial para campos de data
-                    if field == 'data_hora_aplicacao':
-                        update_fields.append(f"{field} = TO_TIMESTAMP(:{param_index}, 'YYYY-MM-DD HH24:MI:SS')")
-                    else:
-                        update_fields.append(f"{field} = :{param_index}")
-                    params.append(value)
-                    param_index += 1
-                elif field in valid_fields and value == "":  # Caso especial para limpar campos
-                    if field == 'data_hora_aplicacao':
-                        update_fields.append(f"{field} = NULL")
-                        # Não adiciona parâmetro para NULL
-
-            if not update_fields:
-                logger.warning("Nenhum campo válido fornecido para atualização")
-                return False
+        Raises:
+            MigracaoError: Se alguma tabela divergir
+        """
+        divergentes = [tabela for tabela in antes if antes[tabela] != depois.get(tabela)]
+        if divergentes:
+            for tabela in divergentes:
+                logger.error(f"Verificação de {tabela}: antes {antes[tabela]}, depois {depois.get(tabela)}")
+            raise MigracaoError(f"Verificação pós-migração falhou em: {', '.join(divergentes)}")
+        logger.info(f"Verificação pós-migração OK: {antes}")
+
+    def ampliar_colunas_numericas(self) -> None:
+        """
+        Migração 1: amplia as chaves para NUMBER(10) e os valores para NUMBER(10,2).
 
-            # Adiciona os códigos como últimos parâmetros
-            params.append(cod_aplicacao)
-            params.append(cod_medicao)
-            params.append(cod_sugestao)
-            params.append(cod_sensor)
+        Aumentar a precisão de uma coluna NUMBER mantendo a escala é uma alteração
+        apenas de dicionário no Oracle: não reescreve linhas, não invalida as
+        constraints nem os índices e mantém o bloqueio exclusivo por instantes.
+        Alterações que não sejam ampliações usam migrar_coluna_em_lotes().
+        """
+        tabelas = sorted({tabela for tabela, _, _, _ in COLUNAS_AMPLIADAS})
+        antes = {tabela: self.capturar_verificacao(tabela) for tabela in tabelas}
+
+        for tabela, coluna, precisao, escala in COLUNAS_AMPLIADAS:
+            linhas = self._consultar(
+                "SELECT data_precision, data_scale FROM user_tab_columns WHERE table_name = :1 AND column_name = :2",
+                [tabela, coluna])
+            if not linhas:
+                raise MigracaoError(f"Coluna {tabela}.{coluna} não encontrada")
+            precisao_atual, escala_atual = linhas[0]
+
+            if precisao_atual is not None and precisao_atual >= precisao and (escala_atual or 0) == escala:
+                logger.info(f"{tabela}.{coluna} já é NUMBER({precisao_atual},{escala_atual})")
+            elif precisao_atual is not None and (escala_atual or 0) == escala:
+                self._executar(f"ALTER TABLE {tabela} MODIFY ({coluna} NUMBER({precisao},{escala}))")
+                logger.info(f"{tabela}.{coluna}: NUMBER({precisao_atual},{escala_atual}) -> NUMBER({precisao},{escala})")
+            else:
+                self.migrar_coluna_em_lotes(tabela, coluna, f"NUMBER({precisao},{escala})")
 
-            sql = f"""UPDATE T_APLICACOES 
-                   SET {', '.join(update_fields)} 
-                   WHERE cod_aplicacao = :{param_index} AND cod_medicao = :{param_index + 1} 
-                   AND cod_sugestao = :{param_index + 2} AND cod_sensor = :{param_index + 3}"""
+        depois = {tabela: self.capturar_verificacao(tabela) for tabela in tabelas}
+        self.verificar_integridade(antes, depois)
 
-            affected_rows = self.executar_sql(sql, params, 'update')
-            success = affected_rows > 0
+    def particionar_medicoes(self) -> None:
+        """
+        Migração 2: particiona T_MEDICOES por intervalo mensal de data_hora_medicao.
 
-            if success:
-                logger.info(f"Aplicação {cod_aplicacao} atualizada com sucesso")
-            else:
-                logger.warning(f"Nenhuma aplicação encontrada com os códigos fornecidos")
+        Colunas TIMESTAMP WITH LOCAL TIME ZONE não podem ser chave de partição
+        por intervalo, por isso a coluna é antes convertida para TIMESTAMP pela
+        coluna sombra. A conversão da tabela usa MODIFY PARTITION BY ... ONLINE
+        (Oracle 12.2 ou superior), sem bloquear as escritas.
+        """
+        tipo = self._consultar(
+            "SELECT data_type FROM user_tab_columns WHERE table_name = 'T_MEDICOES' "
+            "AND column_name = 'DATA_HORA_MEDICAO'")[0][0]
+        if "TIME ZONE" in tipo:
+            self.migrar_coluna_em_lotes("T_MEDICOES", "DATA_HORA_MEDICAO", "TIMESTAMP",
+                                        expressao="CAST({coluna} AS TIMESTAMP)")
+
+        if self._consultar("SELECT 1 FROM user_part_tables WHERE table_name = 'T_MEDICOES'"):
+            logger.info("T_MEDICOES já é particionada")
+        else:
+            if not self._consultar("SELECT 1 FROM user_indexes WHERE index_name = 'IDX_MED_SENS_DATA'"):
+                self._executar(SQL_CRIAR_IDX_MED_SENS_DATA)
+            antes = {"T_MEDICOES": self.capturar_verificacao("T_MEDICOES")}
+            self._executar(SQL_PARTICIONAR_MEDICOES)
+            depois = {"T_MEDICOES": self.capturar_verificacao("T_MEDICOES")}
+            self.verificar_integridade(antes, depois)
+
+        # Sem ROW MOVEMENT, mudar data_hora_medicao para outro mês falha com ORA-14402
+        if self._consultar("SELECT 1 FROM user_tables WHERE table_name = 'T_MEDICOES' "
+                           "AND row_movement = 'DISABLED'"):
+            self._executar("ALTER TABLE T_MEDICOES ENABLE ROW MOVEMENT")
+
+    def criar_chave_natural_medicoes(self) -> None:
+        """
+        Migração 3: índice único (cod_sensor, data_hora_medicao) e sequência SEQ_MEDICOES.
 
-            return success
+        A migração falha, sem alterar nada, se já houver medições repetidas para
+        o mesmo sensor e instante; elas precisam ser tratadas antes.
+        """
+        duplicadas = self._consultar("""
+            SELECT COUNT(*) FROM (
+                SELECT cod_sensor, data_hora_medicao FROM T_MEDICOES
+                GROUP BY cod_sensor, data_hora_medicao HAVING COUNT(*) > 1
+            )
+        """)[0][0]
+        if duplicadas:
+            raise MigracaoError(f"{duplicadas} pares (cod_sensor, data_hora_medicao) repetidos em T_MEDICOES")
+
+        if not self._consultar("SELECT 1 FROM user_indexes WHERE index_name = 'UN_MED_SENS_DATA'"):
+            self._executar("CREATE UNIQUE INDEX UN_MED_SENS_DATA ON T_MEDICOES (cod_sensor, data_hora_medicao) "
+                           "LOCAL ONLINE")
+        if not self._consultar("SELECT 1 FROM user_sequences WHERE sequence_name = 'SEQ_MEDICOES'"):
+            inicio = self._consultar("SELECT NVL(MAX(cod_medicao), 0) + 1 FROM T_MEDICOES")[0][0]
+            self._executar(f"CREATE SEQUENCE SEQ_MEDICOES START WITH {inicio} CACHE 1000")
+
+    def criar_sequencias_codigos(self) -> None:
+        """
+        Migração 4: sequências dos códigos gerados pelos create_* (antes MAX + 1).
 
-        except Exception as e:
-            logger.error(f"Erro ao atualizar aplicação: {e}")
-            return False
-        finally:
-            self.disconnect()
+        Cada sequência começa após o maior código existente na tabela.
+        """
+        for sequencia, (tabela, coluna) in self.SEQUENCIAS_CODIGOS.items():
+            if self._consultar("SELECT 1 FROM user_sequences WHERE sequence_name = :1", [sequencia]):
+                continue
+            inicio = self._consultar(f"SELECT NVL(MAX({coluna}), 0) + 1 FROM {tabela}")[0][0]
+            self._executar(f"CREATE SEQUENCE {sequencia} START WITH {inicio}")
 
-    def delete_aplicacao(self, cod_aplicacao: int, cod_medicao: int = None,
-                         cod_sugestao: int = None, cod_sensor: int = None) -> bool:
+    def migrar_coluna_em_lotes(self, tabela: str, coluna: str, novo_tipo: str,
+                               expressao: str = "{coluna}") -> None:
         """
-        Remove uma aplicação do banco de dados.
+        Converte uma coluna para um novo tipo com backfill em lotes (coluna sombra).
 
-        Args:
-            cod_aplicacao: Código da aplicação a ser removida
-            cod_medicao: Código da medição associada (opcional)
-            cod_sugestao: Código da sugestão associada (opcional)
-            cod_sensor: Código do sensor associado (opcional)
+        Fluxo:
+        1. Adiciona a coluna sombra e um trigger que a mantém sincronizada
+           com as escritas da aplicação durante a migração
+        2. Preenche a coluna sombra em lotes, com um commit por lote
+        3. Verifica a cópia e troca as colunas por RENAME (bloqueio instantâneo)
+        4. Recria os índices da coluna original sobre a nova coluna (ONLINE)
 
-        Returns:
-            True se a remoção foi bem-sucedida, False caso contrário
+        Args:
+            tabela: Nome da tabela
+            coluna: Nome da coluna
+            novo_tipo: Tipo Oracle da nova coluna (ex.: 'TIMESTAMP')
+            expressao: Conversão do valor antigo, com {coluna} no lugar da coluna de origem
         """
-        self.connect()
+        sombra = f"{coluna[:24]}_NOVO"
+        antiga = f"{coluna[:24]}_ANT"
+        gatilho = f"TRG_MIG_{tabela[:20]}"
+
+        # Índices e obrigatoriedade da coluna original, recriados após a troca
+        indices = [ddl.read() if hasattr(ddl, "read") else ddl for ddl, in self._consultar("""
+            SELECT DBMS_METADATA.GET_DDL('INDEX', i.index_name)
+            FROM user_indexes i
+            WHERE i.table_name = :1
+              AND i.index_name IN (SELECT index_name FROM user_ind_columns WHERE table_name = :1 AND column_name = :2)
+              AND i.index_name NOT IN (SELECT index_name FROM user_constraints
+                                       WHERE table_name = :1 AND index_name IS NOT NULL)
+        """, [tabela, coluna])]
+        obrigatoria = self._consultar(
+            "SELECT nullable FROM user_tab_columns WHERE table_name = :1 AND column_name = :2",
+            [tabela, coluna])[0][0] == "N"
+        antes = self.capturar_verificacao(tabela, excluir_colunas=(coluna,))
+
+        self._executar(f"ALTER TABLE {tabela} ADD ({sombra} {novo_tipo})")
+        self._executar(f"""
+            CREATE OR REPLACE TRIGGER {gatilho}
+            BEFORE INSERT OR UPDATE OF {coluna} ON {tabela}
+            FOR EACH ROW
+            BEGIN
+                :NEW.{sombra} := {expressao.format(coluna=f':NEW.{coluna}')};
+            END;
+        """)
+
+        total = 0
+        while True:
+            atualizadas = self._executar(f"""
+                UPDATE {tabela} SET {sombra} = {expressao.format(coluna=coluna)}
+                WHERE {sombra} IS NULL AND {coluna} IS NOT NULL AND ROWNUM <= :1
+            """, [self.tamanho_lote])
+            self.db.conn.commit()
+            total += atualizadas
+            if atualizadas < self.tamanho_lote:
+                break
+        logger.info(f"{tabela}.{coluna}: {total} linhas copiadas para {sombra}")
+
+        pendentes = self._consultar(
+            f"SELECT COUNT(*) FROM {tabela} WHERE {sombra} IS NULL AND {coluna} IS NOT NULL")[0][0]
+        if pendentes:
+            raise MigracaoError(f"{tabela}.{coluna}: {pendentes} linhas não copiadas")
+
+        self._executar(f"ALTER TABLE {tabela} RENAME COLUMN {coluna} TO {antiga}")
+        self._executar(f"ALTER TABLE {tabela} RENAME COLUMN {sombra} TO {coluna}")
+        self._executar(f"DROP TRIGGER {gatilho}")
+        if obrigatoria:
+            self._executar(f"ALTER TABLE {tabela} MODIFY ({coluna} NOT NULL ENABLE NOVALIDATE)")
+        self._executar(f"ALTER TABLE {tabela} SET UNUSED ({antiga})")
+
+        for ddl in indices:
+            self._executar(f"{ddl.strip().rstrip(';')} ONLINE")
+
+        depois = self.capturar_verificacao(tabela, excluir_colunas=(coluna,))
+        self.verificar_integridade({tabela: antes}, {tabela: depois})
+
+
+def migrar_esquema() -> int:
+    """
+    Aplica as migrações de esquema pendentes.
 
-        try:
-            if cod_medicao is not None and cod_sugestao is not None and cod_sensor is not None:
-                sql = """DELETE FROM T_APLICACOES 
-                       WHERE cod_aplicacao = :1 AND cod_medicao = :2 AND cod_sugestao = :3 AND cod_sensor = :4"""
-                params = [cod_aplicacao, cod_medicao, cod_sugestao, cod_sensor]
-            else:
-                sql = "DELETE FROM T_APLICACOES WHERE cod_aplicacao = :1"
-                params = [cod_aplicacao]
+    Uso: python Fase3_Cap1_Ent2_CRUD.py --migrar
 
-            affected_rows = self.executar_sql(sql, params, 'delete')
-            success = affected_rows > 0
+    Returns:
+        Código de saída (0 em caso de sucesso)
+    """
+    migrador = MigradorEsquema(AgricolaDatabaseManager())
+    try:
+        aplicadas = migrador.aplicar_migracoes()
+    except DatabaseError as e:
+        print(f"❌ Falha na migração: {e}")
+        return 1
+
+    if aplicadas:
+        print(f"✅ Migrações aplicadas: {', '.join(map(str, aplicadas))}")
+    else:
+        print("ℹ️ Esquema já está atualizado")
+    return 0
+
+
+
+# --- RETENÇÃO POR PARTIÇÃO ---
+# Dependentes das medições de uma partição ({particao}), excluídos antes da remoção.
+# Percorrem só a partição e chegam aos filhos pelos índices T_SUG__IDX e APLIC__IDX
+# (aplicações sempre referenciam uma sugestão, pela FK_APLIC_SUG).
+SQL_EXCLUIR_APLICACOES_PARTICAO = """
+DELETE FROM T_APLICACOES
+WHERE (cod_sugestao, cod_medicao, cod_sensor) IN (
+    SELECT s.cod_sugestao, s.cod_medicao, s.cod_sensor
+    FROM T_MEDICOES PARTITION ({particao}) m
+    JOIN T_SUGESTOES s ON s.cod_medicao = m.cod_medicao AND s.cod_sensor = m.cod_sensor)
+"""
+SQL_EXCLUIR_SUGESTOES_PARTICAO = """
+DELETE FROM T_SUGESTOES
+WHERE (cod_medicao, cod_sensor) IN (
+    SELECT cod_medicao, cod_sensor FROM T_MEDICOES PARTITION ({particao}))
+"""
 
-            if success:
-                logger.info(f"Aplicação {cod_aplicacao} removida com sucesso")
-            else:
-                logger.warning(f"Nenhuma aplicação encontrada com os códigos fornecidos")
 
-            return success
+class GerenciadorRetencao:
+    """
+    Expurga medições antigas removendo partições mensais inteiras de T_MEDICOES.
 
-        except Exception as e:
-            logger.error(f"Erro ao excluir aplicação: {e}")
-            return False
-        finally:
-            self.disconnect()
+    Remover uma partição é uma operação de dicionário: não gera undo/redo por
+    linha como um DELETE e leva milissegundos independentemente do volume.
+    Antes disso são excluídas só as sugestões e aplicações das medições da
+    partição, com custo proporcional a elas e não às tabelas inteiras.
+    """
 
-    # Consultas analíticas
+    MODOS = ("drop", "exchange")
 
-    def get_medicoes_by_cultura(self, cod_cultura: int) -> List[Dict[str, Any]]:
+    def __init__(self, db: AgricolaDatabaseManager):
         """
-        Recupera todas as medições associadas a uma cultura específica.
+        Inicializa o gerenciador.
 
         Args:
-            cod_cultura: Código da cultura
+            db: Gerenciador usado para obter a conexão
+        """
+        self.db = db
 
-        Returns:
-            Lista de dicionários com os dados das medições
+    def _executar(self, sql: str, params: Optional[List[Any]] = None) -> int:
         """
-        self.connect()
+        Executa um comando na conexão do gerenciador.
 
+        Raises:
+            RetencaoError: Em caso de falha
+        """
         try:
-            sql = """
-            SELECT m.cod_medicao, TO_CHAR(m.data_hora_medicao, 'YYYY-MM-DD HH24:MI:SS') as data_hora_medicao, 
-                   m.valor_medicao, m.un_medicao, m.cod_sensor, 
-                   s.nm_sensor, s.tipo_sensor, c.desc_cultura
-            FROM T_MEDICOES m
-            JOIN T_SENSORES s ON m.cod_sensor = s.cod_sensor
-            JOIN T_CULTURAS c ON s.cod_cultura = c.cod_cultura
-            WHERE c.cod_cultura = :1
-            ORDER BY m.data_hora_medicao DESC
-            """
-
-            result = self.executar_sql(sql, [cod_cultura], 'select_all')
-            return result
+            self.db.cursor.execute(sql, params or [])
+            return self.db.cursor.rowcount
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}) em '{sql.strip()}': {error.message}")
+            raise RetencaoError(f"Falha no expurgo (ORA-{error.code})") from e
 
-        except Exception as e:
-            logger.error(f"Erro ao recuperar medições por cultura: {e}")
-            return []
-        finally:
-            self.disconnect()
+    def listar_particoes(self) -> List[Dict[str, Any]]:
+        """
+        Lista as partições de T_MEDICOES com o intervalo de datas de cada uma.
 
-    def get_aplicacoes_by_cultura(self, cod_cultura: int) -> List[Dict[str, Any]]:
+        Returns:
+            Lista de dicionários (particao, inicio, fim, intervalo), em ordem de data
         """
-        Recupera todas as aplicações associadas a uma cultura específica.
+        self._executar("""
+            SELECT partition_name, high_value, interval
+            FROM user_tab_partitions
+            WHERE table_name = 'T_MEDICOES'
+            ORDER BY partition_position
+        """)
+        particoes = []
+        inicio = None
+        for nome, high_value, intervalo in self.db.cursor.fetchall():
+            # high_value é um LONG com o literal da partição: TIMESTAMP' 2024-02-01 00:00:00'
+            literal = re.search(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})", high_value)
+            fim = datetime.strptime(literal.group(1), '%Y-%m-%d %H:%M:%S')
+            particoes.append({"particao": nome, "inicio": inicio, "fim": fim, "intervalo": intervalo == "YES"})
+            inicio = fim
+        return particoes
+
+    def expurgar_ate(self, data_limite: Union[str, datetime], modo: str = "drop",
+                     dry_run: bool = False) -> List[Dict[str, Any]]:
+        """
+        Expurga as partições cujas medições são todas anteriores a data_limite.
 
         Args:
-            cod_cultura: Código da cultura
+            data_limite: Data de corte (YYYY-MM-DD [HH:MM:SS])
+            modo: 'drop' descarta as medições; 'exchange' as move para uma tabela
+                  de arquivo (T_MED_ARQ_<partição>) antes de remover a partição
+            dry_run: Se True, apenas informa as partições e quantidades afetadas
 
         Returns:
-            Lista de dicionários com os dados das aplicações
+            Lista de dicionários (particao, inicio, fim, medicoes) das partições expurgadas
+
+        Raises:
+            ValidationError: Se o modo for inválido
+            RetencaoError: Em caso de falha no expurgo
         """
-        self.connect()
+        if modo not in self.MODOS:
+            raise ValidationError(f"Modo de expurgo inválido: {modo} (use {' ou '.join(self.MODOS)})")
+        limite = _converter_data_hora(data_limite)
 
+        self.db.connect()
         try:
-            sql = """
-            SELECT a.cod_aplicacao, a.nm_produto_utilizado, a.valor_aplicacao, a.un_aplicacao,
-                   TO_CHAR(a.data_hora_aplicacao, 'YYYY-MM-DD HH24:MI:SS') as data_hora_aplicacao,
-                   a.nm_resp_aplicacao, a.documento_resp, c.desc_cultura
-            FROM T_APLICACOES a
-            JOIN T_CULTURAS c ON a.cod_cultura = c.cod_cultura
-            WHERE c.cod_cultura = :1
-            ORDER BY a.data_hora_aplicacao DESC
-            """
-
-            result = self.executar_sql(sql, [cod_cultura], 'select_all')
-            return result
-
-        except Exception as e:
-            logger.error(f"Erro ao recuperar aplicações por cultura: {e}")
-            return []
+            expurgadas = []
+            for particao in self.listar_particoes():
+                if particao["fim"] > limite:
+                    break
+                if not particao["intervalo"]:
+                    # A partição inicial define o ponto de transição e não pode ser removida
+                    logger.info(f"Partição inicial {particao['particao']} mantida")
+                    continue
+
+                self._executar(f"SELECT COUNT(*) FROM T_MEDICOES PARTITION ({particao['particao']})")
+                particao["medicoes"] = self.db.cursor.fetchone()[0]
+                if not dry_run:
+                    self._expurgar_particao(particao["particao"], modo)
+                expurgadas.append(particao)
+                logger.info(f"{'[dry-run] ' if dry_run else ''}Partição {particao['particao']} "
+                            f"({particao['inicio']:%Y-%m}) expurgada: {particao['medicoes']} medições")
+
+            return expurgadas
         finally:
-            self.disconnect()
+            self.db.disconnect()
 
-    def get_sugestoes_by_sensor(self, cod_sensor: int) -> List[Dict[str, Any]]:
+    def _expurgar_particao(self, particao: str, modo: str) -> None:
         """
-        Recupera todas as sugestões associadas a um sensor específico.
+        Remove uma partição de T_MEDICOES e os registros dependentes.
+
+        Os dependentes das medições da partição são excluídos e confirmados
+        primeiro, com FK_SUG_MED ainda habilitada (todo DDL faz commit
+        implícito). O Oracle não remove nem troca a partição de uma tabela
+        referenciada por uma FK habilitada, então FK_SUG_MED fica desabilitada
+        só durante o DDL e é reabilitada com NOVALIDATE: as linhas existentes já
+        foram conferidas e o VALIDATE releria T_SUGESTOES inteira a cada partição.
+        """
+        try:
+            self._executar(SQL_EXCLUIR_APLICACOES_PARTICAO.format(particao=particao))
+            self._executar(SQL_EXCLUIR_SUGESTOES_PARTICAO.format(particao=particao))
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self._executar("ALTER TABLE T_SUGESTOES DISABLE CONSTRAINT FK_SUG_MED")
+        try:
+            if modo == "exchange":
+                arquivo = f"T_MED_ARQ_{particao}"[:30]
+                # FOR EXCHANGE copia também as colunas ocultas (SET UNUSED) das migrações
+                self._executar(f"CREATE TABLE {arquivo} FOR EXCHANGE WITH TABLE T_MEDICOES")
+                self._executar(f"""
+                    ALTER TABLE T_MEDICOES EXCHANGE PARTITION {particao} WITH TABLE {arquivo}
+                    EXCLUDING INDEXES WITHOUT VALIDATION UPDATE GLOBAL INDEXES
+                """)
+                logger.info(f"Medições da partição {particao} arquivadas em {arquivo}")
+            self._executar(f"ALTER TABLE T_MEDICOES DROP PARTITION {particao} UPDATE GLOBAL INDEXES")
+        except BaseException:
+            self._reabilitar_fk_sugestoes(apos_falha=True)
+            raise
+        self._reabilitar_fk_sugestoes()
+
+    def _reabilitar_fk_sugestoes(self, apos_falha: bool = False) -> None:
+        """
+        Reabilita FK_SUG_MED. Depois de uma falha no DDL, um erro aqui é só
+        registrado, para não substituir a exceção original.
+        """
+        try:
+            self._executar("ALTER TABLE T_SUGESTOES ENABLE NOVALIDATE CONSTRAINT FK_SUG_MED")
+        except RetencaoError:
+            if not apos_falha:
+                raise
+            logger.error("FK_SUG_MED continua desabilitada; reabilite-a manualmente")
+
+
+def expurgar_medicoes(argumentos: List[str]) -> int:
+    """
+    Expurga partições de medições anteriores a uma data.
+
+    Uso: python Fase3_Cap1_Ent2_CRUD.py --expurgar-medicoes YYYY-MM-DD [--arquivar] [--dry-run]
+
+    Returns:
+        Código de saída (0 em caso de sucesso)
+    """
+    posicao = argumentos.index("--expurgar-medicoes")
+    if posicao + 1 >= len(argumentos):
+        print("❌ Informe a data de corte: --expurgar-medicoes YYYY-MM-DD")
+        return 2
+
+    retencao = GerenciadorRetencao(AgricolaDatabaseManager())
+    try:
+        expurgadas = retencao.expurgar_ate(argumentos[posicao + 1],
+                                           modo="exchange" if "--arquivar" in argumentos else "drop",
+                                           dry_run="--dry-run" in argumentos)
+    except (DatabaseError, ValidationError) as e:
+        print(f"❌ Falha no expurgo: {e}")
+        return 1
+
+    total = sum(particao["medicoes"] for particao in expurgadas)
+    print(f"✅ {len(expurgadas)} partições, {total} medições expurgadas")
+    return 0
+
+
+# --- INGESTÃO DE MEDIÇÕES ---
+# Insere a leitura apenas se ainda não houver medição do sensor no mesmo instante
+# (o Oracle avança SEQ_MEDICOES também para linhas ignoradas; lacunas nos códigos são esperadas)
+SQL_MERGE_MEDICAO = """
+MERGE INTO T_MEDICOES t
+USING (SELECT :1 AS cod_sensor, :2 AS data_hora_medicao, :3 AS valor_medicao, :4 AS un_medicao FROM dual) s
+ON (t.cod_sensor = s.cod_sensor AND t.data_hora_medicao = s.data_hora_medicao)
+WHEN NOT MATCHED THEN
+    INSERT (cod_medicao, data_hora_medicao, valor_medicao, un_medicao, cod_sensor)
+    VALUES (SEQ_MEDICOES.NEXTVAL, s.data_hora_medicao, s.valor_medicao, s.un_medicao, s.cod_sensor)
+"""
+
+# Chaves (cod_sensor, data_hora_medicao) recentes mantidas em memória
+TAMANHO_CACHE_INGESTAO = int(os.getenv("INGEST_CACHE_SIZE", 100000))
+
+# ORA-00001: outra sessão inseriu a mesma chave natural entre o MERGE e o commit.
+# Só conta como duplicada se a restrição violada for a da chave natural (a PK_MED
+# também gera ORA-00001, e aí a leitura é nova e foi rejeitada)
+ORA_CHAVE_DUPLICADA = 1
+INDICE_CHAVE_NATURAL = "UN_MED_SENS_DATA"
+
+
+class IngestorMedicoes:
+    """
+    Registra leituras de sensores de forma idempotente pela chave natural
+    (cod_sensor, data_hora_medicao).
+
+    Leituras retransmitidas pelos gateways são descartadas em três níveis:
+    1. Cache LRU das chaves recentes (sem ida ao banco)
+    2. Repetições dentro do próprio lote
+    3. MERGE ... WHEN NOT MATCHED, apoiado no índice único UN_MED_SENS_DATA
+
+    Um LRU é usado em vez de um filtro de Bloom porque um falso positivo do
+    filtro descartaria uma leitura nova; o LRU só descarta chaves já gravadas.
+    """
+
+    def __init__(self, db: AgricolaDatabaseManager, capacidade_cache: int = TAMANHO_CACHE_INGESTAO):
+        """
+        Inicializa o ingestor.
 
         Args:
-            cod_sensor: Código do sensor
+            db: Gerenciador usado para obter a conexão
+            capacidade_cache: Quantidade de chaves recentes mantidas em memória
+        """
+        self.db = db
+        self.capacidade_cache = capacidade_cache
+        self._recentes: "OrderedDict[Tuple[int, datetime], None]" = OrderedDict()
+
+    def _lembrar(self, chave: Tuple[int, datetime]):
+        """Registra uma chave já gravada no cache LRU."""
+        self._recentes[chave] = None
+        self._recentes.move_to_end(chave)
+        if len(self._recentes) > self.capacidade_cache:
+            self._recentes.popitem(last=False)
+
+    def registrar(self, leituras: List[Tuple[int, Union[str, datetime], float, str]]) -> Dict[str, int]:
+        """
+        Grava um lote de leituras, ignorando as já registradas.
+
+        Args:
+            leituras: Lista de (cod_sensor, data_hora_medicao, valor_medicao, un_medicao)
 
         Returns:
-            Lista de dicionários com os dados das sugestões
+            Dicionário com as quantidades 'inseridas', 'duplicadas_cache', 'duplicadas_banco'
+            e 'rejeitadas' (erros do lote, como sensor inexistente; não entram no cache)
+
+        Raises:
+            ValidationError: Se alguma leitura tiver data ou valor inválido
+            DatabaseError: Em caso de falha no banco
         """
-        self.connect()
+        resumo = {'inseridas': 0, 'duplicadas_cache': 0, 'duplicadas_banco': 0, 'rejeitadas': 0}
+        novas = {}
+        for cod_sensor, data_hora, valor, unidade in leituras:
+            chave = (int(cod_sensor), _converter_data_hora(data_hora))
+            if chave in self._recentes or chave in novas:
+                if chave in self._recentes:
+                    self._recentes.move_to_end(chave)
+                resumo['duplicadas_cache'] += 1
+                continue
+            validar_numero("valor_medicao", valor, *PRECISAO_VALOR)
+            novas[chave] = [chave[0], chave[1], float(valor), unidade]
 
-        try:
-            sql = """
-            SELECT s.cod_sugestao, s.objetivo_sugestao, 
-                   TO_CHAR(s.data_hora_sugestao, 'YYYY-MM-DD HH24:MI:SS') as data_hora_sugestao,
-                   s.valor_sugestao, s.un_sugestao, s.cod_sensor, s.cod_medicao,
-                   m.valor_medicao, TO_CHAR(m.data_hora_medicao, 'YYYY-MM-DD HH24:MI:SS') as data_hora_medicao
-            FROM T_SUGESTOES s
-            JOIN T_MEDICOES m ON s.cod_medicao = m.cod_medicao AND s.cod_sensor = m.cod_sensor
-            WHERE s.cod_sensor = :1
-            ORDER BY s.data_hora_sugestao DESC
-            """
-
-            result = self.executar_sql(sql, [cod_sensor], 'select_all')
-            return result
+        if not novas:
+            return resumo
 
-        except Exception as e:
-            logger.error(f"Erro ao recuperar sugestões por sensor: {e}")
-            return []
+        linhas = list(novas.values())
+        self.db.connect()
+        try:
+            self.db.cursor.setinputsizes(oracledb.DB_TYPE_NUMBER, oracledb.DB_TYPE_TIMESTAMP,
+                                         oracledb.DB_TYPE_NUMBER, 2)
+            self.db.cursor.executemany(SQL_MERGE_MEDICAO, linhas, batcherrors=True, arraydmlrowcounts=True)
+            contagens = self.db.cursor.getarraydmlrowcounts()
+            erros = {erro.offset: erro for erro in self.db.cursor.getbatcherrors()}
+            self.db.conn.commit()
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}) ao registrar medições: {error.message}")
+            self.db.conn.rollback()
+            raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
         finally:
-            self.disconnect()
+            self.db.disconnect()
+
+        for posicao, (chave, contagem) in enumerate(zip(novas, contagens)):
+            erro = erros.get(posicao)
+            if erro is not None and not (erro.code == ORA_CHAVE_DUPLICADA and INDICE_CHAVE_NATURAL in erro.message):
+                logger.error(f"Erro ao registrar medição {chave}: {erro.message}")
+                resumo['rejeitadas'] += 1
+                continue
+            if contagem and erro is None:
+                resumo['inseridas'] += 1
+            else:
+                resumo['duplicadas_banco'] += 1
+            self._lembrar(chave)
+
+        logger.info(f"Ingestão de medições: {resumo}")
+        return resumo
 
 
 def main():
@@ -1623,5 +3646,40 @@ def main():
         print(f"Erro ao inicializar o sistema: {e}")
         logger.exception("Erro fatal durante a execução do programa")
 
+def verificar_planos() -> int:
+    """
+    Executa o harness de planos de execução e exibe o resultado.
+
+    Uso: python Fase3_Cap1_Ent2_CRUD.py --verificar-planos
+
+    Returns:
+        Código de saída (0 se nenhum full scan indevido foi encontrado)
+    """
+    db = AgricolaDatabaseManager()
+    try:
+        planos = db.verificar_planos_execucao()
+    except PlanoExecucaoError as e:
+        print(f"❌ {e}")
+        return 1
+    except DatabaseError as e:
+        print(f"❌ Erro ao verificar planos: {e}")
+        return 2
+
+    for nome, linhas in planos.items():
+        print(f"\n=== {nome} ===")
+        for linha in linhas:
+            print(f"  {linha}")
+    print(f"\n✅ {len(planos)} comandos verificados sem full scan indevido")
+    return 0
+
 if __name__ == "__main__":
+    if "--verificar-planos" in sys.argv:
+        sys.exit(verificar_planos())
+    if "--migrar" in sys.argv:
+        sys.exit(migrar_esquema())
+    if "--expurgar-medicoes" in sys.argv:
+        sys.exit(expurgar_medicoes(sys.argv))
+    if "--benchmark-conversao" in sys.argv:
+        benchmark_conversao()
+        sys.exit(0)
     main()
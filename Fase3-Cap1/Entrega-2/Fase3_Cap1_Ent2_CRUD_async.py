@@ -0,0 +1,736 @@
+"""
+Sistema de Gerenciamento de Dados Agrícolas - Versão assíncrona
+Operações CRUD com asyncio sobre o pool assíncrono do python-oracledb
+
+Este módulo oferece o AsyncAgricolaDatabaseManager, com os mesmos métodos do
+AgricolaDatabaseManager (Fase3_Cap1_Ent2_CRUD.py), mas implementados como
+corrotinas. Cada operação obtém uma conexão do pool, de modo que consultas
+disparadas juntas (asyncio.gather) sobrepõem suas esperas de rede em vez de
+serem executadas em série.
+
+Exemplo:
+    async with AsyncAgricolaDatabaseManager() as db:
+        sensor, medicoes, sugestoes = await asyncio.gather(
+            db.read_sensor(1),
+            db.get_medicoes_by_cultura(1),
+            db.get_sugestoes_by_sensor(1)
+        )
+
+Autor: FarmTech Solutions
+Data: Maio 2025
+"""
+
+import asyncio
+import contextvars
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Tuple, Optional, Union, AsyncIterator
+
+import oracledb
+
+from Fase3_Cap1_Ent2_CRUD import (
+    AgricolaDatabaseManager, DatabaseError, ValidationError, MapeadorTabela, obter_mapeador,
+    PRECISAO_CODIGO, validar_numero, _converter_data_hora,
+    tratador_tipos_saida, formatadores_colunas, formatar_linhas,
+    DATA_HORA_MINIMA, DATA_HORA_MAXIMA,
+    SQL_PROXIMO_COD_CULTURA, SQL_PROXIMO_COD_SENSOR, SQL_PROXIMO_COD_MEDICAO,
+    SQL_PROXIMO_COD_SUGESTAO, SQL_PROXIMO_COD_APLICACAO,
+    SQL_SELECT_CULTURAS, SQL_SELECT_CULTURA_POR_COD,
+    SQL_SELECT_SENSORES, SQL_SELECT_SENSOR_POR_COD,
+    SQL_SELECT_MEDICOES, SQL_SELECT_MEDICAO_POR_CHAVE, SQL_SELECT_MEDICAO_POR_COD,
+    SQL_SELECT_MEDICOES_POR_SENSOR,
+    SQL_SELECT_SUGESTOES, SQL_SELECT_SUGESTAO_POR_CHAVE, SQL_SELECT_SUGESTOES_POR_MEDICAO,
+    SQL_SELECT_SUGESTAO_POR_COD,
+    SQL_SELECT_APLICACOES, SQL_SELECT_APLICACAO_POR_COD, SQL_SELECT_APLICACOES_POR_SUGESTAO,
+    SQL_DELETE_CULTURA, SQL_DELETE_SENSOR, SQL_DELETE_MEDICAO, SQL_DELETE_SUGESTAO,
+    SQL_DELETE_APLICACAO_POR_CHAVE, SQL_DELETE_APLICACAO_POR_COD, SQL_DELETE_CASCATA_CULTURA,
+    SQL_MEDICOES_POR_CULTURA, SQL_MEDICOES_RECENTES, SQL_APLICACOES_POR_CULTURA,
+    SQL_SUGESTOES_POR_SENSOR
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAgricolaDatabaseManager:
+    """
+    Versão assíncrona do AgricolaDatabaseManager.
+
+    Não guarda conexão nem cursor como estado da instância: cada operação usa
+    uma conexão própria do pool, então a mesma instância pode ser usada por
+    várias corrotinas ao mesmo tempo. Dentro de transacao(), as operações da
+    mesma tarefa compartilham a conexão da transação (via contextvars).
+
+    Para testes, um pool substituto pode ser injetado no construtor: basta
+    oferecer acquire() como gerenciador de contexto assíncrono e close()
+    assíncrono, com conexões no formato do AsyncConnection do oracledb.
+    """
+
+    def __init__(self, pool: Any = None, pool_min: int = 1, pool_max: int = 8, tipos_nativos: bool = False):
+        """
+        Inicializa o gerenciador assíncrono.
+
+        Args:
+            pool: Pool já criado (opcional; se omitido, abrir() cria um create_pool_async)
+            pool_min: Conexões mantidas abertas no pool
+            pool_max: Máximo de conexões simultâneas (limita a concorrência no banco)
+            tipos_nativos: Se True, datas são retornadas como datetime; se False, como texto
+        """
+        self.tipos_nativos = tipos_nativos
+
+        # Mesmas configurações de conexão da versão síncrona
+        config = AgricolaDatabaseManager()
+        self.host = config.host
+        self.port = config.port
+        self.service_name = config.service_name
+        self.user = config.user
+        self.password = config.password
+
+        self.pool = pool
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self._pool_proprio = pool is None
+        self._conexao_transacao = contextvars.ContextVar(f"conexao_transacao_{id(self)}", default=None)
+        # Estado da transação da tarefa ({"falhou": bool}); o mesmo dicionário é
+        # visto pelas subtarefas do gather, que copiam o contexto da tarefa
+        self._estado_transacao = contextvars.ContextVar(f"estado_transacao_{id(self)}", default=None)
+
+    async def abrir(self) -> "AsyncAgricolaDatabaseManager":
+        """
+        Cria o pool de conexões assíncronas, se ainda não existir.
+
+        Raises:
+            DatabaseError: Em caso de falha na conexão
+        """
+        if self.pool is not None:
+            return self
+        try:
+            dsn = oracledb.makedsn(self.host, self.port, service_name=self.service_name)
+            self.pool = oracledb.create_pool_async(user=self.user, password=self.password, dsn=dsn,
+                                                   min=self.pool_min, max=self.pool_max, increment=1)
+            logger.info(f"Pool assíncrono criado (min={self.pool_min}, max={self.pool_max})")
+            return self
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            logger.error(f"Erro Oracle (ORA-{error.code}): {error.message}")
+            raise DatabaseError(f"Falha na conexão com o banco de dados (ORA-{error.code})") from e
+
+    async def fechar(self):
+        """Fecha o pool de conexões criado por abrir()."""
+        if self.pool is not None and self._pool_proprio:
+            await self.pool.close()
+            self.pool = None
+            logger.info("Pool assíncrono encerrado")
+
+    async def __aenter__(self) -> "AsyncAgricolaDatabaseManager":
+        return await self.abrir()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.fechar()
+
+    @asynccontextmanager
+    async def _conexao(self) -> AsyncIterator[Any]:
+        """Fornece a conexão da transação em andamento ou uma conexão do pool."""
+        conn = self._conexao_transacao.get()
+        if conn is not None:
+            yield conn
+            return
+        if self.pool is None:
+            await self.abrir()
+        async with self.pool.acquire() as conn:
+            conn.outputtypehandler = tratador_tipos_saida
+            yield conn
+
+    @asynccontextmanager
+    async def transacao(self) -> AsyncIterator["AsyncAgricolaDatabaseManager"]:
+        """
+        Agrupa várias operações em uma única transação da tarefa atual.
+
+        As operações executadas dentro do bloco pela mesma tarefa usam a mesma
+        conexão e são confirmadas juntas ao final. Qualquer exceção, ou falha
+        tratada internamente por um método (que retornou False ou []), desfaz
+        todas. Blocos aninhados participam da transação mais externa.
+
+        Raises:
+            DatabaseError: Se alguma operação falhou ou o commit não foi concluído
+        """
+        if self._conexao_transacao.get() is not None:
+            yield self
+            return
+
+        async with self._conexao() as conn:
+            token = self._conexao_transacao.set(conn)
+            estado = {"falhou": False}
+            token_estado = self._estado_transacao.set(estado)
+            try:
+                try:
+                    yield self
+                except BaseException:
+                    await conn.rollback()
+                    logger.warning("Transação desfeita")
+                    raise
+
+                if estado["falhou"]:
+                    await conn.rollback()
+                    raise DatabaseError("Transação desfeita: uma das operações falhou")
+
+                try:
+                    await conn.commit()
+                    logger.info("Transação confirmada")
+                except oracledb.DatabaseError as e:
+                    error, = e.args
+                    logger.error(f"Erro Oracle (ORA-{error.code}) ao confirmar transação: {error.message}")
+                    await conn.rollback()
+                    raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+            finally:
+                self._estado_transacao.reset(token_estado)
+                self._conexao_transacao.reset(token)
+
+    def _falha_tratada(self, mensagem: str, erro: Exception) -> None:
+        """
+        Registra a falha de um método que a trata retornando False ou [].
+
+        Dentro de transacao() a falha marca a transação da tarefa para ser desfeita.
+        """
+        logger.error(f"{mensagem}: {erro}")
+        estado = self._estado_transacao.get()
+        if estado is not None:
+            estado["falhou"] = True
+
+    async def executar_sql(
+            self,
+            sql: str,
+            params: Optional[Union[List[Any], Dict[str, Any]]] = None,
+            operacao: str = 'insert',
+            tipos: Optional[Dict[str, Any]] = None
+    ) -> Union[int, List[Dict[str, Any]], Dict[str, Any], None]:
+        """
+        Executa operações SQL no banco de dados com tratamento de erros.
+
+        Args:
+            sql (str): Comando SQL a ser executado.
+            params (Optional[Union[List[Any], Dict[str, Any]]]): Parâmetros posicionais (lista) ou nomeados (dicionário).
+            operacao (str): Tipo de operação ('insert', 'select_one', 'select_all', 'update', 'delete').
+            tipos (Optional[Dict[str, Any]]): Tipos dos binds nomeados para cursor.setinputsizes (opcional).
+
+        Returns:
+            Union[int, List[Dict[str, Any]], Dict[str, Any], None]:
+                - Para 'select_all': Lista de dicionários com os resultados
+                - Para 'select_one': Um dicionário com o resultado
+                - Para outros: Número de linhas afetadas
+
+        Raises:
+            DatabaseError: Em caso de falha na execução SQL.
+        """
+        em_transacao = self._conexao_transacao.get() is not None
+        async with self._conexao() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    if tipos:
+                        cursor.setinputsizes(**tipos)
+                    await cursor.execute(sql, params or [])
+
+                    if operacao in ('insert', 'update', 'delete'):
+                        affected_rows = cursor.rowcount
+                        if not em_transacao:
+                            await conn.commit()
+                        logger.info(f"Operação realizada: {sql.split()[0]}, linhas afetadas: {affected_rows}")
+                        return affected_rows
+
+                    columns = [desc[0] for desc in cursor.description]
+                    if operacao == 'select_one':
+                        row = await cursor.fetchone()
+                        rows = [row] if row else []
+                    else:
+                        rows = await cursor.fetchall()
+                    linhas = [dict(zip(columns, row)) for row in rows]
+                    if not self.tipos_nativos:
+                        linhas = formatar_linhas(linhas, dict(zip(columns, formatadores_colunas(cursor.description))))
+
+                    if operacao == 'select_one':
+                        return linhas[0] if linhas else None
+                    return linhas
+
+            except oracledb.DatabaseError as e:
+                error, = e.args
+                logger.error(f"Erro Oracle (ORA-{error.code}): {error.message}")
+                if not em_transacao:
+                    await conn.rollback()
+                else:
+                    self._estado_transacao.get()["falhou"] = True
+                raise DatabaseError(f"Falha no banco de dados (ORA-{error.code})") from e
+
+    async def _proximo_codigo(self, sql: str, campo: str) -> int:
+        """Obtém o próximo código da sequência da tabela e valida o limite da coluna."""
+        linha = await self.executar_sql(sql, [], 'select_one')
+        novo_cod = list(linha.values())[0]
+        validar_numero(campo, novo_cod, *PRECISAO_CODIGO)
+        return novo_cod
+
+    async def _existe_registro(self, tabela: str, condicao: str, params: List[Any]) -> bool:
+        """Verifica se existe ao menos um registro que atende à condição (ROWNUM = 1)."""
+        linha = await self.executar_sql(f"SELECT 1 FROM {tabela} WHERE {condicao} AND ROWNUM = 1", params,
+                                        'select_one')
+        return linha is not None
+
+    async def _executar_mapeado(self, mapeador: MapeadorTabela, operacao: str, params: Dict[str, Any],
+                                tipo_execucao: str, colunas: Optional[Tuple[str, ...]] = None
+                                ) -> Union[int, Dict[str, Any], None]:
+        """Executa uma operação com o comando e os tipos compilados do mapeador (ver MapeadorTabela)."""
+        return await self.executar_sql(mapeador.sql(operacao, colunas), params, tipo_execucao,
+                                       mapeador.tipos_bind(operacao, colunas))
+
+    async def _inserir_registro(self, tabela: str, registro: Dict[str, Any]) -> None:
+        """Insere um registro com o INSERT compilado da tabela (usado pelas rotinas create_*)."""
+        mapeador = obter_mapeador(tabela)
+        await self._executar_mapeado(mapeador, "inserir", mapeador.params_inserir(registro), 'insert')
+
+    async def _atualizar(self, tabela: str, campos: Dict[str, Any], chave: Dict[str, Any]) -> bool:
+        """
+        Atualiza os campos informados do registro da chave com o UPDATE compilado
+        para essas colunas (valores None são ignorados; "" limpa colunas de data).
+
+        Returns:
+            True se algum registro foi atualizado, False caso contrário
+        """
+        mapeador = obter_mapeador(tabela)
+        campos = mapeador.campos_informados(campos)
+        if not campos:
+            logger.warning("Nenhum campo válido fornecido para atualização")
+            return False
+
+        affected_rows = await self._executar_mapeado(mapeador, "atualizar", mapeador.params_atualizar(chave, campos),
+                                                     'update', mapeador.colunas_alteradas(campos))
+        if affected_rows > 0:
+            logger.info(f"{tabela} {chave} atualizado com sucesso")
+        else:
+            logger.warning(f"Nenhum registro de {tabela} encontrado com {chave}")
+        return affected_rows > 0
+
+    async def _ler(self, descricao: str, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        """Executa uma consulta de leitura; em caso de erro registra e retorna lista vazia."""
+        try:
+            return await self.executar_sql(sql, params, 'select_all')
+        except Exception as e:
+            self._falha_tratada(f"Erro ao ler {descricao}", e)
+            return []
+
+    # Operações CRUD para T_CULTURAS
+
+    async def create_cultura(self, desc_cultura: str, tamanho_cultura: float, data_prev_colheita: str = None) -> int:
+        """
+        Insere uma nova cultura no banco de dados.
+
+        Returns:
+            ID da cultura inserida
+        """
+        try:
+            async with self.transacao():
+                new_cod = await self._proximo_codigo(SQL_PROXIMO_COD_CULTURA, "cod_cultura")
+                await self._inserir_registro("T_CULTURAS", {
+                    "cod_cultura": new_cod,
+                    "desc_cultura": desc_cultura,
+                    "tamanho_cultura": tamanho_cultura,
+                    "data_prev_colheita": data_prev_colheita
+                })
+            logger.info(f"Nova cultura inserida com ID: {new_cod}")
+            return new_cod
+        except Exception as e:
+            logger.error(f"Erro ao criar cultura: {e}")
+            raise
+
+    async def read_cultura(self, cod_cultura: int = None) -> List[Dict[str, Any]]:
+        """Recupera uma cultura (ou todas, se cod_cultura for omitido)."""
+        if cod_cultura is not None:
+            return await self._ler("cultura(s)", SQL_SELECT_CULTURA_POR_COD, [cod_cultura])
+        return await self._ler("cultura(s)", SQL_SELECT_CULTURAS, [])
+
+    async def update_cultura(self, cod_cultura: int, desc_cultura: str = None,
+                             tamanho_cultura: float = None, data_prev_colheita: str = None) -> bool:
+        """Atualiza dados de uma cultura existente ("" em data_prev_colheita limpa a data)."""
+        try:
+            return await self._atualizar("T_CULTURAS", {
+                "desc_cultura": desc_cultura,
+                "tamanho_cultura": tamanho_cultura,
+                "data_prev_colheita": data_prev_colheita
+            }, {"cod_cultura": cod_cultura})
+        except Exception as e:
+            self._falha_tratada("Erro ao atualizar cultura", e)
+            return False
+
+    async def delete_cultura(self, cod_cultura: int) -> bool:
+        """Remove uma cultura sem sensores nem aplicações associados."""
+        try:
+            if await self.executar_sql(SQL_DELETE_CULTURA, [cod_cultura], 'delete') > 0:
+                logger.info(f"Cultura {cod_cultura} removida com sucesso")
+                return True
+            if await self._existe_registro("T_SENSORES", "cod_cultura = :1", [cod_cultura]):
+                logger.warning(
+                    f"Não é possível excluir a cultura {cod_cultura} pois existem sensores associados a ela.")
+            elif await self._existe_registro("T_APLICACOES", "cod_cultura = :1", [cod_cultura]):
+                logger.warning(
+                    f"Não é possível excluir a cultura {cod_cultura} pois existem aplicações associadas a ela.")
+            else:
+                logger.warning(f"Nenhuma cultura encontrada com o código {cod_cultura}")
+            return False
+        except Exception as e:
+            self._falha_tratada("Erro ao excluir cultura", e)
+            return False
+
+    async def delete_cultura_cascata(self, cod_cultura: int) -> Dict[str, int]:
+        """
+        Remove uma cultura e toda a sua subárvore em uma única transação.
+
+        Raises:
+            DatabaseError: Se alguma etapa falhar (nada é removido)
+        """
+        try:
+            removidos = {}
+            async with self.transacao():
+                for tabela, sql in SQL_DELETE_CASCATA_CULTURA:
+                    removidos[tabela] = await self.executar_sql(sql, {"cod_cultura": cod_cultura}, 'delete')
+            logger.info(f"Cultura {cod_cultura} removida em cascata: {removidos}")
+            return removidos
+        except Exception as e:
+            logger.error(f"Erro ao excluir cultura {cod_cultura} em cascata: {e}")
+            raise
+
+    # Operações CRUD para T_SENSORES
+
+    async def create_sensor(self, nm_sensor: str, tipo_sensor: str, objetivo_sensor: str,
+                            fab_sensor: str, modelo_sensor: str, data_instalacao: str,
+                            latitude_instalacao: float, longitude_instalacao: float,
+                            valor_minimo: float, valor_maximo: float, unidade: str,
+                            cod_cultura: int) -> int:
+        """
+        Insere um novo sensor no banco de dados.
+
+        Returns:
+            ID do sensor inserido
+        """
+        try:
+            async with self.transacao():
+                new_cod = await self._proximo_codigo(SQL_PROXIMO_COD_SENSOR, "cod_sensor")
+                await self._inserir_registro("T_SENSORES", {
+                    "cod_sensor": new_cod,
+                    "nm_sensor": nm_sensor,
+                    "tipo_sensor": tipo_sensor,
+                    "objetivo_sensor": objetivo_sensor,
+                    "fab_sensor": fab_sensor,
+                    "modelo_sensor": modelo_sensor,
+                    "data_instalacao": data_instalacao,
+                    "latitude_instalacao": latitude_instalacao,
+                    "longitude_instalacao": longitude_instalacao,
+                    "valor_minimo": valor_minimo,
+                    "valor_maximo": valor_maximo,
+                    "unidade": unidade,
+                    "cod_cultura": cod_cultura
+                })
+            logger.info(f"Novo sensor inserido com ID: {new_cod}")
+            return new_cod
+        except Exception as e:
+            logger.error(f"Erro ao criar sensor: {e}")
+            raise
+
+    async def read_sensor(self, cod_sensor: int = None) -> List[Dict[str, Any]]:
+        """Recupera um sensor (ou todos, se cod_sensor for omitido)."""
+        if cod_sensor is not None:
+            return await self._ler("sensor(es)", SQL_SELECT_SENSOR_POR_COD, [cod_sensor])
+        return await self._ler("sensor(es)", SQL_SELECT_SENSORES, [])
+
+    async def update_sensor(self, cod_sensor: int, **kwargs) -> bool:
+        """Atualiza dados de um sensor existente (campos em kwargs)."""
+        try:
+            return await self._atualizar("T_SENSORES", kwargs, {"cod_sensor": cod_sensor})
+        except Exception as e:
+            self._falha_tratada("Erro ao atualizar sensor", e)
+            return False
+
+    async def delete_sensor(self, cod_sensor: int) -> bool:
+        """Remove um sensor sem medições associadas."""
+        try:
+            if await self.executar_sql(SQL_DELETE_SENSOR, [cod_sensor], 'delete') > 0:
+                logger.info(f"Sensor {cod_sensor} removido com sucesso")
+                return True
+            if await self._existe_registro("T_MEDICOES", "cod_sensor = :1", [cod_sensor]):
+                logger.warning(f"Não é possível excluir o sensor {cod_sensor} pois existem medições associadas a ele.")
+            else:
+                logger.warning(f"Nenhum sensor encontrado com o código {cod_sensor}")
+            return False
+        except Exception as e:
+            self._falha_tratada("Erro ao excluir sensor", e)
+            return False
+
+    # Operações CRUD para T_MEDICOES
+
+    async def create_medicao(self, data_hora_medicao: str, valor_medicao: float,
+                             un_medicao: str, cod_sensor: int) -> int:
+        """
+        Insere uma nova medição no banco de dados.
+
+        Returns:
+            ID da medição inserida
+        """
+        try:
+            async with self.transacao():
+                new_cod = await self._proximo_codigo(SQL_PROXIMO_COD_MEDICAO, "cod_medicao")
+                await self._inserir_registro("T_MEDICOES", {
+                    "cod_medicao": new_cod,
+                    "data_hora_medicao": data_hora_medicao,
+                    "valor_medicao": valor_medicao,
+                    "un_medicao": un_medicao,
+                    "cod_sensor": cod_sensor
+                })
+            logger.info(f"Nova medição inserida com ID: {new_cod}")
+            return new_cod
+        except Exception as e:
+            logger.error(f"Erro ao criar medição: {e}")
+            raise
+
+    async def read_medicao(self, cod_medicao: int = None, cod_sensor: int = None) -> List[Dict[str, Any]]:
+        """Recupera medições pela chave, pelo código, pelo sensor ou todas."""
+        if cod_medicao is not None and cod_sensor is not None:
+            return await self._ler("medição(ões)", SQL_SELECT_MEDICAO_POR_CHAVE, [cod_medicao, cod_sensor])
+        if cod_medicao is not None:
+            return await self._ler("medição(ões)", SQL_SELECT_MEDICAO_POR_COD, [cod_medicao])
+        if cod_sensor is not None:
+            return await self._ler("medição(ões)", SQL_SELECT_MEDICOES_POR_SENSOR, [cod_sensor])
+        return await self._ler("medição(ões)", SQL_SELECT_MEDICOES, [])
+
+    async def update_medicao(self, cod_medicao: int, cod_sensor: int,
+                             data_hora_medicao: str = None, valor_medicao: float = None,
+                             un_medicao: str = None) -> bool:
+        """Atualiza dados de uma medição existente."""
+        try:
+            return await self._atualizar("T_MEDICOES", {
+                "data_hora_medicao": data_hora_medicao,
+                "valor_medicao": valor_medicao,
+                "un_medicao": un_medicao
+            }, {"cod_medicao": cod_medicao, "cod_sensor": cod_sensor})
+        except Exception as e:
+            self._falha_tratada("Erro ao atualizar medição", e)
+            return False
+
+    async def delete_medicao(self, cod_medicao: int, cod_sensor: int) -> bool:
+        """Remove uma medição sem sugestões associadas."""
+        try:
+            if await self.executar_sql(SQL_DELETE_MEDICAO, [cod_medicao, cod_sensor], 'delete') > 0:
+                logger.info(f"Medição {cod_medicao} removida com sucesso")
+                return True
+            if await self._existe_registro("T_SUGESTOES", "cod_medicao = :1 AND cod_sensor = :2",
+                                           [cod_medicao, cod_sensor]):
+                logger.warning(f"Não é possível excluir a medição {cod_medicao} pois existem sugestões associadas a ela.")
+            else:
+                logger.warning(f"Nenhuma medição encontrada com os códigos fornecidos")
+            return False
+        except Exception as e:
+            self._falha_tratada("Erro ao excluir medição", e)
+            return False
+
+    # Operações CRUD para T_SUGESTOES
+
+    async def create_sugestao(self, cod_medicao: int, objetivo_sugestao: str,
+                              data_hora_sugestao: str, valor_sugestao: float,
+                              un_sugestao: str, cod_sensor: int) -> int:
+        """
+        Insere uma nova sugestão no banco de dados.
+
+        Returns:
+            ID da sugestão inserida
+        """
+        try:
+            async with self.transacao():
+                new_cod = await self._proximo_codigo(SQL_PROXIMO_COD_SUGESTAO, "cod_sugestao")
+                await self._inserir_registro("T_SUGESTOES", {
+                    "cod_medicao": cod_medicao,
+                    "cod_sugestao": new_cod,
+                    "objetivo_sugestao": objetivo_sugestao,
+                    "data_hora_sugestao": data_hora_sugestao,
+                    "valor_sugestao": valor_sugestao,
+                    "un_sugestao": un_sugestao,
+                    "cod_sensor": cod_sensor
+                })
+            logger.info(f"Nova sugestão inserida com ID: {new_cod}")
+            return new_cod
+        except Exception as e:
+            logger.error(f"Erro ao criar sugestão: {e}")
+            raise
+
+    async def read_sugestao(self, cod_sugestao: int = None, cod_medicao: int = None,
+                            cod_sensor: int = None) -> List[Dict[str, Any]]:
+        """Recupera sugestões pela chave, pela medição, pelo código ou todas."""
+        if cod_sugestao is not None and cod_medicao is not None and cod_sensor is not None:
+            return await self._ler("sugestão(ões)", SQL_SELECT_SUGESTAO_POR_CHAVE,
+                                   [cod_sugestao, cod_medicao, cod_sensor])
+        if cod_medicao is not None and cod_sensor is not None:
+            return await self._ler("sugestão(ões)", SQL_SELECT_SUGESTOES_POR_MEDICAO, [cod_medicao, cod_sensor])
+        if cod_sugestao is not None:
+            return await self._ler("sugestão(ões)", SQL_SELECT_SUGESTAO_POR_COD, [cod_sugestao])
+        return await self._ler("sugestão(ões)", SQL_SELECT_SUGESTOES, [])
+
+    async def update_sugestao(self, cod_sugestao: int, cod_medicao: int, cod_sensor: int,
+                              objetivo_sugestao: str = None, data_hora_sugestao: str = None,
+                              valor_sugestao: float = None, un_sugestao: str = None) -> bool:
+        """Atualiza dados de uma sugestão existente."""
+        try:
+            return await self._atualizar("T_SUGESTOES", {
+                "objetivo_sugestao": objetivo_sugestao,
+                "data_hora_sugestao": data_hora_sugestao,
+                "valor_sugestao": valor_sugestao,
+                "un_sugestao": un_sugestao
+            }, {"cod_sugestao": cod_sugestao, "cod_medicao": cod_medicao, "cod_sensor": cod_sensor})
+        except Exception as e:
+            self._falha_tratada("Erro ao atualizar sugestão", e)
+            return False
+
+    async def delete_sugestao(self, cod_sugestao: int, cod_medicao: int, cod_sensor: int) -> bool:
+        """Remove uma sugestão sem aplicações associadas."""
+        params = [cod_sugestao, cod_medicao, cod_sensor]
+        try:
+            if await self.executar_sql(SQL_DELETE_SUGESTAO, params, 'delete') > 0:
+                logger.info(f"Sugestão {cod_sugestao} removida com sucesso")
+                return True
+            if await self._existe_registro("T_APLICACOES",
+                                           "cod_sugestao = :1 AND cod_medicao = :2 AND cod_sensor = :3", params):
+                logger.warning(
+                    f"Não é possível excluir a sugestão {cod_sugestao} pois existem aplicações associadas a ela.")
+            else:
+                logger.warning(f"Nenhuma sugestão encontrada com os códigos fornecidos")
+            return False
+        except Exception as e:
+            self._falha_tratada("Erro ao excluir sugestão", e)
+            return False
+
+    # Operações CRUD para T_APLICACOES
+
+    async def create_aplicacao(self, cod_medicao: int, cod_sugestao: int, cod_sensor: int,
+                               cod_cultura: int, nm_produto_utilizado: str, valor_aplicacao: float,
+                               un_aplicacao: str, data_hora_aplicacao: str,
+                               nm_resp_aplicacao: str, documento_resp: str) -> int:
+        """
+        Insere uma nova aplicação no banco de dados.
+
+        Returns:
+            ID da aplicação inserida
+        """
+        try:
+            async with self.transacao():
+                new_cod = await self._proximo_codigo(SQL_PROXIMO_COD_APLICACAO, "cod_aplicacao")
+                await self._inserir_registro("T_APLICACOES", {
+                    "cod_medicao": cod_medicao,
+                    "cod_sugestao": cod_sugestao,
+                    "cod_sensor": cod_sensor,
+                    "cod_cultura": cod_cultura,
+                    "cod_aplicacao": new_cod,
+                    "nm_produto_utilizado": nm_produto_utilizado,
+                    "valor_aplicacao": valor_aplicacao,
+                    "un_aplicacao": un_aplicacao,
+                    "data_hora_aplicacao": data_hora_aplicacao,
+                    "nm_resp_aplicacao": nm_resp_aplicacao,
+                    "documento_resp": documento_resp
+                })
+            logger.info(f"Nova aplicação inserida com ID: {new_cod}")
+            return new_cod
+        except Exception as e:
+            logger.error(f"Erro ao criar aplicação: {e}")
+            raise
+
+    async def read_aplicacao(self, cod_aplicacao: int = None, cod_medicao: int = None,
+                             cod_sugestao: int = None, cod_sensor: int = None) -> List[Dict[str, Any]]:
+        """Recupera aplicações pelo código, pela sugestão ou todas."""
+        if cod_aplicacao is not None:
+            return await self._ler("aplicação(ões)", SQL_SELECT_APLICACAO_POR_COD, [cod_aplicacao])
+        if cod_medicao is not None and cod_sugestao is not None and cod_sensor is not None:
+            return await self._ler("aplicação(ões)", SQL_SELECT_APLICACOES_POR_SUGESTAO,
+                                   [cod_medicao, cod_sugestao, cod_sensor])
+        return await self._ler("aplicação(ões)", SQL_SELECT_APLICACOES, [])
+
+    async def update_aplicacao(self, cod_aplicacao: int, cod_medicao: int, cod_sugestao: int,
+                               cod_sensor: int, **kwargs) -> bool:
+        """Atualiza dados de uma aplicação existente (campos em kwargs)."""
+        try:
+            return await self._atualizar("T_APLICACOES", kwargs, {
+                "cod_aplicacao": cod_aplicacao, "cod_medicao": cod_medicao,
+                "cod_sugestao": cod_sugestao, "cod_sensor": cod_sensor
+            })
+        except Exception as e:
+            self._falha_tratada("Erro ao atualizar aplicação", e)
+            return False
+
+    async def delete_aplicacao(self, cod_aplicacao: int, cod_medicao: int = None,
+                               cod_sugestao: int = None, cod_sensor: int = None) -> bool:
+        """Remove uma aplicação pela chave completa ou apenas pelo código."""
+        if cod_medicao is not None and cod_sugestao is not None and cod_sensor is not None:
+            sql, params = SQL_DELETE_APLICACAO_POR_CHAVE, [cod_aplicacao, cod_medicao, cod_sugestao, cod_sensor]
+        else:
+            sql, params = SQL_DELETE_APLICACAO_POR_COD, [cod_aplicacao]
+        try:
+            if await self.executar_sql(sql, params, 'delete') > 0:
+                logger.info(f"Aplicação {cod_aplicacao} removida com sucesso")
+                return True
+            logger.warning(f"Nenhuma aplicação encontrada com os códigos fornecidos")
+            return False
+        except Exception as e:
+            self._falha_tratada("Erro ao excluir aplicação", e)
+            return False
+
+    # Consultas analíticas
+
+    async def get_medicoes_by_cultura(self, cod_cultura: int,
+                                      data_inicio: Optional[Union[str, datetime]] = None,
+                                      data_fim: Optional[Union[str, datetime]] = None) -> List[Dict[str, Any]]:
+        """Recupera as medições de uma cultura, opcionalmente em um período [data_inicio, data_fim)."""
+        inicio = _converter_data_hora(data_inicio) or DATA_HORA_MINIMA
+        fim = _converter_data_hora(data_fim) or DATA_HORA_MAXIMA
+        return await self._ler("medições por cultura", SQL_MEDICOES_POR_CULTURA, [cod_cultura, inicio, fim])
+
+    async def get_medicoes_recentes(self, dias: int = 7) -> List[Dict[str, Any]]:
+        """Recupera as medições dos últimos dias."""
+        return await self._ler("medições recentes", SQL_MEDICOES_RECENTES,
+                               [datetime.now() - timedelta(days=dias)])
+
+    async def get_aplicacoes_by_cultura(self, cod_cultura: int) -> List[Dict[str, Any]]:
+        """Recupera as aplicações de uma cultura."""
+        return await self._ler("aplicações por cultura", SQL_APLICACOES_POR_CULTURA, [cod_cultura])
+
+    async def get_sugestoes_by_sensor(self, cod_sensor: int) -> List[Dict[str, Any]]:
+        """Recupera as sugestões de um sensor."""
+        return await self._ler("sugestões por sensor", SQL_SUGESTOES_POR_SENSOR, [cod_sensor])
+
+    async def painel_cultura(self, cod_cultura: int) -> Dict[str, Any]:
+        """
+        Monta o painel de uma cultura com as consultas disparadas em paralelo.
+
+        Returns:
+            Dicionário com cultura, medições e aplicações
+        """
+        cultura, medicoes, aplicacoes = await asyncio.gather(
+            self.read_cultura(cod_cultura),
+            self.get_medicoes_by_cultura(cod_cultura),
+            self.get_aplicacoes_by_cultura(cod_cultura)
+        )
+        return {
+            "cultura": cultura[0] if cultura else None,
+            "medicoes": medicoes,
+            "aplicacoes": aplicacoes
+        }
+
+
+async def main():
+    """Demonstração: painéis de todas as culturas consultados em paralelo."""
+    async with AsyncAgricolaDatabaseManager() as db:
+        culturas = await db.read_cultura()
+        paineis = await asyncio.gather(*(db.painel_cultura(c['COD_CULTURA']) for c in culturas))
+
+        print("\n=== PAINEL DAS CULTURAS ===")
+        for painel in paineis:
+            cultura = painel["cultura"]
+            print(f"🌱 {cultura['DESC_CULTURA']}: {len(painel['medicoes'])} medições, "
+                  f"{len(painel['aplicacoes'])} aplicações")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except (DatabaseError, ValidationError) as e:
+        print(f"❌ Erro: {e}")
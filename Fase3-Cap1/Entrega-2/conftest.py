@@ -0,0 +1,37 @@
+"""
+Configuração dos testes do CRUD
+
+Sem o python-oracledb instalado, registra em sys.modules um módulo oracledb
+mínimo: as exceções e os tipos DB_TYPE_* usados na importação dos
+gerenciadores. Os testes rodam sobre o pool em memória e nunca abrem conexão;
+connect/create_pool levantam ImportError se forem chamados.
+"""
+
+import sys
+import types
+
+try:
+    import oracledb  # noqa: F401
+except ImportError:
+    class _TipoBanco:
+        """Tipo de coluna no formato de oracledb.DbType (só o nome)"""
+
+        def __init__(self, nome):
+            self.name = nome
+
+        def __repr__(self):
+            return f"<DbType {self.name}>"
+
+    def _sem_driver(*args, **kwargs):
+        raise ImportError("python-oracledb não está instalado")
+
+    substituto = types.ModuleType("oracledb")
+    substituto.Error = type("Error", (Exception,), {"__module__": "oracledb"})
+    substituto.DatabaseError = type("DatabaseError", (substituto.Error,), {"__module__": "oracledb"})
+    substituto.IntegrityError = type("IntegrityError", (substituto.DatabaseError,), {"__module__": "oracledb"})
+    for nome in ("DB_TYPE_BINARY_DOUBLE", "DB_TYPE_DATE", "DB_TYPE_NUMBER", "DB_TYPE_TIMESTAMP",
+                 "DB_TYPE_TIMESTAMP_TZ", "DB_TYPE_TIMESTAMP_LTZ", "DB_TYPE_VARCHAR"):
+        setattr(substituto, nome, _TipoBanco(nome))
+    substituto.connect = substituto.create_pool = substituto.create_pool_async = _sem_driver
+    substituto.makedsn = _sem_driver
+    sys.modules["oracledb"] = substituto
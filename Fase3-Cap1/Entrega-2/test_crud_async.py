@@ -0,0 +1,278 @@
+"""
+Testes do AsyncAgricolaDatabaseManager sobre um pool em memória
+
+O pool substituto (PoolMemoria) imita o pool assíncrono do python-oracledb:
+cada comando espera uma latência simulada antes de responder, as escritas
+ficam pendentes na conexão até o commit, e NEXTVAL de qualquer sequência
+devolve o próximo valor de um contador. Assim é possível verificar, sem
+banco, o commit/rollback de transacao() e a sobreposição das consultas
+disparadas com asyncio.gather. Sem o python-oracledb instalado, o conftest.py
+registra um módulo oracledb substituto, então os testes rodam em qualquer
+ambiente.
+
+Uso:
+    python -m pytest test_crud_async.py
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import oracledb
+import pytest
+
+from Fase3_Cap1_Ent2_CRUD import DatabaseError, obter_mapeador
+from Fase3_Cap1_Ent2_CRUD_async import AsyncAgricolaDatabaseManager
+
+LATENCIA = 0.02   # Segundos de "rede" por comando
+
+
+class ErroMemoria:
+    """Erro no formato de e.args[0] do oracledb (code e message)"""
+
+    def __init__(self, code, message):
+        self.code = code
+        self.message = message
+
+
+class ErroBancoMemoria(oracledb.DatabaseError):
+    """Erro do banco em memória, capturado pelo gerenciador como oracledb.DatabaseError"""
+
+
+class BancoMemoria:
+    """Estado compartilhado pelas conexões do pool: escritas confirmadas, sequências e medidas"""
+
+    def __init__(self, latencia=LATENCIA):
+        self.latencia = latencia
+        self.confirmados = []
+        self.sequencias = {}
+        self.falhar_em = None        # Trecho de SQL que responde com ORA-00001
+        self.em_andamento = 0
+        self.maximo_em_andamento = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+
+class CursorMemoria:
+
+    def __init__(self, conexao):
+        self.conexao = conexao
+        self.banco = conexao.banco
+        self.description = None
+        self.rowcount = 0
+        self.linhas = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        return False
+
+    def setinputsizes(self, **tipos):
+        self.tipos = tipos
+
+    async def execute(self, sql, params=None):
+        banco = self.banco
+        banco.em_andamento += 1
+        banco.maximo_em_andamento = max(banco.maximo_em_andamento, banco.em_andamento)
+        try:
+            await asyncio.sleep(banco.latencia)
+        finally:
+            banco.em_andamento -= 1
+
+        if banco.falhar_em and banco.falhar_em in sql:
+            raise ErroBancoMemoria(ErroMemoria(1, "ORA-00001: unique constraint violated"))
+        if "NEXTVAL" in sql:
+            sequencia = sql.split()[1].split(".")[0]
+            banco.sequencias[sequencia] = banco.sequencias.get(sequencia, 0) + 1
+            self.description = [("NEXTVAL", None)]
+            self.linhas = [(banco.sequencias[sequencia],)]
+        elif sql.lstrip().upper().startswith("SELECT"):
+            self.description = [("COD", None)]
+            self.linhas = []
+        else:
+            self.conexao.pendentes.append((sql, params))
+            self.rowcount = 1
+
+    async def fetchone(self):
+        return self.linhas[0] if self.linhas else None
+
+    async def fetchall(self):
+        return list(self.linhas)
+
+
+class ConexaoMemoria:
+
+    def __init__(self, banco):
+        self.banco = banco
+        self.pendentes = []
+        self.outputtypehandler = None
+
+    def cursor(self):
+        return CursorMemoria(self)
+
+    async def commit(self):
+        self.banco.confirmados.extend(self.pendentes)
+        self.pendentes = []
+        self.banco.commits += 1
+
+    async def rollback(self):
+        self.pendentes = []
+        self.banco.rollbacks += 1
+
+
+class PoolMemoria:
+    """Pool com acquire() e close() no formato do AsyncConnectionPool"""
+
+    def __init__(self, banco):
+        self.banco = banco
+
+    @asynccontextmanager
+    async def acquire(self):
+        conexao = ConexaoMemoria(self.banco)
+        try:
+            yield conexao
+        finally:
+            # Escritas não confirmadas voltam ao pool desfeitas, como no Oracle
+            conexao.pendentes = []
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def banco():
+    return BancoMemoria()
+
+
+@pytest.fixture
+def db(banco):
+    return AsyncAgricolaDatabaseManager(pool=PoolMemoria(banco))
+
+
+INSERT = "INSERT INTO T_CULTURAS (cod_cultura, desc_cultura) VALUES (:1, :2)"
+
+
+def test_transacao_confirma_todas_as_operacoes(db, banco):
+    async def cenario():
+        async with db.transacao():
+            await db.executar_sql(INSERT, [1, "Soja"])
+            await db.executar_sql(INSERT, [2, "Milho"])
+            assert banco.confirmados == []   # Nada visível antes do fim do bloco
+
+    asyncio.run(cenario())
+    assert [params for _, params in banco.confirmados] == [[1, "Soja"], [2, "Milho"]]
+    assert banco.commits == 1
+    assert banco.rollbacks == 0
+
+
+def test_transacao_desfaz_tudo_em_excecao(db, banco):
+    async def cenario():
+        async with db.transacao():
+            await db.executar_sql(INSERT, [1, "Soja"])
+            raise ValueError("falha da aplicação")
+
+    with pytest.raises(ValueError):
+        asyncio.run(cenario())
+    assert banco.confirmados == []
+    assert banco.commits == 0
+    assert banco.rollbacks == 1
+
+
+def test_transacao_desfaz_tudo_em_erro_do_banco(db, banco):
+    banco.falhar_em = "T_SENSORES"
+
+    async def cenario():
+        async with db.transacao():
+            await db.executar_sql(INSERT, [1, "Soja"])
+            await db.executar_sql("INSERT INTO T_SENSORES (cod_sensor, nm_sensor) VALUES (:1, :2)", [1, "S1"])
+
+    with pytest.raises(DatabaseError):
+        asyncio.run(cenario())
+    assert banco.confirmados == []
+    assert banco.commits == 0
+
+
+def test_update_com_falha_desfaz_a_transacao(db, banco):
+    banco.falhar_em = "UPDATE T_CULTURAS"
+
+    async def cenario():
+        async with db.transacao():
+            await db.executar_sql(INSERT, [1, "Soja"])
+            # update_cultura trata o erro e retorna False, mas a transação é desfeita
+            assert await db.update_cultura(1, desc_cultura="Trigo") is False
+            await db.create_sensor("S1", "UM", "Umidade", "Fab", "M1", None, 0, 0, 0, 100, "PC", 1)
+
+    with pytest.raises(DatabaseError):
+        asyncio.run(cenario())
+    assert banco.confirmados == []
+    assert banco.commits == 0
+
+
+def test_falha_tratada_em_subtarefa_do_gather_desfaz_a_transacao(db, banco):
+    banco.falhar_em = "DELETE FROM T_SENSORES"
+
+    async def cenario():
+        async with db.transacao():
+            await db.executar_sql(INSERT, [1, "Soja"])
+            await asyncio.gather(db.delete_sensor(1), db.read_cultura(1))
+
+    with pytest.raises(DatabaseError):
+        asyncio.run(cenario())
+    assert banco.confirmados == []
+
+
+def test_transacoes_aninhadas_usam_a_externa(db, banco):
+    async def cenario():
+        async with db.transacao():
+            await db.executar_sql(INSERT, [1, "Soja"])
+            async with db.transacao():
+                await db.executar_sql(INSERT, [2, "Milho"])
+
+    asyncio.run(cenario())
+    assert len(banco.confirmados) == 2
+    assert banco.commits == 1
+
+
+def test_gather_sobrepoe_as_consultas(db, banco):
+    async def cenario():
+        inicio = asyncio.get_running_loop().time()
+        await db.painel_cultura(1)
+        return asyncio.get_running_loop().time() - inicio
+
+    duracao = asyncio.run(cenario())
+    # As três consultas do painel esperam a "rede" ao mesmo tempo, não em série
+    assert banco.maximo_em_andamento == 3
+    assert duracao < 3 * LATENCIA
+
+
+def test_create_concorrentes_geram_codigos_distintos(db, banco):
+    async def cenario():
+        return await asyncio.gather(*(db.create_cultura(f"Cultura {i}", 10.0) for i in range(20)))
+
+    codigos = asyncio.run(cenario())
+    assert sorted(codigos) == list(range(1, 21))
+    assert len(banco.confirmados) == 20
+
+
+def test_update_escreve_so_as_colunas_alteradas(db, banco):
+    async def cenario():
+        await db.update_cultura(1, desc_cultura="Soja")
+        await db.update_cultura(2, desc_cultura="Milho")
+        await db.update_cultura(3, tamanho_cultura=12.5, data_prev_colheita="2025-12-01")
+
+    asyncio.run(cenario())
+    (sql_1, params_1), (sql_2, _), (sql_3, params_3) = banco.confirmados
+    assert sql_1 == "UPDATE T_CULTURAS SET desc_cultura = :desc_cultura WHERE cod_cultura = :cod_cultura"
+    assert params_1 == {"cod_cultura": 1, "desc_cultura": "Soja"}
+    # O comando de cada conjunto de colunas é gerado uma vez e reaproveitado
+    assert sql_2 is sql_1
+    assert sql_3 == ("UPDATE T_CULTURAS SET tamanho_cultura = :tamanho_cultura, "
+                     "data_prev_colheita = :data_prev_colheita WHERE cod_cultura = :cod_cultura")
+    assert set(params_3) == {"cod_cultura", "tamanho_cultura", "data_prev_colheita"}
+
+
+def test_create_usa_o_insert_do_mapeador(db, banco):
+    asyncio.run(db.create_cultura("Soja", 10.0))
+    [(sql, params)] = banco.confirmados
+    assert sql == obter_mapeador("T_CULTURAS").sql("inserir")
+    assert params["cod_cultura"] == 1
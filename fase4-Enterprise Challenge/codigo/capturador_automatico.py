@@ -1,9 +1,27 @@
-import serial
+import binascii
 import csv
+import struct
+import tempfile
+import threading
 import time
 import datetime
+import math
+import operator
+import heapq
+import importlib
+import json
+import queue
+import re
 import sys
 import os
+from collections import deque
+
+import difusao_registros
+
+try:
+    import serial
+except ImportError:
+    serial = None   # Só a captura pela porta serial precisa da pyserial (verificado em __main__)
 
 """
 Script Python para Geração Automática de CSV
@@ -14,6 +32,7 @@ FUNCIONALIDADES:
 - Interpreta comandos especiais do ESP32
 - Salva dados em tempo real
 - Gera alertas em arquivo separado
+- Publica registros e alertas ao vivo para outros consumidores (difusao_registros.py)
 
 COMO USAR:
 1. Execute este script: python capturador_automatico.py
@@ -30,27 +49,131 @@ ARQUIVOS GERADOS:
 PORTA_SERIAL = 'COM3'  # Altere para sua porta (COM3, COM4, /dev/ttyUSB0, etc.)
 BAUD_RATE = 115200
 PASTA_DESTINO = os.getcwd()  # Pasta atual
+INTERVALO_GRAVACAO_DISCO = 1.0      # Segundos máximos de linhas só no buffer (FLUSH_FILE grava na hora)
+
+# ===== LEITURA DA SERIAL =====
+TAMANHO_BLOCO_LEITURA = 64 * 1024   # Máximo de bytes lidos por chamada
+TAMANHO_MAXIMO_LINHA = 64 * 1024    # Linha sem '\n' além disso é descartada (ruído)
+INTERVALO_PROGRESSO = 1.0           # Segundos entre mensagens de progresso no console
+
+# ===== VERSÃO DO PROTOCOLO (CSV_AUTO_START:<versão>) =====
+# 1: cada amostra chega duas vezes (CSV_CMD:WRITE_DATA e DATA:), firmware original
+# 2: mensagem única; o capturador confirma com HOST:2 e o ESP32 deixa de enviar DATA:
+# 3: controle de fluxo; o capturador concede CRED:<n> e confirma com ACK:<seq> os
+#    comandos CSV_CMDS:<seq>:..., e o ESP32 dispensa a pausa fixa de 50 ms
+# 4: canal de controle; o capturador envia SET:INTERVALO:<ms>, SET:CANAL:<canal>:<0|1>
+#    e BURST:<amostras>:<ms>, e o ESP32 responde com CFG:<configuração atual>
+# Em qualquer versão, SYNC faz o ESP32 reanunciar a sessão (CSV_AUTO_START, negociação,
+# CREATE_FILE e WRITE_HEADER) para um capturador que conectou no meio dela
+VERSAO_PROTOCOLO = 4
+JANELA_CREDITOS = 32                # Comandos que o ESP32 pode enviar sem confirmação
+INTERVALO_RECONCESSAO = 1.0         # Segundos entre novos CRED: para um ESP32 que voltou à pausa fixa
+
+# ===== AMOSTRAGEM ADAPTATIVA (versão 4) =====
+ADAPTAR_AMOSTRAGEM = True           # False mantém o intervalo do firmware (3 s)
+CANAIS_INICIAIS = {"DHT": True, "LDR": True, "MPU": True}   # Canais desligados são enviados vazios
+# Intervalo de leitura (ms) por nível
+INTERVALOS_AMOSTRAGEM = {"ECONOMIA": 10000, "NORMAL": 3000, "ATENCAO": 1000, "CRITICO": 250}
+NIVEIS_AMOSTRAGEM = ("ECONOMIA", "NORMAL", "ATENCAO", "CRITICO")
+# Limites iguais aos de analisarStatus() no prog1.cpp
+LIMITE_TEMPERATURA_ALERTA = 25.0
+LIMITE_TEMPERATURA_CRITICO = 35.0
+LIMITE_VIBRACAO_ALERTA = 2.0
+LIMITE_VIBRACAO_CRITICO = 5.0
+JANELA_TENDENCIA = 10               # Amostras usadas na regressão da tendência
+HORIZONTE_TENDENCIA = 5             # Amostras à frente na projeção
+AMOSTRAS_PARA_REDUZIR = 5           # Amostras mais calmas seguidas antes de reduzir a taxa
+AMOSTRAS_PARA_ECONOMIA = 20         # Amostras NORMAL seguidas antes do modo econômico
+RAJADA_CRITICA = (20, 100)          # (amostras, ms) pedidas ao entrar no nível CRITICO
+
+# ===== ALINHAMENTO DO RELÓGIO =====
+# O timestamp do ESP32 é o millis() desde o boot; a coluna data_hora traz a hora
+# do computador equivalente (em UTC), estimada por regressão sobre as horas de recepção
+COLUNA_DATA_HORA = "data_hora"
+ESQUECIMENTO_RELOGIO = 0.999        # Peso das amostras antigas na regressão (~1000 amostras de memória)
+DESVIO_MAXIMO_RELOGIO = 0.01        # Deriva aceita entre os relógios (1%); cristais ficam abaixo de 0,01%
+TOLERANCIA_REINICIO_MS = 1000       # millis() que volta mais que isso indica reinício do ESP32
+
+# ===== SEGMENTOS DE CAPTURA =====
+# Cada CREATE_FILE abre uma captura em segmentos numerados (<nome>_000001.csv, ...)
+# que nunca são sobrescritos; os segmentos fechados são comprimidos em segundo plano
+ROTACIONAR_SEGMENTOS = True         # False: um único CSV por CREATE_FILE (comportamento original)
+TAMANHO_MAXIMO_SEGMENTO = 16 * 1024 * 1024   # Bytes de CSV por segmento
+DURACAO_MAXIMA_SEGMENTO = 3600      # Segundos por segmento
+COMPRIMIR_SEGMENTOS = True
+INTERVALO_INDICE = 512              # Linhas por bloco do índice esparso (e por quadro comprimido)
+
+# ===== DIFUSÃO LOCAL (difusao_registros.py) =====
+DIFUNDIR_REGISTROS = True           # Publica registros e alertas para consumidores ao vivo
+ENDERECO_DIFUSAO = difusao_registros.ENDERECO_PADRAO
+
+# ===== PROTOCOLO BINÁRIO (negociado com o ESP32) =====
+USAR_PROTOCOLO_BINARIO = True       # False mantém sempre o protocolo texto
+PROTOCOLO_BINARIO = "BIN1"
+TIPO_TEXTO = 1                      # Payload: linha de texto (LOG, ALERT, CSV_CMD...)
+TIPO_AMOSTRA = 2                    # Payload: AMOSTRA_BINARIA
+CABECALHO_QUADRO = struct.Struct('<BH')   # tipo, sequência
+CRC_QUADRO = struct.Struct('<H')
+# timestamp (ms), temperatura (centésimos °C), umidade (centésimos %), luminosidade (%),
+# aceleração X/Y/Z (milésimos de g), rotação X/Y/Z (centésimos °/s), status
+# Canais desligados (versão 4) chegam com o valor máximo do tipo
+AMOSTRA_BINARIA = struct.Struct('<IhHB3h3hB')
+AUSENTE_I16 = -32768
+AUSENTE_U16 = 0xFFFF
+AUSENTE_U8 = 0xFF
+STATUS_AMOSTRA = ("NORMAL", "ALERTA", "CRITICO")
+# Maior quadro do prog1.cpp: payload (240) + tipo, sequência e CRC (5) + COBS (2) + 0x00
+TAMANHO_MAXIMO_QUADRO = 248
+# Conexão aberta no meio de uma sessão (ESP32 já negociado): o capturador pede
+# SYNC e o ESP32 reanuncia CSV_AUTO_START, o arquivo e o cabeçalho
+INTERVALO_SINCRONIZACAO = 5.0       # Segundos entre pedidos de SYNC sem resposta
 
 # ===== VARIÁVEIS GLOBAIS =====
 arquivo_csv_atual = None
 writer_csv = None
 arquivo_alertas = None
+registros_salvos = 0
+sistema_iniciado = False
+versao_protocolo = 1                # Versão combinada com o ESP32 conectado
+comandos_processados = 0
+ultimo_progresso = 0.0
+ultima_gravacao_disco = 0.0
+canal_controle = None
+compressor = None                   # CompressorSegmentos (criado no primeiro segmento fechado)
+encaminhar_comando = None           # supervisor_coleta.py: entrega os comandos ao processo gravador
+difusor = None                      # DifusorRegistros da captura
+colunas_atuais = None               # Cabeçalho do CSV atual (chaves dos registros publicados)
+dispositivo_atual = None            # supervisor_coleta.py: nome do dispositivo nas mensagens publicadas
 
 def processar_comando_csv(comando, dados=""):
     """Processa comandos CSV enviados pelo ESP32"""
-    global arquivo_csv_atual, writer_csv, arquivo_alertas
+    global arquivo_csv_atual, writer_csv, arquivo_alertas, comandos_processados, colunas_atuais
     
+    comandos_processados += 1
+    if encaminhar_comando and comando != "WRITE_DATA":
+        encaminhar_comando(comando, dados)
+        return
     try:
         if comando == "CREATE_FILE":
+            # ESP32 reiniciado: encerra a captura anterior
+            if arquivo_csv_atual:
+                arquivo_csv_atual.close()
+            if arquivo_alertas:
+                arquivo_alertas.close()
+            
             # Criar arquivo CSV
-            caminho_arquivo = os.path.join(PASTA_DESTINO, dados)
-            arquivo_csv_atual = open(caminho_arquivo, 'w', newline='', encoding='utf-8')
-            writer_csv = csv.writer(arquivo_csv_atual)
+            if ROTACIONAR_SEGMENTOS:
+                arquivo_csv_atual = writer_csv = ArquivoSegmentado(PASTA_DESTINO, dados)
+                caminho_arquivo = os.path.join(PASTA_DESTINO, f"{arquivo_csv_atual.base}_{arquivo_csv_atual.numero + 1:06d}.csv")
+            else:
+                caminho_arquivo = os.path.join(PASTA_DESTINO, dados)
+                arquivo_csv_atual = open(caminho_arquivo, 'w', newline='', encoding='utf-8')
+                writer_csv = csv.writer(arquivo_csv_atual)
             
-            # Criar arquivo de alertas
+            # Criar arquivo de alertas (acrescenta: os alertas anteriores são mantidos)
             nome_alertas = dados.replace('.csv', '_alertas.txt')
             caminho_alertas = os.path.join(PASTA_DESTINO, nome_alertas)
-            arquivo_alertas = open(caminho_alertas, 'w', encoding='utf-8')
+            arquivo_alertas = open(caminho_alertas, 'a', encoding='utf-8')
             arquivo_alertas.write(f"=== ALERTAS DO SISTEMA - {datetime.datetime.now()} ===\n\n")
             arquivo_alertas.flush()
             
@@ -59,29 +182,23 @@ def processar_comando_csv(comando, dados=""):
             
         elif comando == "WRITE_HEADER":
             # Escrever cabeçalho
+            colunas_atuais = dados.split(',') + [COLUNA_DATA_HORA]
             if writer_csv:
-                colunas = dados.split(',')
-                writer_csv.writerow(colunas)
+                writer_csv.writerow(colunas_atuais)
                 arquivo_csv_atual.flush()
-                print(f"📋 Cabeçalho CSV escrito: {len(colunas)} colunas")
+                print(f"📋 Cabeçalho CSV escrito: {len(colunas_atuais)} colunas")
                 
         elif comando == "WRITE_DATA":
-            # Escrever dados
-            if writer_csv:
-                linha_dados = dados.split(',')
-                writer_csv.writerow(linha_dados)
-                arquivo_csv_atual.flush()
-                
-                # Mostrar progresso
-                timestamp = linha_dados[0] if linha_dados else "N/A"
-                temp = linha_dados[1] if len(linha_dados) > 1 else "N/A"
-                status = linha_dados[-1] if linha_dados else "N/A"
-                print(f"📊 Dados salvos: {timestamp}ms | {temp}°C | Status: {status}")
+            # Escrever dados (na versão 2 esta é a única mensagem da amostra)
+            if versao_protocolo >= 2:
+                contar_registro()
+            gravar_linha_dados(dados.split(','))
                 
         elif comando == "WRITE_ALERT":
             # Escrever alerta
+            timestamp_atual = formatar_data_hora(time.time())  # Mesmo formato da coluna data_hora
+            publicar("alerta", data_hora=timestamp_atual, mensagem=dados)
             if arquivo_alertas:
-                timestamp_atual = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 arquivo_alertas.write(f"[{timestamp_atual}] {dados}\n")
                 arquivo_alertas.flush()
                 print(f"🚨 ALERTA REGISTRADO: {dados}")
@@ -97,7 +214,1236 @@ def processar_comando_csv(comando, dados=""):
     except Exception as e:
         print(f"❌ Erro ao processar comando {comando}: {e}")
 
+def mostrar_progresso():
+    """Indica se já passou INTERVALO_PROGRESSO desde a última mensagem de progresso"""
+    global ultimo_progresso
+    agora = time.monotonic()
+    if agora - ultimo_progresso < INTERVALO_PROGRESSO:
+        return False
+    ultimo_progresso = agora
+    return True
+
+def descarregar_periodicamente():
+    """Grava o buffer do CSV no disco no máximo a cada INTERVALO_GRAVACAO_DISCO (não a cada linha)"""
+    global ultima_gravacao_disco
+    agora = time.monotonic()
+    if agora - ultima_gravacao_disco >= INTERVALO_GRAVACAO_DISCO:
+        ultima_gravacao_disco = agora
+        if arquivo_csv_atual:
+            arquivo_csv_atual.flush()
+
+def texto(payload):
+    """Decodifica um payload; bytes inválidos viram o caractere de substituição sem perder o restante do registro"""
+    return str(payload, 'utf-8', 'replace').strip()
+
+def contar_registro():
+    global registros_salvos
+    registros_salvos += 1
+
+def formatar_data_hora(instante):
+    """
+    Hora UTC com milissegundos e o deslocamento (+00:00). A ordem alfabética é a
+    ordem cronológica mesmo na volta do horário de verão, quando a hora local se repete
+    """
+    return datetime.datetime.fromtimestamp(instante, datetime.timezone.utc).isoformat(sep=' ', timespec='milliseconds')
+
+def data_hora_alinhada(linha_dados):
+    """Coluna data_hora: hora do computador equivalente ao millis() da amostra"""
+    try:
+        millis = int(linha_dados[0])
+    except (IndexError, ValueError):
+        return ""
+    return formatar_data_hora(canal_controle.relogio.alinhar(millis, canal_controle.leitor.recebido))
+
+def publicar(tipo, **campos):
+    """Entrega uma mensagem aos consumidores ao vivo (sem assinantes não custa nada)"""
+    if difusor:
+        if dispositivo_atual:
+            campos["dispositivo"] = dispositivo_atual
+        difusor.publicar(tipo, **campos)
+
+def gravar_linha_dados(linha_dados):
+    """Grava uma linha de dados no CSV atual (protocolo texto ou binário)"""
+    if canal_controle:
+        # Processo que lê a porta (no supervisor_coleta.py o gravador recebe a linha já alinhada)
+        if canal_controle.politica:
+            canal_controle.politica.observar_linha(linha_dados)
+        linha_dados.append(data_hora_alinhada(linha_dados))
+    
+    if encaminhar_comando:
+        encaminhar_comando("WRITE_DATA", ",".join(linha_dados))
+        return
+    
+    if difusor:
+        # Sem cabeçalho conhecido, as colunas são identificadas pela posição ("0", "1", ...)
+        if colunas_atuais and len(colunas_atuais) == len(linha_dados):
+            colunas = colunas_atuais
+        else:
+            colunas = [str(indice) for indice in range(len(linha_dados))]
+        publicar("dados", registro=dict(zip(colunas, linha_dados)))
+    
+    if writer_csv:
+        writer_csv.writerow(linha_dados)
+        descarregar_periodicamente()
+        
+        # Mostrar progresso (limitado para não travar a captura no console)
+        if mostrar_progresso():
+            timestamp = linha_dados[0] if linha_dados else "N/A"
+            temp = linha_dados[1] if len(linha_dados) > 1 else "N/A"
+            status = linha_dados[-2] if len(linha_dados) > 1 else "N/A"
+            print(f"📊 Dados salvos: {timestamp}ms | {temp}°C | Status: {status} | Total: {registros_salvos}")
+
+# ===== TRATAMENTO DAS MENSAGENS =====
+def tratar_inicio(payload):
+    """CSV_AUTO_START[:versão]: sem versão é o firmware original (versão 1)"""
+    global sistema_iniciado, versao_protocolo
+    sistema_iniciado = True
+    versao_dispositivo = texto(payload)
+    versao_protocolo = min(int(versao_dispositivo), VERSAO_PROTOCOLO) if versao_dispositivo.isdigit() else 1
+    if canal_controle:
+        canal_controle.relogio.reiniciar()   # millis() recomeça do zero
+    if versao_protocolo >= 2 and canal_controle:
+        canal_controle.enviar(f"HOST:{versao_protocolo}")
+    if versao_protocolo >= 3 and canal_controle:
+        canal_controle.conceder_creditos()
+    if versao_protocolo >= 4 and canal_controle:
+        for canal, ativo in CANAIS_INICIAIS.items():
+            if not ativo:
+                canal_controle.definir_canal(canal, False)
+        if ADAPTAR_AMOSTRAGEM:
+            canal_controle.politica = PoliticaAmostragem(canal_controle)
+    print(f"🎯 Sistema ESP32 detectado e inicializado! (protocolo versão {versao_protocolo})")
+
+def solicitar_sincronizacao():
+    """Mensagem de uma sessão iniciada antes do capturador: o ESP32 reanuncia arquivo, cabeçalho e protocolo"""
+    if canal_controle and not sistema_iniciado:
+        canal_controle.sincronizar()
+
+def tratar_comando_csv(payload):
+    solicitar_sincronizacao()
+    if versao_protocolo >= 3 and canal_controle:
+        canal_controle.reconceder_creditos()
+    comando, _, dados = texto(payload).partition(':')
+    processar_comando_csv(comando, dados)
+
+def tratar_comando_sequenciado(payload):
+    """CSV_CMDS:<seq>:<COMANDO>:<dados> (versão 3): processa e agenda a confirmação"""
+    solicitar_sincronizacao()
+    sequencia, _, resto = texto(payload).partition(':')
+    comando, _, dados = resto.partition(':')
+    processar_comando_csv(comando, dados)
+    if canal_controle and sequencia.isdigit():
+        canal_controle.confirmar_ate = int(sequencia)
+
+def tratar_log(payload):
+    print(f"ℹ️  {texto(payload)}")
+
+def tratar_dados(payload):
+    # Versão 1: a cópia DATA: só serve para a contagem (o payload não é decodificado).
+    # Na versão 2 o registro já foi contado pelo WRITE_DATA.
+    if versao_protocolo < 2:
+        contar_registro()
+
+def tratar_alerta(payload):
+    print(f"🚨 {texto(payload)}")
+
+def tratar_capacidades(payload):
+    """O ESP32 anuncia os protocolos suportados; aceita o binário se estiver habilitado"""
+    capacidades = texto(payload).split(',')
+    print(f"🧩 Protocolos do ESP32: {', '.join(capacidades)}")
+    if not canal_controle:
+        return
+    if USAR_PROTOCOLO_BINARIO and PROTOCOLO_BINARIO in capacidades:
+        canal_controle.enviar(f"MODE:{PROTOCOLO_BINARIO}")
+    else:
+        canal_controle.enviar("MODE:TEXT")  # Recusa explícita: o ESP32 não espera o timeout
+
+def tratar_modo(payload):
+    """Confirmação do ESP32: a partir daqui o fluxo chega em quadros binários"""
+    if texto(payload) == PROTOCOLO_BINARIO and canal_controle:
+        canal_controle.leitor.protocolo = ProtocoloBinario()
+        print("🔒 Protocolo binário ativado (COBS + CRC16)")
+
+def tratar_configuracao(payload):
+    """CFG:INTERVALO=<ms>,CANAIS=<máscara>,RAJADA=<n>: estado atual do ESP32 após um comando"""
+    configuracao = dict(item.partition('=')[::2] for item in texto(payload).split(',') if '=' in item)
+    if canal_controle:
+        canal_controle.configuracao = configuracao
+    print(f"⚙️  Configuração do ESP32: {configuracao}")
+
+def valor_ou_vazio(valor, ausente, escala, casas):
+    return "" if valor == ausente else f"{valor / escala:.{casas}f}"
+
+def tratar_amostra(amostra):
+    """Amostra do protocolo binário: equivale ao WRITE_DATA + DATA do protocolo texto"""
+    timestamp, temperatura, umidade, luminosidade, ax, ay, az, gx, gy, gz, status = amostra
+    solicitar_sincronizacao()
+    contar_registro()
+    gravar_linha_dados([
+        str(timestamp), valor_ou_vazio(temperatura, AUSENTE_I16, 100, 2), valor_ou_vazio(umidade, AUSENTE_U16, 100, 2),
+        "" if luminosidade == AUSENTE_U8 else str(luminosidade),
+        *(valor_ou_vazio(eixo, AUSENTE_I16, 1000, 3) for eixo in (ax, ay, az)),
+        *(valor_ou_vazio(eixo, AUSENTE_I16, 100, 2) for eixo in (gx, gy, gz)),
+        STATUS_AMOSTRA[status] if status < len(STATUS_AMOSTRA) else "DESCONHECIDO"
+    ])
+
+# Prefixo (bytes antes do primeiro ':') -> tratador do payload
+TRATADORES = {
+    b"CSV_AUTO_START": tratar_inicio,
+    b"CSV_CMD": tratar_comando_csv,
+    b"CSV_CMDS": tratar_comando_sequenciado,
+    b"LOG": tratar_log,
+    b"DATA": tratar_dados,
+    b"ALERT": tratar_alerta,
+    b"CAPS": tratar_capacidades,
+    b"MODE_OK": tratar_modo,
+    b"CFG": tratar_configuracao,
+}
+
+def despachar_linha(buffer, visao, inicio, fim, tratadores=TRATADORES):
+    """Encaminha a linha buffer[inicio:fim] ao tratador do seu prefixo, sem copiar o payload"""
+    separador = buffer.find(b':', inicio, fim)
+    if separador < 0:
+        separador = fim
+    tratador = tratadores.get(bytes(visao[inicio:separador]))
+    if tratador:
+        tratador(visao[min(separador + 1, fim):fim])
+
+# ===== PROTOCOLO BINÁRIO =====
+def crc16(dados, crc=0xFFFF):
+    """CRC-16/CCITT-FALSE (polinômio 0x1021, início 0xFFFF), o mesmo do prog1.cpp"""
+    return binascii.crc_hqx(dados, crc)
+
+def codificar_cobs(dados):
+    """Codifica em COBS: o resultado não contém 0x00, usado como delimitador do quadro"""
+    saida = bytearray(b'\x00')
+    posicao_codigo = 0
+    for byte in dados:
+        if byte:
+            saida.append(byte)
+        if not byte or len(saida) - posicao_codigo == 0xFF:
+            saida[posicao_codigo] = len(saida) - posicao_codigo
+            posicao_codigo = len(saida)
+            saida.append(0)
+    saida[posicao_codigo] = len(saida) - posicao_codigo
+    return bytes(saida)
+
+def decodificar_cobs(dados):
+    """Decodifica um quadro COBS (sem o delimitador); retorna None se estiver malformado"""
+    saida = bytearray()
+    tamanho = len(dados)
+    posicao = 0
+    while posicao < tamanho:
+        codigo = dados[posicao]
+        if codigo == 0 or posicao + codigo > tamanho:
+            return None
+        saida += dados[posicao + 1:posicao + codigo]
+        posicao += codigo
+        if codigo < 0xFF and posicao < tamanho:
+            saida.append(0)
+    return saida
+
+def decodificar_quadro(dados):
+    """Quadro decodificado (tipo, sequência, payload, CRC) ou None se o COBS ou o CRC forem inválidos"""
+    quadro = decodificar_cobs(dados)
+    if (quadro is None or len(quadro) < CABECALHO_QUADRO.size + CRC_QUADRO.size
+            or crc16(memoryview(quadro)[:-CRC_QUADRO.size]) != CRC_QUADRO.unpack_from(quadro, len(quadro) - CRC_QUADRO.size)[0]):
+        return None
+    return quadro
+
+def montar_quadro(tipo, sequencia, payload):
+    """Monta um quadro completo (cabeçalho + payload + CRC, em COBS e com o 0x00 final)"""
+    corpo = CABECALHO_QUADRO.pack(tipo, sequencia) + payload
+    return codificar_cobs(corpo + CRC_QUADRO.pack(crc16(corpo))) + b'\x00'
+
+# ===== PROTOCOLOS =====
+class ProtocoloTexto:
+    """Linhas ASCII terminadas em '\n' (protocolo original do prog1.cpp)"""
+
+    delimitador = b'\n'
+
+    def __init__(self, tratadores=TRATADORES):
+        self.tratadores = tratadores
+
+    def despachar(self, buffer, visao, inicio, fim):
+        if fim > inicio and buffer[fim - 1] == 13:  # remove '\r'
+            fim -= 1
+        if fim > inicio:
+            despachar_linha(buffer, visao, inicio, fim, self.tratadores)
+
+class ProtocoloBinario:
+    """
+    Quadros binários terminados em 0x00: COBS(tipo, sequência, payload, CRC16).
+
+    Amostras chegam como struct compacta (TIPO_AMOSTRA); mensagens de texto
+    (LOG, ALERT, CSV_CMD) seguem como TIPO_TEXTO e usam os mesmos tratadores
+    do protocolo texto. Quadros corrompidos são descartados pelo CRC e lacunas
+    na sequência contam como quadros perdidos.
+    """
+
+    delimitador = b'\x00'
+
+    def __init__(self, tratadores=TRATADORES, tratar_amostra=tratar_amostra):
+        self.texto = ProtocoloTexto(tratadores)
+        self.tratar_amostra = tratar_amostra
+        self.proxima_sequencia = None
+        self.corrompidos = 0
+        self.perdidos = 0
+
+    def despachar(self, buffer, visao, inicio, fim):
+        if fim == inicio:
+            return
+        quadro = decodificar_quadro(visao[inicio:fim])
+        if quadro is None:
+            self.corrompidos += 1
+            if mostrar_progresso():
+                print(f"⚠️  Quadros corrompidos descartados: {self.corrompidos}")
+            return
+
+        tipo, sequencia = CABECALHO_QUADRO.unpack_from(quadro)
+        if self.proxima_sequencia is not None and sequencia != self.proxima_sequencia:
+            self.perdidos += (sequencia - self.proxima_sequencia) & 0xFFFF
+            print(f"⚠️  Lacuna na sequência: esperado {self.proxima_sequencia}, recebido {sequencia} "
+                  f"(perdidos: {self.perdidos})")
+        self.proxima_sequencia = (sequencia + 1) & 0xFFFF
+
+        inicio_payload = CABECALHO_QUADRO.size
+        fim_payload = len(quadro) - CRC_QUADRO.size
+        if tipo == TIPO_AMOSTRA and fim_payload - inicio_payload == AMOSTRA_BINARIA.size:
+            self.tratar_amostra(AMOSTRA_BINARIA.unpack_from(quadro, inicio_payload))
+        elif tipo == TIPO_TEXTO:
+            self.texto.despachar(quadro, memoryview(quadro), inicio_payload, fim_payload)
+
+# ===== ENQUADRAMENTO =====
+class LeitorLinhas:
+    """
+    Separa os quadros do fluxo serial diretamente em bytes.
+
+    Tudo o que estiver disponível na porta é lido de uma vez para um bloco
+    reutilizável; os quadros são localizados com find() pelo delimitador do
+    protocolo atual e entregues como fatias de memoryview, sem decodificar o
+    fluxo inteiro. Um byte inválido afeta apenas o payload em que aparece.
+    O protocolo pode ser trocado durante o processamento (negociação).
+    Use uma instância por porta.
+    """
+
+    def __init__(self, protocolo=None, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+        self.protocolo = protocolo or ProtocoloTexto()
+        self.buffer = bytearray()
+        self.bloco = bytearray(tamanho_bloco)
+        self.visao_bloco = memoryview(self.bloco)
+        self.linhas = 0
+        self.descartados = 0
+        self.recebido = time.time()     # Hora da última leitura (alinhamento do relógio)
+
+    def ler(self, ser):
+        """Lê os bytes pendentes (ou aguarda até o timeout por 1 byte) e os acumula no buffer"""
+        quantidade = min(max(ser.in_waiting, 1), len(self.bloco))
+        lidos = ser.readinto(self.visao_bloco[:quantidade]) or 0
+        if lidos:
+            self.recebido = time.time()
+        self.buffer += self.visao_bloco[:lidos]
+        return lidos
+
+    def alimentar(self, dados, recebido=None):
+        """Acrescenta bytes recebidos por outro meio (testes, arquivos de captura)"""
+        self.recebido = time.time() if recebido is None else recebido
+        self.buffer += dados
+
+    def processar(self):
+        """Entrega cada quadro completo ao protocolo atual e retorna quantos foram"""
+        buffer = self.buffer
+        inicio = 0
+        quantidade = 0
+        zero = -1   # Próximo 0x00 a partir de inicio no protocolo texto (len(buffer) se não houver)
+        with memoryview(buffer) as visao:
+            while True:
+                protocolo = self.protocolo
+                if protocolo.delimitador == b'\n':
+                    if zero < inicio:
+                        zero = buffer.find(b'\x00', inicio)
+                        if zero < 0:
+                            zero = len(buffer)
+                    fim = buffer.find(b'\n', inicio, zero)
+                    if fim < 0 and zero < len(buffer):
+                        # Linhas completas antes do 0x00 já entregues: o resto pode ser binário
+                        resultado, posicao = self._detectar_binario(visao, inicio, zero)
+                        if resultado == "binario":
+                            inicio = posicao
+                            continue
+                        if resultado == "aguardar":
+                            break
+                        zero = len(buffer)   # Ruído: segue como texto
+                        continue
+                else:
+                    fim = buffer.find(protocolo.delimitador, inicio)
+                if fim < 0:
+                    break
+                protocolo.despachar(buffer, visao, inicio, fim)
+                quantidade += 1
+                inicio = fim + 1
+
+        # Mantém só o quadro incompleto no buffer
+        if inicio:
+            del buffer[:inicio]
+        self._detectar_reinicio()
+        if len(buffer) > TAMANHO_MAXIMO_LINHA:
+            self.descartados += len(buffer)
+            del buffer[:]
+        self.linhas += quantidade
+        return quantidade
+
+    def _detectar_binario(self, visao, inicio, zero):
+        """
+        Fluxo binário sem negociação: capturador (ou leitor do supervisor_coleta.py)
+        reiniciado com o ESP32 já no modo binário.
+
+        O protocolo texto nunca tem 0x00. O trecho de inicio (depois da última
+        linha completa) até o primeiro 0x00 é o candidato a quadro; se ele for
+        parcial (leitura começou no meio de um quadro), vale o trecho seguinte,
+        entre dois 0x00. Um quadro com COBS e CRC válidos ativa o protocolo
+        binário a partir do começo desse quadro e pede SYNC ao ESP32.
+
+        Returns:
+            ("binario", início do quadro), ("aguardar", None) enquanto não houver
+            um trecho completo para validar, ou ("texto", None) para ruído
+            (trecho inválido ou longo demais para um quadro)
+        """
+        buffer = self.buffer
+        inicio_trecho, fim_trecho = inicio, zero
+        parcial_permitido = True
+        while True:
+            if fim_trecho > inicio_trecho:
+                if decodificar_quadro(visao[inicio_trecho:fim_trecho]) is not None:
+                    self.protocolo = ProtocoloBinario(self.protocolo.tratadores)
+                    print("🔒 Fluxo binário detectado sem negociação: protocolo binário ativado")
+                    solicitar_sincronizacao()
+                    return "binario", inicio_trecho
+                if not parcial_permitido:
+                    return "texto", None
+                parcial_permitido = False
+            proximo = buffer.find(b'\x00', fim_trecho + 1)
+            if proximo < 0:
+                if len(buffer) - fim_trecho <= TAMANHO_MAXIMO_QUADRO:
+                    return "aguardar", None
+                return "texto", None
+            inicio_trecho, fim_trecho = fim_trecho + 1, proximo
+
+    def _detectar_reinicio(self):
+        """Se o ESP32 reiniciar no modo binário, ele volta a falar texto: retorna ao protocolo texto"""
+        if isinstance(self.protocolo, ProtocoloTexto):
+            return
+        posicao = self.buffer.find(b"CSV_AUTO_START")
+        if posicao >= 0:
+            del self.buffer[:posicao]
+            self.protocolo = ProtocoloTexto(self.protocolo.texto.tratadores)
+            print("🔄 ESP32 reiniciado: voltando ao protocolo texto")
+            self.processar()
+
+class CanalControle:
+    """Porta serial e leitor de um dispositivo, usados pelos tratadores para responder ao ESP32"""
+
+    def __init__(self, ser, leitor):
+        self.ser = ser
+        self.leitor = leitor
+        self.confirmar_ate = None    # Último CSV_CMDS processado e ainda não confirmado
+        self.configuracao = {}       # Último CFG: recebido
+        self.politica = None         # PoliticaAmostragem (versão 4)
+        self.relogio = AlinhadorRelogio()
+        self.ultima_sincronizacao = -INTERVALO_SINCRONIZACAO
+        self.ultima_concessao = -INTERVALO_RECONCESSAO
+
+    def enviar(self, mensagem):
+        self.ser.write(mensagem.encode('utf-8') + b'\n')
+        self.ser.flush()
+
+    def sincronizar(self):
+        """Pede ao ESP32 que reanuncie a sessão (no máximo a cada INTERVALO_SINCRONIZACAO)"""
+        agora = time.monotonic()
+        if agora - self.ultima_sincronizacao >= INTERVALO_SINCRONIZACAO:
+            self.ultima_sincronizacao = agora
+            self.enviar("SYNC")
+            print("🔁 ESP32 já estava em sessão: pedindo o reanúncio (SYNC)")
+
+    def conceder_creditos(self, janela=JANELA_CREDITOS):
+        self.ultima_concessao = time.monotonic()
+        self.enviar(f"CRED:{janela}")
+
+    def reconceder_creditos(self):
+        """
+        CSV_CMD: sem sequência de um ESP32 versão 3+: um atraso nas confirmações
+        (disco, compressão) esgotou o TIMEOUT_CREDITO e ele voltou à pausa fixa
+        """
+        if time.monotonic() - self.ultima_concessao >= INTERVALO_RECONCESSAO:
+            self.conceder_creditos()
+
+    def confirmar(self):
+        """Confirma de uma vez (ACK cumulativo) os comandos processados na última leitura"""
+        if self.confirmar_ate is not None:
+            self.enviar(f"ACK:{self.confirmar_ate}")
+            self.confirmar_ate = None
+
+    def definir_intervalo(self, intervalo_ms):
+        self.enviar(f"SET:INTERVALO:{int(intervalo_ms)}")
+
+    def definir_canal(self, canal, ativo):
+        """canal: DHT (temperatura/umidade), LDR (luminosidade) ou MPU (aceleração/rotação)"""
+        self.enviar(f"SET:CANAL:{canal}:{int(bool(ativo))}")
+
+    def solicitar_rajada(self, amostras, intervalo_ms):
+        """Pede amostras leituras seguidas a cada intervalo_ms; depois o ESP32 volta ao intervalo atual"""
+        self.enviar(f"BURST:{int(amostras)}:{int(intervalo_ms)}")
+
+# ===== ALINHAMENTO DO RELÓGIO =====
+class AlinhadorRelogio:
+    """
+    Converte o millis() de um ESP32 na hora do computador.
+
+    Estima hora = deslocamento + inclinação × millis por mínimos quadrados
+    sobre as horas de recepção das amostras, com pesos que decaem
+    (ESQUECIMENTO_RELOGIO) para acompanhar a deriva do cristal. A inclinação
+    fica limitada a 1 ± DESVIO_MAXIMO_RELOGIO, o que evita estimativas
+    absurdas nas primeiras amostras, e a hora alinhada nunca volta para trás.
+    Se o millis() diminuir (ESP32 reiniciado sem o CSV_AUTO_START chegar),
+    a estimativa recomeça. O atraso médio da serial fica embutido no
+    deslocamento.
+    """
+
+    def __init__(self, esquecimento=ESQUECIMENTO_RELOGIO):
+        self.esquecimento = esquecimento
+        self.reinicios = 0
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.origem = None          # (millis, hora) da primeira amostra: mantém as somas pequenas
+        self.peso = self.soma_x = self.soma_y = self.soma_xx = self.soma_xy = 0.0
+        self.ultimo_millis = None
+        self.ultima_hora = None
+        self.inclinacao = 1.0
+
+    def alinhar(self, millis, recebido):
+        """Registra a amostra (millis, hora de recepção) e retorna a hora alinhada"""
+        if self.ultimo_millis is not None and millis < self.ultimo_millis - TOLERANCIA_REINICIO_MS:
+            self.reinicios += 1
+            print(f"🔄 millis() voltou de {self.ultimo_millis} para {millis}: ESP32 reiniciado, realinhando o relógio")
+            self.reiniciar()
+        if self.origem is None:
+            self.origem = (millis, recebido)
+        self.ultimo_millis = millis
+
+        x = (millis - self.origem[0]) / 1000
+        y = recebido - self.origem[1]
+        fator = self.esquecimento
+        self.peso = self.peso * fator + 1
+        self.soma_x = self.soma_x * fator + x
+        self.soma_y = self.soma_y * fator + y
+        self.soma_xx = self.soma_xx * fator + x * x
+        self.soma_xy = self.soma_xy * fator + x * y
+
+        media_x = self.soma_x / self.peso
+        media_y = self.soma_y / self.peso
+        variancia = self.soma_xx / self.peso - media_x * media_x
+        if variancia > 1e-6:
+            inclinacao = (self.soma_xy / self.peso - media_x * media_y) / variancia
+            self.inclinacao = min(max(inclinacao, 1 - DESVIO_MAXIMO_RELOGIO), 1 + DESVIO_MAXIMO_RELOGIO)
+        hora = self.origem[1] + media_y + self.inclinacao * (x - media_x)
+
+        if self.ultima_hora is not None and hora < self.ultima_hora:
+            hora = self.ultima_hora
+        self.ultima_hora = hora
+        return hora
+
+    @property
+    def deriva_ppm(self):
+        """Diferença de ritmo entre o relógio do ESP32 e o do computador, em partes por milhão"""
+        return (self.inclinacao - 1) * 1e6
+
+def cabecalho_csv(caminho):
+    with abrir_segmento(caminho) as arquivo:
+        return next(csv.reader(arquivo), [])
+
+def linhas_por_data_hora(caminhos, nome):
+    """
+    Linhas dos segmentos de um dispositivo, em sequência, com data_hora e o
+    dispositivo à frente (linhas sem data_hora são puladas). Abre um
+    segmento por vez.
+    """
+    for caminho in caminhos:
+        with abrir_segmento(caminho) as arquivo:
+            leitor = csv.reader(arquivo)
+            colunas = next(leitor, [])
+            if COLUNA_DATA_HORA not in colunas:
+                print(f"⚠️  {caminho} sem a coluna {COLUNA_DATA_HORA}: ignorado")
+                continue
+            indice = colunas.index(COLUNA_DATA_HORA)
+            for linha in leitor:
+                if len(linha) > indice and linha[indice]:
+                    yield [linha[indice], nome] + linha[:indice] + linha[indice + 1:]
+
+def mesclar_csvs(caminhos, destino, nomes=None):
+    """
+    Intercala os CSVs de vários dispositivos em um único CSV ordenado por data_hora.
+
+    caminhos: um arquivo por dispositivo ou a lista dos seus segmentos em
+    ordem (comprimidos ou não). Cada dispositivo já está em ordem (a
+    data_hora não volta), então heapq.merge lê uma linha de cada vez por
+    dispositivo, sem carregar nem ordenar o conjunto. A primeira coluna da
+    saída identifica o dispositivo. Retorna o número de linhas gravadas.
+    """
+    grupos = [[caminho] if isinstance(caminho, str) else list(caminho) for caminho in caminhos]
+    nomes = nomes or [os.path.basename(grupo[0]).split('.')[0] for grupo in grupos]
+    cabecalho = next((colunas for grupo in grupos for colunas in map(cabecalho_csv, grupo)
+                      if COLUNA_DATA_HORA in colunas), None)
+    fluxos = [linhas_por_data_hora(grupo, nome) for nome, grupo in zip(nomes, grupos)]
+
+    with open(destino, 'w', newline='', encoding='utf-8') as saida:
+        writer = csv.writer(saida)
+        if cabecalho is None:
+            return 0
+        indice = cabecalho.index(COLUNA_DATA_HORA)
+        writer.writerow([COLUNA_DATA_HORA, "dispositivo"] + cabecalho[:indice] + cabecalho[indice + 1:])
+        total = 0
+        for linha in heapq.merge(*fluxos, key=lambda linha: linha[0]):
+            writer.writerow(linha)
+            total += 1
+    print(f"🔀 {total} linhas de {len(fluxos)} dispositivos intercaladas em {destino}")
+    return total
+
+# ===== SEGMENTOS DE CAPTURA =====
+def escolher_compressao():
+    """Melhor compressor da biblioteca padrão disponível: zstd (Python 3.14+), lzma ou gzip"""
+    for extensao, modulo in ((".zst", "compression.zstd"), (".xz", "lzma"), (".gz", "gzip")):
+        try:
+            return extensao, importlib.import_module(modulo)
+        except ImportError:
+            continue
+
+EXTENSAO_COMPRESSAO, MODULO_COMPRESSAO = escolher_compressao()
+MODULOS_COMPRESSAO = {".zst": "compression.zstd", ".xz": "lzma", ".gz": "gzip"}
+
+def abrir_segmento(caminho):
+    """Abre um CSV para leitura, comprimido ou não (pela extensão)"""
+    extensao = os.path.splitext(caminho)[1]
+    if extensao in MODULOS_COMPRESSAO:
+        modulo = importlib.import_module(MODULOS_COMPRESSAO[extensao])
+        return modulo.open(caminho, 'rt', newline='', encoding='utf-8')
+    return open(caminho, newline='', encoding='utf-8')
+
+class Manifesto:
+    """
+    Índice JSON (<nome>_manifesto.json) dos segmentos de uma captura: arquivo
+    atual (comprimido ou não), linhas, bytes e o intervalo de data_hora e de
+    timestamp de cada um. Atualizado pela captura e pelo compressor; cada
+    gravação substitui o arquivo de uma vez (os.replace). Use abrir(): as
+    capturas seguidas de um dispositivo compartilham a mesma instância.
+    """
+
+    abertos = {}
+
+    @classmethod
+    def abrir(cls, caminho):
+        caminho = os.path.abspath(caminho)
+        if caminho not in cls.abertos:
+            cls.abertos[caminho] = cls(caminho)
+        return cls.abertos[caminho]
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.trava = threading.Lock()
+        self.dados = {"segmentos": []}
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                self.dados = json.load(arquivo)
+
+    def segmento(self, nome):
+        return next((segmento for segmento in self.dados["segmentos"] if segmento["segmento"] == nome), None)
+
+    def atualizar(self, **campos):
+        with self.trava:
+            self.dados.update(campos)
+            self._salvar()
+
+    def registrar(self, segmento):
+        with self.trava:
+            self.dados["segmentos"].append(dict(segmento))
+            self._salvar()
+
+    def atualizar_segmento(self, nome, **campos):
+        with self.trava:
+            self.segmento(nome).update(campos)
+            self._salvar()
+
+    def _salvar(self):
+        temporario = self.caminho + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.dados, arquivo, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.caminho)
+
+class CompressorSegmentos:
+    """Thread que comprime os segmentos fechados; a captura só enfileira o caminho"""
+
+    def __init__(self):
+        self.fila = queue.Queue()
+        self.pendentes = set()      # Caminhos na fila ou em compressão
+        self.thread = threading.Thread(target=self._executar, name="compressor", daemon=True)
+        self.thread.start()
+
+    def agendar(self, caminho, manifesto):
+        if caminho not in self.pendentes:
+            self.pendentes.add(caminho)
+            self.fila.put((caminho, manifesto))
+
+    def aguardar(self):
+        self.fila.join()
+
+    def _executar(self):
+        while True:
+            caminho, manifesto = self.fila.get()
+            try:
+                self.comprimir(caminho, manifesto)
+            except Exception as e:
+                print(f"❌ Erro ao comprimir {caminho}: {e}")
+            finally:
+                self.pendentes.discard(caminho)
+                self.fila.task_done()
+
+    @staticmethod
+    def comprimir(caminho, manifesto):
+        """
+        Comprime para um temporário, troca no manifesto e só então remove o CSV.
+
+        O cabeçalho e cada bloco do índice viram quadros independentes
+        concatenados (o arquivo continua legível por gzip/xz/zstd) e o
+        índice recebe a posição de cada quadro no arquivo comprimido.
+        """
+        destino = caminho + EXTENSAO_COMPRESSAO
+        temporario = destino + ".tmp"
+        indice = IndiceSegmento.carregar(caminho_indice(caminho)) if os.path.exists(caminho_indice(caminho)) else None
+        with open(caminho, 'rb') as origem, open(temporario, 'wb') as saida:
+            if indice is None or not indice.blocos:
+                saida.write(MODULO_COMPRESSAO.compress(origem.read()))   # Segmento sem índice
+            else:
+                saida.write(MODULO_COMPRESSAO.compress(origem.read(indice.blocos[0]["posicao"])))
+                for bloco in indice.blocos:
+                    origem.seek(bloco["posicao"])
+                    bloco["posicao_comprimida"] = saida.tell()
+                    saida.write(MODULO_COMPRESSAO.compress(origem.read(bloco["tamanho"])))
+                    bloco["tamanho_comprimido"] = saida.tell() - bloco["posicao_comprimida"]
+        os.replace(temporario, destino)
+        if indice is not None:
+            indice.salvar()
+        manifesto.atualizar_segmento(os.path.basename(caminho), arquivo=os.path.basename(destino),
+                                     bytes_comprimidos=os.path.getsize(destino))
+        os.remove(caminho)
+
+def agendar_compressao(caminho, manifesto):
+    global compressor
+    if compressor is None:
+        compressor = CompressorSegmentos()
+    compressor.agendar(caminho, manifesto)
+
+def aguardar_compressao():
+    """Espera os segmentos já fechados serem comprimidos (no encerramento)"""
+    if compressor and compressor.fila.unfinished_tasks:
+        print("🗜️  Aguardando a compressão dos segmentos...")
+        compressor.aguardar()
+
+def caminho_indice(caminho_segmento):
+    """dados_000001.csv -> dados_000001.indice.json"""
+    return re.sub(r'\.csv$', '', caminho_segmento) + '.indice.json'
+
+class IndiceSegmento:
+    """
+    Índice esparso de um segmento (<segmento>.indice.json).
+
+    As linhas são agrupadas em blocos de INTERVALO_INDICE: cada bloco guarda
+    a data_hora da primeira e da última linha, o timestamp da primeira, a
+    posição e o tamanho em bytes no CSV, o mínimo e o máximo das colunas
+    numéricas e a contagem por status. Uma consulta localiza os blocos da
+    janela por busca binária e descarta os que não podem satisfazer o filtro
+    sem lê-los. Enquanto o segmento está aberto o último bloco fica sem
+    tamanho (vai até o fim do arquivo).
+    """
+
+    def __init__(self, caminho, cabecalho, intervalo=INTERVALO_INDICE):
+        self.caminho = caminho
+        self.cabecalho = list(cabecalho)
+        self.intervalo = intervalo
+        self.aberto = True
+        self.blocos = []
+        self.salvo_em = 0.0
+        self.indice_data_hora = self.cabecalho.index(COLUNA_DATA_HORA) if COLUNA_DATA_HORA in self.cabecalho else None
+        self.indice_status = next((indice for indice, nome in enumerate(self.cabecalho) if nome.lower() == "status"), None)
+        self.numericas = [(indice, nome) for indice, nome in enumerate(self.cabecalho)
+                          if indice not in (self.indice_data_hora, self.indice_status)]
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        indice = cls(caminho, dados["cabecalho"], dados["intervalo"])
+        indice.aberto = dados["aberto"]
+        indice.blocos = dados["blocos"]
+        return indice
+
+    def registrar(self, linha, posicao):
+        """Inclui a linha que começa em posicao; retorna True se ela abriu um bloco novo"""
+        data_hora = linha[self.indice_data_hora] if self.indice_data_hora is not None and len(linha) > self.indice_data_hora else None
+        novo = not self.blocos or self.blocos[-1]["linhas"] >= self.intervalo
+        if novo:
+            if self.blocos:
+                self.blocos[-1]["tamanho"] = posicao - self.blocos[-1]["posicao"]
+            self.blocos.append({"inicio": data_hora, "fim": data_hora, "timestamp": linha[0] if linha else None,
+                                "posicao": posicao, "tamanho": None, "linhas": 0,
+                                "minimos": {}, "maximos": {}, "status": {}})
+        bloco = self.blocos[-1]
+        bloco["linhas"] += 1
+        bloco["fim"] = data_hora
+        minimos = bloco["minimos"]
+        maximos = bloco["maximos"]
+        for indice, nome in self.numericas:
+            try:
+                valor = float(linha[indice])
+            except (IndexError, ValueError):
+                continue
+            if nome not in minimos or valor < minimos[nome]:
+                minimos[nome] = valor
+            if nome not in maximos or valor > maximos[nome]:
+                maximos[nome] = valor
+        if self.indice_status is not None and len(linha) > self.indice_status:
+            status = linha[self.indice_status]
+            bloco["status"][status] = bloco["status"].get(status, 0) + 1
+        return novo
+
+    def fechar(self, tamanho_total):
+        if self.blocos:
+            self.blocos[-1]["tamanho"] = tamanho_total - self.blocos[-1]["posicao"]
+        self.aberto = False
+
+    def estatisticas(self):
+        """Mínimos, máximos e contagem por status do segmento inteiro (para o manifesto)"""
+        minimos, maximos, status = {}, {}, {}
+        for bloco in self.blocos:
+            for nome, valor in bloco["minimos"].items():
+                minimos[nome] = min(valor, minimos.get(nome, valor))
+            for nome, valor in bloco["maximos"].items():
+                maximos[nome] = max(valor, maximos.get(nome, valor))
+            for nome, quantidade in bloco["status"].items():
+                status[nome] = status.get(nome, 0) + quantidade
+        return {"minimos": minimos, "maximos": maximos, "status": status}
+
+    def salvar(self):
+        temporario = self.caminho + ".tmp"
+        # json.dumps usa o codificador em C (json.dump codifica em Python, por partes)
+        conteudo = json.dumps({"cabecalho": self.cabecalho, "intervalo": self.intervalo, "aberto": self.aberto,
+                               "blocos": self.blocos}, ensure_ascii=False)
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+        os.replace(temporario, self.caminho)
+        self.salvo_em = time.monotonic()
+
+class ArquivoSegmentado:
+    """
+    CSV de uma captura dividido em segmentos <nome>_000001.csv, _000002.csv...
+
+    Usado no lugar do arquivo e do csv.writer: a primeira linha recebida é
+    o cabeçalho, repetido no início de cada segmento. Um segmento é fechado
+    ao passar de TAMANHO_MAXIMO_SEGMENTO bytes ou DURACAO_MAXIMA_SEGMENTO
+    segundos, registrado no manifesto e enfileirado para compressão; o
+    próximo só é aberto na linha seguinte. Os números continuam os que já
+    existem na pasta e os segmentos são abertos com 'x', então uma nova
+    captura (ESP32 reiniciado) nunca sobrescreve a anterior. Segmentos que
+    ficaram sem comprimir (captura interrompida) são retomados ao abrir.
+    Cada segmento mantém um IndiceSegmento, salvo a cada bloco novo para
+    que consultas alcancem também o segmento aberto.
+    """
+
+    def __init__(self, pasta, nome, cabecalho=None, tamanho_maximo=TAMANHO_MAXIMO_SEGMENTO,
+                 duracao_maxima=DURACAO_MAXIMA_SEGMENTO, comprimir=COMPRIMIR_SEGMENTOS):
+        self.pasta = pasta
+        self.base = os.path.splitext(nome)[0]
+        self.tamanho_maximo = tamanho_maximo
+        self.duracao_maxima = duracao_maxima
+        self.comprimir = comprimir
+        self.padrao = re.compile(re.escape(self.base) + r'_(\d{6})\.csv')
+        self.manifesto = Manifesto.abrir(os.path.join(pasta, f"{self.base}_manifesto.json"))
+        self.escritor = csv.writer(self)
+        self.arquivo = None
+        self.segmento = None
+        self.indice = None
+        self.cabecalho = None
+        self.indice_data_hora = None
+        self.numero = max([int(self.padrao.match(nome).group(1)) for nome in os.listdir(pasta) if self.padrao.match(nome)]
+                          + [int(self.padrao.match(segmento["segmento"]).group(1)) for segmento in self.manifesto.dados["segmentos"]]
+                          + [0])
+        self.recuperar()
+        if cabecalho:
+            self.definir_cabecalho(cabecalho)
+
+    def recuperar(self):
+        """Registra e comprime os segmentos que uma captura interrompida deixou sem comprimir"""
+        for nome in sorted(os.listdir(self.pasta)):
+            if not self.padrao.fullmatch(nome):
+                continue
+            caminho = os.path.join(self.pasta, nome)
+            if compressor and caminho in compressor.pendentes:
+                continue  # Captura anterior deste processo: já está na fila
+            segmento = self.manifesto.segmento(nome)
+            if segmento is None:
+                self.manifesto.registrar(self.examinar(caminho))
+            elif segmento["arquivo"] != nome:
+                if os.path.exists(caminho):
+                    os.remove(caminho)  # Já comprimido; faltou apenas remover o CSV
+                continue
+            elif "indice" not in segmento and not os.path.exists(caminho_indice(caminho)):
+                self.manifesto.atualizar_segmento(nome, **self.examinar(caminho))  # Segmento anterior ao índice
+            if self.comprimir:
+                agendar_compressao(caminho, self.manifesto)
+
+    def examinar(self, caminho):
+        """Entrada do manifesto (e índice) de um segmento que não chegou a ser registrado"""
+        segmento = self._novo_segmento(os.path.basename(caminho))
+        indice = None
+        posicao = 0
+        with open(caminho, 'rb') as arquivo:
+            for bruta in arquivo:
+                linha = next(csv.reader([str(bruta, 'utf-8', 'replace')]), [])
+                if indice is None:
+                    indice = IndiceSegmento(caminho_indice(caminho), linha)
+                else:
+                    self._contar(segmento, linha, indice.indice_data_hora)
+                    indice.registrar(linha, posicao)
+                posicao += len(bruta)
+        segmento["bytes"] = posicao
+        if indice is not None:
+            indice.fechar(posicao)
+            indice.salvar()
+            segmento.update(indice=os.path.basename(indice.caminho), **indice.estatisticas())
+        return segmento
+
+    @staticmethod
+    def _novo_segmento(nome):
+        return {"segmento": nome, "arquivo": nome, "linhas": 0, "bytes": 0, "bytes_comprimidos": None,
+                "inicio": None, "fim": None, "timestamp_inicio": None, "timestamp_fim": None}
+
+    @staticmethod
+    def _contar(segmento, linha, indice_data_hora):
+        data_hora = linha[indice_data_hora] if indice_data_hora is not None and len(linha) > indice_data_hora else None
+        timestamp = linha[0] if linha else None
+        if segmento["linhas"] == 0:
+            segmento["inicio"], segmento["timestamp_inicio"] = data_hora, timestamp
+        segmento["fim"], segmento["timestamp_fim"] = data_hora, timestamp
+        segmento["linhas"] += 1
+
+    def definir_cabecalho(self, cabecalho):
+        self.cabecalho = list(cabecalho)
+        self.indice_data_hora = self.cabecalho.index(COLUNA_DATA_HORA) if COLUNA_DATA_HORA in self.cabecalho else None
+        self.manifesto.atualizar(base=self.base, cabecalho=self.cabecalho, compressao=EXTENSAO_COMPRESSAO)
+
+    def _abrir(self):
+        self.numero += 1
+        nome = f"{self.base}_{self.numero:06d}.csv"
+        self.arquivo = open(os.path.join(self.pasta, nome), 'x', newline='', encoding='utf-8')
+        self.segmento = self._novo_segmento(nome)
+        self.aberto_em = time.monotonic()
+        self.escritor.writerow(self.cabecalho)
+        self.indice = IndiceSegmento(caminho_indice(os.path.join(self.pasta, nome)), self.cabecalho)
+        self.manifesto.atualizar(aberto=nome)
+
+    def _fechar_segmento(self):
+        self.arquivo.close()
+        self.arquivo = None
+        caminho = os.path.join(self.pasta, self.segmento["segmento"])
+        if not self.segmento["linhas"]:
+            os.remove(caminho)  # Só o cabeçalho
+            self.manifesto.atualizar(aberto=None)
+            return
+        self.indice.fechar(self.segmento["bytes"])
+        self.indice.salvar()
+        self.segmento.update(indice=os.path.basename(self.indice.caminho), **self.indice.estatisticas())
+        self.manifesto.registrar(self.segmento)
+        self.manifesto.atualizar(aberto=None)
+        if self.comprimir:
+            agendar_compressao(caminho, self.manifesto)
+
+    def write(self, texto):
+        """Destino do csv.writer interno (uma chamada por linha); conta bytes, não caracteres"""
+        self.segmento["bytes"] += len(texto) if texto.isascii() else len(texto.encode('utf-8'))
+        return self.arquivo.write(texto)
+
+    def writerow(self, linha):
+        if self.cabecalho is None:
+            self.definir_cabecalho(linha)
+            return
+        if self.arquivo is None:
+            self._abrir()
+        posicao = self.segmento["bytes"]
+        self.escritor.writerow(linha)
+        self._contar(self.segmento, linha, self.indice_data_hora)
+        if (self.indice.registrar(linha, posicao)
+                and time.monotonic() - self.indice.salvo_em >= INTERVALO_GRAVACAO_DISCO):
+            # Blocos anteriores completos: visíveis para consultas (as linhas depois do
+            # último bloco salvo são lidas até o fim do arquivo)
+            self.arquivo.flush()
+            self.indice.salvar()
+        if (self.segmento["bytes"] >= self.tamanho_maximo
+                or time.monotonic() - self.aberto_em >= self.duracao_maxima):
+            self._fechar_segmento()
+
+    def flush(self):
+        if self.arquivo:
+            self.arquivo.flush()
+
+    def close(self):
+        """Fecha o segmento atual; a compressão continua em segundo plano (aguardar_compressao)"""
+        if self.arquivo:
+            self._fechar_segmento()
+
+# ===== POLÍTICA DE AMOSTRAGEM =====
+def projetar(valores, horizonte=HORIZONTE_TENDENCIA):
+    """Projeta o valor horizonte amostras à frente pela reta de mínimos quadrados da janela"""
+    n = len(valores)
+    if n < 2:
+        return valores[-1] if valores else None
+    # Σ(x - x̄)(y - ȳ) = Σxy - x̄·Σy e Σ(x - x̄)² = n(n² - 1)/12 para x = 0..n-1
+    media_x = (n - 1) / 2
+    covariancia = sum(map(operator.mul, range(n), valores)) - media_x * sum(valores)
+    variancia = n * (n * n - 1) / 12
+    inclinacao = covariancia / variancia
+    return valores[-1] + inclinacao * horizonte
+
+class PoliticaAmostragem:
+    """
+    Ajusta o intervalo de leitura do ESP32 conforme a tendência das amostras.
+
+    A temperatura e a vibração (módulo da aceleração, como em analisarStatus)
+    são projetadas HORIZONTE_TENDENCIA amostras à frente: a taxa sobe assim que
+    o status ou a projeção alcança os limites de ALERTA/CRITICO, antes de o
+    status mudar, e só desce depois de AMOSTRAS_PARA_REDUZIR amostras mais
+    calmas seguidas. Com tudo NORMAL por AMOSTRAS_PARA_ECONOMIA amostras o
+    intervalo passa ao modo econômico. Ao entrar no nível CRITICO é pedida
+    uma rajada de leituras.
+    """
+
+    def __init__(self, canal, intervalos=INTERVALOS_AMOSTRAGEM):
+        self.canal = canal
+        self.intervalos = intervalos
+        self.temperaturas = deque(maxlen=JANELA_TENDENCIA)
+        self.vibracoes = deque(maxlen=JANELA_TENDENCIA)
+        self.nivel = "NORMAL"              # Intervalo do firmware na inicialização
+        self.amostras_calmas = 0
+        self.amostras_normais = 0
+
+    def observar_linha(self, linha_dados):
+        """Extrai temperatura, aceleração e status de uma linha do CSV e aplica a política"""
+        def numero(indice):
+            try:
+                return float(linha_dados[indice])
+            except (IndexError, ValueError):
+                return None
+        eixos = [numero(indice) for indice in (4, 5, 6)]
+        vibracao = math.sqrt(sum(eixo * eixo for eixo in eixos)) if None not in eixos else None
+        return self.observar(numero(1), vibracao, linha_dados[-1] if linha_dados else "")
+
+    def classificar(self, temperatura, vibracao, status):
+        """Nível pedido pela amostra atual e pela tendência da janela"""
+        if temperatura is not None:
+            self.temperaturas.append(temperatura)
+        if vibracao is not None:
+            self.vibracoes.append(vibracao)
+        temperatura_projetada = projetar(self.temperaturas)
+        vibracao_projetada = projetar(self.vibracoes)
+
+        def acima(valor, limite):
+            return valor is not None and valor > limite
+
+        if (status == "CRITICO" or acima(temperatura_projetada, LIMITE_TEMPERATURA_CRITICO)
+                or acima(vibracao_projetada, LIMITE_VIBRACAO_CRITICO)):
+            nivel = "CRITICO"
+        elif (status == "ALERTA" or acima(temperatura_projetada, LIMITE_TEMPERATURA_ALERTA)
+                or acima(vibracao_projetada, LIMITE_VIBRACAO_ALERTA)):
+            nivel = "ATENCAO"
+        else:
+            nivel = "NORMAL"
+
+        self.amostras_normais = self.amostras_normais + 1 if nivel == "NORMAL" and status == "NORMAL" else 0
+        if self.amostras_normais >= AMOSTRAS_PARA_ECONOMIA:
+            return "ECONOMIA"
+        return nivel
+
+    def observar(self, temperatura, vibracao, status):
+        """Processa uma amostra; retorna o novo intervalo (ms) se ele mudou, senão None"""
+        pedido = self.classificar(temperatura, vibracao, status)
+        atual = NIVEIS_AMOSTRAGEM.index(self.nivel)
+        novo = NIVEIS_AMOSTRAGEM.index(pedido)
+        if novo > atual:
+            self.amostras_calmas = 0          # Subir a taxa é imediato
+        elif novo < atual:
+            self.amostras_calmas += 1         # Descer só após várias amostras calmas
+            if self.amostras_calmas < AMOSTRAS_PARA_REDUZIR and pedido != "ECONOMIA":
+                return None
+            self.amostras_calmas = 0
+        else:
+            self.amostras_calmas = 0
+            return None
+
+        anterior = self.nivel
+        self.nivel = pedido
+        intervalo = self.intervalos[pedido]
+        self.canal.definir_intervalo(intervalo)
+        if pedido == "CRITICO":
+            self.canal.solicitar_rajada(*RAJADA_CRITICA)
+        print(f"🎚️  Amostragem {anterior} → {pedido}: intervalo de {intervalo} ms")
+        return intervalo
+
+def medir_vazao(total_linhas=500000):
+    """Mede quadros/s do enquadramento e despacho com tratadores vazios (sem porta serial)"""
+    contagem = dict.fromkeys(TRATADORES, 0)
+    tratadores = {prefixo: (lambda payload, p=prefixo: contagem.__setitem__(p, contagem[p] + 1))
+                  for prefixo in TRATADORES}
+    amostra_texto = (b"DATA:123456,25.4,60.1,0.02,OK\r\n"
+                     b"CSV_CMD:WRITE_DATA:123456,25.4,60.1,0.02,OK\r\n"
+                     b"LOG:Leitura concluida\r\n"
+                     b"ALERT:Temperatura alta \xff\r\n")
+    amostra_binaria = AMOSTRA_BINARIA.pack(123456, 2540, 6010, 52, 123, -45, 987, 123, -45, 12, 0)
+    fluxos = {
+        "texto": (ProtocoloTexto(tratadores), amostra_texto * (total_linhas // 4)),
+        # Sequência contínua para não acusar lacunas
+        "binário": (ProtocoloBinario(tratadores, tratar_amostra=lambda amostra: None),
+                    b"".join(montar_quadro(TIPO_AMOSTRA, sequencia & 0xFFFF, amostra_binaria)
+                             for sequencia in range(total_linhas)))
+    }
+
+    vazoes = {}
+    for nome, (protocolo, fluxo) in fluxos.items():
+        leitor = LeitorLinhas(protocolo)
+        inicio = time.perf_counter()
+        for posicao in range(0, len(fluxo), TAMANHO_BLOCO_LEITURA):
+            leitor.alimentar(fluxo[posicao:posicao + TAMANHO_BLOCO_LEITURA])
+            leitor.processar()
+        duracao = time.perf_counter() - inicio
+
+        vazoes[nome] = leitor.linhas / duracao
+        bytes_por_quadro = len(fluxo) / max(leitor.linhas, 1)
+        print(f"⚡ Protocolo {nome}: {leitor.linhas} quadros em {duracao:.3f}s: "
+              f"{vazoes[nome]:,.0f} quadros/s ({bytes_por_quadro:.0f} bytes/quadro)")
+    return vazoes
+
+class PortaDescarte:
+    """Porta que descarta o que o capturador envia ao ESP32 (benchmark do caminho completo)"""
+
+    def write(self, dados):
+        pass
+
+    def flush(self):
+        pass
+
+def medir_vazao_completa(total_linhas=100000):
+    """
+    Mede linhas/s pelos tratadores reais: enquadramento, alinhamento do relógio,
+    política de amostragem, arquivo segmentado com índice e difusão (sem assinantes)
+    """
+    global PASTA_DESTINO, canal_controle
+    pasta_original = PASTA_DESTINO
+    cabecalho = "Timestamp,Temperatura,Umidade,Luminosidade,Accel_X,Accel_Y,Accel_Z,Gyro_X,Gyro_Y,Gyro_Z,Status"
+    fluxo = bytearray(f"CSV_AUTO_START:{VERSAO_PROTOCOLO}\r\nCSV_CMDS:1:CREATE_FILE:vazao.csv\r\n"
+                      f"CSV_CMDS:2:WRITE_HEADER:{cabecalho}\r\n".encode())
+    for numero in range(total_linhas):
+        fluxo += (f"CSV_CMDS:{numero + 3}:WRITE_DATA:{numero * 100},23.45,47.20,52,0.123,-0.045,0.987,"
+                  f"1.23,-0.45,0.12,NORMAL\r\n").encode()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        PASTA_DESTINO = pasta
+        leitor = LeitorLinhas()
+        canal_controle = CanalControle(PortaDescarte(), leitor)
+        registros_antes = registros_salvos
+        try:
+            inicio = time.perf_counter()
+            for posicao in range(0, len(fluxo), TAMANHO_BLOCO_LEITURA):
+                leitor.alimentar(fluxo[posicao:posicao + TAMANHO_BLOCO_LEITURA])
+                leitor.processar()
+                canal_controle.confirmar()
+            duracao = time.perf_counter() - inicio
+        finally:
+            processar_comando_csv("FLUSH_FILE")
+            arquivo_csv_atual.close()
+            arquivo_alertas.close()
+            aguardar_compressao()
+            PASTA_DESTINO = pasta_original
+            canal_controle = None
+
+    vazao = (registros_salvos - registros_antes) / duracao
+    print(f"⚡ Caminho completo: {registros_salvos - registros_antes} linhas em {duracao:.3f}s: {vazao:,.0f} linhas/s")
+    return vazao
+
+# ===== TESTE DE CONTROLE DE FLUXO (pty) =====
+LINHA_TESTE = "WRITE_DATA:3000,23.45,47.20,52,0.123,-0.045,0.987,1.23,-0.45,0.12,NORMAL"
+
+def simular_esp32(fd, total_comandos, com_creditos):
+    """Simula o envio de comandos do prog1.cpp no lado mestre de um pty"""
+    if not com_creditos:
+        # Firmware original: pausa fixa após cada comando
+        for _ in range(total_comandos):
+            os.write(fd, f"CSV_CMD:{LINHA_TESTE}\r\n".encode())
+            time.sleep(0.05)
+        return
+
+    os.write(fd, f"CSV_AUTO_START:{VERSAO_PROTOCOLO}\r\n".encode())
+    janela = 0
+    confirmado = 0
+    enviados = 0
+    pendente = b""
+    while enviados < total_comandos:
+        # Sem crédito: aguarda CRED/ACK do capturador
+        while janela == 0 or enviados - confirmado >= janela:
+            pendente += os.read(fd, 1024)
+            *linhas, pendente = pendente.split(b"\n")
+            for linha in linhas:
+                if linha.startswith(b"CRED:"):
+                    janela = int(linha[5:])
+                elif linha.startswith(b"ACK:"):
+                    confirmado = int(linha[4:])
+        enviados += 1
+        os.write(fd, f"CSV_CMDS:{enviados}:{LINHA_TESTE}\r\n".encode())
+
+def medir_controle_fluxo(total_comandos=200, abrir_porta=None):
+    """
+    Compara, em um par pty (Linux/macOS), a vazão de comandos CSV com a pausa
+    fixa de 50 ms do firmware original e com o controle de fluxo por créditos.
+    Um thread simula o ESP32 no lado mestre e o capturador lê o lado escravo
+    pela pyserial (ou por abrir_porta(fd_escravo)), com o mesmo laço de main().
+    """
+    global canal_controle
+    vazoes = {}
+    for modo, com_creditos in (("pausa fixa", False), ("créditos", True)):
+        mestre, escravo = os.openpty()
+        ser = abrir_porta(escravo) if abrir_porta else serial.Serial(os.ttyname(escravo), BAUD_RATE, timeout=0.05)
+        leitor = LeitorLinhas()
+        canal_controle = CanalControle(ser, leitor)
+        processados_antes = comandos_processados
+
+        simulador = threading.Thread(target=simular_esp32, args=(mestre, total_comandos, com_creditos), daemon=True)
+        inicio = time.perf_counter()
+        simulador.start()
+        while comandos_processados - processados_antes < total_comandos and time.perf_counter() - inicio < 60:
+            if leitor.ler(ser):
+                leitor.processar()
+                canal_controle.confirmar()
+        duracao = time.perf_counter() - inicio
+
+        ser.close()
+        os.close(escravo)
+        os.close(mestre)
+        vazoes[modo] = (comandos_processados - processados_antes) / duracao
+        print(f"⚡ {modo}: {comandos_processados - processados_antes} comandos em {duracao:.2f}s "
+              f"({vazoes[modo]:,.0f} comandos/s)")
+
+    print(f"🚀 Ganho com créditos: {vazoes['créditos'] / vazoes['pausa fixa']:.0f}x")
+    return vazoes
+
 def main():
+    global canal_controle, difusor
+    
     print("=== Capturador Automático de CSV - Hermes Reply ===")
     print(f"📁 Pasta de destino: {PASTA_DESTINO}")
     print(f"🔌 Porta serial: {PORTA_SERIAL}")
@@ -110,45 +1456,17 @@ def main():
         time.sleep(2)  # Aguardar conexão
         
         print("✅ Conectado! Aguardando dados do ESP32...\n")
-        registros_salvos = 0
-        sistema_iniciado = False
+        if DIFUNDIR_REGISTROS:
+            difusor = difusao_registros.DifusorRegistros(ENDERECO_DIFUSAO).iniciar()
+        leitor = LeitorLinhas()
+        canal_controle = CanalControle(ser, leitor)
         
         while True:
-            try:
-                # Ler linha da serial
-                linha = ser.readline().decode('utf-8').strip()
-                
-                if linha:
-                    # Verificar início do sistema
-                    if linha == "CSV_AUTO_START":
-                        sistema_iniciado = True
-                        print("🎯 Sistema ESP32 detectado e inicializado!")
-                        continue
-                    
-                    # Processar comandos CSV
-                    if linha.startswith("CSV_CMD:"):
-                        partes = linha[8:].split(':', 2)  # Remove "CSV_CMD:"
-                        comando = partes[0]
-                        dados = partes[1] if len(partes) > 1 else ""
-                        processar_comando_csv(comando, dados)
-                        
-                    # Mostrar logs do sistema
-                    elif linha.startswith("LOG:"):
-                        print(f"ℹ️  {linha[4:].strip()}")
-                        
-                    # Mostrar dados em tempo real
-                    elif linha.startswith("DATA:"):
-                        registros_salvos += 1
-                        if registros_salvos % 5 == 0:  # Mostrar a cada 5 registros
-                            print(f"📈 Total de registros salvos: {registros_salvos}")
-                            
-                    # Mostrar alertas
-                    elif linha.startswith("ALERT:"):
-                        print(f"🚨 {linha[6:].strip()}")
-                        
-            except UnicodeDecodeError:
-                # Ignorar erros de decodificação
-                pass
+            # Lê tudo o que estiver pendente e processa as linhas completas
+            if leitor.ler(ser):
+                leitor.processar()
+                canal_controle.confirmar()
+            descarregar_periodicamente()   # Também com a porta ociosa (timeout de 1 s)
                 
     except serial.SerialException as e:
         print(f"❌ Erro na porta serial: {e}")
@@ -162,7 +1480,7 @@ def main():
         # Listar arquivos gerados
         print("\n📁 Arquivos gerados:")
         for arquivo in os.listdir(PASTA_DESTINO):
-            if arquivo.startswith("dados_monitoramento") and (arquivo.endswith(".csv") or arquivo.endswith("_alertas.txt")):
+            if arquivo.startswith("dados_monitoramento") and arquivo.endswith((".csv", "_alertas.txt", "_manifesto.json", EXTENSAO_COMPRESSAO)):
                 caminho_completo = os.path.join(PASTA_DESTINO, arquivo)
                 tamanho = os.path.getsize(caminho_completo)
                 print(f"   📄 {arquivo} ({tamanho} bytes)")
@@ -177,18 +1495,29 @@ def main():
                 arquivo_csv_atual.close()
             if arquivo_alertas:
                 arquivo_alertas.close()
+            aguardar_compressao()
+            if difusor:
+                difusor.fechar()
             ser.close()
         except:
             pass
 
 if __name__ == "__main__":
     # Verificar se pyserial está instalado
-    try:
-        import serial
-    except ImportError:
+    if serial is None:
         print("❌ Biblioteca 'pyserial' não encontrada")
         print("💡 Instale com: pip install pyserial")
         sys.exit(1)
     
-    main()
+    if "--benchmark" in sys.argv:
+        medir_vazao()
+        medir_vazao_completa()
+    elif "--mesclar" in sys.argv:
+        # python capturador_automatico.py --mesclar saida.csv dispositivo1.csv dispositivo2.csv ...
+        argumentos = sys.argv[sys.argv.index("--mesclar") + 1:]
+        mesclar_csvs(argumentos[1:], argumentos[0])
+    elif "--teste-fluxo" in sys.argv:
+        medir_controle_fluxo()
+    else:
+        main()
 
@@ -0,0 +1,196 @@
+import bisect
+import csv
+import datetime
+import importlib
+import json
+import os
+import sys
+
+import capturador_automatico as capturador
+
+"""
+Consulta por Intervalo de Tempo nas Capturas
+Sistema de Monitoramento Industrial - Hermes Reply
+
+FUNCIONALIDADES:
+- Lê apenas os segmentos e blocos que cobrem o intervalo pedido, usando o
+  manifesto (intervalo e estatísticas de cada segmento) e o índice esparso
+  de cada segmento (posição de cada bloco no CSV ou no arquivo comprimido)
+- Descarta segmentos e blocos pelo mínimo/máximo das colunas e pelos status
+  antes de descomprimir, e filtra as linhas restantes
+- Inclui o segmento ainda aberto pela captura em andamento
+
+COMO USAR:
+1. python consulta_capturas.py dados_monitoramento_hermes_reply.csv "2025-06-10 14:32:05" [minutos] [status]
+   mostra os minutos (padrão: 10) anteriores ao instante, por exemplo o de um alerta
+2. No código: ConsultaCaptura(...).consultar(inicio, fim, status={"CRITICO"}, minimos={"Temperatura": 30})
+"""
+
+# ===== CONFIGURAÇÕES =====
+JANELA_PADRAO_MINUTOS = 10
+FIM_ABERTO = "\uffff"          # Maior que qualquer data_hora: último bloco do segmento aberto
+
+def normalizar_instante(instante):
+    """
+    Aceita data_hora (texto), datetime ou segundos desde a época e devolve o formato
+    da coluna (UTC). Texto e datetime sem deslocamento são tomados na hora local
+    """
+    if instante is None:
+        return None
+    if isinstance(instante, str):
+        instante = datetime.datetime.fromisoformat(instante)
+    if isinstance(instante, datetime.datetime):
+        instante = instante.timestamp()
+    return capturador.formatar_data_hora(instante)
+
+def pode_conter(estatisticas, status=None, minimos=None, maximos=None):
+    """Indica se um segmento ou bloco pode ter linhas que satisfaçam os filtros (pelas estatísticas)"""
+    if status and estatisticas.get("status") is not None and not set(status) & set(estatisticas["status"]):
+        return False
+    for coluna, limite in (minimos or {}).items():
+        maximo = estatisticas.get("maximos", {}).get(coluna)
+        if maximo is not None and maximo < limite:
+            return False
+    for coluna, limite in (maximos or {}).items():
+        minimo = estatisticas.get("minimos", {}).get(coluna)
+        if minimo is not None and minimo > limite:
+            return False
+    return True
+
+class ConsultaCaptura:
+    """
+    Consultas por intervalo de data_hora nos segmentos de uma captura.
+
+    O custo é proporcional à janela: o manifesto descarta segmentos fora do
+    intervalo, a busca binária no índice encontra o primeiro bloco e a
+    leitura para no primeiro bloco que começa depois do fim. Cada bloco é
+    lido com seek e, se comprimido, descomprimido isoladamente.
+    """
+
+    def __init__(self, nome, pasta=None):
+        self.pasta = pasta or os.path.dirname(nome) or capturador.PASTA_DESTINO
+        self.base = os.path.splitext(os.path.basename(nome))[0]
+        self.caminho_manifesto = os.path.join(self.pasta, f"{self.base}_manifesto.json")
+
+    def _manifesto(self):
+        with open(self.caminho_manifesto, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+
+    def _segmentos(self):
+        """Segmentos fechados do manifesto e, por último, o aberto (sem estatísticas)"""
+        manifesto = self._manifesto()
+        segmentos = list(manifesto["segmentos"])
+        aberto = manifesto.get("aberto")
+        if aberto and not any(segmento["segmento"] == aberto for segmento in segmentos):
+            segmentos.append({"segmento": aberto, "arquivo": aberto, "inicio": None, "fim": None,
+                              "indice": os.path.basename(capturador.caminho_indice(aberto))})
+        return manifesto.get("cabecalho", []), segmentos
+
+    def consultar(self, inicio=None, fim=None, status=None, minimos=None, maximos=None):
+        """
+        Linhas (dicionários coluna -> valor) com inicio <= data_hora <= fim.
+
+        status: status aceitos; minimos/maximos: {coluna: limite} com valor >=
+        / <= limite (nomes de coluna sem diferenciar maiúsculas). Sem inicio
+        ou fim o intervalo fica aberto daquele lado.
+        """
+        inicio, fim = normalizar_instante(inicio), normalizar_instante(fim)
+        cabecalho, segmentos = self._segmentos()
+        nomes = {nome.lower(): nome for nome in cabecalho}
+        minimos = {nomes.get(coluna.lower(), coluna): limite for coluna, limite in (minimos or {}).items()}
+        maximos = {nomes.get(coluna.lower(), coluna): limite for coluna, limite in (maximos or {}).items()}
+        status = set(status) if status else None
+
+        for segmento in segmentos:
+            if inicio and segmento["fim"] and segmento["fim"] < inicio:
+                continue
+            if fim and segmento["inicio"] and segmento["inicio"] > fim:
+                break   # Segmentos em ordem: os seguintes começam ainda mais tarde
+            if not pode_conter(segmento, status, minimos, maximos):
+                continue
+            for linha in self._linhas_segmento(segmento, inicio, fim, status, minimos, maximos):
+                if self._satisfaz(linha, inicio, fim, status, minimos, maximos):
+                    yield linha
+
+    def janela_antes(self, instante, minutos=JANELA_PADRAO_MINUTOS, **filtros):
+        """Linhas dos minutos anteriores a instante (ex.: data_hora de um alerta)"""
+        fim = normalizar_instante(instante)
+        inicio = datetime.datetime.fromisoformat(fim) - datetime.timedelta(minutes=minutos)
+        return self.consultar(inicio, fim, **filtros)
+
+    def _linhas_segmento(self, segmento, inicio, fim, status, minimos, maximos):
+        caminho = os.path.join(self.pasta, segmento["arquivo"])
+        if not os.path.exists(caminho):
+            caminho += capturador.EXTENSAO_COMPRESSAO   # Comprimido depois da leitura do manifesto
+        caminho_indice = os.path.join(self.pasta, segmento.get("indice") or "")
+        if not segmento.get("indice") or not os.path.exists(caminho_indice):
+            yield from self._varrer(caminho)   # Segmento sem índice: leitura completa
+            return
+        extensao = os.path.splitext(caminho)[1]
+        modulo = importlib.import_module(capturador.MODULOS_COMPRESSAO[extensao]) if extensao in capturador.MODULOS_COMPRESSAO else None
+
+        with open(caminho, 'rb') as arquivo:
+            # O índice é lido depois de abrir o arquivo: já traz as posições comprimidas, se for o caso
+            indice = capturador.IndiceSegmento.carregar(caminho_indice)
+            blocos = indice.blocos
+            if modulo is not None and blocos and "posicao_comprimida" not in blocos[0]:
+                yield from self._varrer(caminho)
+                return
+            if indice.aberto and blocos:
+                blocos[-1]["fim"] = FIM_ABERTO
+
+            primeiro = bisect.bisect_left(blocos, inicio, key=lambda bloco: bloco["fim"] or "") if inicio else 0
+            for numero in range(primeiro, len(blocos)):
+                bloco = blocos[numero]
+                if fim and bloco["inicio"] and bloco["inicio"] > fim:
+                    break
+                ultimo_aberto = indice.aberto and numero == len(blocos) - 1
+                if not ultimo_aberto and not pode_conter(bloco, status, minimos, maximos):
+                    continue
+                for linha in csv.reader(self._ler_bloco(arquivo, modulo, bloco).splitlines()):
+                    if len(linha) == len(indice.cabecalho):   # Descarta uma linha sendo escrita
+                        yield dict(zip(indice.cabecalho, linha))
+
+    @staticmethod
+    def _ler_bloco(arquivo, modulo, bloco):
+        if modulo is not None:
+            arquivo.seek(bloco["posicao_comprimida"])
+            return str(modulo.decompress(arquivo.read(bloco["tamanho_comprimido"])), 'utf-8', 'replace')
+        arquivo.seek(bloco["posicao"])
+        tamanho = bloco["tamanho"]
+        return str(arquivo.read(tamanho) if tamanho is not None else arquivo.read(), 'utf-8', 'replace')
+
+    @staticmethod
+    def _varrer(caminho):
+        with capturador.abrir_segmento(caminho) as arquivo:
+            yield from csv.DictReader(arquivo)
+
+    @staticmethod
+    def _satisfaz(linha, inicio, fim, status, minimos, maximos):
+        data_hora = linha.get(capturador.COLUNA_DATA_HORA) or ""
+        if (inicio and data_hora < inicio) or (fim and data_hora > fim):
+            return False
+        if status and next((valor for coluna, valor in linha.items() if coluna.lower() == "status"), None) not in status:
+            return False
+        try:
+            return (all(float(linha[coluna]) >= limite for coluna, limite in minimos.items())
+                    and all(float(linha[coluna]) <= limite for coluna, limite in maximos.items()))
+        except (KeyError, ValueError):
+            return False
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print('💡 Uso: python consulta_capturas.py <captura.csv> "<data_hora>" [minutos] [status]')
+        sys.exit(1)
+    consulta = ConsultaCaptura(sys.argv[1])
+    minutos = float(sys.argv[3]) if len(sys.argv) > 3 else JANELA_PADRAO_MINUTOS
+    filtros = {"status": {sys.argv[4]}} if len(sys.argv) > 4 else {}
+    writer = None
+    total = 0
+    for linha in consulta.janela_antes(sys.argv[2], minutos, **filtros):
+        if writer is None:
+            writer = csv.DictWriter(sys.stdout, fieldnames=list(linha))
+            writer.writeheader()
+        writer.writerow(linha)
+        total += 1
+    print(f"🔎 {total} linhas nos {minutos:g} minutos anteriores a {sys.argv[2]}", file=sys.stderr)
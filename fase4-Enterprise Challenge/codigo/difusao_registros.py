@@ -0,0 +1,336 @@
+import collections
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+"""
+Difusão Local dos Registros Capturados
+Sistema de Monitoramento Industrial - Hermes Reply
+
+FUNCIONALIDADES:
+- Publica os registros e alertas da captura em andamento para vários
+  consumidores locais (painéis, outro analisador) sem que eles leiam o CSV
+- Socket de domínio UNIX (ou TCP em 127.0.0.1 onde não houver AF_UNIX),
+  uma linha JSON por mensagem
+- Cada assinante tem uma fila limitada e a sua política para quando ela
+  enche: descartar as mensagens mais antigas, descartar as novas ou
+  desconectar o assinante lento; a captura nunca espera por um consumidor
+
+COMO USAR:
+1. O capturador_automatico.py (e cada gravador do supervisor_coleta.py) abre
+   o difusor automaticamente (DIFUNDIR_REGISTROS)
+2. python difusao_registros.py [endereço] [tipos] mostra as mensagens ao vivo
+   (ex.: python difusao_registros.py 127.0.0.1:8765 alerta)
+3. No código: for mensagem in assinar(tipos={"dados"}): ...
+4. python difusao_registros.py --benchmark mede o custo de publicar com um
+   consumidor parado
+"""
+
+# ===== CONFIGURAÇÕES =====
+if hasattr(socket, "AF_UNIX"):
+    ENDERECO_PADRAO = os.path.join(tempfile.gettempdir(), "hermes_reply_capturas.sock")
+else:
+    ENDERECO_PADRAO = ("127.0.0.1", 8765)
+TAMANHO_FILA = 1024                 # Mensagens pendentes por assinante
+POLITICA_PADRAO = "descartar_antigos"
+POLITICAS = ("descartar_antigos", "descartar_novos", "desconectar")
+MAXIMO_ASSINANTES = 32
+TIMEOUT_ASSINATURA = 0.5            # Segundos esperando a linha ASSINAR (sem ela: padrões)
+
+# Assinatura (opcional, primeira linha do consumidor):
+# ASSINAR tipos=dados,alerta politica=desconectar fila=256
+# Mensagens: {"tipo": "dados", "dispositivo": ..., "registro": {coluna: valor}}
+#            (sem cabeçalho conhecido, a coluna é a posição: {"0": valor, ...})
+#            {"tipo": "alerta", "dispositivo": ..., "data_hora": ..., "mensagem": ...}
+#            {"tipo": "perdidos", "quantidade": n} (antes da próxima mensagem entregue)
+
+def interpretar_endereco(texto):
+    """'host:porta' ou 'porta' viram endereço TCP; o restante é o caminho de um socket UNIX"""
+    if not isinstance(texto, str):
+        return texto
+    host, _, porta = texto.rpartition(':')
+    if porta.isdigit():
+        return (host or "127.0.0.1", int(porta))
+    return texto
+
+def endereco_indexado(endereco, indice):
+    """Endereço do i-ésimo difusor (um por processo gravador do supervisor_coleta.py)"""
+    if isinstance(endereco, tuple):
+        return (endereco[0], endereco[1] + indice)
+    base, extensao = os.path.splitext(endereco)
+    return f"{base}_{indice}{extensao}"
+
+def criar_socket(endereco):
+    familia = socket.AF_INET if isinstance(endereco, tuple) else socket.AF_UNIX
+    return socket.socket(familia, socket.SOCK_STREAM)
+
+class Assinante:
+    """
+    Conexão de um consumidor: fila limitada e uma thread que a envia.
+
+    enfileirar roda na thread da captura e só toma a trava da fila por um
+    instante; o envio (que pode bloquear num consumidor lento) fica na thread
+    do assinante. As mensagens pendentes são enviadas juntas.
+    """
+
+    def __init__(self, difusor, conexao, tipos=None, politica=POLITICA_PADRAO, tamanho_fila=TAMANHO_FILA):
+        self.difusor = difusor
+        self.conexao = conexao
+        self.tipos = tipos
+        self.politica = politica
+        self.tamanho_fila = tamanho_fila
+        self.fila = collections.deque()
+        self.condicao = threading.Condition()
+        self.perdidos = 0
+        self.total_perdidos = 0
+        self.ativo = True
+        self.thread = threading.Thread(target=self._enviar, daemon=True, name="assinante-difusao")
+
+    def enfileirar(self, mensagem):
+        with self.condicao:
+            if not self.ativo:
+                return
+            if len(self.fila) >= self.tamanho_fila:
+                if self.politica == "desconectar":
+                    self.desconectar()
+                    return
+                self.perdidos += 1
+                self.total_perdidos += 1
+                if self.politica == "descartar_novos":
+                    return
+                self.fila.popleft()
+            self.fila.append(mensagem)
+            self.condicao.notify()
+
+    def desconectar(self):
+        with self.condicao:
+            self.ativo = False
+            self.condicao.notify()
+        try:
+            self.conexao.shutdown(socket.SHUT_RDWR)   # Interrompe um sendall parado
+        except OSError:
+            pass
+
+    def _enviar(self):
+        try:
+            while True:
+                with self.condicao:
+                    while self.ativo and not self.fila:
+                        self.condicao.wait()
+                    if not self.ativo:
+                        break
+                    lote = b"".join(self.fila)
+                    self.fila.clear()
+                    perdidos, self.perdidos = self.perdidos, 0
+                if perdidos:
+                    lote = json.dumps({"tipo": "perdidos", "quantidade": perdidos}).encode('utf-8') + b"\n" + lote
+                self.conexao.sendall(lote)
+        except OSError:
+            pass
+        finally:
+            self.ativo = False
+            self.conexao.close()
+            self.difusor.remover(self)
+
+class DifusorRegistros:
+    """
+    Servidor de publicação/assinatura local.
+
+    publicar serializa a mensagem uma única vez e a coloca na fila de cada
+    assinante interessado; sem assinantes não há custo além de uma
+    verificação. Falhas do socket nunca interrompem a captura.
+    """
+
+    def __init__(self, endereco=ENDERECO_PADRAO, tamanho_fila=TAMANHO_FILA, politica=POLITICA_PADRAO):
+        self.endereco = interpretar_endereco(endereco)
+        self.tamanho_fila = tamanho_fila
+        self.politica = politica
+        self.assinantes = []
+        self.trava = threading.Lock()
+        self.servidor = None
+        self.publicadas = 0
+
+    def iniciar(self):
+        try:
+            servidor = criar_socket(self.endereco)
+            if isinstance(self.endereco, tuple):
+                servidor.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            elif os.path.exists(self.endereco):
+                self._remover_abandonado()
+            servidor.bind(self.endereco)
+            servidor.listen()
+        except OSError as e:
+            print(f"⚠️  Difusão local indisponível em {self.endereco}: {e}")
+            return self
+        self.servidor = servidor
+        threading.Thread(target=self._aceitar, daemon=True, name="difusao-registros").start()
+        print(f"📡 Difusão local dos registros: {self.endereco}")
+        return self
+
+    def _remover_abandonado(self):
+        """Apaga o socket que restou de um processo que caiu; um difusor ativo no endereço é erro"""
+        with criar_socket(self.endereco) as teste:
+            try:
+                teste.connect(self.endereco)
+            except ConnectionRefusedError:
+                self._remover_socket()
+                return
+        raise OSError(f"outro difusor já usa {self.endereco}")
+
+    def _remover_socket(self):
+        try:
+            if stat.S_ISSOCK(os.stat(self.endereco).st_mode):
+                os.unlink(self.endereco)
+        except OSError:
+            pass
+
+    def _aceitar(self):
+        servidor = self.servidor
+        while True:
+            try:
+                conexao, _ = servidor.accept()
+            except OSError:
+                break   # Servidor fechado
+            threading.Thread(target=self._registrar, args=(conexao,), daemon=True).start()
+
+    def _registrar(self, conexao):
+        """Lê a linha ASSINAR opcional e passa a entregar as mensagens ao consumidor"""
+        opcoes = {}
+        conexao.settimeout(TIMEOUT_ASSINATURA)
+        try:
+            with conexao.makefile('rb') as entrada:
+                linha = entrada.readline()
+            comando, *argumentos = str(linha, 'utf-8', 'replace').split()
+            if comando.upper() == "ASSINAR":
+                opcoes = dict(argumento.partition('=')[::2] for argumento in argumentos)
+        except (OSError, ValueError):
+            pass
+        conexao.settimeout(None)
+
+        politica = opcoes.get("politica", self.politica)
+        tipos = set(opcoes["tipos"].split(',')) if opcoes.get("tipos") else None
+        tamanho_fila = int(opcoes["fila"]) if opcoes.get("fila", "").isdigit() else self.tamanho_fila
+        with self.trava:
+            if len(self.assinantes) >= MAXIMO_ASSINANTES or politica not in POLITICAS:
+                conexao.close()
+                return
+            assinante = Assinante(self, conexao, tipos, politica, max(tamanho_fila, 1))
+            self.assinantes = self.assinantes + [assinante]   # A captura percorre a lista sem trava
+        assinante.thread.start()
+
+    def remover(self, assinante):
+        with self.trava:
+            self.assinantes = [atual for atual in self.assinantes if atual is not assinante]
+
+    def publicar(self, tipo, **campos):
+        assinantes = self.assinantes
+        if not assinantes:
+            return
+        mensagem = json.dumps({"tipo": tipo, **campos}, ensure_ascii=False).encode('utf-8') + b"\n"
+        for assinante in assinantes:
+            if assinante.tipos is None or tipo in assinante.tipos:
+                assinante.enfileirar(mensagem)
+        self.publicadas += 1
+
+    def fechar(self):
+        if self.servidor is None:
+            return
+        try:
+            self.servidor.shutdown(socket.SHUT_RDWR)   # Acorda o accept
+        except OSError:
+            pass
+        self.servidor.close()
+        self.servidor = None
+        for assinante in self.assinantes:
+            assinante.desconectar()
+        if not isinstance(self.endereco, tuple):
+            self._remover_socket()
+
+def assinar(endereco=ENDERECO_PADRAO, tipos=None, politica=None, tamanho_fila=None):
+    """Conecta a um difusor e devolve as mensagens (dicionários) conforme chegam"""
+    endereco = interpretar_endereco(endereco)
+    opcoes = []
+    if tipos:
+        opcoes.append(f"tipos={','.join(tipos)}")
+    if politica:
+        opcoes.append(f"politica={politica}")
+    if tamanho_fila:
+        opcoes.append(f"fila={tamanho_fila}")
+    with criar_socket(endereco) as conexao:
+        conexao.connect(endereco)
+        conexao.sendall(" ".join(["ASSINAR", *opcoes]).encode('utf-8') + b"\n")
+        with conexao.makefile('rb') as entrada:
+            for linha in entrada:
+                yield json.loads(linha)
+
+# ===== BENCHMARK =====
+def medir_difusao(total_mensagens=200000):
+    """Custo de publicar sem assinantes, com dois consumidores rápidos e com mais um parado"""
+    print("=== Benchmark da difusão local ===")
+    endereco = endereco_indexado(ENDERECO_PADRAO, os.getpid())
+    registro = {"timestamp": "123456", "temperatura": "25.50", "umidade": "60.00", "status": "NORMAL"}
+
+    def consumir(recebidas):
+        for mensagem in assinar(endereco):
+            recebidas[mensagem["tipo"]] += 1
+
+    def aguardar_assinantes(quantidade):
+        while len(difusor.assinantes) < quantidade:
+            time.sleep(0.01)
+
+    def parar_consumidor():
+        parado = criar_socket(difusor.endereco)
+        parado.connect(difusor.endereco)
+        parado.sendall(b"ASSINAR\n")   # Nunca lê: a fila enche e as antigas são descartadas
+        aguardar_assinantes(3)
+        return parado
+
+    difusor = DifusorRegistros(endereco).iniciar()
+    contagens = [collections.Counter() for _ in range(2)]
+    parado = None
+    try:
+        for etapa in ("sem assinantes", "2 rápidos", "2 rápidos + 1 parado"):
+            if etapa == "2 rápidos":
+                for recebidas in contagens:
+                    threading.Thread(target=consumir, args=(recebidas,), daemon=True).start()
+                aguardar_assinantes(2)
+            elif etapa == "2 rápidos + 1 parado":
+                parado = parar_consumidor()
+            inicio = time.perf_counter()
+            for numero in range(total_mensagens):
+                difusor.publicar("dados", registro=registro)
+            decorrido = time.perf_counter() - inicio
+            print(f"   {etapa:>22}: {decorrido / total_mensagens * 1e6:.2f} µs por registro publicado")
+        time.sleep(0.5)
+        print(f"   Recebidas pelos rápidos: {[recebidas['dados'] for recebidas in contagens]}")
+        print(f"   Descartadas por assinante: {[assinante.total_perdidos for assinante in difusor.assinantes]}")
+    finally:
+        difusor.fechar()
+        if parado:
+            parado.close()
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        medir_difusao()
+        sys.exit(0)
+    endereco = sys.argv[1] if len(sys.argv) > 1 else ENDERECO_PADRAO
+    tipos = sys.argv[2].split(',') if len(sys.argv) > 2 else None
+    print(f"📡 Assinando {endereco} (Ctrl+C para parar)")
+    try:
+        for mensagem in assinar(endereco, tipos):
+            if mensagem["tipo"] == "dados":
+                print(f"📊 {mensagem.get('dispositivo') or ''} {mensagem['registro']}")
+            elif mensagem["tipo"] == "alerta":
+                print(f"🚨 [{mensagem['data_hora']}] {mensagem.get('dispositivo') or ''} {mensagem['mensagem']}")
+            elif mensagem["tipo"] == "perdidos":
+                print(f"⚠️  {mensagem['quantidade']} mensagens descartadas (consumidor lento)")
+        print("🔌 Difusor encerrado")
+    except (ConnectionRefusedError, FileNotFoundError):
+        print(f"❌ Nenhum difusor em {endereco}: a captura está em andamento?")
+    except KeyboardInterrupt:
+        pass
@@ -40,6 +40,46 @@
 // ===== CONFIGURAÇÕES DO ARQUIVO CSV =====
 #define NOME_ARQUIVO "dados_monitoramento_hermes_reply.csv"
 
+// ===== VERSÃO DO PROTOCOLO (anunciada em CSV_AUTO_START:<versão>) =====
+// Versão 2: com a confirmação HOST:<n> (n >= 2) do capturador, cada amostra é
+// enviada só como CSV_CMD:WRITE_DATA (sem a cópia DATA:)
+// Versão 3: controle de fluxo; com CRED:<n> do capturador os comandos seguem
+// como CSV_CMDS:<seq>:... até n sem confirmação (ACK:<seq>), sem pausa fixa
+// Versão 4: canal de controle; o capturador ajusta o intervalo de leitura
+// (SET:INTERVALO:<ms>), liga/desliga canais (SET:CANAL:<DHT|LDR|MPU>:<0|1>) e
+// pede rajadas (BURST:<amostras>:<ms>); cada mudança é respondida com CFG:
+// SYNC: capturador conectado no meio da sessão (reiniciado); a sessão é
+// reanunciada em texto (CSV_AUTO_START, negociação, CREATE_FILE e WRITE_HEADER)
+#define VERSAO_PROTOCOLO 4
+#define TIMEOUT_CREDITO 1000      // ms sem ACK até voltar à pausa fixa
+#define TAMANHO_MAXIMO_CONTROLE 64
+
+// ===== CANAIS E INTERVALO DE LEITURA (ajustáveis pelo capturador) =====
+#define CANAL_DHT 0x01            // Temperatura e umidade
+#define CANAL_LDR 0x02            // Luminosidade
+#define CANAL_MPU 0x04            // Aceleração e rotação
+#define INTERVALO_MINIMO 50       // ms
+#define INTERVALO_MAXIMO 60000    // ms
+#define RAJADA_MAXIMA 200         // amostras
+
+// ===== PROTOCOLO BINÁRIO (negociado com capturador_automatico.py) =====
+// Quadro: COBS(tipo, sequência, payload, CRC16) seguido de 0x00
+#define PROTOCOLO_BINARIO "BIN1"
+#define TIPO_TEXTO 1              // Payload: linha de texto (LOG, ALERT, CSV_CMD...)
+#define TIPO_AMOSTRA 2            // Payload: AmostraBinaria
+#define TIMEOUT_NEGOCIACAO 3000   // ms aguardando a resposta do capturador
+#define TAMANHO_MAXIMO_PAYLOAD 240
+
+struct __attribute__((packed)) AmostraBinaria {
+  uint32_t timestamp;     // ms
+  int16_t temperatura;    // centésimos de °C
+  uint16_t umidade;       // centésimos de %
+  uint8_t luminosidade;   // %
+  int16_t accel[3];       // milésimos de g
+  int16_t gyro[3];        // centésimos de °/s
+  uint8_t status;         // 0 NORMAL, 1 ALERTA, 2 CRITICO
+};
+
 // ===== DECLARAÇÕES DAS FUNÇÕES (OBRIGATÓRIO EM C++) =====
 void lerSensores();
 String analisarStatus();
@@ -47,6 +87,20 @@ void enviarDadosCSV(unsigned long timestamp, String status);
 void verificarAlertas();
 void enviarComandoArquivo(String comando, String dados = "");
 void inicializarSistema();
+void criarArquivoCSV();
+void reanunciarSessao();
+void negociarProtocolo();
+void lerControle();
+void tratarControle(String linha);
+void aguardarCredito();
+void enviarLinha(const String& linha);
+void enviarQuadro(uint8_t tipo, const uint8_t* payload, size_t tamanho);
+void enviarAmostraBinaria(unsigned long timestamp, String status);
+String montarLinhaCSV(unsigned long timestamp, String status);
+void enviarConfiguracao();
+uint8_t canalPorNome(String nome);
+uint16_t calcularCRC16(const uint8_t* dados, size_t tamanho);
+size_t codificarCOBS(const uint8_t* entrada, size_t tamanho, uint8_t* saida);
 
 // ===== INICIALIZAÇÃO DOS SENSORES =====
 DHT dht(DHT_PIN, DHT_TYPE);
@@ -59,9 +113,23 @@ float accel_x = 0.0, accel_y = 0.0, accel_z = 0.0;
 float gyro_x = 0.0, gyro_y = 0.0, gyro_z = 0.0;
 
 unsigned long ultimaLeitura = 0;
-const unsigned long intervaloLeitura = 3000; // 3 segundos
+unsigned long intervaloLeitura = 3000; // 3 segundos (ajustável com SET:INTERVALO)
+uint8_t canaisAtivos = CANAL_DHT | CANAL_LDR | CANAL_MPU;
+uint16_t rajadaRestante = 0;           // Leituras restantes da rajada (BURST)
+unsigned long intervaloRajada = 0;
 int contadorRegistros = 0;
 bool sistemaInicializado = false;
+bool modoBinario = false;          // Ativado somente se o capturador aceitar o protocolo binário
+bool mensagemUnica = false;        // Ativado com a confirmação HOST:<n> (sem a linha DATA:)
+bool protocoloDefinido = false;    // Capturador respondeu MODE:BIN1 ou MODE:TEXT
+bool reanunciar = false;           // SYNC recebido: reanunciar a sessão no próximo loop
+uint16_t sequenciaQuadro = 0;
+
+// Controle de fluxo (versão 3): janela 0 = capturador sem créditos, usa a pausa fixa
+uint16_t janelaCreditos = 0;
+uint16_t sequenciaComando = 0;
+uint16_t ultimoConfirmado = 0;
+String entradaControle = "";
 
 void setup() {
   Serial.begin(115200);
@@ -70,11 +138,11 @@ void setup() {
   inicializarSistema();
   
   // ===== VERIFICAÇÃO DAS CONEXÕES =====
-  Serial.println("LOG: Verificando conexões físicas...");
+  enviarLinha("LOG: Verificando conexões físicas...");
   
   // Inicializar DHT22
   dht.begin();
-  Serial.println("LOG: ✓ DHT22 inicializado (GPIO 15)");
+  enviarLinha("LOG: ✓ DHT22 inicializado (GPIO 15)");
   
   // Inicializar I2C para MPU6050
   Wire.begin(21, 22); // SDA=21, SCL=22
@@ -84,57 +152,64 @@ void setup() {
   byte error = Wire.endTransmission();
   
   if (error == 0) {
-    Serial.println("LOG: ✓ MPU6050 detectado (I2C: SDA=21, SCL=22)");
+    enviarLinha("LOG: ✓ MPU6050 detectado (I2C: SDA=21, SCL=22)");
   } else {
-    Serial.println("LOG: ❌ MPU6050 NÃO detectado - Verificar conexões!");
+    enviarLinha("LOG: ❌ MPU6050 NÃO detectado - Verificar conexões!");
   }
   
   // Configurar LDR
   pinMode(LDR_PIN, INPUT);
-  Serial.println("LOG: ✓ LDR configurado (GPIO 34 + resistor pull-up)");
+  enviarLinha("LOG: ✓ LDR configurado (GPIO 34 + resistor pull-up)");
   
   // ===== TESTE INICIAL DOS SENSORES =====
-  Serial.println("LOG: === TESTE INICIAL DOS SENSORES ===");
+  enviarLinha("LOG: === TESTE INICIAL DOS SENSORES ===");
   
   // Teste DHT22
   float temp_teste = dht.readTemperature();
   float hum_teste = dht.readHumidity();
   if (!isnan(temp_teste) && !isnan(hum_teste)) {
-    Serial.println("LOG: ✓ DHT22 funcionando: " + String(temp_teste) + "°C, " + String(hum_teste) + "%");
+    enviarLinha("LOG: ✓ DHT22 funcionando: " + String(temp_teste) + "°C, " + String(hum_teste) + "%");
   } else {
-    Serial.println("LOG: ❌ DHT22 com problema - Verificar conexão DATA no GPIO 15");
+    enviarLinha("LOG: ❌ DHT22 com problema - Verificar conexão DATA no GPIO 15");
   }
   
   // Teste LDR
   int ldr_teste = analogRead(LDR_PIN);
-  Serial.println("LOG: ✓ LDR funcionando: " + String(ldr_teste) + " (0-4095)");
+  enviarLinha("LOG: ✓ LDR funcionando: " + String(ldr_teste) + " (0-4095)");
   
   // Teste MPU6050
   if (error == 0) {
-    Serial.println("LOG: ✓ MPU6050 comunicando via I2C");
+    enviarLinha("LOG: ✓ MPU6050 comunicando via I2C");
   }
   
   // ===== CRIAR ARQUIVO CSV =====
-  enviarComandoArquivo("CREATE_FILE", NOME_ARQUIVO);
-  enviarComandoArquivo("WRITE_HEADER", "Timestamp,Temperatura,Umidade,Luminosidade,Accel_X,Accel_Y,Accel_Z,Gyro_X,Gyro_Y,Gyro_Z,Status");
+  criarArquivoCSV();
   
-  Serial.println("LOG: === INICIANDO COLETA DE DADOS ===");
-  Serial.println("LOG: Arquivo CSV: " + String(NOME_ARQUIVO));
-  Serial.println("LOG: Dados sendo salvos automaticamente no computador");
+  enviarLinha("LOG: === INICIANDO COLETA DE DADOS ===");
+  enviarLinha("LOG: Arquivo CSV: " + String(NOME_ARQUIVO));
+  enviarLinha("LOG: Dados sendo salvos automaticamente no computador");
   
   sistemaInicializado = true;
   delay(2000);
 }
 
 void loop() {
+  lerControle();  // Confirmações e créditos do capturador
+  
+  if (reanunciar) {
+    reanunciar = false;
+    reanunciarSessao();
+  }
+  
   if (!sistemaInicializado) {
     delay(1000);
     return;
   }
   
   unsigned long tempoAtual = millis();
+  unsigned long intervaloAtual = rajadaRestante > 0 ? intervaloRajada : intervaloLeitura;
   
-  if (tempoAtual - ultimaLeitura >= intervaloLeitura) {
+  if (tempoAtual - ultimaLeitura >= intervaloAtual) {
     ultimaLeitura = tempoAtual;
     
     // Ler todos os sensores
@@ -143,90 +218,305 @@ void loop() {
     // Analisar status
     String status = analisarStatus();
     
-    // Enviar dados para arquivo CSV
-    enviarDadosCSV(tempoAtual, status);
+    // Enviar dados para arquivo CSV (no modo binário, um único quadro compacto)
+    if (modoBinario) {
+      enviarAmostraBinaria(tempoAtual, status);
+    } else {
+      enviarDadosCSV(tempoAtual, status);
+    }
     
     // Verificar alertas
     verificarAlertas();
     
     contadorRegistros++;
     
+    // Fim da rajada: volta ao intervalo configurado
+    if (rajadaRestante > 0 && --rajadaRestante == 0) {
+      enviarConfiguracao();
+    }
+    
     // Mostrar progresso a cada 10 registros
     if (contadorRegistros % 10 == 0) {
-      Serial.println("LOG: Registros coletados: " + String(contadorRegistros));
-      Serial.println("LOG: Arquivo CSV atualizado: " + String(NOME_ARQUIVO));
+      enviarLinha("LOG: Registros coletados: " + String(contadorRegistros));
+      enviarLinha("LOG: Arquivo CSV atualizado: " + String(NOME_ARQUIVO));
       enviarComandoArquivo("FLUSH_FILE"); // Forçar gravação
     }
     
-    // Mostrar dados no Serial Monitor também
-    Serial.println("DATA: " + String(tempoAtual) + "," + 
-                   String(temperatura, 2) + "," + 
-                   String(umidade, 2) + "," + 
-                   String(luminosidade) + "," + 
-                   String(accel_x, 3) + "," + 
-                   String(accel_y, 3) + "," + 
-                   String(accel_z, 3) + "," + 
-                   String(gyro_x, 2) + "," + 
-                   String(gyro_y, 2) + "," + 
-                   String(gyro_z, 2) + "," + 
-                   status);
+    // Mostrar dados no Serial Monitor também (só para capturadores da versão 1)
+    if (!modoBinario && !mensagemUnica) enviarLinha("DATA: " + montarLinhaCSV(tempoAtual, status));
   }
   
-  delay(100);
+  delay(10);  // Curto para respeitar intervalos pequenos (rajadas)
 }
 
 // ===== IMPLEMENTAÇÃO DAS FUNÇÕES =====
 
 void inicializarSistema() {
-  Serial.println("CSV_AUTO_START");
-  Serial.println("LOG: === Sistema de Monitoramento Industrial ===");
-  Serial.println("LOG: Hermes Reply - Fase 4 Challenge");
-  Serial.println("LOG: VERSÃO COM GERAÇÃO AUTOMÁTICA DE CSV");
-  Serial.println("LOG: CONEXÕES FÍSICAS CORRETAS");
-  Serial.println("LOG: ");
-  Serial.println("LOG: 💾 ARQUIVO CSV SERÁ GERADO AUTOMATICAMENTE");
-  Serial.println("LOG: 📁 Local: Pasta onde o script Python está rodando");
-  Serial.println("LOG: 📄 Nome: " + String(NOME_ARQUIVO));
-  Serial.println("LOG: ");
+  enviarLinha("CSV_AUTO_START:" + String(VERSAO_PROTOCOLO));
+  negociarProtocolo();
+  enviarLinha("LOG: === Sistema de Monitoramento Industrial ===");
+  enviarLinha("LOG: Hermes Reply - Fase 4 Challenge");
+  enviarLinha("LOG: VERSÃO COM GERAÇÃO AUTOMÁTICA DE CSV");
+  enviarLinha("LOG: CONEXÕES FÍSICAS CORRETAS");
+  enviarLinha("LOG: ");
+  enviarLinha("LOG: 💾 ARQUIVO CSV SERÁ GERADO AUTOMATICAMENTE");
+  enviarLinha("LOG: 📁 Local: Pasta onde o script Python está rodando");
+  enviarLinha("LOG: 📄 Nome: " + String(NOME_ARQUIVO));
+  enviarLinha("LOG: ");
+}
+
+void criarArquivoCSV() {
+  enviarComandoArquivo("CREATE_FILE", NOME_ARQUIVO);
+  enviarComandoArquivo("WRITE_HEADER", "Timestamp,Temperatura,Umidade,Luminosidade,Accel_X,Accel_Y,Accel_Z,Gyro_X,Gyro_Y,Gyro_Z,Status");
+}
+
+void reanunciarSessao() {
+  // Volta ao estado do boot (texto, sem créditos) e renegocia com o novo capturador;
+  // intervalo e canais configurados são mantidos
+  modoBinario = false;
+  mensagemUnica = false;
+  protocoloDefinido = false;
+  janelaCreditos = 0;
+  inicializarSistema();
+  criarArquivoCSV();
+  enviarConfiguracao();
 }
 
 void enviarComandoArquivo(String comando, String dados) {
-  Serial.println("CSV_CMD:" + comando + ":" + dados);
-  delay(50); // Pequena pausa para processamento
+  if (janelaCreditos == 0) {
+    // Capturador sem controle de fluxo: pausa fixa para processamento
+    enviarLinha("CSV_CMD:" + comando + ":" + dados);
+    delay(50);
+    return;
+  }
+  aguardarCredito();
+  sequenciaComando++;
+  enviarLinha("CSV_CMDS:" + String(sequenciaComando) + ":" + comando + ":" + dados);
+}
+
+void aguardarCredito() {
+  // Bloqueia apenas enquanto há janelaCreditos comandos sem confirmação
+  unsigned long inicio = millis();
+  while ((uint16_t)(sequenciaComando - ultimoConfirmado) >= janelaCreditos) {
+    lerControle();
+    if (millis() - inicio > TIMEOUT_CREDITO) {
+      janelaCreditos = 0;  // Capturador parou de confirmar: volta à pausa fixa (até um novo CRED:,
+                           // que o capturador envia ao receber um CSV_CMD: sem sequência)
+      return;
+    }
+    delay(1);
+  }
+}
+
+void lerControle() {
+  // Lê sem bloquear as linhas enviadas pelo capturador
+  while (Serial.available()) {
+    char c = Serial.read();
+    if (c == '\n') {
+      tratarControle(entradaControle);
+      entradaControle = "";
+    } else if (entradaControle.length() < TAMANHO_MAXIMO_CONTROLE) {
+      entradaControle += c;
+    }
+  }
+}
+
+void tratarControle(String linha) {
+  linha.trim();
+  if (linha.startsWith("ACK:")) {
+    ultimoConfirmado = (uint16_t)linha.substring(4).toInt();
+  } else if (linha.startsWith("CRED:")) {
+    janelaCreditos = (uint16_t)linha.substring(5).toInt();
+    ultimoConfirmado = sequenciaComando;  // Nova janela a partir do último comando enviado
+  } else if (linha.startsWith("HOST:")) {
+    mensagemUnica = linha.substring(5).toInt() >= 2;
+  } else if (linha == "MODE:" PROTOCOLO_BINARIO) {
+    enviarLinha("MODE_OK:" PROTOCOLO_BINARIO);  // Última linha em texto puro
+    modoBinario = true;
+    protocoloDefinido = true;
+  } else if (linha == "MODE:TEXT") {
+    protocoloDefinido = true;
+  } else if (linha == "SYNC") {
+    reanunciar = sistemaInicializado;  // No boot a sessão já vai ser anunciada
+  } else if (linha.startsWith("SET:INTERVALO:")) {
+    intervaloLeitura = constrain(linha.substring(14).toInt(), INTERVALO_MINIMO, INTERVALO_MAXIMO);
+    enviarConfiguracao();
+  } else if (linha.startsWith("SET:CANAL:")) {
+    // SET:CANAL:<DHT|LDR|MPU>:<0|1>
+    int separador = linha.indexOf(':', 10);
+    uint8_t canal = canalPorNome(linha.substring(10, separador));
+    if (canal != 0 && separador > 0) {
+      if (linha.substring(separador + 1).toInt()) {
+        canaisAtivos |= canal;
+      } else {
+        canaisAtivos &= ~canal;
+      }
+    }
+    enviarConfiguracao();
+  } else if (linha.startsWith("BURST:")) {
+    // BURST:<amostras>:<ms>; a próxima leitura já sai no intervalo da rajada
+    int separador = linha.indexOf(':', 6);
+    if (separador > 0) {
+      rajadaRestante = constrain(linha.substring(6, separador).toInt(), 0, RAJADA_MAXIMA);
+      intervaloRajada = constrain(linha.substring(separador + 1).toInt(), INTERVALO_MINIMO, INTERVALO_MAXIMO);
+    }
+    enviarConfiguracao();
+  }
+}
+
+uint8_t canalPorNome(String nome) {
+  if (nome == "DHT") return CANAL_DHT;
+  if (nome == "LDR") return CANAL_LDR;
+  if (nome == "MPU") return CANAL_MPU;
+  return 0;
+}
+
+void enviarConfiguracao() {
+  enviarLinha("CFG:INTERVALO=" + String(intervaloLeitura) +
+              ",CANAIS=" + String(canaisAtivos) +
+              ",RAJADA=" + String(rajadaRestante));
+}
+
+void negociarProtocolo() {
+  // Anuncia o protocolo binário; sem resposta (Serial Monitor, capturador antigo) segue em
+  // texto, na versão 1 (com a linha DATA:)
+  enviarLinha("CAPS:" PROTOCOLO_BINARIO);
+  unsigned long inicio = millis();
+  while (!protocoloDefinido && millis() - inicio < TIMEOUT_NEGOCIACAO) {
+    lerControle();  // HOST:, CRED: e MODE: chegam nesta ordem
+    delay(10);
+  }
+}
+
+void enviarLinha(const String& linha) {
+  if (!modoBinario) {
+    Serial.println(linha);
+    return;
+  }
+  size_t tamanho = linha.length() < TAMANHO_MAXIMO_PAYLOAD ? linha.length() : TAMANHO_MAXIMO_PAYLOAD;
+  enviarQuadro(TIPO_TEXTO, (const uint8_t*)linha.c_str(), tamanho);
+}
+
+void enviarQuadro(uint8_t tipo, const uint8_t* payload, size_t tamanho) {
+  // tipo (1) + sequência (2) + payload + CRC16 (2), em little-endian
+  uint8_t quadro[TAMANHO_MAXIMO_PAYLOAD + 5];
+  size_t n = 0;
+  quadro[n++] = tipo;
+  quadro[n++] = sequenciaQuadro & 0xFF;
+  quadro[n++] = sequenciaQuadro >> 8;
+  memcpy(quadro + n, payload, tamanho);
+  n += tamanho;
+  uint16_t crc = calcularCRC16(quadro, n);
+  quadro[n++] = crc & 0xFF;
+  quadro[n++] = crc >> 8;
+
+  uint8_t codificado[TAMANHO_MAXIMO_PAYLOAD + 8];
+  size_t m = codificarCOBS(quadro, n, codificado);
+  codificado[m++] = 0x00;  // Delimitador do quadro
+  Serial.write(codificado, m);
+  sequenciaQuadro++;
+}
+
+void enviarAmostraBinaria(unsigned long timestamp, String status) {
+  AmostraBinaria amostra;
+  amostra.timestamp = timestamp;
+  // Canais desligados seguem com o menor int16 / maior unsigned (campo vazio no CSV)
+  bool dht = canaisAtivos & CANAL_DHT;
+  bool mpu = canaisAtivos & CANAL_MPU;
+  amostra.temperatura = dht ? (int16_t)lroundf(temperatura * 100) : INT16_MIN;
+  amostra.umidade = dht ? (uint16_t)lroundf(umidade * 100) : UINT16_MAX;
+  amostra.luminosidade = (canaisAtivos & CANAL_LDR) ? (uint8_t)luminosidade : UINT8_MAX;
+  amostra.accel[0] = mpu ? (int16_t)lroundf(accel_x * 1000) : INT16_MIN;
+  amostra.accel[1] = mpu ? (int16_t)lroundf(accel_y * 1000) : INT16_MIN;
+  amostra.accel[2] = mpu ? (int16_t)lroundf(accel_z * 1000) : INT16_MIN;
+  amostra.gyro[0] = mpu ? (int16_t)lroundf(gyro_x * 100) : INT16_MIN;
+  amostra.gyro[1] = mpu ? (int16_t)lroundf(gyro_y * 100) : INT16_MIN;
+  amostra.gyro[2] = mpu ? (int16_t)lroundf(gyro_z * 100) : INT16_MIN;
+  amostra.status = status == "CRITICO" ? 2 : (status == "ALERTA" ? 1 : 0);
+  enviarQuadro(TIPO_AMOSTRA, (const uint8_t*)&amostra, sizeof(amostra));
+}
+
+uint16_t calcularCRC16(const uint8_t* dados, size_t tamanho) {
+  // CRC-16/CCITT-FALSE (polinômio 0x1021, início 0xFFFF)
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < tamanho; i++) {
+    crc ^= (uint16_t)dados[i] << 8;
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+size_t codificarCOBS(const uint8_t* entrada, size_t tamanho, uint8_t* saida) {
+  // Substitui os bytes 0x00 para que o 0x00 marque apenas o fim do quadro
+  size_t posicaoCodigo = 0;
+  size_t n = 1;
+  uint8_t codigo = 1;
+  for (size_t i = 0; i < tamanho; i++) {
+    if (entrada[i] == 0) {
+      saida[posicaoCodigo] = codigo;
+      posicaoCodigo = n++;
+      codigo = 1;
+    } else {
+      saida[n++] = entrada[i];
+      if (++codigo == 0xFF) {
+        saida[posicaoCodigo] = codigo;
+        posicaoCodigo = n++;
+        codigo = 1;
+      }
+    }
+  }
+  saida[posicaoCodigo] = codigo;
+  return n;
 }
 
 void enviarDadosCSV(unsigned long timestamp, String status) {
-  // Montar linha CSV
-  String linhaCsv = String(timestamp) + "," + 
-                    String(temperatura, 2) + "," + 
-                    String(umidade, 2) + "," + 
-                    String(luminosidade) + "," + 
-                    String(accel_x, 3) + "," + 
-                    String(accel_y, 3) + "," + 
-                    String(accel_z, 3) + "," + 
-                    String(gyro_x, 2) + "," + 
-                    String(gyro_y, 2) + "," + 
-                    String(gyro_z, 2) + "," + 
-                    status;
-  
   // Enviar comando para escrever no arquivo
-  enviarComandoArquivo("WRITE_DATA", linhaCsv);
+  enviarComandoArquivo("WRITE_DATA", montarLinhaCSV(timestamp, status));
+}
+
+String montarLinhaCSV(unsigned long timestamp, String status) {
+  // Canais desligados seguem como campos vazios
+  bool dht = canaisAtivos & CANAL_DHT;
+  bool ldr = canaisAtivos & CANAL_LDR;
+  bool mpu = canaisAtivos & CANAL_MPU;
+  return String(timestamp) + "," + 
+         (dht ? String(temperatura, 2) : "") + "," + 
+         (dht ? String(umidade, 2) : "") + "," + 
+         (ldr ? String(luminosidade) : "") + "," + 
+         (mpu ? String(accel_x, 3) : "") + "," + 
+         (mpu ? String(accel_y, 3) : "") + "," + 
+         (mpu ? String(accel_z, 3) : "") + "," + 
+         (mpu ? String(gyro_x, 2) : "") + "," + 
+         (mpu ? String(gyro_y, 2) : "") + "," + 
+         (mpu ? String(gyro_z, 2) : "") + "," + 
+         status;
 }
 
 void lerSensores() {
-  // ===== LEITURA DHT22 =====
-  temperatura = dht.readTemperature();
-  umidade = dht.readHumidity();
-  
-  // Verificar se leitura é válida
-  if (isnan(temperatura) || isnan(umidade)) {
-    temperatura = 0.0;
-    umidade = 0.0;
+  // Canais desligados pelo capturador não são lidos
+  if (canaisAtivos & CANAL_DHT) {
+    // ===== LEITURA DHT22 =====
+    temperatura = dht.readTemperature();
+    umidade = dht.readHumidity();
+    
+    // Verificar se leitura é válida
+    if (isnan(temperatura) || isnan(umidade)) {
+      temperatura = 0.0;
+      umidade = 0.0;
+    }
+  }
+  
+  if (canaisAtivos & CANAL_LDR) {
+    // ===== LEITURA LDR =====
+    int leitura_raw = analogRead(LDR_PIN);
+    luminosidade = map(leitura_raw, 0, 4095, 0, 100); // Converter para 0-100%
   }
   
-  // ===== LEITURA LDR =====
-  int leitura_raw = analogRead(LDR_PIN);
-  luminosidade = map(leitura_raw, 0, 4095, 0, 100); // Converter para 0-100%
+  if (!(canaisAtivos & CANAL_MPU)) {
+    return;
+  }
   
   // ===== LEITURA MPU6050 =====
   Wire.beginTransmission(MPU_ADDRESS);
@@ -261,28 +551,32 @@ void lerSensores() {
 }
 
 String analisarStatus() {
+  // Apenas os canais ativos entram na análise
+  bool dht = canaisAtivos & CANAL_DHT;
+  bool mpu = canaisAtivos & CANAL_MPU;
+  
   // Calcular vibração total
   float vibracao_total = sqrt(accel_x*accel_x + accel_y*accel_y + accel_z*accel_z);
   
   // Verificar condições críticas
-  if (temperatura > 35.0) {
+  if (dht && temperatura > 35.0) {
     return "CRITICO";
   }
   
-  if (vibracao_total > 5.0) {
+  if (mpu && vibracao_total > 5.0) {
     return "CRITICO";
   }
   
   // Verificar condições de alerta
-  if (temperatura > 25.0 && temperatura <= 35.0) {
+  if (dht && temperatura > 25.0 && temperatura <= 35.0) {
     return "ALERTA";
   }
   
-  if (vibracao_total > 2.0 && vibracao_total <= 5.0) {
+  if (mpu && vibracao_total > 2.0 && vibracao_total <= 5.0) {
     return "ALERTA";
   }
   
-  if (umidade > 80.0 || umidade < 20.0) {
+  if (dht && (umidade > 80.0 || umidade < 20.0)) {
     return "ALERTA";
   }
   
@@ -290,24 +584,27 @@ String analisarStatus() {
 }
 
 void verificarAlertas() {
-  if (temperatura > 35.0) {
-    Serial.println("ALERT: CRÍTICO - Temperatura > 35°C");
+  bool dht = canaisAtivos & CANAL_DHT;
+  bool mpu = canaisAtivos & CANAL_MPU;
+  
+  if (dht && temperatura > 35.0) {
+    enviarLinha("ALERT: CRÍTICO - Temperatura > 35°C");
     enviarComandoArquivo("WRITE_ALERT", "CRÍTICO - Temperatura > 35°C - " + String(millis()));
   }
   
   float vibracao_total = sqrt(accel_x*accel_x + accel_y*accel_y + accel_z*accel_z);
-  if (vibracao_total > 5.0) {
-    Serial.println("ALERT: CRÍTICO - Vibração excessiva");
+  if (mpu && vibracao_total > 5.0) {
+    enviarLinha("ALERT: CRÍTICO - Vibração excessiva");
     enviarComandoArquivo("WRITE_ALERT", "CRÍTICO - Vibração excessiva - " + String(millis()));
   }
   
-  if (umidade > 80.0) {
-    Serial.println("ALERT: Umidade alta - Risco de corrosão");
+  if (dht && umidade > 80.0) {
+    enviarLinha("ALERT: Umidade alta - Risco de corrosão");
     enviarComandoArquivo("WRITE_ALERT", "ALERTA - Umidade alta - " + String(millis()));
   }
   
-  if (umidade < 20.0) {
-    Serial.println("ALERT: Umidade baixa - Risco de estática");
+  if (dht && umidade < 20.0) {
+    enviarLinha("ALERT: Umidade baixa - Risco de estática");
     enviarComandoArquivo("WRITE_ALERT", "ALERTA - Umidade baixa - " + String(millis()));
   }
 }
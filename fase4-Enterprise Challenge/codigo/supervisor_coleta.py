@@ -0,0 +1,463 @@
+import csv
+import multiprocessing
+import os
+import signal
+import struct
+import sys
+import tempfile
+import time
+from multiprocessing import shared_memory
+
+import capturador_automatico as capturador
+import difusao_registros
+
+"""
+Supervisor de Coleta com Vários Processos
+Sistema de Monitoramento Industrial - Hermes Reply
+
+FUNCIONALIDADES:
+- Distribui os dispositivos (portas seriais) entre processos leitores
+- Leitores fazem o enquadramento, a negociação e a amostragem adaptativa
+  do capturador_automatico e entregam os comandos decodificados aos
+  processos gravadores por anéis em memória compartilhada (sem pickle)
+- Gravadores mantêm os arquivos CSV e de alertas de cada dispositivo
+- Verifica os batimentos dos processos e reinicia os que travarem ou caírem
+
+COMO USAR:
+1. python supervisor_coleta.py COM3 COM4 COM5 (ou /dev/ttyUSB0 /dev/ttyUSB1 ...)
+2. Cada dispositivo grava em uma subpasta própria de PASTA_DESTINO
+3. Pressione Ctrl+C para parar
+4. python supervisor_coleta.py --mesclar todos.csv junta os CSVs das subpastas
+   em um único arquivo ordenado pela coluna data_hora
+5. python supervisor_coleta.py --benchmark mede a vazão com 1..N leitores
+6. Cada gravador publica os registros dos seus dispositivos no endereço de
+   difusão com o número do gravador (ex.: hermes_reply_capturas_0.sock)
+"""
+
+# ===== CONFIGURAÇÕES =====
+PROCESSOS_LEITORES = None           # None: um por núcleo (limitado ao número de dispositivos)
+PROCESSOS_GRAVADORES = None         # None: um para cada dois leitores
+SLOTS_ANEL = 4096                   # Comandos pendentes por anel (um anel por leitor)
+TAMANHO_SLOT = 512                  # Bytes por slot (cabeçalho + "COMANDO:dados")
+LOTE_GRAVADOR = 256                 # Slots consumidos de um anel por vez
+ESPERA_OCIOSA = 0.001               # Segundos de pausa quando não há nada para ler
+INTERVALO_VERIFICACAO = 1.0         # Segundos entre verificações de saúde
+TIMEOUT_BATIMENTO = 5.0             # Processo sem batimento por mais tempo é considerado travado
+PAUSA_REINICIO = 1.0                # Segundos antes de reiniciar um processo que caiu
+
+class AnelMemoriaCompartilhada:
+    """
+    Fila circular de slots de tamanho fixo em multiprocessing.shared_memory.
+
+    Um único produtor (leitor) e um único consumidor (gravador): o produtor
+    só escreve a posição de escrita e o consumidor só a de leitura, cada uma
+    em sua própria linha de cache, então não há trava. As posições crescem
+    sem voltar a zero; o slot é posição % slots. O payload é copiado para o
+    slot antes de a posição de escrita avançar, e o consumidor só libera os
+    slots depois de gravá-los: a entrega é "pelo menos uma vez", e um
+    gravador que cai regrava o último lote. As posições são inteiros de 64
+    bits alinhados, escritos de uma vez pela memoryview (struct.pack_into
+    grava byte a byte e o outro processo poderia ler um valor pela metade).
+    Elas ficam na memória compartilhada: um processo reiniciado continua de
+    onde o anterior parou.
+    """
+
+    GEOMETRIA = struct.Struct('<II')     # slots, tamanho do slot (após a posição de escrita)
+    CABECALHO_SLOT = struct.Struct('<HH')  # dispositivo, tamanho do payload
+    ESCRITA = 0                          # Índices em posicoes (inteiros de 8 bytes)
+    LEITURA = 8                          # Byte 64: outra linha de cache
+    TAMANHO_CABECALHO = 128
+
+    def __init__(self, nome=None, slots=SLOTS_ANEL, tamanho_slot=TAMANHO_SLOT):
+        if nome is None:
+            self.memoria = shared_memory.SharedMemory(create=True, size=self.TAMANHO_CABECALHO + slots * tamanho_slot)
+            self.GEOMETRIA.pack_into(self.memoria.buf, 8, slots, tamanho_slot)
+        else:
+            self.memoria = shared_memory.SharedMemory(name=nome)
+            slots, tamanho_slot = self.GEOMETRIA.unpack_from(self.memoria.buf, 8)
+        self.nome = self.memoria.name
+        self.slots = slots
+        self.tamanho_slot = tamanho_slot
+        self.tamanho_maximo = tamanho_slot - self.CABECALHO_SLOT.size
+        self.buf = self.memoria.buf
+        self.posicoes = self.buf[:self.TAMANHO_CABECALHO].cast('Q')
+        if nome is None:
+            self.posicoes[self.ESCRITA] = self.posicoes[self.LEITURA] = 0
+
+    def __len__(self):
+        return self.posicoes[self.ESCRITA] - self.posicoes[self.LEITURA]
+
+    def escrever(self, dispositivo, payload):
+        """Publica um payload; retorna False se o anel estiver cheio"""
+        if len(payload) > self.tamanho_maximo:
+            raise ValueError(f"payload de {len(payload)} bytes excede o slot ({self.tamanho_maximo})")
+        escrita = self.posicoes[self.ESCRITA]
+        if escrita - self.posicoes[self.LEITURA] >= self.slots:
+            return False
+        inicio = self.TAMANHO_CABECALHO + (escrita % self.slots) * self.tamanho_slot
+        self.CABECALHO_SLOT.pack_into(self.buf, inicio, dispositivo, len(payload))
+        inicio += self.CABECALHO_SLOT.size
+        self.buf[inicio:inicio + len(payload)] = payload
+        self.posicoes[self.ESCRITA] = escrita + 1
+        return True
+
+    def ler(self, maximo=LOTE_GRAVADOR):
+        """Copia até maximo payloads pendentes: lista de (dispositivo, bytes); libere-os com liberar()"""
+        leitura = self.posicoes[self.LEITURA]
+        disponiveis = min(self.posicoes[self.ESCRITA] - leitura, maximo)
+        itens = []
+        for posicao in range(leitura, leitura + disponiveis):
+            inicio = self.TAMANHO_CABECALHO + (posicao % self.slots) * self.tamanho_slot
+            dispositivo, tamanho = self.CABECALHO_SLOT.unpack_from(self.buf, inicio)
+            inicio += self.CABECALHO_SLOT.size
+            itens.append((dispositivo, bytes(self.buf[inicio:inicio + tamanho])))
+        return itens
+
+    def liberar(self, quantidade):
+        """Devolve ao produtor os quantidade slots mais antigos"""
+        self.posicoes[self.LEITURA] += quantidade
+
+    def fechar(self):
+        self.posicoes.release()
+        self.buf = None
+        self.memoria.close()
+
+    def remover(self):
+        self.fechar()
+        self.memoria.unlink()
+
+class EstadoCapturador:
+    """
+    Variáveis globais do capturador_automatico de um dispositivo.
+
+    O capturador guarda o estado da conexão em variáveis globais (um
+    dispositivo por processo); com vários dispositivos no mesmo processo,
+    cada um ativa o seu estado com 'with' antes de processar e o guarda de
+    volta ao terminar.
+    """
+
+    def __init__(self, **valores):
+        self.valores = valores
+
+    def __enter__(self):
+        for nome, valor in self.valores.items():
+            setattr(capturador, nome, valor)
+        return self
+
+    def __exit__(self, *erro):
+        for nome in self.valores:
+            self.valores[nome] = getattr(capturador, nome)
+
+class PortaReproducao:
+    """Substitui a porta serial por bytes gravados (benchmark e reprodução de capturas)"""
+
+    def __init__(self, dados, tamanho_bloco=capturador.TAMANHO_BLOCO_LEITURA):
+        self.dados = memoryview(dados)
+        self.posicao = 0
+        self.tamanho_bloco = tamanho_bloco
+
+    @property
+    def in_waiting(self):
+        return min(len(self.dados) - self.posicao, self.tamanho_bloco)
+
+    def readinto(self, destino):
+        quantidade = min(len(destino), len(self.dados) - self.posicao)
+        destino[:quantidade] = self.dados[self.posicao:self.posicao + quantidade]
+        self.posicao += quantidade
+        return quantidade
+
+    def write(self, dados):
+        return len(dados)  # Respostas ao "ESP32" são descartadas
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+def nome_dispositivo(porta):
+    """Nome da subpasta do dispositivo: COM3 -> COM3, /dev/ttyUSB0 -> ttyUSB0"""
+    return os.path.basename(str(porta)) or "dispositivo"
+
+def ignorar_interrupcao():
+    """Ctrl+C chega a todos os processos; só o supervisor trata e encerra os demais na ordem"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+# ===== PROCESSO LEITOR =====
+def executar_leitor(indice, dispositivos, nome_anel, batimentos, parar, fonte=None):
+    """
+    Lê as portas de um grupo de dispositivos e publica os comandos no anel.
+
+    dispositivos: lista de (número, porta). fonte: bytes reproduzidos no lugar
+    das portas seriais (benchmark).
+    """
+    ignorar_interrupcao()
+    anel = AnelMemoriaCompartilhada(nome_anel)
+    atual = None
+
+    def publicar(comando, dados):
+        payload = f"{comando}:{dados}".encode('utf-8')
+        try:
+            while not anel.escrever(atual, payload):
+                batimentos[indice] = time.monotonic()   # Gravador atrasado não é travamento do leitor
+                time.sleep(ESPERA_OCIOSA)
+        except ValueError as e:
+            print(f"⚠️  Leitor {indice}: comando {comando} descartado: {e}")
+
+    capturador.encaminhar_comando = publicar
+    conexoes = []
+    try:
+        for numero, porta in dispositivos:
+            ser = PortaReproducao(fonte) if fonte is not None else capturador.serial.Serial(porta, capturador.BAUD_RATE, timeout=0)
+            leitor = capturador.LeitorLinhas()
+            estado = EstadoCapturador(versao_protocolo=1, sistema_iniciado=False,
+                                      canal_controle=capturador.CanalControle(ser, leitor))
+            conexoes.append((numero, ser, leitor, estado))
+            print(f"🔌 Leitor {indice}: {porta} (dispositivo {numero})")
+
+        while not parar.is_set():
+            batimentos[indice] = time.monotonic()
+            lidos = 0
+            for numero, ser, leitor, estado in conexoes:
+                quantidade = leitor.ler(ser)
+                if quantidade:
+                    lidos += quantidade
+                    atual = numero
+                    with estado:
+                        leitor.processar()
+                        capturador.canal_controle.confirmar()
+            if not lidos:
+                time.sleep(ESPERA_OCIOSA)
+    finally:
+        for numero, ser, leitor, estado in conexoes:
+            ser.close()
+        anel.fechar()
+
+# ===== PROCESSO GRAVADOR =====
+def retomar_arquivos(estado):
+    """Após o reinício do gravador, continua a captura mais recente da pasta do dispositivo"""
+    pasta = estado.valores["PASTA_DESTINO"]
+    if capturador.ROTACIONAR_SEGMENTOS:
+        # Novo segmento da captura, com o cabeçalho guardado no manifesto
+        manifestos = sorted((os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith('_manifesto.json')),
+                            key=os.path.getmtime)
+        cabecalho = capturador.Manifesto.abrir(manifestos[-1]).dados.get("cabecalho") if manifestos else None
+        if not cabecalho:
+            return
+        nome = os.path.basename(manifestos[-1])[:-len('_manifesto.json')] + '.csv'
+        arquivo = writer = capturador.ArquivoSegmentado(pasta, nome, cabecalho)
+        colunas = cabecalho
+    else:
+        existentes = sorted((os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith('.csv')),
+                            key=os.path.getmtime)
+        if not existentes:
+            return
+        nome = os.path.basename(existentes[-1])
+        colunas = capturador.cabecalho_csv(existentes[-1])
+        arquivo = open(existentes[-1], 'a', newline='', encoding='utf-8')
+        writer = csv.writer(arquivo)
+    estado.valores.update(arquivo_csv_atual=arquivo, writer_csv=writer, colunas_atuais=colunas,
+                          arquivo_alertas=open(os.path.join(pasta, nome.replace('.csv', '_alertas.txt')), 'a', encoding='utf-8'))
+    print(f"♻️  Continuando {os.path.join(pasta, nome)}")
+
+def executar_gravador(indice, gravador, nomes_aneis, pastas, batimentos, contadores, parar, reiniciado=False):
+    """
+    Consome os anéis de um grupo de leitores e grava os arquivos de cada dispositivo.
+
+    indice: posição em batimentos; gravador: posição em contadores. pastas:
+    número do dispositivo -> pasta de destino. Termina quando parar estiver
+    sinalizado e os anéis estiverem vazios.
+
+    Os slots de um lote só são liberados depois de processados. Se o gravador
+    cair no meio do lote, o reiniciado grava o lote inteiro de novo: as linhas
+    ainda no buffer do arquivo não se perdem, mas as já gravadas se repetem.
+    """
+    ignorar_interrupcao()
+    aneis = [AnelMemoriaCompartilhada(nome) for nome in nomes_aneis]
+    estados = {}
+    if capturador.DIFUNDIR_REGISTROS:
+        capturador.difusor = difusao_registros.DifusorRegistros(
+            difusao_registros.endereco_indexado(capturador.ENDERECO_DIFUSAO, gravador)).iniciar()
+    try:
+        while True:
+            batimentos[indice] = time.monotonic()
+            gravados = 0
+            for anel in aneis:
+                lote = anel.ler()
+                for numero, payload in lote:
+                    estado = estados.get(numero)
+                    if estado is None:
+                        os.makedirs(pastas[numero], exist_ok=True)
+                        estado = estados[numero] = EstadoCapturador(
+                            arquivo_csv_atual=None, writer_csv=None, arquivo_alertas=None, registros_salvos=0,
+                            colunas_atuais=None, dispositivo_atual=os.path.basename(pastas[numero]),
+                            versao_protocolo=capturador.VERSAO_PROTOCOLO, PASTA_DESTINO=pastas[numero],
+                            ultima_gravacao_disco=0.0)
+                        if reiniciado:
+                            retomar_arquivos(estado)
+                    comando, _, dados = str(payload, 'utf-8', 'replace').partition(':')
+                    with estado:
+                        capturador.processar_comando_csv(comando, dados)
+                    gravados += 1
+                anel.liberar(len(lote))
+            contadores[gravador] += gravados
+            if not gravados:
+                if parar.is_set():
+                    break
+                for estado in estados.values():
+                    with estado:
+                        capturador.descarregar_periodicamente()   # Linhas paradas no buffer
+                time.sleep(ESPERA_OCIOSA)
+    finally:
+        for estado in estados.values():
+            for nome in ("arquivo_csv_atual", "arquivo_alertas"):
+                if estado.valores[nome]:
+                    estado.valores[nome].close()
+        capturador.aguardar_compressao()
+        if capturador.difusor:
+            capturador.difusor.fechar()
+        for anel in aneis:
+            anel.fechar()
+
+# ===== SUPERVISOR =====
+class SupervisorColeta:
+    """
+    Distribui os dispositivos entre processos leitores e gravadores.
+
+    Cada leitor tem o seu anel, consumido por um único gravador; os
+    dispositivos são distribuídos em rodízio. A cada INTERVALO_VERIFICACAO o
+    supervisor confere se os processos estão vivos e com batimento recente
+    e reinicia os que caíram ou travaram.
+    """
+
+    def __init__(self, portas, leitores=PROCESSOS_LEITORES, gravadores=PROCESSOS_GRAVADORES,
+                 pasta_destino=capturador.PASTA_DESTINO, fonte=None):
+        self.portas = list(portas)
+        self.leitores = max(1, min(leitores or os.cpu_count() or 1, len(self.portas)))
+        self.gravadores = max(1, min(gravadores or (self.leitores + 1) // 2, self.leitores))
+        self.fonte = fonte
+        self.pastas = {numero: os.path.join(pasta_destino, nome_dispositivo(porta))
+                       for numero, porta in enumerate(self.portas)}
+        self.aneis = []
+        self.processos = {}     # índice do batimento -> processo
+        self.reinicios = {}
+        self.batimentos = multiprocessing.Array('d', self.leitores + self.gravadores, lock=False)
+        self.contadores = multiprocessing.Array('Q', self.gravadores, lock=False)
+        self.parar_leitores = multiprocessing.Event()
+        self.parar_gravadores = multiprocessing.Event()
+
+    def _iniciar(self, indice, reiniciado=False):
+        if indice < self.leitores:
+            dispositivos = [(numero, porta) for numero, porta in enumerate(self.portas)
+                            if numero % self.leitores == indice]
+            alvo = executar_leitor
+            argumentos = (indice, dispositivos, self.aneis[indice].nome, self.batimentos, self.parar_leitores, self.fonte)
+        else:
+            gravador = indice - self.leitores
+            alvo = executar_gravador
+            argumentos = (indice, gravador, [anel.nome for anel in self.aneis[gravador::self.gravadores]], self.pastas,
+                          self.batimentos, self.contadores, self.parar_gravadores, reiniciado)
+        self.batimentos[indice] = time.monotonic()
+        processo = multiprocessing.Process(target=alvo, args=argumentos, daemon=True)
+        processo.start()
+        self.processos[indice] = processo
+
+    def iniciar(self):
+        self.aneis = [AnelMemoriaCompartilhada() for _ in range(self.leitores)]
+        for indice in range(self.leitores + self.gravadores):
+            self._iniciar(indice)
+        print(f"🧵 {len(self.portas)} dispositivos em {self.leitores} leitores e {self.gravadores} gravadores")
+
+    def verificar(self):
+        """Reinicia processos que terminaram ou estão sem batimento há mais de TIMEOUT_BATIMENTO"""
+        agora = time.monotonic()
+        for indice, processo in list(self.processos.items()):
+            tipo = "Leitor" if indice < self.leitores else "Gravador"
+            if processo.is_alive() and agora - self.batimentos[indice] <= TIMEOUT_BATIMENTO:
+                continue
+            if processo.is_alive():
+                print(f"⏱️  {tipo} {indice} sem batimento há {agora - self.batimentos[indice]:.1f}s: encerrando")
+                processo.terminate()
+            processo.join()
+            self.reinicios[indice] = self.reinicios.get(indice, 0) + 1
+            print(f"🔁 {tipo} {indice} caiu (código {processo.exitcode}); reinício nº {self.reinicios[indice]}")
+            time.sleep(PAUSA_REINICIO)
+            self._iniciar(indice, reiniciado=True)
+
+    def comandos_gravados(self):
+        return sum(self.contadores)
+
+    def encerrar(self):
+        """Para os leitores, deixa os gravadores esvaziarem os anéis e libera a memória compartilhada"""
+        self.parar_leitores.set()
+        for indice in range(self.leitores):
+            self.processos[indice].join()
+        self.parar_gravadores.set()
+        for indice in range(self.leitores, self.leitores + self.gravadores):
+            self.processos[indice].join()
+        for anel in self.aneis:
+            anel.remover()
+
+    def executar(self):
+        self.iniciar()
+        try:
+            while True:
+                time.sleep(INTERVALO_VERIFICACAO)
+                self.verificar()
+        except KeyboardInterrupt:
+            print("\n✅ Captura interrompida pelo usuário")
+        finally:
+            self.encerrar()
+            print(f"📊 Total de comandos gravados: {self.comandos_gravados()}")
+
+def mesclar_dispositivos(destino, pasta_destino=capturador.PASTA_DESTINO):
+    """Intercala por data_hora os CSVs (e segmentos comprimidos) de todas as subpastas de dispositivos"""
+    extensoes = ('.csv',) + tuple('.csv' + extensao for extensao in capturador.MODULOS_COMPRESSAO)
+    nomes = sorted(subpasta for subpasta in os.listdir(pasta_destino) if os.path.isdir(os.path.join(pasta_destino, subpasta)))
+    # Segmentos de um dispositivo em ordem de número
+    grupos = [sorted(os.path.join(pasta_destino, subpasta, nome) for nome in os.listdir(os.path.join(pasta_destino, subpasta))
+                     if nome.endswith(extensoes)) for subpasta in nomes]
+    return capturador.mesclar_csvs(grupos, destino, nomes)
+
+# ===== BENCHMARK =====
+def fluxo_sintetico(amostras):
+    """Fluxo de um ESP32 na versão 4 (texto): inicialização, arquivo, cabeçalho e amostras numeradas"""
+    linhas = [f"CSV_AUTO_START:{capturador.VERSAO_PROTOCOLO}",
+              "CSV_CMD:CREATE_FILE:dados_monitoramento.csv",
+              "CSV_CMD:WRITE_HEADER:timestamp,temperatura,umidade,luminosidade,accel_x,accel_y,accel_z,"
+              "gyro_x,gyro_y,gyro_z,status"]
+    linhas += [f"CSV_CMDS:{sequencia}:{capturador.LINHA_TESTE}" for sequencia in range(1, amostras + 1)]
+    return ("\r\n".join(linhas) + "\r\n").encode()
+
+def medir_escalabilidade(dispositivos=8, amostras=20000):
+    """
+    Mede registros/s gravados com 1..N leitores (N = núcleos), reproduzindo o
+    mesmo fluxo sintético em todos os dispositivos.
+    """
+    fonte = fluxo_sintetico(amostras)
+    esperado = dispositivos * (amostras + 2)   # amostras + criação do arquivo + cabeçalho
+    vazoes = {}
+    for leitores in range(1, min(os.cpu_count() or 1, dispositivos) + 1):
+        with tempfile.TemporaryDirectory() as pasta:
+            supervisor = SupervisorColeta([f"sim{numero}" for numero in range(dispositivos)], leitores=leitores,
+                                          pasta_destino=pasta, fonte=fonte)
+            inicio = time.perf_counter()
+            supervisor.iniciar()
+            while supervisor.comandos_gravados() < esperado and time.perf_counter() - inicio < 300:
+                time.sleep(0.01)
+            duracao = time.perf_counter() - inicio
+            supervisor.encerrar()
+        vazoes[leitores] = supervisor.comandos_gravados() / duracao
+        print(f"⚡ {leitores} leitores / {supervisor.gravadores} gravadores: {supervisor.comandos_gravados()} "
+              f"comandos em {duracao:.2f}s ({vazoes[leitores]:,.0f} comandos/s)")
+    return vazoes
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        medir_escalabilidade()
+    elif "--mesclar" in sys.argv:
+        mesclar_dispositivos(sys.argv[sys.argv.index("--mesclar") + 1])
+    elif len(sys.argv) > 1:
+        SupervisorColeta(sys.argv[1:]).executar()
+    else:
+        print("💡 Uso: python supervisor_coleta.py COM3 COM4 ... | --mesclar todos.csv | --benchmark")
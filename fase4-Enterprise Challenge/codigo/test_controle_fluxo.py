@@ -0,0 +1,93 @@
+import fcntl
+import os
+import select
+import struct
+import termios
+import tty
+
+import pytest
+
+import capturador_automatico as capturador
+
+"""
+Testes do controle de fluxo por créditos (protocolo versão 3)
+
+COMO USAR:
+python -m pytest test_controle_fluxo.py (Linux/macOS: usa um par pty, sem a pyserial)
+"""
+
+class PortaPty:
+    """Lado escravo de um pty com a interface da pyserial usada pelo LeitorLinhas e pelo CanalControle"""
+
+    def __init__(self, fd, timeout=0.05):
+        tty.setraw(fd)
+        self.fd = fd
+        self.timeout = timeout
+
+    @property
+    def in_waiting(self):
+        return struct.unpack('I', fcntl.ioctl(self.fd, termios.FIONREAD, b'\0' * 4))[0]
+
+    def readinto(self, destino):
+        if not select.select([self.fd], [], [], self.timeout)[0]:
+            return 0
+        dados = os.read(self.fd, len(destino))
+        destino[:len(dados)] = dados
+        return len(dados)
+
+    def write(self, dados):
+        os.write(self.fd, dados)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class PortaMemoria:
+    """Guarda o que o capturador envia ao ESP32"""
+
+    def __init__(self):
+        self.enviado = b""
+
+    def write(self, dados):
+        self.enviado += dados
+
+    def flush(self):
+        pass
+
+@pytest.fixture
+def estado_capturador(monkeypatch):
+    """Isola as variáveis globais alteradas pelos testes"""
+    for nome in ("canal_controle", "versao_protocolo", "sistema_iniciado", "writer_csv", "arquivo_csv_atual"):
+        monkeypatch.setattr(capturador, nome, getattr(capturador, nome))
+    monkeypatch.setattr(capturador, "difusor", None)
+    monkeypatch.setattr(capturador, "encaminhar_comando", None)
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="requer pty (Linux/macOS)")
+def test_creditos_superam_pausa_fixa(estado_capturador):
+    vazoes = capturador.medir_controle_fluxo(total_comandos=40, abrir_porta=PortaPty)
+    assert vazoes["créditos"] > 5 * vazoes["pausa fixa"]
+
+def test_reconcede_creditos_apos_pausa_fixa(estado_capturador):
+    porta = PortaMemoria()
+    capturador.canal_controle = capturador.CanalControle(porta, capturador.LeitorLinhas())
+    capturador.sistema_iniciado = True
+    capturador.versao_protocolo = 3
+
+    # ESP32 esgotou o TIMEOUT_CREDITO e voltou a enviar CSV_CMD: sem sequência
+    capturador.tratar_comando_csv(b"FLUSH_FILE:")
+    assert porta.enviado == f"CRED:{capturador.JANELA_CREDITOS}\n".encode()
+
+    # Outros comandos antes do novo CRED: chegar não repetem a concessão
+    capturador.tratar_comando_csv(b"FLUSH_FILE:")
+    assert porta.enviado.count(b"CRED:") == 1
+
+def test_sem_reconcessao_para_firmware_sem_creditos(estado_capturador):
+    porta = PortaMemoria()
+    capturador.canal_controle = capturador.CanalControle(porta, capturador.LeitorLinhas())
+    capturador.sistema_iniciado = True
+    capturador.versao_protocolo = 2
+
+    capturador.tratar_comando_csv(b"FLUSH_FILE:")
+    assert b"CRED:" not in porta.enviado